@@ -92,11 +92,11 @@ def dev_mode_required(f):
 
 # --- FILTRE JINJA2 ---
 @app.template_filter('competitor_thumbnail')
-def competitor_thumbnail_filter(competitor_id):
-    """Filter to get local competitor thumbnail"""
+def competitor_thumbnail_filter(competitor_id, width=None):
+    """Filter to get local competitor thumbnail (resized WebP variant when width is given)"""
     try:
         from yt_channel_analyzer.utils.thumbnails import get_competitor_thumbnail
-        return get_competitor_thumbnail(competitor_id)
+        return get_competitor_thumbnail(competitor_id, width=width)
     except ImportError:
         return f"/static/competitors/images/{competitor_id}.jpg"
 
@@ -685,6 +685,24 @@ def create_app():
     except Exception as e:
         print(f"[WARNING] Erreur d'initialisation DB: {e}")
     
+    # File de tâches : migration JSON et reprise des jobs en attente (hors import du module)
+    try:
+        from yt_channel_analyzer.background_tasks import task_manager
+        task_manager.start()
+        print("[STARTUP] ✅ File de tâches démarrée")
+    except Exception as e:
+        print(f"[WARNING] File de tâches indisponible: {e}")
+    
+    # Monitoring des performances (opt-in : PERFORMANCE_MONITORING=true)
+    from yt_channel_analyzer.request_metrics import monitoring_enabled
+    if monitoring_enabled():
+        try:
+            from yt_channel_analyzer.performance_manager import enable_monitoring
+            enable_monitoring(app)
+            print("[STARTUP] 📊 Monitoring des performances activé")
+        except Exception as e:
+            print(f"[WARNING] Monitoring des performances indisponible: {e}")
+    
     print(f"[STARTUP] 🎉 Application prête avec {len(list(app.url_map.iter_rules()))} routes")
     return app
 
@@ -33,11 +33,11 @@ topic_analyzer = None
 
 # --- FILTRE JINJA2 ---
 @app.template_filter('competitor_thumbnail')
-def competitor_thumbnail_filter(competitor_id):
-    """Filtre pour obtenir la miniature locale d'un concurrent"""
+def competitor_thumbnail_filter(competitor_id, width=None):
+    """Filtre pour obtenir la miniature locale d'un concurrent (variante WebP si width)"""
     try:
         from yt_channel_analyzer.utils.thumbnails import get_competitor_thumbnail
-        return get_competitor_thumbnail(competitor_id)
+        return get_competitor_thumbnail(competitor_id, width=width)
     except ImportError:
         return f"/static/competitors/images/{competitor_id}.jpg"
 
@@ -579,75 +579,44 @@ def data_export():
 @admin_bp.route('/export-data/<data_type>')
 @login_required
 def export_data(data_type):
-    """Exporter des données en JSON"""
+    """Exporter des données en flux (json, ndjson, csv ou parquet ; gzip à la volée)"""
     try:
-        from yt_channel_analyzer.database import get_db_connection
-        from flask import Response
-        
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        from flask import Response, stream_with_context
+        from yt_channel_analyzer.streaming_export import (
+            EXPORT_SOURCES, FORMATS, PYARROW_AVAILABLE, export_filename, export_stream
+        )
         
-        if data_type == 'competitors':
-            cursor.execute("""
-                SELECT id, name, channel_url, country, subscribers, 
-                       created_at, last_updated
-                FROM concurrent
-                ORDER BY name
-            """)
-            columns = ['id', 'name', 'channel_url', 'country', 'subscribers', 'created_at', 'last_updated']
-            
-        elif data_type == 'videos':
-            cursor.execute("""
-                SELECT v.id, v.title, v.view_count, v.like_count, v.comment_count,
-                       v.published_at, v.duration_seconds, v.category, c.name as competitor_name
-                FROM video v
-                JOIN concurrent c ON v.concurrent_id = c.id
-                ORDER BY v.view_count DESC
-                LIMIT 1000
-            """)
-            columns = ['id', 'title', 'view_count', 'like_count', 'comment_count', 
-                      'published_at', 'duration_seconds', 'category', 'competitor_name']
-            
-        elif data_type == 'playlists':
-            cursor.execute("""
-                SELECT p.id, p.name, p.description, p.category, p.video_count,
-                       c.name as competitor_name
-                FROM playlist p
-                JOIN concurrent c ON p.concurrent_id = c.id
-                ORDER BY p.video_count DESC
-            """)
-            columns = ['id', 'name', 'description', 'category', 'video_count', 'competitor_name']
-            
-        else:
+        if data_type not in EXPORT_SOURCES:
             return jsonify({'error': 'Type de données non supporté'}), 400
         
-        # Convertir en dictionnaires
-        data = []
-        for row in cursor.fetchall():
-            data.append(dict(zip(columns, row)))
+        fmt = request.args.get('format', 'json').lower()
+        if fmt not in FORMATS:
+            return jsonify({'error': f"Format non supporté: {fmt}", 'formats': list(FORMATS)}), 400
+        if fmt == 'parquet' and not PYARROW_AVAILABLE:
+            return jsonify({'error': "Export Parquet indisponible (pyarrow non installé)"}), 501
         
-        conn.close()
+        # JSON reste non compressé par défaut (compatibilité) ; ndjson/csv compressés sauf ?compress=none
+        default_compress = 'none' if fmt == 'json' else 'gzip'
+        compress = request.args.get('compress', default_compress).lower() == 'gzip' and fmt != 'parquet'
         
-        # Préparer l'export JSON
-        export_data = {
-            'export_type': data_type,
-            'export_date': datetime.now().isoformat(),
-            'total_records': len(data),
-            'data': data
-        }
+        stream = export_stream(data_type, fmt, compress)
+        # Ouvre la source avant d'envoyer les en-têtes : une base absente renvoie une vraie erreur
+        first_chunk = next(stream, b'')
         
-        json_data = json.dumps(export_data, indent=2, ensure_ascii=False)
+        def generate():
+            yield first_chunk
+            yield from stream
         
-        response = Response(
-            json_data,
-            mimetype='application/json',
+        mimetype = 'application/gzip' if compress else FORMATS[fmt][0]
+        return Response(
+            stream_with_context(generate()),
+            mimetype=mimetype,
             headers={
-                'Content-Disposition': f'attachment; filename={data_type}_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+                'Content-Disposition': f'attachment; filename={export_filename(data_type, fmt, compress)}',
+                'X-Accel-Buffering': 'no'
             }
         )
         
-        return response
-        
     except Exception as e:
         print(f"[ERROR] Error exporting {data_type}: {e}")
         return jsonify({'error': str(e)}), 500
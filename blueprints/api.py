@@ -6,10 +6,12 @@ Extracted from monolithic app.py to improve maintainability.
 from flask import Blueprint, jsonify, request, current_app
 from blueprints.auth import login_required
 from yt_channel_analyzer.database import get_db_connection
+from yt_channel_analyzer import request_metrics
 import os
 import json
 import subprocess
 import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -81,17 +83,46 @@ def recent_analyses():
         })
 
 
+def _system_samples():
+    """Échantillons du buffer circulaire de PerformanceMonitor (vide si le monitoring est inactif)"""
+    if not request_metrics.registry.enabled:
+        return []
+    from yt_channel_analyzer.performance_manager import performance_monitor
+    return [
+        {**sample.__dict__, 'timestamp': sample.timestamp.isoformat()}
+        for sample in performance_monitor.metrics_history
+    ]
+
+
+def _performance_metrics_prometheus():
+    """Export texte Prometheus des métriques de requêtes et système"""
+    system = {}
+    if psutil:
+        memory = psutil.virtual_memory()
+        system = {
+            'cpu_percent': psutil.cpu_percent(interval=None),
+            'memory_percent': memory.percent,
+            'memory_available_bytes': memory.available
+        }
+    body = request_metrics.registry.to_prometheus(system)
+    return current_app.response_class(body, mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
 @api_bp.route('/performance-metrics')
 @login_required
 def performance_metrics():
-    """API pour récupérer les métriques de performance"""
+    """API pour récupérer les métriques de performance (JSON ou ?format=prometheus)"""
     try:
+        if request.args.get('format') == 'prometheus':
+            return _performance_metrics_prometheus()
+        
         if not psutil:
             return jsonify({
                 'error': 'psutil non disponible - métriques système désactivées',
                 'memory': {'percent': 0, 'available_mb': 0, 'used_mb': 0, 'total_mb': 0},
                 'disk': {'percent': 0, 'free_gb': 0, 'used_gb': 0, 'total_gb': 0},
                 'database': {'size_mb': 0},
+                'requests': request_metrics.registry.snapshot(),
                 'timestamp': datetime.now().isoformat()
             })
         
@@ -123,6 +154,8 @@ def performance_metrics():
             'database': {
                 'size_mb': db_size // (1024 * 1024)
             },
+            'requests': request_metrics.registry.snapshot(),
+            'system_samples': _system_samples(),
             'timestamp': datetime.now().isoformat()
         }
         
@@ -477,6 +510,7 @@ def launch_background_task():
         # Créer la tâche
         task_name = f"Relancement - {channel_name}"
         task_id = task_manager.create_task(channel_url, task_name)
+        task_manager.start_background_scraping(task_id, channel_url)
         
         return jsonify({
             'success': True,
@@ -1098,83 +1132,59 @@ def autocomplete():
         return jsonify([])
     
     try:
-        from yt_channel_analyzer.youtube_api import YouTubeAPI
+        from yt_channel_analyzer.search_index import (
+            LOCAL_RESULTS_THRESHOLD, remote_channel_search, search_competitors
+        )
         
         suggestions = []
         
-        # 1. D'abord chercher dans les concurrents existants (priorité haute)
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        # 1. D'abord chercher dans les concurrents existants (index FTS5, préfixe + bm25)
+        conn = get_db_connection(update_schema=False)
+        try:
+            existing_results = search_competitors(conn, q, limit=5)
+        finally:
+            conn.close()
         
-        cursor.execute("""
-            SELECT 
-                c.id,
-                c.name,
-                c.channel_url as url,
-                c.country,
-                c.thumbnail_url,
-                COUNT(v.id) as video_count
-            FROM concurrent c
-            LEFT JOIN video v ON c.id = v.concurrent_id
-            WHERE c.name LIKE ? OR c.name LIKE ?
-            GROUP BY c.id, c.name, c.channel_url, c.country, c.thumbnail_url
-            ORDER BY 
-                CASE 
-                    WHEN c.name LIKE ? THEN 1  -- Commence par la recherche
-                    WHEN c.name LIKE ? THEN 2  -- Contient la recherche
-                    ELSE 3
-                END,
-                COUNT(v.id) DESC
-            LIMIT 5
-        """, (f"{q}%", f"%{q}%", f"{q}%", f"%{q}%"))
-        
-        existing_results = cursor.fetchall()
         existing_names = set()
-        
         for result in existing_results:
-            competitor_id, name, url, country, thumbnail_url, video_count = result
-            existing_names.add(name.lower())
-            
-            local_thumbnail = f"/static/competitors/images/{competitor_id}.jpg"
-            
+            existing_names.add(result['name'].lower())
             suggestions.append({
-                'id': competitor_id,
-                'name': name,
-                'url': url or '',
-                'country': country or 'Pays non spécifié',
-                'thumbnail': local_thumbnail,
-                'video_count': video_count,
+                'id': result['id'],
+                'name': result['name'],
+                'url': result['url'] or '',
+                'country': result['country'] or 'Pays non spécifié',
+                'thumbnail': f"/static/competitors/images/{result['id']}.jpg",
+                'video_count': result['video_count'],
                 'is_analyzed': True,
                 'priority': 'existing'
             })
         
-        conn.close()
+        # 2. Recherche YouTube API seulement si les résultats locaux sont insuffisants (cache + anti-rebond)
+        youtube_channels = []
+        if len(existing_results) < LOCAL_RESULTS_THRESHOLD:
+            try:
+                youtube_channels = remote_channel_search.search(q, max_results=10)
+                
+                for channel in youtube_channels:
+                    # Éviter les doublons avec les chaînes existantes
+                    if channel['title'].lower() not in existing_names:
+                        suggestions.append({
+                            'id': None,  # Pas encore en base
+                            'name': channel['title'],
+                            'url': channel.get('url', ''),
+                            'country': 'YouTube Search',
+                            'thumbnail': channel.get('thumbnail', '/static/competitors/images/default.jpg'),
+                            'video_count': 0,
+                            'subscriber_count': 0,
+                            'is_analyzed': False,
+                            'priority': 'youtube'
+                        })
+                
+            except Exception as youtube_error:
+                print(f"[AUTOCOMPLETE] ⚠️ Erreur YouTube API: {youtube_error}")
+                # Continuer avec seulement les résultats existants
         
-        # 2. Ensuite chercher sur YouTube API (toutes les chaînes)
-        try:
-            youtube_api = YouTubeAPI()
-            youtube_channels = youtube_api.search_channels(q, max_results=10)
-            
-            for channel in youtube_channels:
-                # Éviter les doublons avec les chaînes existantes
-                if channel['title'].lower() not in existing_names:
-                    suggestions.append({
-                        'id': None,  # Pas encore en base
-                        'name': channel['title'],
-                        'url': channel.get('url', ''),
-                        'country': 'YouTube Search',
-                        'thumbnail': channel.get('thumbnail', '/static/competitors/images/default.jpg'),
-                        'video_count': 0,
-                        'subscriber_count': 0,
-                        'is_analyzed': False,
-                        'priority': 'youtube'
-                    })
-            
-            print(f"[AUTOCOMPLETE] ✅ {len(existing_results)} existants + {len(youtube_channels)} YouTube pour '{q}'")
-            
-        except Exception as youtube_error:
-            print(f"[AUTOCOMPLETE] ⚠️ Erreur YouTube API: {youtube_error}")
-            # Continuer avec seulement les résultats existants
+        print(f"[AUTOCOMPLETE] ✅ {len(existing_results)} existants + {len(youtube_channels)} YouTube pour '{q}'")
         
         # Limiter à 10 résultats maximum
         suggestions = suggestions[:10]
@@ -1186,6 +1196,102 @@ def autocomplete():
         return jsonify([])
 
 
+@api_bp.route('/search')
+@login_required
+def search():
+    """Recherche plein texte locale (vidéos, playlists, concurrents) pour la navbar et les sujets"""
+    q = request.args.get('q', '').strip()
+    search_type = request.args.get('type', 'videos')
+    limit = min(request.args.get('limit', 20, type=int), 100)
+    if not q:
+        return jsonify({'success': True, 'results': []})
+    
+    try:
+        from yt_channel_analyzer.search_index import search_competitors, search_playlists, search_videos
+        
+        searchers = {
+            'videos': lambda conn: search_videos(conn, q, limit, request.args.get('competitor_id', type=int)),
+            'playlists': lambda conn: search_playlists(conn, q, limit),
+            'competitors': lambda conn: search_competitors(conn, q, limit),
+        }
+        if search_type not in searchers:
+            return jsonify({'success': False, 'error': f"Type inconnu: {search_type}"}), 400
+        
+        conn = get_db_connection(update_schema=False)
+        try:
+            results = [dict(row) for row in searchers[search_type](conn)]
+        finally:
+            conn.close()
+        
+        return jsonify({'success': True, 'type': search_type, 'results': results})
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@api_bp.route('/similar/video/<int:video_id>')
+@login_required
+def similar_videos(video_id):
+    """Vidéos concurrentes les plus proches sémantiquement (index HNSW, sans parcours des embeddings)"""
+    limit = min(request.args.get('limit', 10, type=int), 100)
+    other_competitors = request.args.get('same_competitor', '0') != '1'
+    
+    try:
+        from yt_channel_analyzer.similarity_service import IndexNotReady, similarity_service, video_details
+        
+        started = time.perf_counter()
+        try:
+            hits = similarity_service.similar_videos(video_id, limit, other_competitors)
+        except IndexNotReady as e:
+            return jsonify({'success': False, 'error': str(e)}), 503
+        query_ms = (time.perf_counter() - started) * 1000
+        
+        conn = get_db_connection(update_schema=False)
+        try:
+            results = video_details(conn, hits)
+        finally:
+            conn.close()
+        
+        return jsonify({'success': True, 'video_id': video_id, 'results': results,
+                        'query_ms': round(query_ms, 3), 'index_version': similarity_service.version})
+        
+    except KeyError as e:
+        return jsonify({'success': False, 'error': str(e).strip("'")}), 404
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@api_bp.route('/similar/competitor/<int:competitor_id>')
+@login_required
+def similar_competitors(competitor_id):
+    """Concurrents au contenu le plus proche (centroïdes des embeddings de leurs vidéos)"""
+    limit = min(request.args.get('limit', 10, type=int), 100)
+    
+    try:
+        from yt_channel_analyzer.similarity_service import IndexNotReady, competitor_details, similarity_service
+        
+        started = time.perf_counter()
+        try:
+            hits = similarity_service.similar_competitors(competitor_id, limit)
+        except IndexNotReady as e:
+            return jsonify({'success': False, 'error': str(e)}), 503
+        query_ms = (time.perf_counter() - started) * 1000
+        
+        conn = get_db_connection(update_schema=False)
+        try:
+            results = competitor_details(conn, hits)
+        finally:
+            conn.close()
+        
+        return jsonify({'success': True, 'competitor_id': competitor_id, 'results': results,
+                        'query_ms': round(query_ms, 3), 'index_version': similarity_service.version})
+        
+    except KeyError as e:
+        return jsonify({'success': False, 'error': str(e).strip("'")}), 404
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @api_bp.route('/ultimate-refresh/start', methods=['POST'])
 @login_required
 def start_ultimate_refresh():
@@ -18,6 +18,18 @@ def test_auth():
     return f"Auth test successful! Session: {dict(session)}"
 
 
+
+@competitors_bp.route('/thumbs/<path:filename>')
+def thumbnail_file(filename):
+    """Content-addressed thumbnails: the name changes with the content, so cache forever"""
+    from flask import send_from_directory
+    from yt_channel_analyzer.thumbnail_service import THUMBS_DIR, THUMBS_MAX_AGE
+
+    response = send_from_directory(THUMBS_DIR, filename, max_age=THUMBS_MAX_AGE)
+    response.headers['Cache-Control'] = f'public, max-age={THUMBS_MAX_AGE}, immutable'
+    return response
+
+
 @competitors_bp.route('/concurrents')
 @login_required
 def concurrents():
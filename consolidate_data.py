@@ -12,6 +12,7 @@ import os
 from datetime import datetime
 from collections import Counter
 import pandas as pd
+from yt_channel_analyzer.analytics_snapshot import PYARROW_AVAILABLE, SNAPSHOT_ROOT, write_snapshot
 
 class YouTubeDataConsolidator:
     def __init__(self, db_path='instance/database.db'):
@@ -324,6 +325,16 @@ class YouTubeDataConsolidator:
         
         return output_file
     
+    def save_columnar_snapshot(self):
+        """Snapshot Arrow partitionné (pays/concurrent) lu par memory-map par les scripts d'analyse"""
+        if not PYARROW_AVAILABLE:
+            print("⚠️ pyarrow non installé : snapshot colonnaire ignoré")
+            return None
+        print("\n🗄️ Snapshot colonnaire (vidéos, playlists, concurrents, émotions)...")
+        manifest = write_snapshot()
+        print(f"✅ Snapshot {manifest['version']} publié dans {SNAPSHOT_ROOT}")
+        return manifest
+    
     def print_summary(self):
         """Affiche un résumé détaillé de la consolidation"""
         metadata = self.consolidated_data['metadata']
@@ -387,6 +398,7 @@ def main():
         
         # Sauvegarder tout
         output_file = consolidator.save_consolidated_data()
+        consolidator.save_columnar_snapshot()
         
         # Afficher le résumé
         consolidator.print_summary()
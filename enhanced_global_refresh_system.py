@@ -34,6 +34,10 @@ from collections import defaultdict, Counter
 sys.path.append(str(Path(__file__).parent))
 
 from yt_channel_analyzer.database import get_db_connection
+from yt_channel_analyzer.playlist_linker import PlaylistLinker, fetch_playlist_video_ids
+from yt_channel_analyzer.refresh_watermarks import (
+    ChannelChangeDetector, WatermarkStore, commit_watermark, incremental_mode_requested
+)
 from yt_channel_analyzer.semantic_classifier import create_advanced_classifier
 from yt_channel_analyzer.semantic_training import SemanticTrainingManager
 from services.competitor_service import CompetitorAdvancedMetricsService
@@ -61,6 +65,7 @@ class EnhancedGlobalRefreshSystem:
             'zero_hero_competitors_fixed': 0,
             'date_corrections': 0,
             'metrics_recalculated': 0,
+            'competitors_unchanged': 0,
             'validation_errors': 0,
             'before_after_comparison': {},
             'suspicious_metrics_detected': []
@@ -179,40 +184,7 @@ class EnhancedGlobalRefreshSystem:
 
     def get_playlist_videos_from_api(self, api_key: str, playlist_id: str):
         """Get videos from a playlist via API"""
-        videos = []
-        next_page_token = None
-        
-        while True:
-            url = "https://www.googleapis.com/youtube/v3/playlistItems"
-            params = {
-                'part': 'snippet',
-                'playlistId': playlist_id,
-                'maxResults': 50,
-                'key': api_key
-            }
-            
-            if next_page_token:
-                params['pageToken'] = next_page_token
-            
-            response = requests.get(url, params=params)
-            
-            if response.status_code != 200:
-                break
-            
-            data = response.json()
-            
-            for item in data.get('items', []):
-                try:
-                    video_id = item['snippet']['resourceId']['videoId']
-                    videos.append(video_id)
-                except KeyError:
-                    continue
-            
-            next_page_token = data.get('nextPageToken')
-            if not next_page_token:
-                break
-        
-        return videos
+        return fetch_playlist_video_ids(lambda endpoint, params: self._api_get(api_key, endpoint, params), playlist_id)
 
     def detect_date_integrity_issues(self, conn):
         """Detect and report date integrity issues"""
@@ -312,7 +284,16 @@ class EnhancedGlobalRefreshSystem:
         self.stats['before_after_comparison']['before'] = before_metrics
         return before_metrics
 
-    def import_and_classify_playlists(self, conn, api_key: str):
+    def _api_get(self, api_key: str, endpoint: str, params: Dict) -> Optional[Dict]:
+        """GET on the YouTube Data API, None when the response is not usable"""
+        response = requests.get(
+            f"https://www.googleapis.com/youtube/v3/{endpoint}",
+            params={**params, 'key': api_key},
+            timeout=30
+        )
+        return response.json() if response.status_code == 200 else None
+
+    def import_and_classify_playlists(self, conn, api_key: str, incremental: bool = False):
         """Import playlists and handle classification with protection"""
         cursor = conn.cursor()
         
@@ -330,8 +311,23 @@ class EnhancedGlobalRefreshSystem:
         
         self.update_status(f"📋 {total_competitors} competitors found for playlist import")
         
+        # Incremental mode: only channels that changed since their watermark (or are due a recheck)
+        deltas = {}
+        if incremental:
+            detector = ChannelChangeDetector(lambda endpoint, params: self._api_get(api_key, endpoint, params))
+            deltas = {
+                delta.concurrent_id: delta
+                for delta in detector.probe_channels(competitors, WatermarkStore.load_all(conn), playlists_only=True)
+            }
+        
         for i, (competitor_id, name, channel_id, channel_url) in enumerate(competitors):
             
+            delta = deltas.get(competitor_id)
+            if delta is not None and not delta.playlists_due:
+                self.update_status(f"⏭️ {name} unchanged since last refresh ({i+1}/{total_competitors})", 1)
+                self.stats['competitors_unchanged'] += 1
+                continue
+            
             self.update_status(f"🏢 Processing playlists for {name} ({i+1}/{total_competitors})", 1)
             
             try:
@@ -382,6 +378,10 @@ class EnhancedGlobalRefreshSystem:
                 # Create links for classified playlists
                 self.create_playlist_video_links(conn, api_key, competitor_id, name)
                 
+                if delta is not None:
+                    # Playlists-only probe: the uploads watermark stays owned by the ULTIMATE incremental refresh
+                    commit_watermark(cursor, delta, playlists_checked=True, changed=playlists_imported > 0)
+                
             except Exception as e:
                 self.update_status(f"   ⚠️ Error importing playlists for {name}: {str(e)}")
                 self.stats['validation_errors'] += 1
@@ -393,93 +393,38 @@ class EnhancedGlobalRefreshSystem:
         """Create links between playlists and videos with human-validated protection"""
         cursor = conn.cursor()
         
-        # Get classified playlists for this competitor
-        cursor.execute("""
-            SELECT p.id, p.playlist_id, p.name, p.category
-            FROM playlist p
+        # Link every unlinked classified playlist in one pass (concurrent API fetch + bulk insert)
+        linker = PlaylistLinker(lambda endpoint, params: self._api_get(api_key, endpoint, params))
+        linker.link_unlinked(conn, competitor_id)
+        
+        # ABSOLUTE PROTECTION: Propagate only to NON-human-validated videos
+        # (first classified playlist wins, as with the former per-playlist updates)
+        classified_links = """
+            FROM playlist_video pv
+            JOIN playlist p ON pv.playlist_id = p.playlist_id
             WHERE p.concurrent_id = ?
             AND p.category IS NOT NULL
             AND p.name NOT LIKE 'All Videos%'
-        """, (competitor_id,))
-        
-        classified_playlists = cursor.fetchall()
-        videos_propagated = 0
-        
-        for db_id, youtube_playlist_id, playlist_name, category in classified_playlists:
-            
-            # Check if links exist
-            cursor.execute("SELECT COUNT(*) FROM playlist_video WHERE playlist_id = ?", (youtube_playlist_id,))
-            existing_links = cursor.fetchone()[0]
-            
-            if existing_links > 0:
-                # ABSOLUTE PROTECTION: Propagate only to NON-human-validated videos
-                cursor.execute("""
-                    UPDATE video 
-                    SET category = ?,
-                        classification_source = 'propagated_from_human_playlist',
-                        is_human_validated = 1,
-                        classification_date = datetime('now')
-                    WHERE id IN (
-                        SELECT pv.video_id 
-                        FROM playlist_video pv
-                        WHERE pv.playlist_id = ?
-                    )
-                    AND concurrent_id = ?
-                    AND (is_human_validated = 0 OR is_human_validated IS NULL)
-                    AND (classification_source != 'human' OR classification_source IS NULL)
-                    AND (category IS NULL OR category = 'uncategorized')
-                """, (category, youtube_playlist_id, competitor_id))
-                
-                videos_propagated += cursor.rowcount
-                continue
-            
-            # Get videos from API
-            playlist_videos = self.get_playlist_videos_from_api(api_key, youtube_playlist_id)
-            
-            if playlist_videos:
-                # Find videos in our database
-                video_id_list = playlist_videos
-                placeholders = ','.join(['?' for _ in video_id_list])
-                
-                cursor.execute(f"""
-                    SELECT id, video_id FROM video 
-                    WHERE video_id IN ({placeholders})
-                    AND concurrent_id = ?
-                """, video_id_list + [competitor_id])
-                
-                found_videos = {row[1]: row[0] for row in cursor.fetchall()}
-                
-                # Create links
-                for video_id in playlist_videos:
-                    if video_id in found_videos:
-                        db_video_id = found_videos[video_id]
-                        try:
-                            cursor.execute("""
-                                INSERT INTO playlist_video (playlist_id, video_id) 
-                                VALUES (?, ?)
-                            """, (youtube_playlist_id, db_video_id))
-                        except Exception:
-                            pass
-                
-                # ABSOLUTE PROTECTION: Propagate only to NON-human-validated videos
-                cursor.execute("""
-                    UPDATE video 
-                    SET category = ?,
-                        classification_source = 'propagated_from_human_playlist',
-                        is_human_validated = 1,
-                        classification_date = datetime('now')
-                    WHERE id IN (
-                        SELECT pv.video_id 
-                        FROM playlist_video pv
-                        WHERE pv.playlist_id = ?
-                    )
-                    AND concurrent_id = ?
-                    AND (is_human_validated = 0 OR is_human_validated IS NULL)
-                    AND (classification_source != 'human' OR classification_source IS NULL)
-                    AND (category IS NULL OR category = 'uncategorized')
-                """, (category, youtube_playlist_id, competitor_id))
-                
-                videos_propagated += cursor.rowcount
+        """
+        cursor.execute(f"""
+            UPDATE video 
+            SET category = (
+                    SELECT p.category {classified_links}
+                    AND pv.video_id = video.id
+                    ORDER BY p.id
+                    LIMIT 1
+                ),
+                classification_source = 'propagated_from_human_playlist',
+                is_human_validated = 1,
+                classification_date = datetime('now')
+            WHERE id IN (SELECT pv.video_id {classified_links})
+            AND concurrent_id = ?
+            AND (is_human_validated = 0 OR is_human_validated IS NULL)
+            AND (classification_source != 'human' OR classification_source IS NULL)
+            AND (category IS NULL OR category = 'uncategorized')
+        """, (competitor_id, competitor_id, competitor_id))
+        
+        videos_propagated = cursor.rowcount
         
         self.stats['videos_classified'] += videos_propagated
         if videos_propagated > 0:
@@ -792,7 +737,7 @@ class EnhancedGlobalRefreshSystem:
         
         return report
 
-    def run_enhanced_refresh(self):
+    def run_enhanced_refresh(self, incremental: bool = False):
         """Execute the complete enhanced refresh process"""
         
         self.is_running = True
@@ -823,7 +768,7 @@ class EnhancedGlobalRefreshSystem:
             
             # STEP 4: Import and classify playlists (biggest step)
             self.update_status("📋 Importing playlists with human-validated protection", 10)
-            self.import_and_classify_playlists(conn, api_key)
+            self.import_and_classify_playlists(conn, api_key, incremental=incremental)
             
             # STEP 5: Fix classification gaps
             self.update_status("🎯 Fixing orphaned video classifications", 15)
@@ -897,7 +842,7 @@ def run_enhanced_global_refresh():
     print("=" * 60)
     
     refresh_system = EnhancedGlobalRefreshSystem()
-    result = refresh_system.run_enhanced_refresh()
+    result = refresh_system.run_enhanced_refresh(incremental=incremental_mode_requested())
     
     if result:
         print("\n🎉 ENHANCED REFRESH COMPLETED SUCCESSFULLY!")
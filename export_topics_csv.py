@@ -40,8 +40,10 @@ def export_top_topics_csv():
     
     print(f"📊 {len(competitors)} concurrents trouvés avec des vidéos")
     
-    # Préparer les données pour CSV - Format: une ligne par topic
-    csv_data = []
+    # CSV écrit au fil de l'analyse - Format: une ligne par topic
+    filename = f'top_topics_by_competitor_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    preview = []  # 15 premières lignes pour l'aperçu
+    total_lines = 0
     
     # Headers simplifiés
     headers = [
@@ -49,41 +51,33 @@ def export_top_topics_csv():
         'Topic'
     ]
     
-    csv_data.append(headers)
-    
-    # Analyser chaque concurrent
-    for i, competitor in enumerate(competitors, 1):
-        competitor_id, name, country, video_count = competitor
-        
-        print(f"📈 Analyse {i}/{len(competitors)}: {name}")
-        
-        # Récupérer les top 5 vidéos engageantes
-        top_videos = analyzer.get_top_engaging_videos(competitor_id, 5)
-        
-        # Créer une ligne par topic (5 lignes par concurrent)
-        for j, video in enumerate(top_videos[:5], 1):
-            # Titre du topic (tronqué à 60 caractères pour plus de lisibilité)
-            topic_title = video['title'][:60] + '...' if len(video['title']) > 60 else video['title']
-            
-            # Ajouter la ligne
-            csv_data.append([
-                name,
-                topic_title
-            ])
-        
-        # Si moins de 5 vidéos, compléter avec des lignes vides pour maintenir la structure
-        for j in range(len(top_videos), 5):
-            csv_data.append([
-                name,
-                ''
-            ])
-    
-    # Sauvegarder le CSV
-    filename = f'top_topics_by_competitor_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-    
     with open(filename, 'w', newline='', encoding='utf-8-sig') as csvfile:  # utf-8-sig pour Excel
         writer = csv.writer(csvfile, delimiter=';')  # Point-virgule pour Excel français
-        writer.writerows(csv_data)
+        writer.writerow(headers)
+        
+        # Analyser chaque concurrent
+        for i, competitor in enumerate(competitors, 1):
+            competitor_id, name, country, video_count = competitor
+            
+            print(f"📈 Analyse {i}/{len(competitors)}: {name}")
+            
+            # Récupérer les top 5 vidéos engageantes
+            top_videos = analyzer.get_top_engaging_videos(competitor_id, 5)
+            
+            # Créer une ligne par topic (5 lignes par concurrent)
+            rows = []
+            for j, video in enumerate(top_videos[:5], 1):
+                # Titre du topic (tronqué à 60 caractères pour plus de lisibilité)
+                topic_title = video['title'][:60] + '...' if len(video['title']) > 60 else video['title']
+                rows.append([name, topic_title])
+            
+            # Si moins de 5 vidéos, compléter avec des lignes vides pour maintenir la structure
+            for j in range(len(top_videos), 5):
+                rows.append([name, ''])
+            
+            writer.writerows(rows)
+            total_lines += len(rows)
+            preview.extend(rows[:15 - len(preview)])
     
     print(f"\n✅ Export terminé!")
     print(f"📄 Fichier créé: {filename}")
@@ -95,12 +89,11 @@ def export_top_topics_csv():
     print(f"{'Concurrent':<25} | {'Topic'}")
     print("-" * 80)
     
-    for i, row in enumerate(csv_data[1:16]):  # Skip headers, show 15 lines
+    for row in preview:
         competitor_name = row[0]
         topic = row[1][:50] + '...' if len(row[1]) > 50 else row[1]
         print(f"{competitor_name:<25} | {topic}")
     
-    total_lines = len(csv_data) - 1  # Excluding header
     print(f"\n📊 Total: {total_lines} lignes ({len(competitors)} concurrents × 5 topics)")
     print(f"📈 Structure: 5 lignes consécutives par concurrent")
     
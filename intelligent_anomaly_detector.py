@@ -29,6 +29,7 @@ from collections import defaultdict
 
 sys.path.append(str(Path(__file__).parent))
 
+from yt_channel_analyzer.anomaly_engine import AnomalyEngine
 from yt_channel_analyzer.database import get_db_connection
 from services.competitor_service import CompetitorAdvancedMetricsService
 
@@ -39,6 +40,7 @@ class IntelligentAnomalyDetector:
         self.verbose_log = []
         self.anomalies_found = []
         self.fixes_applied = []
+        self.anomaly_engine = AnomalyEngine()
         self.api_key = self.get_youtube_api_key()
         
     def log(self, message, level="INFO"):
@@ -122,28 +124,23 @@ class IntelligentAnomalyDetector:
         self.log(f"📋 {total_competitors} concurrents à analyser")
         self.log("=" * 80)
         
-        # Phase 1: Scan de base pour anomalies générales
-        self.log("🔍 PHASE 1: SCAN GÉNÉRAL DES ANOMALIES", "PHASE")
+        # Phases 1-2: toutes les règles évaluées en une passe sur le tableau d'agrégats
+        self.log("🔍 PHASES 1-2: DÉTECTION DES ANOMALIES EN UNE PASSE", "PHASE")
         
-        for i, (competitor_id, name, channel_id, channel_url, country) in enumerate(competitors, 1):
-            self.log(f"\n📊 [{i}/{total_competitors}] ANALYSE: {name} (Pays: {country or 'Non spécifié'})")
-            self.analyze_competitor_basic_anomalies(conn, competitor_id, name)
+        table = self.detect_all_anomalies(conn)
+        flagged = table.by_competitor()
         
-        # Phase 2: Analyse des métriques détaillées
-        self.log("\n" + "=" * 80)
-        self.log("📈 PHASE 2: ANALYSE DÉTAILLÉE DES MÉTRIQUES", "PHASE")
-        
-        for i, (competitor_id, name, channel_id, channel_url, country) in enumerate(competitors, 1):
-            self.log(f"\n🎯 [{i}/{total_competitors}] MÉTRIQUES: {name}")
-            self.analyze_competitor_detailed_metrics(conn, competitor_id, name)
+        self.log(f"⚡ {len(table)} anomalies sur {len(flagged)}/{table.competitors_scanned} concurrents ({table.elapsed * 1000:.0f} ms)")
         
-        # Phase 3: Corrections intelligentes
+        # Phase 3: Corrections intelligentes, uniquement pour les concurrents signalés (les plus touchés d'abord)
         self.log("\n" + "=" * 80)
         self.log("🔧 PHASE 3: CORRECTIONS INTELLIGENTES", "PHASE")
         
-        for i, (competitor_id, name, channel_id, channel_url, country) in enumerate(competitors, 1):
-            self.log(f"\n⚡ [{i}/{total_competitors}] CORRECTIONS: {name}")
-            self.apply_intelligent_fixes(conn, competitor_id, name, channel_id)
+        competitors_by_id = {competitor[0]: competitor for competitor in competitors}
+        for i, (competitor_id, anomalies) in enumerate(flagged.items(), 1):
+            competitor_id, name, channel_id, channel_url, country = competitors_by_id[competitor_id]
+            self.log(f"\n⚡ [{i}/{len(flagged)}] CORRECTIONS: {name}")
+            self.apply_intelligent_fixes(conn, competitor_id, name, channel_id, [a.to_dict() for a in anomalies])
         
         # Phase 4: Rapport final
         self.log("\n" + "=" * 80)
@@ -152,215 +149,20 @@ class IntelligentAnomalyDetector:
         
         conn.close()
     
-    def analyze_competitor_basic_anomalies(self, conn, competitor_id, name):
-        """Analyse de base pour détecter les anomalies évidentes"""
-        
-        cursor = conn.cursor()
-        
-        # 1. Compter les vidéos
-        cursor.execute("SELECT COUNT(*) FROM video WHERE concurrent_id = ?", (competitor_id,))
-        video_count = cursor.fetchone()[0]
-        
-        if video_count == 0:
-            self.log_anomaly(name, "NO_VIDEOS", "Aucune vidéo en base", "CRITICAL")
-            return
-        
-        self.log(f"   📺 {video_count} vidéos trouvées")
-        
-        # 2. Vérifier la distribution HHH
-        cursor.execute("""
-            SELECT 
-                COUNT(CASE WHEN category = 'hero' THEN 1 END) as hero_count,
-                COUNT(CASE WHEN category = 'hub' THEN 1 END) as hub_count,
-                COUNT(CASE WHEN category = 'help' THEN 1 END) as help_count,
-                COUNT(CASE WHEN category IS NULL OR category = '' OR category = 'uncategorized' THEN 1 END) as uncategorized_count
-            FROM video WHERE concurrent_id = ?
-        """, (competitor_id,))
-        
-        hero, hub, help_count, uncategorized = cursor.fetchone()
-        classified_total = hero + hub + help_count
-        
-        self.log(f"   🎯 HHH: {hero} HERO, {hub} HUB, {help_count} HELP ({uncategorized} non classifiées)")
-        
-        # Détecter les anomalies HHH
-        if uncategorized > 0:
-            percentage = (uncategorized / video_count) * 100
-            self.log_anomaly(name, "UNCATEGORIZED_VIDEOS", f"{uncategorized} vidéos ({percentage:.1f}%) non classifiées", "HIGH")
-        
-        if classified_total > 0:
-            hero_pct = (hero / classified_total) * 100
-            hub_pct = (hub / classified_total) * 100
-            help_pct = (help_count / classified_total) * 100
-            
-            # Détection des problèmes de distribution
-            if hero_pct == 0:
-                self.log_anomaly(name, "ZERO_HERO", f"0% de contenu HERO sur {classified_total} vidéos", "HIGH")
-            elif hero_pct > 80:
-                self.log_anomaly(name, "TOO_MUCH_HERO", f"{hero_pct:.1f}% HERO (déséquilibré)", "MEDIUM")
-            
-            if help_pct == 0 and classified_total > 20:
-                self.log_anomaly(name, "ZERO_HELP", f"0% de contenu HELP sur {classified_total} vidéos", "HIGH")
-            elif help_pct > 80:
-                self.log_anomaly(name, "TOO_MUCH_HELP", f"{help_pct:.1f}% HELP (déséquilibré)", "MEDIUM")
-            
-            if hub_pct > 95:
-                self.log_anomaly(name, "TOO_MUCH_HUB", f"{hub_pct:.1f}% HUB (quasi-monopole)", "HIGH")
-        
-        # 3. Vérifier les durées
-        cursor.execute("""
-            SELECT 
-                COUNT(CASE WHEN duration_seconds > 0 THEN 1 END) as valid_durations,
-                COUNT(CASE WHEN duration_seconds = 0 OR duration_seconds IS NULL THEN 1 END) as invalid_durations,
-                AVG(duration_seconds) as avg_duration,
-                MAX(duration_seconds) as max_duration
-            FROM video WHERE concurrent_id = ?
-        """, (competitor_id,))
-        
-        valid_durations, invalid_durations, avg_duration, max_duration = cursor.fetchone()
-        
-        if invalid_durations > 0:
-            percentage = (invalid_durations / video_count) * 100
-            self.log_anomaly(name, "INVALID_DURATIONS", f"{invalid_durations} vidéos ({percentage:.1f}%) sans durée", "MEDIUM")
-        
-        if avg_duration and avg_duration > 0:
-            avg_minutes = avg_duration / 60
-            self.log(f"   ⏱️ Durée moyenne: {avg_minutes:.1f} min")
-            
-            # Détection de durées aberrantes
-            if avg_minutes > 60:
-                self.log_anomaly(name, "EXTREMELY_LONG_VIDEOS", f"Durée moyenne {avg_minutes:.1f} min (suspicieusement long)", "MEDIUM")
-            elif avg_minutes < 0.5:
-                self.log_anomaly(name, "EXTREMELY_SHORT_VIDEOS", f"Durée moyenne {avg_minutes:.1f} min (suspicieusement court)", "MEDIUM")
-        else:
-            self.log_anomaly(name, "NO_DURATION_DATA", "Aucune donnée de durée valide", "HIGH")
-        
-        # 4. Vérifier les dates
-        cursor.execute("""
-            SELECT 
-                COUNT(DISTINCT DATE(published_at)) as distinct_dates,
-                MIN(published_at) as earliest_date,
-                MAX(published_at) as latest_date,
-                COUNT(CASE WHEN DATE(published_at) IN ('2025-07-05', '2025-01-07', '2025-07-11') THEN 1 END) as suspicious_dates
-            FROM video WHERE concurrent_id = ?
-        """, (competitor_id,))
+    def detect_all_anomalies(self, conn):
+        """Évalue toutes les règles sur tous les concurrents et journalise la table classée"""
         
-        distinct_dates, earliest, latest, suspicious = cursor.fetchone()
-        
-        if suspicious > 0:
-            percentage = (suspicious / video_count) * 100
-            self.log_anomaly(name, "CORRUPTED_DATES", f"{suspicious} vidéos ({percentage:.1f}%) avec dates d'import suspectes", "HIGH")
-        
-        if distinct_dates < 3 and video_count > 10:
-            self.log_anomaly(name, "DATE_UNIFORMITY", f"Seulement {distinct_dates} dates distinctes pour {video_count} vidéos", "MEDIUM")
-        
-        # 5. Vérifier les playlists
-        cursor.execute("SELECT COUNT(*) FROM playlist WHERE concurrent_id = ?", (competitor_id,))
-        playlist_count = cursor.fetchone()[0]
-        
-        self.log(f"   📋 {playlist_count} playlists")
-        
-        if playlist_count == 0:
-            self.log_anomaly(name, "NO_PLAYLISTS", "Aucune playlist en base", "MEDIUM")
-        elif playlist_count > 100:
-            self.log_anomaly(name, "TOO_MANY_PLAYLISTS", f"{playlist_count} playlists (potentiellement excessif)", "LOW")
-    
-    def analyze_competitor_detailed_metrics(self, conn, competitor_id, name):
-        """Analyse détaillée des métriques avec calculs avancés"""
-        
-        cursor = conn.cursor()
-        
-        # Récupérer toutes les vidéos
-        cursor.execute("""
-            SELECT video_id, title, view_count, like_count, comment_count, 
-                   duration_seconds, published_at, category
-            FROM video 
-            WHERE concurrent_id = ?
-            ORDER BY view_count DESC
-        """, (competitor_id,))
-        
-        videos = cursor.fetchall()
-        
-        if not videos:
-            return
-        
-        # Calculs de métriques avancées
-        view_counts = [v[2] for v in videos if v[2] and v[2] > 0]
-        like_counts = [v[3] for v in videos if v[3] and v[3] > 0]
-        durations = [v[5] for v in videos if v[5] and v[5] > 0]
-        
-        # Analyse des vues
-        if view_counts:
-            avg_views = sum(view_counts) / len(view_counts)
-            max_views = max(view_counts)
-            min_views = min(view_counts)
-            
-            self.log(f"   👁️ Vues: {avg_views:.0f} moy, {max_views:,} max, {min_views:,} min")
-            
-            # Détection d'anomalies de vues
-            if avg_views < 10:
-                self.log_anomaly(name, "VERY_LOW_VIEWS", f"Moyenne {avg_views:.0f} vues (très faible)", "MEDIUM")
-            elif avg_views > 1000000:
-                self.log_anomaly(name, "VERY_HIGH_VIEWS", f"Moyenne {avg_views:.0f} vues (exceptionnellement élevé)", "LOW")
-            
-            # Ratio min/max suspect
-            if max_views > 0 and min_views / max_views < 0.001:
-                ratio = min_views / max_views
-                self.log_anomaly(name, "EXTREME_VIEW_VARIANCE", f"Ratio min/max: {ratio:.6f} (variance extrême)", "LOW")
-        
-        # Analyse de l'engagement
-        if view_counts and like_counts:
-            total_views = sum(view_counts)
-            total_likes = sum(like_counts)
-            engagement_rate = (total_likes / total_views) * 100 if total_views > 0 else 0
-            
-            self.log(f"   ❤️ Engagement: {engagement_rate:.3f}% ({total_likes:,} likes sur {total_views:,} vues)")
-            
-            if engagement_rate < 0.1:
-                self.log_anomaly(name, "LOW_ENGAGEMENT", f"Taux d'engagement {engagement_rate:.3f}% très faible", "MEDIUM")
-            elif engagement_rate > 10:
-                self.log_anomaly(name, "SUSPICIOUSLY_HIGH_ENGAGEMENT", f"Taux d'engagement {engagement_rate:.3f}% suspicieusement élevé", "LOW")
-        
-        # Analyse des shorts
-        if durations:
-            shorts_count = len([d for d in durations if d <= 60])
-            regular_count = len(durations) - shorts_count
-            shorts_percentage = (shorts_count / len(durations)) * 100
-            
-            self.log(f"   📱 Shorts: {shorts_count} ({shorts_percentage:.1f}%), Réguliers: {regular_count}")
-            
-            if shorts_percentage == 100 and len(durations) > 5:
-                self.log_anomaly(name, "ONLY_SHORTS", "100% de shorts uniquement", "LOW")
-            elif shorts_percentage == 0 and len(durations) > 10:
-                self.log_anomaly(name, "NO_SHORTS", "Aucun short créé", "LOW")
-        
-        # Analyse de la fréquence de publication
-        dates_with_videos = []
-        for video in videos:
-            if video[6]:  # published_at
-                try:
-                    date = datetime.fromisoformat(video[6].replace('Z', '+00:00'))
-                    dates_with_videos.append(date)
-                except:
-                    pass
-        
-        if len(dates_with_videos) >= 2:
-            dates_with_videos.sort()
-            date_span = (dates_with_videos[-1] - dates_with_videos[0]).days
-            
-            if date_span > 0:
-                frequency_per_week = (len(dates_with_videos) / date_span) * 7
-                self.log(f"   📅 Fréquence: {frequency_per_week:.2f} vidéos/semaine sur {date_span} jours")
-                
-                if frequency_per_week > 50:
-                    self.log_anomaly(name, "IMPOSSIBLE_FREQUENCY", f"{frequency_per_week:.1f} vidéos/semaine (impossible)", "HIGH")
-                elif frequency_per_week < 0.1 and len(videos) > 5:
-                    self.log_anomaly(name, "VERY_LOW_FREQUENCY", f"{frequency_per_week:.2f} vidéos/semaine (très inactif)", "LOW")
+        table = self.anomaly_engine.detect(conn)
+        for anomaly in table:
+            self.log_anomaly(anomaly.competitor, anomaly.type, anomaly.details, anomaly.severity)
+        return table
     
-    def apply_intelligent_fixes(self, conn, competitor_id, name, channel_id):
+    def apply_intelligent_fixes(self, conn, competitor_id, name, channel_id, competitor_anomalies=None):
         """Appliquer des corrections intelligentes basées sur les anomalies détectées"""
         
         # Récupérer les anomalies pour ce concurrent
-        competitor_anomalies = [a for a in self.anomalies_found if a['competitor'] == name]
+        if competitor_anomalies is None:
+            competitor_anomalies = [a for a in self.anomalies_found if a['competitor'] == name]
         
         if not competitor_anomalies:
             self.log(f"   ✅ Aucune anomalie détectée pour {name}")
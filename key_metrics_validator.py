@@ -27,15 +27,21 @@ Critères de validation :
 
 import sqlite3
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 import json
 import statistics
 import re
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+
+from yt_channel_analyzer.thumbnail_features import consistency_by_competitor, consistency_for_videos
+
 # Configuration
 PROJECT_ROOT = Path(__file__).parent
 DB_PATH = PROJECT_ROOT / 'instance' / 'database.db'
@@ -88,6 +94,46 @@ class CompetitorValidationReport:
     validation_date: datetime
 
 
+# Métriques dont un statut CRITICAL est signalé comme alerte, sans bloquer le PowerPoint
+WARNING_ONLY_METRICS = ("Cohérence des Miniatures", "Champ Lexical")
+
+# Colonnes nécessaires au mode bulk (pas de description ni de SELECT *)
+BULK_VIDEO_QUERY = """
+    SELECT concurrent_id, duration_seconds, published_at, category, view_count, like_count,
+           {is_short} AS is_short, COALESCE(thumbnail_url, '') != '' AS has_thumbnail, title
+    FROM video
+    ORDER BY concurrent_id, published_at DESC
+"""
+
+_WORD = re.compile(r'\w+')
+_ISO_DAY = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}')
+
+
+def parse_published_timestamp(date_str: Optional[str]) -> Optional[float]:
+    """Timestamp POSIX d'une date de publication (ISO 8601 ou YYYY-MM-DD), None si invalide"""
+    if not date_str:
+        return None
+    try:
+        if 'T' in date_str:
+            date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        elif _ISO_DAY.fullmatch(date_str):
+            date = datetime.fromisoformat(date_str)  # même résultat que strptime, sans son coût
+        else:
+            date = datetime.strptime(date_str, '%Y-%m-%d')
+    except Exception:
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.timestamp()
+
+
+def lexical_stats(titles: List[Optional[str]]) -> Tuple[int, int, int]:
+    """(titres non vides, mots, mots uniques) d'une liste de titres"""
+    titles = [title for title in titles if title]
+    words = [word for title in titles for word in _WORD.findall(title.lower())]
+    return len(titles), len(words), len(set(words))
+
+
 class KeyMetricsValidator:
     """Agent de validation des métriques clés pour tous les competitors."""
     
@@ -101,8 +147,11 @@ class KeyMetricsValidator:
         conn.row_factory = sqlite3.Row
         return conn
     
-    def validate_all_competitors(self) -> List[CompetitorValidationReport]:
+    def validate_all_competitors(self, bulk: bool = True) -> List[CompetitorValidationReport]:
         """Valide les métriques de tous les competitors."""
+        if bulk:
+            return self.validate_all_competitors_bulk()
+        
         logger.info("🚀 Démarrage de la validation complète de tous les competitors")
         
         with self.get_db_connection() as conn:
@@ -127,6 +176,144 @@ class KeyMetricsValidator:
         logger.info(f"🏁 Validation terminée pour {len(reports)} competitors")
         return reports
     
+    def validate_all_competitors_bulk(self, max_workers: Optional[int] = None) -> List[CompetitorValidationReport]:
+        """Mode bulk : une lecture colonnaire de toutes les vidéos, métriques calculées par groupe (numpy).
+        Produit les mêmes rapports que validate_competitor, dans le même ordre (pays, nom)."""
+        logger.info("🚀 Démarrage de la validation bulk de tous les competitors")
+        started = datetime.now()
+        
+        with self.get_db_connection() as conn:
+            competitors = conn.execute(
+                "SELECT id, name, country FROM concurrent ORDER BY country, name"
+            ).fetchall()
+            video_columns = {row[1] for row in conn.execute("PRAGMA table_info(video)").fetchall()}
+            rows = conn.execute(BULK_VIDEO_QUERY.format(
+                is_short='is_short' if 'is_short' in video_columns else '0'
+            )).fetchall()
+            visual = consistency_by_competitor(conn)
+        
+        if not competitors:
+            return []
+        
+        # Index de groupe : position du competitor dans la liste triée des ids
+        competitor_ids = np.array(sorted(c['id'] for c in competitors), dtype=np.int64)
+        group_count = len(competitor_ids)
+        
+        (concurrent_ids, durations, published, categories, views, likes,
+         is_short, has_thumbnail, titles) = zip(*rows) if rows else ([],) * 9
+        
+        def as_float(values):
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        
+        raw_groups = np.array(concurrent_ids, dtype=np.int64)
+        positions = np.searchsorted(competitor_ids, raw_groups)
+        known = (positions < group_count) & (competitor_ids[np.minimum(positions, group_count - 1)] == raw_groups)
+        groups = positions[known]
+        
+        def per_group(mask=None, weights=None):
+            selected = known if mask is None else known & mask
+            return np.bincount(positions[selected], weights=None if weights is None else weights[selected],
+                               minlength=group_count)
+        
+        totals = per_group()
+        
+        # 1. Durée
+        duration = as_float(durations)
+        with np.errstate(invalid='ignore'):
+            valid_duration = duration > 0
+            short_duration = valid_duration & (duration < 60)
+        duration_count = per_group(valid_duration)
+        duration_sum = per_group(valid_duration, np.nan_to_num(duration))
+        short_count = per_group(short_duration)
+        
+        # 2. Fréquence : min/max des dates valides par segment (lignes triées par competitor)
+        parsed = {p: parse_published_timestamp(p) for p in set(published)}
+        timestamps = np.array([parsed[p] for p in published], dtype=np.float64)
+        dated = known & ~np.isnan(timestamps)
+        dated_count = per_group(dated)
+        date_range = np.zeros(group_count, dtype=np.int64)
+        if dated.any():
+            dated_groups = positions[dated]
+            dated_times = timestamps[dated]
+            starts = np.flatnonzero(np.r_[True, dated_groups[1:] != dated_groups[:-1]])
+            spans = np.maximum.reduceat(dated_times, starts) - np.minimum.reduceat(dated_times, starts)
+            date_range[dated_groups[starts]] = np.floor_divide(spans, 86400).astype(np.int64)
+        
+        # 3. HHH
+        category = np.array(categories, dtype=object)
+        hero_count = per_group(category == 'hero')
+        hub_count = per_group(category == 'hub')
+        help_count = per_group(category == 'help')
+        
+        # 4. Organique vs payé / 8. Sujet le plus apprécié
+        view = as_float(views)
+        like = as_float(likes)
+        with np.errstate(invalid='ignore'):
+            viewed = view > 0
+            paid = viewed & (view >= self.paid_threshold)
+        viewed_count = per_group(viewed)
+        paid_count = per_group(paid)
+        
+        engaged = known & viewed & ~np.isnan(like)
+        engaged_count = per_group(engaged)
+        best_row = np.full(group_count, -1, dtype=np.int64)
+        engaged_rows = np.flatnonzero(engaged)
+        if len(engaged_rows):
+            engagement = like[engaged_rows] / np.maximum(view[engaged_rows], 1)
+            # Premier maximum par competitor dans l'ordre de lecture (comme max())
+            order = np.lexsort((engaged_rows, -engagement, positions[engaged_rows]))
+            ordered_groups = positions[engaged_rows][order]
+            firsts = np.flatnonzero(np.r_[True, ordered_groups[1:] != ordered_groups[:-1]])
+            best_row[ordered_groups[firsts]] = engaged_rows[order][firsts]
+        
+        # 5. Shorts / 6. Miniatures
+        shorts_count = per_group(np.array(is_short, dtype=object) == 1)
+        thumbnail_count = per_group(np.array(has_thumbnail, dtype=bool))
+        
+        # 7. Champ lexical : tokenisation par competitor, en parallèle (processus) sur les gros volumes
+        titles_by_group = [[] for _ in range(group_count)]
+        for group, title in zip(groups, np.array(titles, dtype=object)[known]):
+            titles_by_group[group].append(title)
+        max_workers = max_workers or min(os.cpu_count() or 1, 8)
+        if max_workers > 1 and len(rows) > 50000:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                lexical = list(pool.map(lexical_stats, titles_by_group, chunksize=16))
+        else:
+            lexical = [lexical_stats(group_titles) for group_titles in titles_by_group]
+        
+        reports = []
+        for competitor in competitors:
+            g = int(np.searchsorted(competitor_ids, competitor['id']))
+            total = int(totals[g])
+            best = int(best_row[g])
+            if best >= 0:
+                best_title = titles[best]
+                engagement_rate = (likes[best] or 0) / max(views[best], 1) * 100
+            else:
+                best_title, engagement_rate = None, 0
+            
+            dcount = int(duration_count[g])
+            metrics_results = [
+                self._duration_result(total, dcount,
+                                      (duration_sum[g] / dcount) / 60 if dcount else 0,
+                                      (short_count[g] / dcount) * 100 if dcount else 0),
+                self._frequency_result(total, int(dated_count[g]), int(date_range[g])),
+                self._hhh_result(total, int(hero_count[g]), int(hub_count[g]), int(help_count[g])),
+                self._organic_paid_result(total, int(viewed_count[g]), int(paid_count[g])),
+                self._shorts_result(total, int(shorts_count[g])),
+                self._thumbnail_result(total, int(thumbnail_count[g]), visual.get(competitor['id'])),
+                self._lexical_result(total, *lexical[g]),
+                self._top_subject_result(total, int(engaged_count[g]), best_title, engagement_rate),
+            ]
+            report = self._build_report(competitor['id'], competitor['name'], competitor['country'],
+                                        total, metrics_results)
+            reports.append(report)
+            logger.debug(f"✅ Competitor {competitor['name']} - Status: {report.overall_status.value}")
+        
+        elapsed = (datetime.now() - started).total_seconds()
+        logger.info(f"🏁 Validation bulk terminée pour {len(reports)} competitors ({len(rows):,} vidéos) en {elapsed:.1f}s")
+        return reports
+    
     def validate_competitor(self, competitor_id: int) -> CompetitorValidationReport:
         """Valide les métriques d'un competitor spécifique."""
         with self.get_db_connection() as conn:
@@ -146,69 +333,31 @@ class KeyMetricsValidator:
             """, (competitor_id,)).fetchall()
         
         # Exécuter toutes les validations
-        metrics_results = []
+        metrics_results = [
+            self._validate_video_duration(videos),              # 1. Durée des Vidéos
+            self._validate_publishing_frequency(videos),        # 2. Fréquence de Publication
+            self._validate_hhh_distribution(videos),            # 3. Distribution HHH
+            self._validate_organic_vs_paid(videos),             # 4. Organique vs Payé
+            self._validate_shorts_distribution(videos),         # 5. Shorts vs Vidéos 16:9
+            self._validate_thumbnail_consistency(videos),       # 6. Cohérence des Miniatures
+            self._validate_lexical_consistency(videos),         # 7. Champ Lexical
+            self._validate_top_performing_subject(videos),      # 8. Sujet le Plus Apprécié
+        ]
+        
+        return self._build_report(
+            competitor_id, competitor['name'], competitor['country'], len(videos), metrics_results
+        )
+    
+    def _build_report(self, competitor_id: int, competitor_name: str, country: str,
+                      total_videos: int, metrics_results: List[ValidationResult]) -> CompetitorValidationReport:
+        """Assemble le rapport d'un competitor à partir des 8 résultats de métriques."""
         critical_issues = []
         warnings = []
-        
-        # 1. Validation Durée des Vidéos
-        duration_result = self._validate_video_duration(videos)
-        metrics_results.append(duration_result)
-        if duration_result.status == ValidationStatus.CRITICAL:
-            critical_issues.append(duration_result.message)
-        elif duration_result.status == ValidationStatus.WARNING:
-            warnings.append(duration_result.message)
-        
-        # 2. Validation Fréquence de Publication
-        frequency_result = self._validate_publishing_frequency(videos)
-        metrics_results.append(frequency_result)
-        if frequency_result.status == ValidationStatus.CRITICAL:
-            critical_issues.append(frequency_result.message)
-        elif frequency_result.status == ValidationStatus.WARNING:
-            warnings.append(frequency_result.message)
-        
-        # 3. Validation Distribution HHH
-        hhh_result = self._validate_hhh_distribution(videos)
-        metrics_results.append(hhh_result)
-        if hhh_result.status == ValidationStatus.CRITICAL:
-            critical_issues.append(hhh_result.message)
-        elif hhh_result.status == ValidationStatus.WARNING:
-            warnings.append(hhh_result.message)
-        
-        # 4. Validation Organique vs Payé
-        organic_paid_result = self._validate_organic_vs_paid(videos)
-        metrics_results.append(organic_paid_result)
-        if organic_paid_result.status == ValidationStatus.CRITICAL:
-            critical_issues.append(organic_paid_result.message)
-        elif organic_paid_result.status == ValidationStatus.WARNING:
-            warnings.append(organic_paid_result.message)
-        
-        # 5. Validation Shorts vs Vidéos 16:9
-        shorts_result = self._validate_shorts_distribution(videos)
-        metrics_results.append(shorts_result)
-        if shorts_result.status == ValidationStatus.CRITICAL:
-            critical_issues.append(shorts_result.message)
-        elif shorts_result.status == ValidationStatus.WARNING:
-            warnings.append(shorts_result.message)
-        
-        # 6. Validation Cohérence des Miniatures
-        thumbnail_result = self._validate_thumbnail_consistency(videos)
-        metrics_results.append(thumbnail_result)
-        if thumbnail_result.status == ValidationStatus.WARNING:
-            warnings.append(thumbnail_result.message)
-        
-        # 7. Validation Champ Lexical
-        lexical_result = self._validate_lexical_consistency(videos)
-        metrics_results.append(lexical_result)
-        if lexical_result.status == ValidationStatus.WARNING:
-            warnings.append(lexical_result.message)
-        
-        # 8. Validation Sujet le Plus Apprécié
-        top_subject_result = self._validate_top_performing_subject(videos)
-        metrics_results.append(top_subject_result)
-        if top_subject_result.status == ValidationStatus.CRITICAL:
-            critical_issues.append(top_subject_result.message)
-        elif top_subject_result.status == ValidationStatus.WARNING:
-            warnings.append(top_subject_result.message)
+        for result in metrics_results:
+            if result.status == ValidationStatus.CRITICAL and result.metric_name not in WARNING_ONLY_METRICS:
+                critical_issues.append(result.message)
+            elif result.status == ValidationStatus.WARNING:
+                warnings.append(result.message)
         
         # Déterminer le statut global
         overall_status = self._determine_overall_status(metrics_results)
@@ -217,19 +366,19 @@ class KeyMetricsValidator:
         powerpoint_ready = (
             overall_status in [ValidationStatus.EXCELLENT, ValidationStatus.GOOD] 
             and len(critical_issues) == 0
-            and len(videos) > 0
+            and total_videos > 0
         )
         
         # Générer le résumé
-        summary = self._generate_summary(overall_status, len(videos), len(critical_issues), len(warnings))
+        summary = self._generate_summary(overall_status, total_videos, len(critical_issues), len(warnings))
         
         return CompetitorValidationReport(
             competitor_id=competitor_id,
-            competitor_name=competitor['name'],
-            country=competitor['country'],
+            competitor_name=competitor_name,
+            country=country,
             overall_status=overall_status,
             metrics_results=metrics_results,
-            total_videos=len(videos),
+            total_videos=total_videos,
             powerpoint_ready=powerpoint_ready,
             summary=summary,
             critical_issues=critical_issues,
@@ -237,9 +386,22 @@ class KeyMetricsValidator:
             validation_date=datetime.now()
         )
     
+    # === Métriques : extraction des statistiques (par lignes) puis décision commune ===
+    
     def _validate_video_duration(self, videos: List[sqlite3.Row]) -> ValidationResult:
         """Valide les métriques de durée des vidéos."""
-        if not videos:
+        durations = [v['duration_seconds'] for v in videos if v['duration_seconds'] and v['duration_seconds'] > 0]
+        if not durations:
+            return self._duration_result(len(videos), 0, 0, 0)
+        
+        avg_duration_minutes = statistics.mean(durations) / 60
+        short_videos = sum(1 for d in durations if d < 60)  # < 1 minute
+        short_percentage = (short_videos / len(durations)) * 100
+        return self._duration_result(len(videos), len(durations), avg_duration_minutes, short_percentage)
+    
+    def _duration_result(self, total_videos: int, durations_count: int,
+                         avg_duration_minutes: float, short_percentage: float) -> ValidationResult:
+        if not total_videos:
             return ValidationResult(
                 metric_name="Durée des Vidéos",
                 status=ValidationStatus.INSUFFICIENT_DATA,
@@ -249,10 +411,7 @@ class KeyMetricsValidator:
                 recommendation="Importer des vidéos pour cette chaîne"
             )
         
-        # Calculer les durées
-        durations = [v['duration_seconds'] for v in videos if v['duration_seconds'] and v['duration_seconds'] > 0]
-        
-        if not durations:
+        if not durations_count:
             return ValidationResult(
                 metric_name="Durée des Vidéos",
                 status=ValidationStatus.CRITICAL,
@@ -262,12 +421,6 @@ class KeyMetricsValidator:
                 recommendation="Récupérer les durées des vidéos via l'API YouTube"
             )
         
-        avg_duration_minutes = statistics.mean(durations) / 60
-        short_videos = sum(1 for d in durations if d < 60)  # < 1 minute
-        long_videos = sum(1 for d in durations if d > 3600)  # > 1 heure
-        short_percentage = (short_videos / len(durations)) * 100
-        long_percentage = (long_videos / len(durations)) * 100
-        
         # Validation
         if avg_duration_minutes <= 0 or avg_duration_minutes > 120:  # Plus de 2h suspect
             return ValidationResult(
@@ -308,7 +461,12 @@ class KeyMetricsValidator:
     
     def _validate_publishing_frequency(self, videos: List[sqlite3.Row]) -> ValidationResult:
         """Valide la fréquence de publication."""
-        if not videos or len(videos) < 2:
+        valid_dates = [ts for ts in (parse_published_timestamp(v['published_at']) for v in videos) if ts is not None]
+        date_range = int((max(valid_dates) - min(valid_dates)) // 86400) if len(valid_dates) >= 2 else 0
+        return self._frequency_result(len(videos), len(valid_dates), date_range)
+    
+    def _frequency_result(self, total_videos: int, dated_count: int, date_range: int) -> ValidationResult:
+        if total_videos < 2:
             return ValidationResult(
                 metric_name="Fréquence de Publication",
                 status=ValidationStatus.INSUFFICIENT_DATA,
@@ -318,22 +476,7 @@ class KeyMetricsValidator:
                 recommendation="Importer plus de vidéos"
             )
         
-        # Parser les dates de publication
-        valid_dates = []
-        for video in videos:
-            if video['published_at']:
-                try:
-                    # Essayer différents formats de date
-                    date_str = video['published_at']
-                    if 'T' in date_str:
-                        date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    else:
-                        date = datetime.strptime(date_str, '%Y-%m-%d')
-                    valid_dates.append(date)
-                except Exception:
-                    continue
-        
-        if len(valid_dates) < 2:
+        if dated_count < 2:
             return ValidationResult(
                 metric_name="Fréquence de Publication",
                 status=ValidationStatus.CRITICAL,
@@ -343,10 +486,7 @@ class KeyMetricsValidator:
                 recommendation="Corriger les dates avec l'agent de correction YouTube"
             )
         
-        valid_dates.sort()
-        
         # Calculer la fréquence
-        date_range = (valid_dates[-1] - valid_dates[0]).days
         if date_range == 0:
             # Toutes les vidéos publiées le même jour (suspect)
             return ValidationResult(
@@ -359,7 +499,7 @@ class KeyMetricsValidator:
             )
         
         weeks = max(date_range / 7, 1)
-        videos_per_week = len(valid_dates) / weeks
+        videos_per_week = dated_count / weeks
         
         # Validation
         if videos_per_week > 50:  # Plus de 50 vidéos/semaine = aberrant
@@ -401,7 +541,13 @@ class KeyMetricsValidator:
     
     def _validate_hhh_distribution(self, videos: List[sqlite3.Row]) -> ValidationResult:
         """Valide la distribution Hero-Hub-Help."""
-        if not videos:
+        hero_count = sum(1 for v in videos if v['category'] == 'hero')
+        hub_count = sum(1 for v in videos if v['category'] == 'hub')
+        help_count = sum(1 for v in videos if v['category'] == 'help')
+        return self._hhh_result(len(videos), hero_count, hub_count, help_count)
+    
+    def _hhh_result(self, total_videos: int, hero_count: int, hub_count: int, help_count: int) -> ValidationResult:
+        if not total_videos:
             return ValidationResult(
                 metric_name="Distribution HHH",
                 status=ValidationStatus.INSUFFICIENT_DATA,
@@ -411,14 +557,7 @@ class KeyMetricsValidator:
                 recommendation="Importer des vidéos"
             )
         
-        # Compter les catégories
-        hero_count = sum(1 for v in videos if v['category'] == 'hero')
-        hub_count = sum(1 for v in videos if v['category'] == 'hub')
-        help_count = sum(1 for v in videos if v['category'] == 'help')
-        uncategorized_count = sum(1 for v in videos if v['category'] is None or v['category'] == '')
-        
         total_categorized = hero_count + hub_count + help_count
-        total_videos = len(videos)
         
         # Calculer les pourcentages
         if total_categorized > 0:
@@ -471,7 +610,12 @@ class KeyMetricsValidator:
     
     def _validate_organic_vs_paid(self, videos: List[sqlite3.Row]) -> ValidationResult:
         """Valide la distribution Organique vs Payé."""
-        if not videos:
+        views = [v['view_count'] for v in videos if v['view_count'] is not None and v['view_count'] > 0]
+        paid_count = sum(1 for view_count in views if view_count >= self.paid_threshold)
+        return self._organic_paid_result(len(videos), len(views), paid_count)
+    
+    def _organic_paid_result(self, total_videos: int, viewed_count: int, paid_count: int) -> ValidationResult:
+        if not total_videos:
             return ValidationResult(
                 metric_name="Organique vs Payé",
                 status=ValidationStatus.INSUFFICIENT_DATA,
@@ -481,10 +625,7 @@ class KeyMetricsValidator:
                 recommendation="Importer des vidéos"
             )
         
-        # Calculer les métriques de vues
-        videos_with_views = [v for v in videos if v['view_count'] is not None and v['view_count'] > 0]
-        
-        if not videos_with_views:
+        if not viewed_count:
             return ValidationResult(
                 metric_name="Organique vs Payé",
                 status=ValidationStatus.CRITICAL,
@@ -495,11 +636,9 @@ class KeyMetricsValidator:
             )
         
         # Classifier en payé/organique basé sur le seuil
-        paid_count = sum(1 for v in videos_with_views if v['view_count'] >= self.paid_threshold)
-        organic_count = len(videos_with_views) - paid_count
-        
-        paid_pct = (paid_count / len(videos_with_views)) * 100
-        organic_pct = (organic_count / len(videos_with_views)) * 100
+        organic_count = viewed_count - paid_count
+        paid_pct = (paid_count / viewed_count) * 100
+        organic_pct = (organic_count / viewed_count) * 100
         
         # Validation
         if paid_pct == 100:
@@ -532,7 +671,12 @@ class KeyMetricsValidator:
     
     def _validate_shorts_distribution(self, videos: List[sqlite3.Row]) -> ValidationResult:
         """Valide la distribution Shorts vs Vidéos format 16:9."""
-        if not videos:
+        # Compter les Shorts (is_short = 1) vs vidéos normales
+        shorts_count = sum(1 for v in videos if v['is_short'] == 1)
+        return self._shorts_result(len(videos), shorts_count)
+    
+    def _shorts_result(self, total_videos: int, shorts_count: int) -> ValidationResult:
+        if not total_videos:
             return ValidationResult(
                 metric_name="Shorts vs Vidéos 16:9",
                 status=ValidationStatus.INSUFFICIENT_DATA,
@@ -542,12 +686,9 @@ class KeyMetricsValidator:
                 recommendation="Importer des vidéos"
             )
         
-        # Compter les Shorts (is_short = 1) vs vidéos normales
-        shorts_count = sum(1 for v in videos if v['is_short'] == 1)
-        regular_count = len(videos) - shorts_count
-        
-        shorts_pct = (shorts_count / len(videos)) * 100
-        regular_pct = (regular_count / len(videos)) * 100
+        regular_count = total_videos - shorts_count
+        shorts_pct = (shorts_count / total_videos) * 100
+        regular_pct = (regular_count / total_videos) * 100
         
         # Validation
         if shorts_count == 0 and regular_count == 0:
@@ -571,7 +712,15 @@ class KeyMetricsValidator:
     
     def _validate_thumbnail_consistency(self, videos: List[sqlite3.Row]) -> ValidationResult:
         """Valide la cohérence des miniatures."""
-        if not videos:
+        videos_with_thumbnails = sum(1 for v in videos if v['thumbnail_url'])
+        with self.get_db_connection() as conn:
+            visual = consistency_for_videos(conn, [v['id'] for v in videos])
+        return self._thumbnail_result(len(videos), videos_with_thumbnails, visual)
+    
+    def _thumbnail_result(self, total_videos: int, videos_with_thumbnails: int,
+                          visual=None) -> ValidationResult:
+        """visual : VisualConsistency issue des empreintes (thumbnail_features), None si non calculées"""
+        if not total_videos:
             return ValidationResult(
                 metric_name="Cohérence des Miniatures",
                 status=ValidationStatus.INSUFFICIENT_DATA,
@@ -581,35 +730,35 @@ class KeyMetricsValidator:
                 recommendation="Importer des vidéos"
             )
         
-        # Compter les vidéos avec des miniatures
-        videos_with_thumbnails = sum(1 for v in videos if v['thumbnail_url'])
-        thumbnail_coverage = (videos_with_thumbnails / len(videos)) * 100
+        thumbnail_coverage = (videos_with_thumbnails / total_videos) * 100
         
-        # Analyse basique de cohérence (placeholder - nécessiterait analyse d'image)
         if thumbnail_coverage < 50:
-            consistency_score = 0
-        elif thumbnail_coverage < 80:
-            consistency_score = 50
-        else:
-            consistency_score = 75  # Score par défaut
-        
-        # Validation
-        if consistency_score == 0:
             return ValidationResult(
                 metric_name="Cohérence des Miniatures",
                 status=ValidationStatus.CRITICAL,
-                value=f"{consistency_score}%",
+                value="0%",
                 expected_range="70-95%",
                 message=f"Miniatures manquantes ({thumbnail_coverage:.0f}% de couverture)",
                 recommendation="Récupérer les URLs des miniatures"
             )
-        elif consistency_score < 60:
+        
+        if visual is None:
+            # Empreintes pas encore calculées : seule la couverture est connue
+            consistency_score = 50 if thumbnail_coverage < 80 else 75
+            detail = "cohérence visuelle non mesurée (python scripts/compute_thumbnail_features.py)"
+        else:
+            consistency_score = round(visual.score)
+            detail = (f"{visual.analyzed} miniatures : structure {visual.hash_similarity:.0f}%, "
+                      f"gabarits {visual.template_share:.0f}%, palette {visual.colour_similarity:.0f}%")
+        
+        # Validation
+        if consistency_score < 60:
             return ValidationResult(
                 metric_name="Cohérence des Miniatures",
                 status=ValidationStatus.WARNING,
                 value=f"{consistency_score}%",
                 expected_range="70-95%",
-                message="Cohérence visuelle faible des miniatures",
+                message=f"Cohérence visuelle faible des miniatures ({detail})",
                 recommendation="Améliorer la cohérence du design des miniatures"
             )
         else:
@@ -618,13 +767,17 @@ class KeyMetricsValidator:
                 status=ValidationStatus.GOOD,
                 value=f"{consistency_score}%",
                 expected_range="70-95%",
-                message="Cohérence des miniatures acceptable",
+                message=f"Cohérence des miniatures acceptable ({detail})",
                 recommendation="Maintenir la qualité visuelle des miniatures"
             )
     
     def _validate_lexical_consistency(self, videos: List[sqlite3.Row]) -> ValidationResult:
         """Valide la cohérence du champ lexical et de la tonalité."""
-        if not videos:
+        return self._lexical_result(len(videos), *lexical_stats([v['title'] for v in videos]))
+    
+    def _lexical_result(self, total_videos: int, titles_count: int,
+                        total_words: int, unique_words: int) -> ValidationResult:
+        if not total_videos:
             return ValidationResult(
                 metric_name="Champ Lexical",
                 status=ValidationStatus.INSUFFICIENT_DATA,
@@ -634,10 +787,7 @@ class KeyMetricsValidator:
                 recommendation="Importer des vidéos"
             )
         
-        # Analyser les titres des vidéos
-        titles = [v['title'] for v in videos if v['title']]
-        
-        if not titles:
+        if not titles_count:
             return ValidationResult(
                 metric_name="Champ Lexical",
                 status=ValidationStatus.CRITICAL,
@@ -647,18 +797,11 @@ class KeyMetricsValidator:
                 recommendation="Récupérer les titres des vidéos"
             )
         
-        # Analyse basique de cohérence lexicale
-        total_words = []
-        for title in titles:
-            words = re.findall(r'\w+', title.lower())
-            total_words.extend(words)
-        
         if not total_words:
             consistency_score = 0
         else:
             # Calculer la diversité lexicale (ratio mots uniques / total)
-            unique_words = len(set(total_words))
-            lexical_diversity = unique_words / len(total_words)
+            lexical_diversity = unique_words / total_words
             
             # Score de cohérence basé sur la diversité (inversement proportionnel)
             # Plus la diversité est faible, plus la cohérence est élevée
@@ -695,7 +838,26 @@ class KeyMetricsValidator:
     
     def _validate_top_performing_subject(self, videos: List[sqlite3.Row]) -> ValidationResult:
         """Valide l'existence d'un sujet le plus apprécié."""
-        if not videos:
+        # Filtrer les vidéos avec des métriques d'engagement
+        videos_with_metrics = [
+            v for v in videos 
+            if v['view_count'] is not None and v['like_count'] is not None
+            and v['view_count'] > 0
+        ]
+        if not videos_with_metrics:
+            return self._top_subject_result(len(videos), 0, None, 0)
+        
+        # Trouver la vidéo avec le meilleur engagement
+        best_video = max(
+            videos_with_metrics, 
+            key=lambda v: (v['like_count'] or 0) / max(v['view_count'], 1)
+        )
+        engagement_rate = (best_video['like_count'] or 0) / max(best_video['view_count'], 1) * 100
+        return self._top_subject_result(len(videos), len(videos_with_metrics), best_video['title'], engagement_rate)
+    
+    def _top_subject_result(self, total_videos: int, metrics_count: int,
+                            best_title: Optional[str], engagement_rate: float) -> ValidationResult:
+        if not total_videos:
             return ValidationResult(
                 metric_name="Sujet le Plus Apprécié",
                 status=ValidationStatus.INSUFFICIENT_DATA,
@@ -705,14 +867,7 @@ class KeyMetricsValidator:
                 recommendation="Importer des vidéos"
             )
         
-        # Filtrer les vidéos avec des métriques d'engagement
-        videos_with_metrics = [
-            v for v in videos 
-            if v['view_count'] is not None and v['like_count'] is not None
-            and v['view_count'] > 0
-        ]
-        
-        if not videos_with_metrics:
+        if not metrics_count:
             return ValidationResult(
                 metric_name="Sujet le Plus Apprécié",
                 status=ValidationStatus.CRITICAL,
@@ -722,14 +877,7 @@ class KeyMetricsValidator:
                 recommendation="Récupérer les métriques de vues et likes"
             )
         
-        # Trouver la vidéo avec le meilleur engagement
-        best_video = max(
-            videos_with_metrics, 
-            key=lambda v: (v['like_count'] or 0) / max(v['view_count'], 1)
-        )
-        
-        best_title = best_video['title'] if best_video['title'] else 'Sans titre'
-        engagement_rate = (best_video['like_count'] or 0) / max(best_video['view_count'], 1) * 100
+        best_title = best_title if best_title else 'Sans titre'
         
         # Validation
         if not best_title or best_title == 'Sans titre':
@@ -127,6 +127,7 @@ def run_fast_comment_scraping(api_key=None, workers=5, resume=True):
         print(f"   Comments scraped: {results['comments_scraped']:,}")
         print(f"   Quota used: {results['quota_used']:,}/10,000")
         print(f"   Processing time: {results['processing_time']/60:.1f} minutes")
+        print(f"   Throughput: {results['comments_per_sec']:.1f} comments/sec")
         
         return True
         
@@ -135,6 +136,34 @@ def run_fast_comment_scraping(api_key=None, workers=5, resume=True):
         logging.error(f"Fast scraping error: {e}", exc_info=True)
         return False
 
+def run_incremental_scraping(api_key=None, workers=4, analyze=False):
+    """Harvest only comments posted since the last run, then optionally analyze them"""
+    print("🔄 Starting incremental comment harvest...")
+    
+    if not api_key:
+        api_key = os.getenv('YOUTUBE_API_KEY')
+        if not api_key:
+            print("❌ YouTube API key not found. Set YOUTUBE_API_KEY environment variable.")
+            return False
+    
+    try:
+        scraper = YouTubeCommentScraper(api_key)
+        results = scraper.scrape_new_comments(max_workers=workers)
+        
+        print("✅ Incremental harvest completed!")
+        print(f"   Videos checked: {results['videos_processed']:,} ({results['videos_with_new']:,} with new comments)")
+        print(f"   New comments: {results['new_comments']:,}")
+        print(f"   Quota used: {results['api_calls']:,}")
+        
+        if analyze and results['new_comments']:
+            return run_emotion_analysis(max_workers=workers)
+        return True
+        
+    except Exception as e:
+        print(f"❌ Incremental harvest failed: {e}")
+        logging.error(f"Incremental harvest error: {e}", exc_info=True)
+        return False
+
 def run_emotion_analysis(batch_size=1000, max_workers=4):
     """Run emotion analysis on scraped comments"""
     print("🧠 Starting emotion analysis pipeline...")
@@ -225,6 +254,11 @@ def main():
     fast_scrape_parser.add_argument('--workers', type=int, default=5, help='Number of concurrent workers')
     fast_scrape_parser.add_argument('--resume', action='store_true', help='Resume from last position')
     
+    # Incremental harvest command
+    incremental_parser = subparsers.add_parser('incremental', help='Harvest only new comments since last run')
+    incremental_parser.add_argument('--workers', type=int, default=4, help='Number of concurrent videos')
+    incremental_parser.add_argument('--analyze', action='store_true', help='Run emotion analysis on new comments')
+    
     # Analyze command
     analyze_parser = subparsers.add_parser('analyze', help='Analyze emotions from comments')
     analyze_parser.add_argument('--batch-size', type=int, default=1000, help='Batch size for emotion analysis')
@@ -280,6 +314,13 @@ def main():
             resume=args.resume
         )
         
+    elif args.command == 'incremental':
+        success = run_incremental_scraping(
+            api_key=args.api_key,
+            workers=args.workers,
+            analyze=args.analyze
+        )
+        
     elif args.command == 'analyze':
         success = run_emotion_analysis(
             batch_size=args.batch_size,
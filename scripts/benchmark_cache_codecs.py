@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark des codecs du cache Redis
+- Compare l'ancien chemin pickle aux codecs orjson/json/msgpack
+- Avec et sans compression (zstd/lz4)
+- Mesure taille des payloads et temps d'encodage/décodage
+"""
+
+import sys
+import pickle
+import random
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ajouter le chemin du projet
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from yt_channel_analyzer.cache_codecs import (
+    CacheSerializer, JSONCodec, MsgpackCodec, ZstdCompressor, LZ4Compressor,
+    msgpack, zstandard, lz4_frame
+)
+
+CATEGORIES = ['hero', 'hub', 'help']
+COUNTRIES = ['France', 'Germany', 'Netherlands', 'United Kingdom', 'Belgium', 'International']
+
+
+def build_insights_payload(n_videos: int) -> dict:
+    """Payload représentatif des insights pays (vidéos + agrégats)"""
+    rng = random.Random(42)
+    base_date = datetime(2024, 1, 1)
+    videos = []
+    for i in range(n_videos):
+        videos.append({
+            'id': i,
+            'video_id': f"vid{i:08d}",
+            'title': f"Séjour en famille au bord du lac - épisode {i}",
+            'view_count': rng.randint(0, 5_000_000),
+            'like_count': rng.randint(0, 100_000),
+            'comment_count': rng.randint(0, 5_000),
+            'category': rng.choice(CATEGORIES),
+            'published_at': (base_date + timedelta(days=i % 365)).isoformat(),
+            'duration_seconds': rng.randint(10, 3600),
+            'is_short': rng.random() < 0.2,
+            'thumbnail_url': f"https://i.ytimg.com/vi/vid{i:08d}/hqdefault.jpg",
+        })
+    return {
+        'country': rng.choice(COUNTRIES),
+        'generated_at': base_date.isoformat(),
+        'stats': {c: {'count': rng.randint(0, n_videos), 'views': rng.randint(0, 10**9)} for c in CATEGORIES},
+        'videos': videos,
+    }
+
+
+def time_call(func, arg, repeat: int) -> tuple:
+    """Temps moyen d'un appel en millisecondes et dernier résultat"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(arg)
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    return elapsed, result
+
+
+def build_candidates():
+    """Configurations à comparer (selon les bibliothèques installées)"""
+    candidates = [('pickle (actuel)', pickle.dumps, pickle.loads)]
+
+    def add(label, serializer):
+        candidates.append((label, serializer.dumps, serializer.loads))
+
+    add(f"{JSONCodec.name}", CacheSerializer(JSONCodec(), None))
+    if msgpack:
+        add("msgpack", CacheSerializer(MsgpackCodec(), None))
+    if zstandard:
+        add(f"{JSONCodec.name}+zstd", CacheSerializer(JSONCodec(), ZstdCompressor()))
+        if msgpack:
+            add("msgpack+zstd", CacheSerializer(MsgpackCodec(), ZstdCompressor()))
+    if lz4_frame:
+        add(f"{JSONCodec.name}+lz4", CacheSerializer(JSONCodec(), LZ4Compressor()))
+    return candidates
+
+
+def run_benchmark(sizes=(10, 100, 1000, 10000)):
+    print("🚀 Benchmark des codecs du cache Redis")
+    candidates = build_candidates()
+
+    for n_videos in sizes:
+        payload = build_insights_payload(n_videos)
+        repeat = max(3, 2000 // max(n_videos // 10, 1))
+        print(f"\n📊 Payload: {n_videos:,} vidéos ({repeat} itérations)")
+        print(f"   {'codec':<20} {'taille':>12} {'encode ms':>11} {'decode ms':>11}")
+
+        for label, dumps, loads in candidates:
+            encode_ms, encoded = time_call(dumps, payload, repeat)
+            decode_ms, _ = time_call(loads, encoded, repeat)
+            print(f"   {label:<20} {len(encoded):>12,} {encode_ms:>11.3f} {decode_ms:>11.3f}")
+
+
+if __name__ == '__main__':
+    run_benchmark()
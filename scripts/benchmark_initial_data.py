@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'extraction des pages vidéo YouTube
+- Compare l'ancien chemin BeautifulSoup + regex au parseur ytInitialData (chemins précompilés)
+- Vérifie que les deux chemins s'accordent sur titre, vues et likes
+- Pages synthétiques par défaut, ou pages HTML sauvegardées passées en argument
+
+Usage:
+    python scripts/benchmark_initial_data.py
+    python scripts/benchmark_initial_data.py pages/*.html
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le chemin du projet
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from yt_channel_analyzer.selenium_scraper import parse_video_html_with_beautifulsoup
+from yt_channel_analyzer.yt_initial_data import extract_video_fields, orjson, to_video_data
+
+COMPARED_FIELDS = ('title', 'views', 'likes')
+
+
+def build_watch_page(video_id: str, n_related: int = 40, seed: int = 0) -> str:
+    """Page /watch représentative : player response, ytInitialData avec vidéos suggérées, scripts annexes"""
+    rng = random.Random(seed)
+    views = rng.randint(1_000, 5_000_000)
+    likes = rng.randint(10, 100_000)
+    player = {
+        'responseContext': {'serviceTrackingParams': [{'service': 'GFEEDBACK', 'params': [{'key': f'k{i}', 'value': 'v' * 20} for i in range(30)]}]},
+        'streamingData': {'adaptiveFormats': [{'itag': i, 'url': f'https://rr1.googlevideo.com/videoplayback?id={i}&' + 'x' * 400,
+                                               'mimeType': 'video/mp4', 'bitrate': rng.randint(1, 10**7)} for i in range(40)]},
+        'videoDetails': {
+            'videoId': video_id, 'title': f'Séjour en famille au bord du lac {video_id}', 'lengthSeconds': str(rng.randint(30, 3600)),
+            'keywords': ['voyage', 'famille', 'lac'], 'channelId': 'UCabcdefghijklmnopqrstuv',
+            'shortDescription': 'Découvrez nos séjours. ' * 40, 'viewCount': str(views), 'author': 'Club Vacances',
+            'isLiveContent': False,
+            'thumbnail': {'thumbnails': [{'url': f'https://i.ytimg.com/vi/{video_id}/{q}.jpg'} for q in ('default', 'mqdefault', 'hqdefault')]},
+        },
+        'microformat': {'playerMicroformatRenderer': {'publishDate': '2024-03-12T08:00:00-07:00', 'uploadDate': '2024-03-12T08:00:00-07:00',
+                                                      'category': 'Travel & Events', 'ownerChannelName': 'Club Vacances'}},
+    }
+    like_button = {'segmentedLikeDislikeButtonViewModel': {'likeButtonViewModel': {'likeButtonViewModel': {'toggleButtonViewModel': {'toggleButtonViewModel': {
+        'defaultButtonViewModel': {'buttonViewModel': {'title': f'{likes // 1000}K' if likes >= 1000 else str(likes),
+                                                       'accessibilityText': f"like this video along with {likes:,} other people"}}}}}}}}
+    related = [{'compactVideoRenderer': {'videoId': f'rel{i:08d}', 'title': {'simpleText': f'Vidéo suggérée {i}'},
+                                         'viewCountText': {'simpleText': f'{rng.randint(1, 10**6)} vues'},
+                                         'thumbnail': {'thumbnails': [{'url': 'https://i.ytimg.com/x.jpg', 'width': 168}] * 3},
+                                         'menu': {'menuRenderer': {'items': [{'menuServiceItemRenderer': {'text': {'runs': [{'text': 'Ajouter'}]}}}] * 4}}}}
+               for i in range(n_related)]
+    initial = {
+        'contents': {'twoColumnWatchNextResults': {
+            'results': {'results': {'contents': [
+                {'videoPrimaryInfoRenderer': {
+                    'title': {'runs': [{'text': player['videoDetails']['title']}]},
+                    'viewCount': {'videoViewCountRenderer': {'viewCount': {'simpleText': f'{views:,} vues'}}},
+                    'dateText': {'simpleText': '12 mars 2024'},
+                    'videoActions': {'menuRenderer': {'topLevelButtons': [like_button]}},
+                }},
+                {'videoSecondaryInfoRenderer': {'owner': {'videoOwnerRenderer': {'title': {'runs': [{'text': 'Club Vacances'}]},
+                                                                                  'subscriberCountText': {'simpleText': '120 k abonnés'}}}}},
+            ]}},
+            'secondaryResults': {'secondaryResults': {'results': related}},
+        }},
+        'frameworkUpdates': {'entityBatchUpdate': {'mutations': [{'entityKey': f'e{i}', 'payload': {'x': 'y' * 50}} for i in range(200)]}},
+    }
+    filler = '<div class="style-scope">' + 'x' * 200 + '</div>'
+    return (
+        '<!DOCTYPE html><html><head><title>' + player['videoDetails']['title'] + ' - YouTube</title>'
+        f'<meta property="og:title" content="{player["videoDetails"]["title"]}">'
+        '<script>var ytcfg = {"EXPERIMENT_FLAGS": {"a": true}};</script></head><body>'
+        + filler * 100
+        + '<script nonce="abc">var ytInitialPlayerResponse = ' + json.dumps(player, ensure_ascii=False, separators=(',', ':'))
+        + ';var meta = document.createElement(\'meta\');</script>'
+        + filler * 100
+        + '<script nonce="abc">var ytInitialData = ' + json.dumps(initial, ensure_ascii=False, separators=(',', ':')) + ';</script>'
+        + filler * 50 + '</body></html>'
+    )
+
+
+def time_parse(func, pages, repeat: int) -> float:
+    """Temps moyen par page en millisecondes"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # logs [DEBUG] de l'ancien chemin
+        for _ in range(repeat):
+            for url, html in pages:
+                func(url, html)
+    return (time.perf_counter() - start) / (repeat * len(pages)) * 1000
+
+
+def fast_parse(url: str, html: str) -> dict:
+    return to_video_data(url, extract_video_fields(html))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BeautifulSoup vs ytInitialData")
+    parser.add_argument('files', nargs='*', help="Pages /watch sauvegardées (sinon pages synthétiques)")
+    parser.add_argument('--pages', type=int, default=20, help="Nombre de pages synthétiques")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.files:
+        pages = [(f"https://www.youtube.com/watch?v={Path(p).stem}", Path(p).read_text(encoding='utf-8', errors='replace'))
+                 for p in args.files]
+    else:
+        pages = [(f"https://www.youtube.com/watch?v=vid{i:08d}", build_watch_page(f'vid{i:08d}', seed=i))
+                 for i in range(args.pages)]
+
+    size_kb = sum(len(html) for _, html in pages) / len(pages) / 1024
+    print(f"🚀 Benchmark extraction pages vidéo ({len(pages)} pages, {size_kb:.0f} Ko en moyenne, "
+          f"décodeur {'orjson' if orjson else 'json'})")
+
+    legacy_ms = time_parse(parse_video_html_with_beautifulsoup, pages, args.repeat)
+    fast_ms = time_parse(fast_parse, pages, args.repeat)
+    print(f"   {'BeautifulSoup + regex':<24} {legacy_ms:>9.2f} ms/page")
+    print(f"   {'ytInitialData':<24} {fast_ms:>9.2f} ms/page  (x{legacy_ms / fast_ms:.1f})")
+
+    mismatches = recovered = 0
+    for url, html in pages:
+        with contextlib.redirect_stdout(io.StringIO()):
+            legacy = parse_video_html_with_beautifulsoup(url, html)
+        fast = fast_parse(url, html)
+        for field in COMPARED_FIELDS:
+            legacy_value = str(legacy.get(field) or '').replace(',', '')
+            fast_value = str(fast.get(field) or '').replace(',', '')
+            if legacy_value == fast_value:
+                continue
+            if not legacy_value:
+                recovered += 1  # champ manqué par les regex (nouvelle structure de page)
+                continue
+            mismatches += 1
+            print(f"   ⚠️ {url} {field}: BeautifulSoup={legacy.get(field)!r} ytInitialData={fast.get(field)!r}")
+    print(f"\n{'✅' if not mismatches else '⚠️'} {mismatches} divergences sur {len(pages) * len(COMPARED_FIELDS)} champs comparés, "
+          f"{recovered} champs trouvés uniquement par ytInitialData")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Construction du snapshot analytique colonnaire (Arrow IPC ou Parquet)
+- Vidéos, playlists, concurrents et émotions, partitionnés par pays et par concurrent
+- Publié comme dernière version ; les anciennes versions au-delà de --keep sont supprimées
+- --summary affiche les agrégats par concurrent calculés sur le snapshot
+
+Usage:
+    python scripts/build_analytics_snapshot.py
+    python scripts/build_analytics_snapshot.py --format parquet --tables videos playlists
+    python scripts/build_analytics_snapshot.py --summary-only --country FR
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ajouter le chemin du projet
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from yt_channel_analyzer.analytics_snapshot import (
+    FILE_FORMATS, SNAPSHOT_KEEP, SNAPSHOT_ROOT, SNAPSHOT_TABLES,
+    competitor_metrics, list_snapshots, read_manifest, write_snapshot
+)
+
+
+def print_summary(country=None):
+    manifest = read_manifest()
+    print(f"\n📦 Snapshot {manifest['version']} ({manifest['file_format']})")
+    for name, info in manifest['tables'].items():
+        print(f"   {name:<12} {info['rows']:>12,} lignes")
+
+    print(f"\n{'VIDÉOS':>8} {'VUES':>14} {'VUES/VIDÉO':>12} {'SHORTS':>7}  PAYS  CONCURRENT")
+    for row in competitor_metrics(country).to_pylist():
+        print(f"{row['view_count_count']:>8,} {row['view_count_sum']:>14,} {row['view_count_mean']:>12,.0f} "
+              f"{row['is_short_sum']:>7,}  {row['country'] or '-':<4}  {row['competitor_name']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot analytique colonnaire")
+    parser.add_argument('--tables', nargs='+', choices=list(SNAPSHOT_TABLES), help="Tables à inclure (toutes par défaut)")
+    parser.add_argument('--format', choices=list(FILE_FORMATS), default='arrow',
+                        help="arrow : memory-map sans copie ; parquet : compressé, pour l'archivage")
+    parser.add_argument('--keep', type=int, default=SNAPSHOT_KEEP, help="Nombre de versions conservées")
+    parser.add_argument('--summary', action='store_true', help="Afficher les agrégats par concurrent")
+    parser.add_argument('--summary-only', action='store_true', help="Agrégats du dernier snapshot, sans reconstruction")
+    parser.add_argument('--country', help="Limiter les agrégats à un pays")
+    args = parser.parse_args()
+
+    if not args.summary_only:
+        manifest = write_snapshot(args.tables, args.format, keep=args.keep)
+        print(f"\n✅ Snapshot {manifest['version']} publié dans {SNAPSHOT_ROOT} "
+              f"({len(list_snapshots())} versions conservées)")
+
+    if args.summary or args.summary_only:
+        print_summary(args.country)
+
+
+if __name__ == "__main__":
+    main()
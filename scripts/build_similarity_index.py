@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Construction / mise à jour de l'index de similarité (vidéos et concurrents)
+- Incrémental par défaut : seules les vidéos nouvelles ou modifiées sont encodées
+- --rebuild réencode tout (changement de modèle, index corrompu)
+- --benchmark mesure la latence des requêtes /api/similar sur des vidéos tirées au hasard
+
+Usage:
+    python scripts/build_similarity_index.py
+    python scripts/build_similarity_index.py --competitor 12
+    python scripts/build_similarity_index.py --rebuild --benchmark 500
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le chemin du projet
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from yt_channel_analyzer.similarity_service import similarity_service
+
+
+def benchmark(queries: int):
+    video_ids = list(similarity_service.owners)
+    competitor_ids = similarity_service.competitors.ids() if similarity_service.competitors else []
+    if not video_ids:
+        print("⚠️ Index vide, rien à mesurer")
+        return
+
+    for label, ids, query in (
+        ('vidéos', video_ids, lambda i: similarity_service.similar_videos(i, 10)),
+        ('concurrents', competitor_ids, lambda i: similarity_service.similar_competitors(i, 10)),
+    ):
+        if not ids:
+            continue
+        timings = []
+        for item_id in random.choices(ids, k=queries):
+            started = time.perf_counter()
+            query(item_id)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        print(f"   {label:<12} p50 {timings[len(timings) // 2]:.3f} ms   "
+              f"p99 {timings[int(len(timings) * 0.99)]:.3f} ms   max {timings[-1]:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index de similarité vidéos / concurrents")
+    parser.add_argument('--competitor', type=int, action='append', help="Limiter la mise à jour à un concurrent")
+    parser.add_argument('--rebuild', action='store_true', help="Réencoder toutes les vidéos")
+    parser.add_argument('--benchmark', type=int, default=0, metavar='N', help="Mesurer N requêtes après la mise à jour")
+    args = parser.parse_args()
+
+    result = similarity_service.update(args.competitor, rebuild=args.rebuild)
+    print(f"\n✅ {result['encoded']} vidéos encodées, {result['removed']} retirées, "
+          f"{result['competitors_updated']} centroïdes mis à jour")
+    stats = similarity_service.stats()
+    print(f"📦 Index {stats['version']} : {stats['videos']} vidéos, {stats['competitors']} concurrents "
+          f"({stats['backend']}, {stats['model']})")
+
+    if args.benchmark:
+        print(f"\n⏱️ Latence sur {args.benchmark} requêtes :")
+        benchmark(args.benchmark)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Calcul incrémental des empreintes visuelles des miniatures (pHash, dHash, histogramme couleur)
+- Seules les vidéos nouvelles ou dont la miniature a changé sont téléchargées et analysées
+- Affiche ensuite la cohérence visuelle par concurrent
+
+Usage:
+    python scripts/compute_thumbnail_features.py
+    python scripts/compute_thumbnail_features.py --competitor 12 --limit 1000
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ajouter le chemin du projet
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from yt_channel_analyzer.database import get_db_connection
+from yt_channel_analyzer.thumbnail_features import consistency_by_competitor, update_thumbnail_features
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Empreintes visuelles des miniatures")
+    parser.add_argument('--competitor', type=int, help="Limiter à un concurrent")
+    parser.add_argument('--limit', type=int, help="Nombre maximal de vidéos à traiter")
+    parser.add_argument('--workers', type=int, default=8, help="Téléchargements parallèles")
+    args = parser.parse_args()
+
+    stats = update_thumbnail_features(args.competitor, args.limit, max_workers=args.workers)
+    print(f"\n✅ {stats['computed']} empreintes calculées, {stats['failed']} échecs "
+          f"({stats['pending']} vidéos en attente)")
+
+    conn = get_db_connection(update_schema=False)
+    try:
+        names = dict(conn.execute("SELECT id, name FROM concurrent").fetchall())
+        competitor_ids = [args.competitor] if args.competitor else None
+        results = consistency_by_competitor(conn, competitor_ids)
+    finally:
+        conn.close()
+
+    print(f"\n{'SCORE':>6} {'STRUCT.':>8} {'GABARIT':>8} {'PALETTE':>8} {'N':>6}  CONCURRENT")
+    for competitor_id, visual in sorted(results.items(), key=lambda item: -item[1].score):
+        print(f"{visual.score:>5.1f}% {visual.hash_similarity:>7.1f}% {visual.template_share:>7.1f}% "
+              f"{visual.colour_similarity:>7.1f}% {visual.analyzed:>6}  {names.get(competitor_id, competitor_id)}")
+
+
+if __name__ == "__main__":
+    main()
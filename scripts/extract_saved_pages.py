@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Extraction en lot de pages YouTube sauvegardées (pages /watch ou onglet /videos d'une chaîne)
+- Lit les blobs ytInitialData / ytInitialPlayerResponse sans navigateur ni BeautifulSoup
+- Une ligne JSON par page (JSONL), pages traitées en parallèle sur plusieurs processus
+
+Usage:
+    python scripts/extract_saved_pages.py pages/ --output videos.jsonl
+    python scripts/extract_saved_pages.py page1.html page2.html --workers 4
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le chemin du projet
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from yt_channel_analyzer.yt_initial_data import parse_saved_pages
+
+
+def collect_files(inputs):
+    """Fichiers .html/.htm, répertoires parcourus récursivement"""
+    files = []
+    for item in map(Path, inputs):
+        if item.is_dir():
+            files.extend(sorted(p for p in item.rglob('*') if p.suffix.lower() in ('.html', '.htm')))
+        elif item.is_file():
+            files.append(item)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extraction en lot de pages YouTube sauvegardées")
+    parser.add_argument('inputs', nargs='+', help="Fichiers HTML ou répertoires")
+    parser.add_argument('--output', help="Fichier JSONL (sortie standard par défaut)")
+    parser.add_argument('--workers', type=int, help="Processus parallèles (défaut: nombre de CPU)")
+    args = parser.parse_args()
+
+    files = collect_files(args.inputs)
+    if not files:
+        print("❌ Aucune page HTML trouvée", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    parsed = empty = 0
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for path, fields in parse_saved_pages(files, max_workers=args.workers):
+            if not (fields.get('title') or fields.get('video_ids')):
+                empty += 1
+            out.write(json.dumps({'file': path, **fields}, ensure_ascii=False) + '\n')
+            parsed += 1
+    finally:
+        if args.output:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ {parsed} pages extraites en {elapsed:.2f}s ({empty} sans données YouTube reconnues)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Conseiller d'index basé sur la charge
+- Charge capturée par l'application (SQL_WORKLOAD_LOG=instance/sql_workload.json) ou charge de référence
+- EXPLAIN QUERY PLAN : scans complets, tris temporaires, index recommandés
+- --apply : migration des index (ensure_indexes) + ANALYZE, puis benchmark avant/après
+
+Usage:
+    SQL_WORKLOAD_LOG=instance/sql_workload.json python app.py     # capture
+    python scripts/index_advisor.py --workload instance/sql_workload.json
+    python scripts/index_advisor.py --apply
+    python scripts/index_advisor.py --database emotions --apply
+"""
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+# Ajouter le chemin du projet
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from yt_channel_analyzer.database.base import DB_DIR, DB_PATH
+from yt_channel_analyzer.database.indexes import analyze_workload, benchmark, ensure_indexes, load_workload
+
+# Requêtes chaudes de l'application (filtres relevés dans les blueprints et services)
+REFERENCE_WORKLOAD = {
+    'main': [
+        ("SELECT COUNT(*) FROM video WHERE DATE(published_at) >= '2024-01-01'", 1),
+        ("SELECT v.id, v.title, v.view_count FROM video v WHERE LOWER(v.category) = 'hero' ORDER BY v.view_count DESC LIMIT 50", 1),
+        ("SELECT c.id, c.name, COUNT(v.id) FROM concurrent c LEFT JOIN video v ON v.concurrent_id = c.id WHERE c.country = 'France' GROUP BY c.id", 1),
+        ("SELECT video_id FROM playlist_video WHERE playlist_id = 1", 1),
+        ("SELECT id, title FROM video WHERE concurrent_id = 1 AND category = 'hub'", 1),
+        ("SELECT COUNT(*) FROM video WHERE concurrent_id = 1 AND published_at >= '2024-01-01'", 1),
+        ("SELECT id FROM video WHERE video_id = 'dQw4w9WgXcQ'", 1),
+        ("SELECT id FROM playlist WHERE playlist_id = 'PL0'", 1),
+    ],
+    'emotions': [
+        ("SELECT video_id, emotion_type, COUNT(*), AVG(confidence) FROM comment_emotions GROUP BY video_id, emotion_type", 1),
+        ("SELECT emotion_type, COUNT(*) FROM comment_emotions WHERE video_id = 'dQw4w9WgXcQ' GROUP BY emotion_type", 1),
+    ],
+}
+
+
+def print_report(reports):
+    for report in reports:
+        status = "❌" if report.error else ("🐢" if report.full_scans else "✅")
+        print(f"\n{status} [{report.executions}x] {report.sql[:110]}")
+        if report.error:
+            print(f"   ⚠️ {report.error}")
+            continue
+        for detail in report.plan:
+            print(f"   {'🔍' if detail in report.full_scans else '  '} {detail}")
+        for spec in report.recommended:
+            print(f"   💡 {spec.ddl}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Conseiller d'index SQLite")
+    parser.add_argument('--database', choices=('main', 'emotions'), default='main')
+    parser.add_argument('--workload', help="Fichier JSON capturé via SQL_WORKLOAD_LOG")
+    parser.add_argument('--apply', action='store_true', help="Créer les index recommandés puis mesurer")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    db_path = DB_PATH if args.database == 'main' else DB_DIR / 'youtube_emotions_massive.db'
+    if not db_path.exists():
+        print(f"❌ Base introuvable: {db_path}")
+        return
+
+    workload = load_workload(args.workload) if args.workload else REFERENCE_WORKLOAD[args.database]
+    print(f"📊 {len(workload)} requêtes analysées sur {db_path.name}")
+
+    # Connexion brute : pas de mise à jour de schéma, pour mesurer l'état réellement déployé
+    conn = sqlite3.connect(str(db_path))
+    try:
+        reports = analyze_workload(conn, workload, args.database)
+        print_report(reports)
+
+        scans = sum(1 for r in reports if r.full_scans)
+        recommended = {spec.name for r in reports for spec in r.recommended}
+        print(f"\n📋 {scans} requêtes avec scan complet, {len(recommended)} index recommandés")
+
+        if not args.apply:
+            print("💡 Relancer avec --apply pour créer les index et mesurer le gain")
+            return
+
+        before = benchmark(conn, workload, args.repeat)
+        created = ensure_indexes(conn, args.database)
+        conn.execute("ANALYZE")
+        conn.commit()
+        after = benchmark(conn, workload, args.repeat)
+
+        print(f"\n✅ Index créés: {', '.join(created) if created else 'aucun (déjà présents)'}")
+        print(f"\n{'AVANT':>10} {'APRÈS':>10} {'GAIN':>8}  REQUÊTE")
+        for sql, before_ms in before.items():
+            after_ms = after.get(sql, before_ms)
+            gain = before_ms / after_ms if after_ms else float('inf')
+            print(f"{before_ms:>8.2f}ms {after_ms:>8.2f}ms {gain:>7.1f}x  {sql[:70]}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Migrations du schéma appliquées une seule fois par base (version dans PRAGMA user_version)
+- Exécutées aussi au démarrage de l'application (init_db) ; ce script permet de les lancer à part
+- --force : rejoue toutes les migrations (idempotentes) quelle que soit la version enregistrée
+
+Usage:
+    python scripts/migrate_database.py
+    python scripts/migrate_database.py --force
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ajouter le chemin du projet
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from yt_channel_analyzer.database.base import SCHEMA_VERSION, DatabaseSchema, get_db_connection
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Applique les migrations du schéma de la base")
+    parser.add_argument('--force', action='store_true', help="rejouer toutes les migrations")
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    try:
+        before = conn.execute('PRAGMA user_version').fetchone()[0]
+        created = DatabaseSchema.run_migrations(conn, force=args.force)
+        after = conn.execute('PRAGMA user_version').fetchone()[0]
+        print(f"📋 Version du schéma: {before} → {after} (cible {SCHEMA_VERSION})")
+        print(f"✅ Objets créés: {', '.join(created) if created else 'aucun'}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """
 Script pour réparer les miniatures manquantes dans la base de données
+--download : télécharge ensuite les miniatures des vidéos (thumbnail_service)
 """
 
 import sys
@@ -134,4 +135,12 @@ if __name__ == "__main__":
     print("\n📊 ÉTAT APRÈS RÉPARATION:")
     get_thumbnail_stats()
     
+    # Télécharger les miniatures réparées en local (parallèle, conditionnel, dédupliqué)
+    if '--download' in sys.argv:
+        from yt_channel_analyzer.thumbnail_service import ThumbnailService
+        print("\n📥 TÉLÉCHARGEMENT DES MINIATURES...")
+        stats = ThumbnailService().sync_videos()
+        print(f"✅ {stats['new']} nouvelles, {stats['not_modified'] + stats['unchanged']} inchangées, "
+              f"{stats['errors']} échecs ({stats['unique_blobs']} fichiers uniques)")
+    
     print("\n✅ Script terminé avec succès!") 
\ No newline at end of file
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Export hors ligne en flux (mêmes générateurs que /export-data)
+- videos, competitors, playlists ou comment_emotions (base sentiment)
+- ndjson / csv / json / parquet, mémoire bornée quelle que soit la taille
+
+Usage:
+    python scripts/stream_export.py comment_emotions --format parquet
+    python scripts/stream_export.py videos --format csv --gzip
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le chemin du projet
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from yt_channel_analyzer.streaming_export import EXPORT_SOURCES, FORMATS, export_filename, export_to_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export en flux des données")
+    parser.add_argument('data_type', choices=sorted(EXPORT_SOURCES))
+    parser.add_argument('--format', default='ndjson', choices=sorted(FORMATS))
+    parser.add_argument('--gzip', action='store_true', help="Compresser la sortie (ignoré pour parquet)")
+    parser.add_argument('--output', help="Fichier de sortie (nom horodaté par défaut)")
+    args = parser.parse_args()
+
+    compress = args.gzip and args.format != 'parquet'
+    output = args.output or export_filename(args.data_type, args.format, compress)
+
+    print(f"📤 Export {args.data_type} → {output} ({args.format}{', gzip' if compress else ''})")
+    started = time.perf_counter()
+    written = export_to_file(args.data_type, output, args.format, compress)
+    print(f"✅ {written / 1_048_576:.1f} Mo écrits en {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
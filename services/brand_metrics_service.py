@@ -8,6 +8,8 @@ import sqlite3
 import json
 import os
 
+from yt_channel_analyzer.thumbnail_features import consistency_by_competitor
+
 
 def load_settings():
     """Load settings from config/settings.json"""
@@ -348,10 +350,17 @@ class BrandMetricsService:
         total_videos, with_thumbnails, avg_beauty_score = thumb_data
         consistency_score = avg_beauty_score if avg_beauty_score else 5
         
+        # Visual consistency from perceptual hashes when computed (scripts/compute_thumbnail_features.py)
+        visual = consistency_by_competitor(self.conn, [competitor_id]).get(competitor_id)
+        if visual:
+            consistency_score = visual.score / 10
+        
         return {
             'total_videos': total_videos,
             'with_thumbnails': with_thumbnails,
-            'consistency_score': round(consistency_score, 1)
+            'consistency_score': round(consistency_score, 1),
+            'analyzed_thumbnails': visual.analyzed if visual else 0,
+            'visual_score': visual.score if visual else None
         }
     
     def _analyze_tone_of_voice(self, competitor_id: int) -> Dict[str, Any]:
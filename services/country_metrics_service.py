@@ -6,6 +6,8 @@ from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
 import sqlite3
 
+from yt_channel_analyzer.thumbnail_features import consistency_by_competitor, weighted_consistency
+
 
 class VideoLengthAnalysisService:
     """Handles video length analysis for a country."""
@@ -262,10 +264,19 @@ class ThumbnailConsistencyService:
         with_thumbnails = thumb_data[1] or 0
         consistency_score = round((with_thumbnails / max(total_videos, 1)) * 10, 1)
         
+        # Visual consistency from perceptual hashes, averaged over the country's channels
+        self.cursor.execute("SELECT id FROM concurrent WHERE country = ?", (country,))
+        competitor_ids = [row[0] for row in self.cursor.fetchall()]
+        visual = weighted_consistency(consistency_by_competitor(self.conn, competitor_ids).values())
+        if visual:
+            consistency_score = round(visual.score / 10, 1)
+        
         return {
             'total_videos': total_videos,
             'with_thumbnails': with_thumbnails,
-            'consistency_score': consistency_score
+            'consistency_score': consistency_score,
+            'analyzed_thumbnails': visual.analyzed if visual else 0,
+            'visual_score': visual.score if visual else None
         }
     
     def _empty_thumbnail_metrics(self) -> Dict[str, Any]:
@@ -273,7 +284,9 @@ class ThumbnailConsistencyService:
         return {
             'total_videos': 0,
             'with_thumbnails': 0,
-            'consistency_score': 0
+            'consistency_score': 0,
+            'analyzed_thumbnails': 0,
+            'visual_score': None
         }
 
 
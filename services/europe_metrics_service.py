@@ -9,6 +9,8 @@ import sqlite3
 import json
 import os
 
+from yt_channel_analyzer.thumbnail_features import consistency_by_competitor, weighted_consistency
+
 def load_settings():
     """Load settings from config/settings.json"""
     try:
@@ -333,10 +335,17 @@ class EuropeMetricsService:
         with_thumbnails = thumb_data[1] or 0
         consistency_score = round((with_thumbnails / max(total_videos, 1)) * 10, 1)
         
+        # Visual consistency from perceptual hashes, averaged over all channels
+        visual = weighted_consistency(consistency_by_competitor(self.conn).values())
+        if visual:
+            consistency_score = round(visual.score / 10, 1)
+        
         return {
             'total_videos': total_videos,
             'with_thumbnails': with_thumbnails,
-            'consistency_score': consistency_score
+            'consistency_score': consistency_score,
+            'analyzed_thumbnails': visual.analyzed if visual else 0,
+            'visual_score': visual.score if visual else None
         }
     
     def _analyze_tone_of_voice(self, sample_limit: int = 200) -> Dict[str, Any]:
@@ -0,0 +1,64 @@
+"""
+Moteur d'anomalies : une requête d'agrégats, règles vectorielles,
+table classée par gravité
+"""
+
+import sqlite3
+
+import pytest
+
+from yt_channel_analyzer.anomaly_engine import AnomalyEngine
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    conn.executescript('''
+        CREATE TABLE concurrent (id INTEGER PRIMARY KEY, name TEXT, channel_id TEXT);
+        CREATE TABLE video (id INTEGER PRIMARY KEY, concurrent_id INTEGER, category TEXT, duration_seconds INTEGER,
+                            published_at TEXT, view_count INTEGER, like_count INTEGER);
+        CREATE TABLE playlist (id INTEGER PRIMARY KEY, concurrent_id INTEGER);
+        INSERT INTO concurrent VALUES (1, 'Alpha', 'UC_alpha'), (2, 'Bravo', 'UC_bravo'),
+                                      (3, 'Charlie', 'UC_charlie'), (4, 'Delta', '');
+        INSERT INTO video (concurrent_id, category, duration_seconds, published_at, view_count, like_count) VALUES
+            (1, 'hero', 300, '2024-01-01 10:00:00', 1000, 50),
+            (1, 'hub', 300, '2024-02-01 10:00:00', 1000, 50),
+            (1, 'help', 300, '2024-03-01 10:00:00', 1000, 50),
+            (3, 'hub', 300, '2025-07-05 10:00:00', 1000, 50),
+            (3, 'hub', 300, '2025-07-05 11:00:00', 1000, 50),
+            (4, NULL, 0, '2025-07-05 10:00:00', 0, 0);
+        INSERT INTO playlist (concurrent_id) VALUES (1);
+    ''')
+    yield conn
+    conn.close()
+
+
+def types_of(table, competitor_id):
+    return {anomaly.type for anomaly in table.by_competitor().get(competitor_id, [])}
+
+
+def test_detect_flags_each_competitor(conn):
+    table = AnomalyEngine().detect(conn)
+
+    # Concurrent sans channel_id ignoré ; concurrent sain non signalé
+    assert table.competitors_scanned == 3
+    assert types_of(table, 1) == set()
+    # Sans vidéo : seule NO_VIDEOS, les autres règles ne s'appliquent pas
+    assert types_of(table, 2) == {'NO_VIDEOS'}
+    assert types_of(table, 3) == {'ZERO_HERO', 'TOO_MUCH_HUB', 'CORRUPTED_DATES', 'NO_PLAYLISTS'}
+    assert table.of_type('CORRUPTED_DATES')[0].details == "2 vidéos (100.0%) avec dates d'import suspectes"
+
+
+def test_table_is_ranked_by_severity(conn):
+    table = AnomalyEngine().detect(conn)
+
+    assert table.anomalies[0].type == 'NO_VIDEOS'
+    assert [anomaly.weight for anomaly in table] == sorted((anomaly.weight for anomaly in table), reverse=True)
+    assert table.scores == {2: 4, 3: 11}
+    assert table.flagged_ids() == [3, 2]
+
+
+def test_detect_restricted_to_competitors(conn):
+    engine = AnomalyEngine()
+    assert engine.detect(conn, competitor_ids=[2]).flagged_ids() == [2]
+    assert len(engine.detect(conn, competitor_ids=[])) == 0
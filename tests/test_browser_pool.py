@@ -0,0 +1,66 @@
+"""
+Pool de navigateurs : attente d'un driver libre, réutilisation, délai d'attente
+(drivers factices : aucun Chrome nécessaire)
+"""
+
+import threading
+import time
+
+import pytest
+
+from yt_channel_analyzer.browser_pool import BrowserPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.pages = []
+        self.closed = False
+
+    def get(self, url):
+        self.pages.append(url)
+
+    def quit(self):
+        self.closed = True
+
+
+def test_acquire_blocks_until_driver_released():
+    pool = BrowserPool(size=1, driver_factory=FakeDriver)
+    first = pool.acquire()
+    acquired = []
+
+    def worker():
+        started = time.monotonic()
+        driver = pool.acquire()
+        acquired.append((driver, time.monotonic() - started))
+        pool.release(driver)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    time.sleep(0.2)
+    assert acquired == []  # le second thread attend
+    pool.release(first)
+    thread.join(timeout=5)
+
+    assert len(acquired) == 1
+    driver, waited = acquired[0]
+    assert driver is first  # driver chaud réutilisé
+    assert waited >= 0.15
+    assert pool.created == 1 and pool.reused == 1
+
+
+def test_acquire_timeout_when_pool_full():
+    pool = BrowserPool(size=1, driver_factory=FakeDriver)
+    driver = pool.acquire()
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.1)
+    assert time.monotonic() - started >= 0.1
+    pool.release(driver)
+
+
+def test_map_pages_shares_single_driver():
+    pool = BrowserPool(size=1, driver_factory=FakeDriver)
+    urls = [f"https://www.youtube.com/watch?v={i}" for i in range(4)]
+    results = pool.map_pages(urls, lambda driver, url: url[-1], max_workers=2)
+    assert results == {url: url[-1] for url in urls}
+    assert pool.created == 1
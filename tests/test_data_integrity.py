@@ -0,0 +1,120 @@
+"""
+Moteur d'intégrité : détection par règles, corrections ensemblistes
+et mode incrémental limité aux lignes modifiées
+"""
+
+import sqlite3
+
+import pytest
+
+from yt_channel_analyzer.database import data_integrity
+from yt_channel_analyzer.database.data_integrity import DataIntegrityValidator
+
+CHANNEL_ID = 'UC' + 'a' * 22
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / 'database.db'
+    conn = sqlite3.connect(str(path))
+    conn.executescript(f'''
+        CREATE TABLE concurrent (id INTEGER PRIMARY KEY, name TEXT, channel_id TEXT, subscriber_count INTEGER,
+                                 video_count INTEGER, total_views INTEGER, avg_views REAL);
+        CREATE TABLE video (id INTEGER PRIMARY KEY, concurrent_id INTEGER, video_id TEXT, title TEXT,
+                            view_count INTEGER, duration_seconds INTEGER, is_short INTEGER,
+                            published_at TEXT, category TEXT);
+        CREATE TABLE playlist (id INTEGER PRIMARY KEY, concurrent_id INTEGER, name TEXT, video_count INTEGER);
+        CREATE TABLE playlist_video (playlist_id INTEGER, video_id INTEGER);
+        INSERT INTO concurrent VALUES (1, 'Center Parcs', '{CHANNEL_ID}', 1000, 2, 300, 150);
+        INSERT INTO video VALUES (1, 1, 'aaaaaaaaaaa', 'Cottage en forêt', 100, 120, 0, '2024-05-01', 'hub');
+        INSERT INTO video VALUES (2, 1, 'bbbbbbbbbbb', 'Toboggan', 200, 30, 1, '2024-06-01', 'hero');
+        INSERT INTO playlist VALUES (1, 1, 'Cottages', 1);
+        INSERT INTO playlist_video VALUES (1, 1);
+    ''')
+    conn.commit()
+    conn.close()
+
+    def connect(update_schema=True):
+        conn = sqlite3.connect(str(path))
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    monkeypatch.setattr(data_integrity, 'get_db_connection', connect)
+    return path
+
+
+def execute(db_path, *statements):
+    conn = sqlite3.connect(str(db_path))
+    for statement in statements:
+        conn.execute(statement)
+    conn.commit()
+    conn.close()
+
+
+def fetch(db_path, query):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute(query).fetchone()
+    finally:
+        conn.close()
+
+
+def triggered(report):
+    return {name for name, count in report['rule_counts'].items() if count}
+
+
+def test_auto_fixable_rules_have_a_fix():
+    for rule in DataIntegrityValidator().build_rules():
+        assert not rule.auto_fixable or rule.fix, rule.name
+
+
+def test_clean_dataset(db_path):
+    report = DataIntegrityValidator().validate_complete_dataset()
+    assert report['success'] and report['mode'] == 'full'
+    assert report['health_status'] == 'excellent'
+    assert report['stats']['total_checks'] == 5
+    assert triggered(report) == set()
+
+
+def test_fix_errors_applies_set_based_fixes(db_path):
+    execute(db_path,
+            "UPDATE video SET title = '', category = 'bogus' WHERE id = 1",
+            "UPDATE video SET is_short = 0 WHERE id = 2",
+            "UPDATE playlist SET video_count = 5")
+
+    report = DataIntegrityValidator().validate_complete_dataset(fix_errors=True)
+    assert triggered(report) == {'video_title_empty', 'video_category_invalid',
+                                 'video_is_short_mismatch', 'playlist_video_count_mismatch'}
+    assert report['stats']['auto_fixes_applied'] == 3
+    assert fetch(db_path, 'SELECT title, category FROM video WHERE id = 1') == ('Video 1', 'bogus')
+    assert fetch(db_path, 'SELECT is_short FROM video WHERE id = 2') == (1,)
+    assert fetch(db_path, 'SELECT video_count FROM playlist') == (1,)
+
+    # Seule l'erreur sans correction automatique subsiste
+    assert triggered(DataIntegrityValidator().validate_complete_dataset()) == {'video_category_invalid'}
+
+
+def test_aggregate_rule_reports_count(db_path):
+    execute(db_path, "INSERT INTO video VALUES (3, 99, 'ccccccccccc', 'Orpheline', 10, 60, 1, '2024-01-01', 'help')")
+
+    report = DataIntegrityValidator().validate_complete_dataset()
+    assert report['rule_counts']['video_orphan'] == 1
+    assert report['health_status'] == 'critical'
+    assert report['critical_errors'][0]['message'] == '1 vidéos orphelines sans concurrent'
+
+
+def test_incremental_scans_only_modified_rows(db_path):
+    execute(db_path, "UPDATE video SET category = 'bogus' WHERE id = 1")
+    validator = DataIntegrityValidator()
+    assert validator.validate_complete_dataset(incremental=True)['mode'] == 'full'
+
+    execute(db_path, "UPDATE video SET title = ' ' WHERE id = 2")
+    report = validator.validate_complete_dataset(incremental=True)
+    assert report['mode'] == 'incremental'
+    # Vidéo 2 et son concurrent marqués par les triggers ; la vidéo 1 n'est pas relue
+    assert triggered(report) == {'video_title_empty'}
+    assert report['stats']['total_checks'] == 3
+
+    report = validator.validate_complete_dataset(incremental=True)
+    assert triggered(report) == set()
+    assert report['stats']['total_checks'] == 1
@@ -0,0 +1,101 @@
+"""
+Mode incrémental du rafraîchissement global amélioré : le second passage
+ignore les chaînes inchangées depuis leur watermark de playlists
+"""
+
+import sqlite3
+
+import pytest
+
+import enhanced_global_refresh_system as enhanced
+from yt_channel_analyzer.database.base import DatabaseSchema
+from yt_channel_analyzer.refresh_watermarks import WatermarkStore
+
+CHANNELS = {1: ('Alpha', 'UC_alpha', 12), 2: ('Beta', 'UC_beta', 30)}
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'database.db'))
+    conn.executescript('''
+        CREATE TABLE concurrent (id INTEGER PRIMARY KEY, name TEXT, channel_id TEXT, channel_url TEXT);
+        CREATE TABLE video (id INTEGER PRIMARY KEY, concurrent_id INTEGER, video_id TEXT);
+        CREATE TABLE playlist (
+            id INTEGER PRIMARY KEY, concurrent_id INTEGER, playlist_id TEXT, name TEXT, description TEXT,
+            thumbnail_url TEXT, video_count INTEGER, category TEXT
+        );
+    ''')
+    DatabaseSchema.update_database_schema(conn)
+    conn.executemany(
+        "INSERT INTO concurrent (id, name, channel_id, channel_url) VALUES (?, ?, ?, ?)",
+        [(cid, name, channel_id, f"https://www.youtube.com/channel/{channel_id}")
+         for cid, (name, channel_id, _) in CHANNELS.items()]
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def system(tmp_path, monkeypatch):
+    def no_training():
+        raise RuntimeError('pas de classifieur dans les tests')
+
+    monkeypatch.setattr(enhanced, 'SemanticTrainingManager', no_training)
+    system = enhanced.EnhancedGlobalRefreshSystem()
+    system.status_file = str(tmp_path / 'status.json')
+    system.video_counts = {channel_id: count for _, channel_id, count in CHANNELS.values()}
+    system.playlist_calls = []
+
+    def api_get(api_key, endpoint, params):
+        assert endpoint == 'channels'
+        return {'items': [
+            {'id': channel_id, 'contentDetails': {'relatedPlaylists': {'uploads': 'UU' + channel_id[2:]}},
+             'statistics': {'videoCount': str(system.video_counts[channel_id])}}
+            for channel_id in params['id'].split(',')
+        ]}
+
+    def get_channel_playlists(api_key, channel_id):
+        system.playlist_calls.append(channel_id)
+        return [{'id': f"PL_{channel_id}", 'title': 'Séjours', 'description': '', 'thumbnail_url': '',
+                 'video_count': 3, 'published_at': '2025-01-01T00:00:00Z'}]
+
+    monkeypatch.setattr(system, '_api_get', api_get)
+    monkeypatch.setattr(system, 'get_channel_playlists', get_channel_playlists)
+    monkeypatch.setattr(system, 'create_playlist_video_links', lambda *args: None)
+    return system
+
+
+def test_second_pass_skips_unchanged_channels(conn, system):
+    system.import_and_classify_playlists(conn, 'key', incremental=True)
+    conn.commit()
+    assert sorted(system.playlist_calls) == ['UC_alpha', 'UC_beta']
+
+    watermarks = WatermarkStore.load_all(conn)
+    assert watermarks[1].playlists_checked_at is not None
+    assert watermarks[1].playlists_video_count == 12
+
+    system.playlist_calls.clear()
+    system.import_and_classify_playlists(conn, 'key', incremental=True)
+    assert system.playlist_calls == []
+    assert system.stats['competitors_unchanged'] == 2
+
+
+def test_channel_with_new_videos_is_reprocessed(conn, system):
+    system.import_and_classify_playlists(conn, 'key', incremental=True)
+    conn.commit()
+
+    system.playlist_calls.clear()
+    system.video_counts['UC_beta'] = 31
+    system.import_and_classify_playlists(conn, 'key', incremental=True)
+    assert system.playlist_calls == ['UC_beta']
+
+
+def test_playlist_pass_leaves_uploads_watermark_untouched(conn, system):
+    system.import_and_classify_playlists(conn, 'key', incremental=True)
+    conn.commit()
+
+    # Le watermark des uploads reste à la charge du rafraîchissement ULTIMATE
+    watermark = WatermarkStore.load_all(conn)[1]
+    assert watermark.checked_at is None
+    assert watermark.channel_video_count is None
@@ -0,0 +1,101 @@
+"""
+File de tâches SQLite : bail, nouvelles tentatives avec backoff, erreur définitive
+et ré-enfilement sans écraser un job en cours
+"""
+
+import sqlite3
+import time
+
+import pytest
+
+from yt_channel_analyzer.job_queue import SQLiteJobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    db_path = tmp_path / 'database.db'
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript('''
+        CREATE TABLE video (id INTEGER PRIMARY KEY, concurrent_id INTEGER, video_id TEXT);
+        CREATE TABLE playlist (id INTEGER PRIMARY KEY, concurrent_id INTEGER, playlist_id TEXT);
+    ''')
+    conn.close()
+    return SQLiteJobQueue(db_path, lease_seconds=60, backoff_base=30)
+
+
+def expire(queue, task_id, column='lease_expires_at'):
+    conn = sqlite3.connect(str(queue.db_path))
+    conn.execute(f'UPDATE background_tasks SET {column} = ? WHERE id = ?', (time.time() - 1, task_id))
+    conn.commit()
+    conn.close()
+
+
+def test_enqueue_keeps_running_job_lease_and_attempts(queue):
+    queue.enqueue('job', 'post_import_workflow', {'competitor_id': 1})
+    assert queue.claim('w1')['attempts'] == 1
+
+    queue.enqueue('job', 'post_import_workflow', {'competitor_id': 1})
+    job = queue.get('job')
+    assert (job['status'], job['lease_owner'], job['attempts']) == ('running', 'w1', 1)
+    assert queue.heartbeat(['job'], 'w1') == {'job': False}
+
+
+def test_enqueue_reschedules_finished_job(queue):
+    queue.enqueue('job', 'post_import_workflow', {'competitor_id': 1})
+    queue.claim('w1')
+    assert queue.complete('job', 'w1')
+
+    queue.enqueue('job', 'post_import_workflow', {'competitor_id': 1, 'rerun': True})
+    job = queue.get('job')
+    assert (job['status'], job['attempts'], job['end_time']) == ('queued', 0, None)
+    assert job['payload'] == {'competitor_id': 1, 'rerun': True}
+
+
+def test_expired_lease_is_taken_over(queue):
+    queue.enqueue('job', 'channel_analysis')
+    queue.claim('w1')
+    assert queue.claim('w2') is None
+
+    expire(queue, 'job')
+    job = queue.claim('w2')
+    assert (job['lease_owner'], job['attempts']) == ('w2', 2)
+    # L'ancien worker a perdu le bail : plus de heartbeat ni de fin de job
+    assert queue.heartbeat(['job'], 'w1') == {}
+    assert not queue.complete('job', 'w1')
+    assert queue.complete('job', 'w2')
+
+
+def test_failed_attempt_is_retried_after_backoff(queue):
+    queue.enqueue('job', 'channel_analysis')
+    queue.claim('w1')
+
+    assert queue.fail('job', 'w1', 'timeout') == 'queued'
+    job = queue.get('job')
+    assert job['lease_owner'] is None and job['error_message'] == 'timeout'
+    assert job['next_run_at'] >= time.time() + 30 * 0.8 - 1
+    assert queue.claim('w1') is None
+
+    expire(queue, 'job', 'next_run_at')
+    assert queue.claim('w1')['attempts'] == 2
+
+
+def test_last_attempt_goes_to_error(queue):
+    queue.enqueue('job', 'channel_analysis', max_attempts=2)
+    for _ in range(2):
+        expire(queue, 'job', 'next_run_at')
+        queue.claim('w1')
+        status = queue.fail('job', 'w1', 'HTTP 500')
+    assert status == 'error'
+    assert queue.get('job')['status'] == 'error'
+    assert queue.claim('w1') is None
+
+
+def test_expired_lease_on_last_attempt_goes_to_error(queue):
+    queue.enqueue('job', 'channel_analysis', max_attempts=1)
+    queue.claim('w1')
+    expire(queue, 'job')
+
+    assert queue.claim('w2') is None
+    job = queue.get('job')
+    assert job['status'] == 'error' and job['lease_owner'] is None
+    assert 'bail expiré' in job['error_message']
@@ -0,0 +1,110 @@
+"""
+Liaison playlist ↔ vidéos : playlists classifiées sans liens, pagination de l'API,
+résolution des IDs YouTube par concurrent et insertion en masse sans doublons
+"""
+
+import sqlite3
+
+import pytest
+
+from yt_channel_analyzer.playlist_linker import PlaylistLinker
+
+PAGES = {
+    ('PL_alpha', None): {'nextPageToken': 'p2', 'items': [
+        {'contentDetails': {'videoId': 'vid_a1'}},
+        {'contentDetails': {'videoId': 'vid_shared'}},
+    ]},
+    ('PL_alpha', 'p2'): {'items': [
+        {'contentDetails': {'videoId': 'vid_a2'}},
+        {'contentDetails': {'videoId': 'vid_unknown'}},
+        {'contentDetails': {}},
+    ]},
+}
+
+
+class FakeApi:
+    def __init__(self, pages=PAGES, failing=()):
+        self.pages = pages
+        self.failing = failing
+        self.calls = []
+
+    def __call__(self, endpoint, params):
+        self.calls.append((endpoint, params['playlistId'], params.get('pageToken')))
+        if params['playlistId'] in self.failing:
+            raise RuntimeError('HTTP 500')
+        return self.pages.get((params['playlistId'], params.get('pageToken')))
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    conn.executescript('''
+        CREATE TABLE video (id INTEGER PRIMARY KEY, concurrent_id INTEGER, video_id TEXT);
+        CREATE TABLE playlist (id INTEGER PRIMARY KEY, concurrent_id INTEGER, playlist_id TEXT, name TEXT, category TEXT);
+        CREATE TABLE playlist_video (playlist_id, video_id INTEGER);
+        INSERT INTO video VALUES (1, 1, 'vid_a1'), (2, 1, 'vid_a2'), (3, 1, 'vid_shared'), (4, 2, 'vid_shared');
+        INSERT INTO playlist VALUES
+            (10, 1, 'PL_alpha', 'Cottages', 'hub'),
+            (11, 1, 'PL_unclassified', 'Divers', NULL),
+            (12, 1, 'PL_all', 'All Videos', 'hub'),
+            (20, 2, 'PL_bravo', 'Spa', 'help');
+    ''')
+    yield conn
+    conn.close()
+
+
+def links(conn):
+    return conn.execute('SELECT playlist_id, video_id FROM playlist_video ORDER BY playlist_id, video_id').fetchall()
+
+
+def test_find_unlinked_playlists(conn):
+    linker = PlaylistLinker()
+    assert linker.find_unlinked_playlists(conn) == [('PL_alpha', 'PL_alpha', 1), ('PL_bravo', 'PL_bravo', 2)]
+    assert linker.find_unlinked_playlists(conn, competitor_id=2) == [('PL_bravo', 'PL_bravo', 2)]
+    assert PlaylistLinker(link_key='id').find_unlinked_playlists(conn, competitor_id=1) == [(10, 'PL_alpha', 1)]
+
+    conn.execute("INSERT INTO playlist_video VALUES ('PL_bravo', 4)")
+    assert linker.find_unlinked_playlists(conn) == [('PL_alpha', 'PL_alpha', 1)]
+
+
+def test_link_unlinked_resolves_videos_of_the_competitor(conn):
+    api = FakeApi()
+    linker = PlaylistLinker(api)
+
+    assert linker.link_unlinked(conn, competitor_id=1) == 3
+    # Toutes les pages lues ; vid_shared du concurrent 2 et les vidéos inconnues ignorées
+    assert [call[2] for call in api.calls] == [None, 'p2']
+    assert links(conn) == [('PL_alpha', 1), ('PL_alpha', 2), ('PL_alpha', 3)]
+
+    # Déjà liée : plus d'appel API ni de nouveau lien
+    assert linker.link_unlinked(conn, competitor_id=1) == 0
+    assert len(api.calls) == 2
+
+
+def test_link_by_database_id(conn):
+    assert PlaylistLinker(FakeApi(), link_key='id').link_unlinked(conn, competitor_id=1) == 3
+    assert {row[0] for row in links(conn)} == {10}
+
+
+def test_fetch_errors_are_recorded(conn):
+    linker = PlaylistLinker(FakeApi(failing=('PL_bravo',)))
+
+    assert linker.link_unlinked(conn) == 3
+    assert linker.errors == {'PL_bravo': 'HTTP 500'}
+
+
+def test_bulk_link_deduplicates_and_replaces(conn):
+    conn.executemany('INSERT INTO playlist_video VALUES (?, ?)', [('PL_alpha', 1), ('PL_alpha', 1), ('PL_alpha', 4)])
+    cursor = conn.cursor()
+
+    assert PlaylistLinker.bulk_link(cursor, {('PL_alpha', None): ['vid_a1', 'vid_a2']}) == 1
+    assert links(conn) == [('PL_alpha', 1), ('PL_alpha', 2), ('PL_alpha', 4)]
+
+    assert PlaylistLinker.bulk_link(cursor, {('PL_alpha', 1): ['vid_a1', 'vid_shared']}, replace=True) == 2
+    assert links(conn) == [('PL_alpha', 1), ('PL_alpha', 3)]
+    assert PlaylistLinker.bulk_link(cursor, {}) == 0
+
+
+def test_invalid_link_key():
+    with pytest.raises(ValueError):
+        PlaylistLinker(link_key='name')
@@ -0,0 +1,88 @@
+"""
+Watermark des uploads : il n'avance que si toutes les pages de la playlist
+et tous les lots de détails ont été lus
+"""
+
+import sqlite3
+
+import pytest
+
+from yt_channel_analyzer.database.base import DatabaseSchema
+from yt_channel_analyzer.refresh_watermarks import (
+    ChannelChangeDetector, ChannelDelta, ChannelWatermark, WatermarkStore, commit_watermark
+)
+
+PAGES = {
+    None: {'etag': 'etag-2', 'pageInfo': {'totalResults': 4}, 'nextPageToken': 'p2', 'items': [
+        {'contentDetails': {'videoId': 'v4', 'videoPublishedAt': '2025-03-04T00:00:00Z'}},
+        {'contentDetails': {'videoId': 'v3', 'videoPublishedAt': '2025-03-03T00:00:00Z'}},
+    ]},
+    'p2': {'etag': 'etag-2', 'pageInfo': {'totalResults': 4}, 'items': [
+        {'contentDetails': {'videoId': 'v2', 'videoPublishedAt': '2025-03-02T00:00:00Z'}},
+        {'contentDetails': {'videoId': 'v1', 'videoPublishedAt': '2025-01-01T00:00:00Z'}},
+    ]},
+}
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    DatabaseSchema.update_database_schema(conn)
+    yield conn
+    conn.close()
+
+
+def make_delta():
+    watermark = ChannelWatermark(
+        1, 'UC_alpha', uploads_playlist_id='UU_alpha', uploads_etag='etag-1', uploads_item_count=1,
+        channel_video_count=1, latest_published_at='2025-02-01T00:00:00Z', checked_at='2025-02-01 00:00:00'
+    )
+    return ChannelDelta(1, 'Alpha', 'UC_alpha', watermark, video_count=4, scan_uploads=True)
+
+
+def api_get(failing=()):
+    def get(endpoint, params):
+        if endpoint == 'playlistItems':
+            token = params.get('pageToken')
+            return None if token in failing else PAGES[token]
+        if 'videos' in failing:
+            return None
+        return {'items': [{'id': video_id, 'snippet': {}, 'statistics': {}, 'contentDetails': {}}
+                          for video_id in params['id'].split(',')]}
+    return get
+
+
+def commit(conn, delta):
+    commit_watermark(conn.cursor(), delta)
+    return WatermarkStore.load_all(conn)[1]
+
+
+def test_complete_scan_advances_watermark(conn):
+    delta = make_delta()
+    detector = ChannelChangeDetector(api_get())
+    new_ids = detector.fetch_new_uploads(delta, set())
+    assert new_ids == ['v4', 'v3', 'v2']
+    detector.fetch_video_details(new_ids, delta)
+
+    watermark = commit(conn, delta)
+    assert delta.uploads_complete
+    assert watermark.uploads_etag == 'etag-2'
+    assert watermark.latest_published_at == '2025-03-04T00:00:00Z'
+    assert watermark.channel_video_count == 4
+
+
+@pytest.mark.parametrize('failing', [('p2',), ('videos',)])
+def test_partial_scan_keeps_previous_watermark(conn, failing):
+    delta = make_delta()
+    detector = ChannelChangeDetector(api_get(failing))
+    new_ids = detector.fetch_new_uploads(delta, set())
+    detector.fetch_video_details(new_ids, delta)
+
+    # Ni la page 1 ni la vidéo la plus récente ne doivent faire avancer le watermark
+    assert delta.watermark.uploads_etag == 'etag-1'
+    watermark = commit(conn, delta)
+    assert not delta.uploads_complete
+    assert watermark.uploads_etag == 'etag-1'
+    assert watermark.latest_published_at == '2025-02-01T00:00:00Z'
+    assert watermark.checked_at == '2025-02-01 00:00:00'
+    assert watermark.channel_video_count == 1
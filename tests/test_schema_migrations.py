@@ -0,0 +1,69 @@
+"""
+Migrations lourdes du schéma : hors du chemin de chaque connexion,
+appliquées une seule fois par base (PRAGMA user_version)
+"""
+
+import sqlite3
+
+import pytest
+
+from yt_channel_analyzer.database.base import SCHEMA_VERSION, DatabaseSchema
+from yt_channel_analyzer.search_index import fts5_available
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'database.db'))
+    conn.executescript('''
+        CREATE TABLE concurrent (id INTEGER PRIMARY KEY, name TEXT, description TEXT, channel_id TEXT, country TEXT);
+        CREATE TABLE video (id INTEGER PRIMARY KEY, concurrent_id INTEGER, video_id TEXT, title TEXT, description TEXT,
+                            category TEXT, published_at TEXT, view_count INTEGER);
+        CREATE TABLE playlist (id INTEGER PRIMARY KEY, concurrent_id INTEGER, playlist_id TEXT, name TEXT,
+                               description TEXT);
+        INSERT INTO concurrent (id, name, description) VALUES (1, 'Center Parcs', 'Cottages en forêt');
+    ''')
+    yield conn
+    conn.close()
+
+
+def tables(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'index')")}
+
+
+@pytest.mark.skipif(not fts5_available(sqlite3.connect(':memory:')), reason='SQLite sans FTS5')
+def test_fts_index_is_created_by_migration_only(conn):
+    DatabaseSchema.update_database_schema(conn)
+    assert 'concurrent_fts' not in tables(conn)
+
+    created = DatabaseSchema.run_migrations(conn)
+    assert {'concurrent_fts', 'video_fts', 'playlist_fts'} <= set(created)
+    assert conn.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION
+    assert conn.execute("SELECT rowid FROM concurrent_fts WHERE concurrent_fts MATCH 'forêt'").fetchall() == [(1,)]
+
+
+def test_performance_indexes_are_created_by_migration_only(conn):
+    DatabaseSchema.update_database_schema(conn)
+    assert 'idx_video_concurrent_id' not in tables(conn)
+
+    created = DatabaseSchema.run_migrations(conn)
+    assert {'idx_video_concurrent_id', 'idx_concurrent_country', 'idx_playlist_playlist_id'} <= set(created)
+    assert 'idx_video_concurrent_id' in tables(conn)
+
+
+def test_migrations_run_once(conn):
+    DatabaseSchema.run_migrations(conn)
+    conn.execute('DROP TABLE IF EXISTS concurrent_fts')
+    conn.execute('DROP INDEX idx_video_concurrent_id')
+
+    assert DatabaseSchema.run_migrations(conn) == []
+    assert 'concurrent_fts' not in tables(conn)
+    assert 'idx_video_concurrent_id' not in tables(conn)
+    if fts5_available(conn):
+        assert 'concurrent_fts' in DatabaseSchema.run_migrations(conn, force=True)
+
+
+def test_migration_waits_for_tables(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'empty.db'))
+    assert DatabaseSchema.run_migrations(conn) == []
+    assert conn.execute('PRAGMA user_version').fetchone()[0] == 0
+    conn.close()
@@ -0,0 +1,152 @@
+"""
+Index de similarité : mise à jour incrémentale, exclusion du concurrent
+et rechargement d'une nouvelle version sans bloquer les requêtes
+"""
+
+import sqlite3
+import threading
+import zlib
+
+import numpy as np
+import pytest
+
+from yt_channel_analyzer import similarity_service as similarity, vector_index
+from yt_channel_analyzer.similarity_service import SimilarityService
+
+DIM = 32
+
+VIDEOS = [
+    # (id, concurrent_id, titre)
+    (1, 1, 'piscine tropicale cottage'),
+    (2, 1, 'piscine tropicale toboggan'),
+    (3, 1, 'cottage forêt vélo'),
+    (4, 2, 'piscine tropicale vagues'),
+    (5, 2, 'piscine toboggan vagues'),
+    (6, 3, 'ski montagne neige'),
+]
+
+
+class Encoder:
+    """Sac de mots haché : textes partageant des mots => vecteurs proches"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return np.stack([self.vector(text) for text in texts])
+
+    @staticmethod
+    def vector(text):
+        vector = np.zeros(DIM, dtype=np.float32)
+        for word in text.lower().split():
+            vector[zlib.crc32(word.encode('utf-8')) % DIM] += 1.0
+        return vector
+
+
+@pytest.fixture(autouse=True)
+def exact_backend(monkeypatch):
+    monkeypatch.setattr(vector_index, 'HNSWLIB_AVAILABLE', False)
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / 'database.db'
+    conn = sqlite3.connect(str(path))
+    conn.execute('CREATE TABLE video (id INTEGER PRIMARY KEY, concurrent_id INTEGER, title TEXT, description TEXT)')
+    conn.executemany('INSERT INTO video (id, concurrent_id, title, description) VALUES (?, ?, ?, NULL)', VIDEOS)
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(similarity, 'get_db_connection', lambda update_schema=True: sqlite3.connect(str(path)))
+    return path
+
+
+@pytest.fixture
+def encoder():
+    return Encoder()
+
+
+@pytest.fixture
+def service(tmp_path, db_path, encoder):
+    service = SimilarityService(index_dir=tmp_path / 'index', model_name='test-model', encoder=encoder)
+    service.update()
+    return service
+
+
+def centroid(titles):
+    vectors = np.stack([Encoder.vector(title) for title in titles])
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    mean = vectors.mean(axis=0)
+    return mean / np.linalg.norm(mean)
+
+
+def test_incremental_update_encodes_only_changes(service, encoder, db_path):
+    assert len(encoder.calls[0]) == len(VIDEOS)
+    first_version = service.version
+
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("UPDATE video SET title = 'cottage forêt lac' WHERE id = 3")
+    conn.execute('DELETE FROM video WHERE id = 2')
+    conn.commit()
+    conn.close()
+
+    result = service.update()
+    assert encoder.calls[-1] == ['cottage forêt lac']
+    assert (result['encoded'], result['removed'], result['competitors_updated']) == (1, 1, 1)
+    assert service.version != first_version
+    assert 2 not in service.videos and 2 not in service.owners
+    np.testing.assert_allclose(service.competitors.get_vectors([1])[0],
+                               centroid(['piscine tropicale cottage', 'cottage forêt lac']), atol=1e-6)
+
+    # Rien de modifié : aucun encodage, aucune nouvelle version
+    assert service.update()['encoded'] == 0
+    assert len(encoder.calls) == 2
+
+
+def test_similar_videos_excludes_own_competitor(service):
+    hits = service.similar_videos(1, k=3)
+    assert [video_id for video_id, _ in hits][:2] == [4, 5]
+    assert all(service.owners[video_id] != 1 for video_id, _ in hits)
+    assert len(hits) == 3
+
+    same = [video_id for video_id, _ in service.similar_videos(1, k=2, other_competitors=False)]
+    assert same[0] == 2
+    with pytest.raises(KeyError):
+        service.similar_videos(99)
+
+
+def test_similar_competitors_uses_centroids(service):
+    assert service.similar_competitors(1, k=1)[0][0] == 2
+
+
+def test_reload_happens_off_the_request_thread(service, tmp_path, encoder, db_path, monkeypatch):
+    reader = SimilarityService(index_dir=tmp_path / 'index', model_name='test-model', encoder=encoder)
+    reader._ensure_loaded(force=True)
+    old_version = reader.version
+
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("INSERT INTO video (id, concurrent_id, title) VALUES (7, 3, 'ski station neige')")
+    conn.commit()
+    conn.close()
+    service.update()
+
+    release = threading.Event()
+    load_state = reader._load_state
+
+    def slow_load_state(version):
+        release.wait(5)
+        return load_state(version)
+
+    monkeypatch.setattr(reader, '_load_state', slow_load_state)
+    reader._checked_at = float('-inf')
+
+    # La requête déclenche le rechargement mais répond avec la version encore servie
+    assert reader.similar_videos(6, k=1, other_competitors=False)[0][0] != 7
+    assert reader.version == old_version and reader.loading()
+
+    release.set()
+    for thread in threading.enumerate():
+        if thread.name == 'similarity-reload':
+            thread.join(5)
+    assert reader.version == service.version
+    assert reader.similar_videos(6, k=1, other_competitors=False)[0][0] == 7
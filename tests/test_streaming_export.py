@@ -0,0 +1,50 @@
+"""
+Export en flux des concurrents : colonnes réelles de la table concurrent
+et schéma Parquet issu des types déclarés
+"""
+
+import gzip
+import io
+import json
+import sqlite3
+
+import pytest
+
+from yt_channel_analyzer import streaming_export
+from yt_channel_analyzer.streaming_export import export_stream
+
+
+@pytest.fixture(autouse=True)
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / 'database.db'
+    conn = sqlite3.connect(str(path))
+    conn.executescript('''
+        CREATE TABLE concurrent (id INTEGER PRIMARY KEY, name TEXT, channel_id TEXT, channel_url TEXT,
+                                 subscriber_count INTEGER, country TEXT,
+                                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                                 last_updated DATETIME DEFAULT CURRENT_TIMESTAMP);
+        INSERT INTO concurrent (id, name, channel_id, channel_url, subscriber_count, country) VALUES
+            (1, 'Center Parcs', 'UC_cp', 'https://www.youtube.com/@centerparcs', 25000, 'FR'),
+            (2, 'Belambra', 'UC_be', 'https://www.youtube.com/@belambra', NULL, 'FR');
+    ''')
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(streaming_export, 'get_db_connection', lambda update_schema=True: sqlite3.connect(str(path)))
+    return path
+
+
+def test_competitors_ndjson():
+    data = gzip.decompress(b''.join(export_stream('competitors', 'ndjson', compress=True)))
+    rows = [json.loads(line) for line in data.decode('utf-8').splitlines()]
+
+    assert [(row['name'], row['subscriber_count']) for row in rows] == [('Belambra', None), ('Center Parcs', 25000)]
+
+
+def test_competitors_parquet_uses_declared_types():
+    pq = pytest.importorskip('pyarrow.parquet')
+    table = pq.read_table(io.BytesIO(b''.join(export_stream('competitors', 'parquet'))))
+
+    declared = dict(streaming_export.EXPORT_SOURCES['competitors'].columns)
+    assert table.column_names == list(declared)
+    assert str(table.schema.field('subscriber_count').type) == 'int64'
+    assert table.column('subscriber_count').to_pylist() == [None, 25000]
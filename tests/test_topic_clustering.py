@@ -0,0 +1,88 @@
+"""
+Clustering de topics sur des embeddings synthétiques, avec l'index exact numpy
+(aucune dépendance ANN requise)
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('sklearn')
+
+from yt_channel_analyzer import topic_clustering, vector_index
+from yt_channel_analyzer.topic_clustering import TopicClusteringEngine
+
+CENTERS = 3
+PER_CENTER = 35
+
+
+@pytest.fixture(autouse=True)
+def exact_backend(monkeypatch):
+    monkeypatch.setattr(vector_index, 'HNSWLIB_AVAILABLE', False)
+
+
+@pytest.fixture
+def embeddings():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(scale=10.0, size=(CENTERS, 16))
+    points = np.concatenate([center + rng.normal(scale=0.5, size=(PER_CENTER, 16)) for center in centers])
+    return points.astype(np.float32)
+
+
+@pytest.fixture
+def engine(embeddings):
+    engine = TopicClusteringEngine(n_clusters=CENTERS, n_components=8, chunk_size=50)
+    engine.fit(embeddings, keys=[f"vid{i}" for i in range(len(embeddings))])
+    return engine
+
+
+def groups(labels):
+    return [set(labels[i * PER_CENTER:(i + 1) * PER_CENTER].tolist()) for i in range(CENTERS)]
+
+
+def test_fit_separates_clusters_with_exact_index(engine):
+    assert engine.index.backend == 'exact'
+    per_group = groups(engine.labels)
+    assert all(len(labels) == 1 for labels in per_group)
+    assert len(set.union(*per_group)) == CENTERS
+
+
+def test_partial_fit_merges_short_remainder(embeddings, monkeypatch):
+    batches = []
+    partial_fit = topic_clustering.IncrementalPCA.partial_fit
+
+    def recording_partial_fit(self, X, *args, **kwargs):
+        batches.append(len(X))
+        return partial_fit(self, X, *args, **kwargs)
+
+    monkeypatch.setattr(topic_clustering.IncrementalPCA, 'partial_fit', recording_partial_fit)
+    # 105 lignes par lots de 50 : le reste de 5 (< 8 composantes) est fusionné au lot précédent
+    TopicClusteringEngine(n_clusters=CENTERS, n_components=8, chunk_size=50).fit(embeddings)
+    assert batches == [50, 55]
+
+
+def test_assign_uses_frozen_centroids(engine, embeddings):
+    labels, novel = engine.assign(embeddings[[0, PER_CENTER]] + 0.01, keys=['new0', 'new1'])
+    assert labels.tolist() == [engine.label_of('vid0'), engine.label_of(f"vid{PER_CENTER}")]
+    assert novel == 0
+    assert engine.label_of('new1') == labels[1]
+    assert 'new0' in [key for key, _ in engine.similar('vid0', k=3)]
+
+
+def test_representatives_stay_in_cluster(engine):
+    cluster_id = engine.label_of('vid0')
+    representatives = engine.representatives(cluster_id, k=5)
+    assert len(representatives) == 5
+    assert all(engine.label_of(key) == cluster_id for key in representatives)
+    assert engine.representatives(CENTERS + 1) == []
+
+
+def test_save_and_load_round_trip(engine, embeddings, tmp_path):
+    engine.save(tmp_path / 'model')
+    loaded = TopicClusteringEngine.load(tmp_path / 'model')
+
+    assert loaded.index.backend == 'exact'
+    assert loaded.keys == engine.keys
+    np.testing.assert_array_equal(loaded.labels, engine.labels)
+    assert loaded.similar('vid3', k=4) == engine.similar('vid3', k=4)
+    labels, _ = loaded.assign(embeddings[:1], keys=['vid0'])
+    assert labels[0] == engine.label_of('vid0')
@@ -0,0 +1,39 @@
+"""
+Index de plus proches voisins : filtrage pendant la recherche et requêtes
+qui demandent presque tous les éléments restants après suppressions
+"""
+
+import numpy as np
+import pytest
+
+from yt_channel_analyzer.vector_index import HNSWLIB_AVAILABLE, VectorIndex
+
+BACKENDS = ['exact', pytest.param('hnsw', marks=pytest.mark.skipif(not HNSWLIB_AVAILABLE, reason='hnswlib absent'))]
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(0).normal(size=(200, 8)).astype(np.float32)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_filter_returns_k_hits_without_oversampling(backend, vectors):
+    index = VectorIndex(8, backend=backend)
+    index.add(np.arange(200), vectors)
+
+    hits = index.query(vectors[0], k=10, exclude=[0], allowed=lambda i: i % 4 == 0)[0]
+    assert len(hits) == 10
+    assert all(i % 4 == 0 and i != 0 for i, _ in hits)
+    assert [d for _, d in hits] == sorted(d for _, d in hits)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_query_after_deletions_returns_what_is_left(backend, vectors):
+    index = VectorIndex(8, backend=backend)
+    index.add(np.arange(200), vectors)
+    index.remove(range(190))
+
+    # Moins de candidats admis que k : résultat partiel au lieu d'une erreur « contiguous 2D array »
+    results = index.query(vectors[:3], k=10, exclude=[195], allowed=lambda i: i % 2 == 0)
+    assert [len(hits) for hits in results] == [5, 5, 5]
+    assert {i for i, _ in results[0]} == {190, 192, 194, 196, 198}
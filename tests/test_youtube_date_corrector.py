@@ -0,0 +1,123 @@
+"""
+Correction des dates en mode bulk : cache permanent des dates YouTube,
+lots réservés dans le registre de quota, UPDATE ensembliste et rollback
+"""
+
+import io
+import json
+import sqlite3
+import urllib.parse
+
+import pytest
+
+from yt_channel_analyzer.database import youtube_date_corrector as corrector
+from yt_channel_analyzer.database.youtube_date_corrector import YouTubeDateCorrectionAgent
+from yt_channel_analyzer.youtube_api_client import QuotaLedger
+
+YOUTUBE_DATES = {
+    'vid_a1': '2023-04-01T08:00:00Z',
+    'vid_a2': '2023-05-02T09:30:00Z',
+}
+
+
+class FakeUrlopen:
+    """videos.list : renvoie publishedAt pour les vidéos connues"""
+
+    def __init__(self):
+        self.requested = []
+
+    def __call__(self, url, timeout=None):
+        ids = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)['id'][0].split(',')
+        self.requested.append(ids)
+        items = [{'id': video_id, 'snippet': {'publishedAt': YOUTUBE_DATES[video_id]}}
+                 for video_id in ids if video_id in YOUTUBE_DATES]
+        return io.BytesIO(json.dumps({'items': items}).encode('utf-8'))
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / 'database.db'
+    conn = sqlite3.connect(str(path))
+    conn.executescript('''
+        CREATE TABLE video (id INTEGER PRIMARY KEY, concurrent_id INTEGER, video_id TEXT, title TEXT,
+                            published_at DATETIME, youtube_published_at DATETIME, last_updated DATETIME);
+        INSERT INTO video (id, concurrent_id, video_id, title, published_at) VALUES
+            (1, 1, 'vid_a1', 'Cottage', '2025-07-05 00:00:00'),
+            (2, 1, 'vid_a2', 'Toboggan', '2025-07-05 00:00:00'),
+            (3, 1, 'vid_gone', 'Supprimée', '2025-07-05 00:00:00'),
+            (4, 2, 'vid_b1', 'Spa', '2025-07-05 00:00:00');
+    ''')
+    conn.commit()
+    conn.close()
+
+    def connect(update_schema=True):
+        conn = sqlite3.connect(str(path))
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    monkeypatch.setattr(corrector, 'get_db_connection', connect)
+    return path
+
+
+@pytest.fixture
+def urlopen(monkeypatch):
+    fake = FakeUrlopen()
+    monkeypatch.setattr(corrector.urllib.request, 'urlopen', fake)
+    return fake
+
+
+def make_agent(tmp_path, daily_limit=100):
+    ledger = QuotaLedger(quota_file=str(tmp_path / 'quota.json'), daily_limit=daily_limit)
+    return YouTubeDateCorrectionAgent(youtube_api_key='key', dry_run=False, quota_ledger=ledger)
+
+
+def dates(db_path):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return dict(conn.execute('SELECT id, published_at FROM video').fetchall())
+    finally:
+        conn.close()
+
+
+def test_bulk_corrections_are_applied_and_rolled_back(tmp_path, db_path, urlopen):
+    agent = make_agent(tmp_path)
+    results = agent.apply_corrections_bulk([1], confirm=True)
+
+    assert urlopen.requested == [['vid_a1', 'vid_a2', 'vid_gone']]
+    assert [(r.video_id, r.new_date, r.success) for r in results] == [
+        ('vid_a1', '2023-04-01 08:00:00', True),
+        ('vid_a2', '2023-05-02 09:30:00', True),
+        ('vid_gone', None, False),
+    ]
+    assert dates(db_path) == {1: '2023-04-01 08:00:00', 2: '2023-05-02 09:30:00',
+                              3: '2025-07-05 00:00:00', 4: '2025-07-05 00:00:00'}
+
+    # Snapshot limité aux lignes modifiées
+    conn = sqlite3.connect(str(db_path))
+    backup = conn.execute(f'SELECT id, published_at FROM {agent.backup_table_name} ORDER BY id').fetchall()
+    conn.close()
+    assert backup == [(1, '2025-07-05 00:00:00'), (2, '2025-07-05 00:00:00')]
+
+    assert agent.rollback()
+    assert set(dates(db_path).values()) == {'2025-07-05 00:00:00'}
+
+
+def test_known_dates_come_from_cache(tmp_path, db_path, urlopen):
+    make_agent(tmp_path).apply_corrections_bulk([1], confirm=False)
+    assert set(dates(db_path).values()) == {'2025-07-05 00:00:00'}
+
+    agent = make_agent(tmp_path)
+    results = agent.apply_corrections_bulk([1, 2], confirm=False)
+    # Seules les vidéos sans date en cache sont redemandées
+    assert urlopen.requested[1] == ['vid_gone', 'vid_b1']
+    assert sum(r.success for r in results) == 2
+    assert agent.quota_ledger.remaining() == 98
+
+
+def test_batches_beyond_quota_are_skipped(tmp_path, db_path, urlopen):
+    results = make_agent(tmp_path, daily_limit=0).apply_corrections_bulk([1], confirm=True)
+
+    assert urlopen.requested == []
+    assert not any(r.success for r in results)
+    assert set(dates(db_path).values()) == {'2025-07-05 00:00:00'}
@@ -0,0 +1,186 @@
+"""
+Extraction ytInitialData / ytInitialPlayerResponse sur des pages YouTube sauvegardées
+(page vidéo, accueil de chaîne, onglet /videos)
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from yt_channel_analyzer import yt_initial_data
+from yt_channel_analyzer.yt_initial_data import (
+    INITIAL_DATA, PLAYER_RESPONSE, extract_channel_page, extract_video_fields, find_blobs,
+    parse_saved_pages, to_video_data
+)
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'yt_initial_data'
+
+
+def load(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding='utf-8')
+
+
+# --- find_blobs ---
+
+def test_find_blobs_watch_page():
+    blobs = find_blobs(load('watch.html'))
+    assert set(blobs) == {INITIAL_DATA, PLAYER_RESPONSE}
+    assert blobs[PLAYER_RESPONSE]['videoDetails']['videoId'] == 'dQw4w9WgXcQ'
+    assert 'twoColumnWatchNextResults' in blobs[INITIAL_DATA]['contents']
+
+
+def test_find_blobs_script_end_inside_string():
+    # ';</script>' dans la description : le blob ne doit pas être coupé à cet endroit
+    blobs = find_blobs(load('watch.html'), (PLAYER_RESPONSE,))
+    assert blobs[PLAYER_RESPONSE]['videoDetails']['shortDescription'] == \
+        'Réservez maintenant ;</script> et </script> restent du texte.'
+
+
+def test_find_blobs_player_response_followed_by_var():
+    html = ('<script>var ytInitialPlayerResponse = {"videoDetails": {"videoId": "abc"}};'
+            'var meta = document.createElement(\'meta\');</script>')
+    assert find_blobs(html) == {PLAYER_RESPONSE: {'videoDetails': {'videoId': 'abc'}}}
+
+
+def test_find_blobs_window_assignment_and_null_blob():
+    blobs = find_blobs(load('videos_tab.html'))
+    # window["ytInitialPlayerResponse"] = null n'est pas un objet : ignoré
+    assert list(blobs) == [INITIAL_DATA]
+    assert blobs[INITIAL_DATA]['metadata']['channelMetadataRenderer']['externalId'] == 'UC_test_channel'
+
+
+def test_find_blobs_only_requested_names():
+    assert list(find_blobs(load('watch.html'), (INITIAL_DATA,))) == [INITIAL_DATA]
+
+
+def test_find_blobs_invalid_json_skipped():
+    assert find_blobs('<script>var ytInitialData = {"a": ;</script>') == {}
+    assert find_blobs('<html><body>Aucune donnée</body></html>') == {}
+
+
+# --- Pages vidéo ---
+
+def test_extract_video_fields():
+    fields = extract_video_fields(load('watch.html'))
+    assert fields['video_id'] == 'dQw4w9WgXcQ'
+    assert fields['title'] == 'Séjour au bord du lac'
+    assert fields['view_count'] == 123456
+    assert fields['duration_seconds'] == 754
+    assert fields['channel_name'] == 'Parc Test'
+    assert fields['channel_id'] == 'UC_test_channel'
+    assert fields['published_at'] == '2024-05-17T08:00:00-07:00'
+    assert fields['category'] == 'Travel & Events'
+    assert fields['keywords'] == ['lac', 'vacances']
+    assert fields['is_live'] is False
+    assert fields['thumbnail_url'] == 'https://i.ytimg.com/vi/dQw4w9WgXcQ/maxresdefault.jpg'
+    # ytInitialData : nombre exact de likes depuis le libellé d'accessibilité
+    assert fields['like_count'] == 4321
+    assert fields['like_text'] == '4,3 k'
+    assert fields['date_text'] == '17 mai 2024'
+    assert fields['view_text'] == '123 456 vues'
+    assert fields['subscriber_text'] == '12,5 k abonnés'
+
+
+def test_extract_video_fields_microformat_fallback():
+    player = {'microformat': {'playerMicroformatRenderer': {
+        'title': {'simpleText': 'Titre microformat'}, 'viewCount': '42', 'uploadDate': '2024-01-02',
+        'ownerChannelName': 'Chaîne', 'lengthSeconds': '61'}}}
+    fields = extract_video_fields(f'<script>var ytInitialPlayerResponse = {json.dumps(player)};</script>')
+    assert fields['title'] == 'Titre microformat'
+    assert fields['view_count'] == 42
+    assert fields['duration_seconds'] == 61
+    assert fields['published_at'] == '2024-01-02'
+    assert fields['like_count'] is None
+
+
+def test_extract_video_fields_unknown_page():
+    fields = extract_video_fields('<html><body>Consentement</body></html>')
+    assert fields['title'] is None
+    assert fields['keywords'] is None
+
+
+def test_to_video_data():
+    url = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=10s'
+    data = to_video_data(url, extract_video_fields(load('watch.html')))
+    assert data == {
+        'url': url,
+        'title': 'Séjour au bord du lac',
+        'likes': '4321',
+        'views': '123456',
+        'publication_date': '2024-05-17T08:00:00-07:00',
+        'channel': {'name': 'Parc Test', 'url': ''},
+        'thumbnail': 'https://img.youtube.com/vi/dQw4w9WgXcQ/mqdefault.jpg',
+        'description': 'Réservez maintenant ;</script> et </script> restent du texte.',
+        'duration_seconds': 754,
+        'tags': ['lac', 'vacances'],
+        'category': 'Travel & Events',
+    }
+
+
+def test_to_video_data_text_fallbacks():
+    url = 'https://www.youtube.com/watch?v=xyz123&list=PL1'
+    data = to_video_data(url, {'like_text': '1,2 k', 'view_text': '3 400 vues', 'date_text': '2 janv. 2024'})
+    assert data['likes'] == '1,2 k'
+    assert data['views'] == '3 400 vues'
+    assert data['publication_date'] == '2 janv. 2024'
+    assert data['thumbnail'] == 'https://img.youtube.com/vi/xyz123/mqdefault.jpg'
+    assert data['title'] == '' and data['tags'] == []
+
+
+# --- Pages de chaîne ---
+
+def test_extract_channel_page_videos_tab():
+    fields = extract_channel_page(load('videos_tab.html'))
+    assert fields['channel_name'] == 'Parc Test'
+    assert fields['channel_id'] == 'UC_test_channel'
+    # Ordre de la grille, doublons retirés, lockupViewModel inclus
+    assert fields['video_ids'] == ['vid00000001', 'vid00000002', 'vid00000003']
+    assert fields['video_count'] == 1234
+    assert fields['videos'][1] == {
+        'video_id': 'vid00000002',
+        'title': 'Nouveaux cottages',
+        'views': '2,1 k vues',
+        'published_text': 'il y a 1 semaine',
+        'duration': '12:04',
+    }
+
+
+def test_extract_channel_page_legacy_header():
+    fields = extract_channel_page(load('channel.html'))
+    assert fields['channel_name'] == 'Parc Test'
+    assert fields['video_count'] == 87
+    assert fields['video_ids'] == []
+    assert fields['videos'] == []
+
+
+def test_parse_saved_pages_detects_page_type():
+    paths = [FIXTURES / 'watch.html', FIXTURES / 'videos_tab.html']
+    results = dict(parse_saved_pages(paths, max_workers=1))
+    assert results[str(paths[0])]['video_id'] == 'dQw4w9WgXcQ'
+    assert results[str(paths[1])]['video_ids'][0] == 'vid00000001'
+
+
+# --- Décodage orjson / json ---
+
+def test_json_fallback_without_orjson(monkeypatch):
+    monkeypatch.setattr(yt_initial_data, 'orjson', None)
+    calls = []
+    real_loads = json.loads
+
+    def recording_loads(text, *args, **kwargs):
+        calls.append(text[:20])
+        return real_loads(text, *args, **kwargs)
+
+    monkeypatch.setattr(yt_initial_data.json, 'loads', recording_loads)
+    fields = extract_video_fields(load('watch.html'))
+    assert fields['video_id'] == 'dQw4w9WgXcQ'
+    assert calls
+
+
+def test_orjson_used_when_available(monkeypatch):
+    orjson = pytest.importorskip('orjson')
+    monkeypatch.setattr(yt_initial_data, 'orjson', orjson)
+    expected = find_blobs(load('watch.html'))
+    monkeypatch.setattr(yt_initial_data, 'orjson', None)
+    assert find_blobs(load('watch.html')) == expected
@@ -9,30 +9,70 @@ Séquence complète :
 3. Classification intelligente + propagation
 4. Recalcul complet des métriques
 5. Stockage en base + force refresh
+
+Mode incrémental (--incremental ou REFRESH_MODE=incremental) :
+- Chaînes inchangées depuis leur watermark ignorées (1 unité de quota pour 50 chaînes)
+- Seules les nouvelles vidéos et les stats des vidéos récentes sont récupérées
+
+Exécution en pipeline :
+- Phase 1 (réseau) en parallèle sur les concurrents, pool borné + budget quota partagé
+- Phases 2 et 3 démarrent pour un concurrent dès que sa phase 1 est terminée
+- Toutes les écritures passent par un unique thread écrivain SQLite
 """
 import sys
 import os
 import requests
 import json
 import time
+import queue
 import sqlite3
+import threading
 import re
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from collections import defaultdict
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 # Charger les variables d'environnement
 load_dotenv()
 
 sys.path.append(str(Path(__file__).parent))
 
+from yt_channel_analyzer.anomaly_engine import AnomalyEngine
 from yt_channel_analyzer.database import get_db_connection
+from yt_channel_analyzer.playlist_linker import PlaylistLinker, fetch_playlist_video_ids
+from yt_channel_analyzer.refresh_watermarks import (
+    ChannelChangeDetector, WatermarkStore, apply_statistics, commit_watermark,
+    incremental_mode_requested, insert_new_videos, known_video_ids, videos_due_for_stats
+)
 from services.competitor_service import CompetitorAdvancedMetricsService
 
+PHASES = ('phase1', 'phase2', 'phase3')
+
+# Types du moteur d'anomalies → actions journalisées (consommées par apply_intelligent_anomaly_fixes)
+ANOMALY_ACTIONS = {
+    'NO_VIDEOS': 'ANOMALY_CRITICAL',
+    'UNCATEGORIZED_VIDEOS': 'ANOMALY_UNCATEGORIZED',
+    'ZERO_HERO': 'ANOMALY_ZERO_HERO',
+    'ZERO_HELP': 'ANOMALY_ZERO_HELP',
+    'TOO_MUCH_HUB': 'ANOMALY_HUB_MONOPOLY',
+    'INVALID_DURATIONS': 'ANOMALY_NO_DURATION',
+    'EXTREMELY_LONG_VIDEOS': 'ANOMALY_VERY_LONG',
+    'EXTREMELY_SHORT_VIDEOS': 'ANOMALY_VERY_SHORT',
+    'NO_DURATION_DATA': 'ANOMALY_NO_DURATION_DATA',
+    'CORRUPTED_DATES': 'ANOMALY_CORRUPT_DATES',
+    'DATE_UNIFORMITY': 'ANOMALY_DATE_UNIFORMITY',
+    'NO_PLAYLISTS': 'ANOMALY_NO_PLAYLISTS',
+    'LOW_ENGAGEMENT': 'ANOMALY_LOW_ENGAGEMENT',
+    'SUSPICIOUSLY_HIGH_ENGAGEMENT': 'ANOMALY_HIGH_ENGAGEMENT',
+}
+
 class UltimateRefreshProgress:
-    """Gestionnaire de progression ultra-détaillé"""
+    """Gestionnaire de progression ultra-détaillé (thread-safe, timings par concurrent et par phase)"""
     
     def __init__(self):
         self.status_file = "/tmp/ultimate_refresh_status.json"
@@ -42,6 +82,7 @@ class UltimateRefreshProgress:
         self.current_message = ""
         self.is_running = False
         self.error = None
+        self.started_at = None
         self.stats = {
             'competitors_processed': 0,
             'playlists_imported': 0,
@@ -50,18 +91,28 @@ class UltimateRefreshProgress:
             'durations_fixed': 0,
             'classifications_applied': 0,
             'metrics_recalculated': 0,
-            'cache_cleared': 0
+            'cache_cleared': 0,
+            'api_units_used': 0,
+            'videos_imported': 0,
+            'stats_refreshed': 0,
+            'channels_unchanged': 0,
+            'competitors_flagged': 0
         }
+        self.timings = defaultdict(dict)  # {concurrent: {phase: secondes}}
         self.detailed_log = []
+        self._lock = threading.RLock()
         
     def start(self, total_steps):
         """Démarrer le processus ultimate"""
-        self.total_steps = total_steps
-        self.current_step = 0
-        self.is_running = True
-        self.error = None
-        self.stats = {key: 0 for key in self.stats}
-        self.detailed_log = []
+        with self._lock:
+            self.total_steps = total_steps
+            self.current_step = 0
+            self.is_running = True
+            self.error = None
+            self.started_at = time.time()
+            self.stats = {key: 0 for key in self.stats}
+            self.timings = defaultdict(dict)
+            self.detailed_log = []
         self.update_status("🚀 ULTIMATE REFRESH DÉMARRÉ - Protection Humaine Activée")
         
     def log_action(self, competitor_name, action, details):
@@ -72,31 +123,65 @@ class UltimateRefreshProgress:
             'action': action,
             'details': details
         }
-        self.detailed_log.append(entry)
+        with self._lock:
+            self.detailed_log.append(entry)
+    
+    def competitor_log(self, competitor_name) -> List[Dict]:
+        """Copie des entrées du log pour un concurrent"""
+        with self._lock:
+            return [entry for entry in self.detailed_log if entry['competitor'] == competitor_name]
+    
+    def increment(self, key, amount=1):
+        """Incrémente un compteur de stats"""
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + amount
+    
+    def record_timing(self, competitor_name, phase, seconds):
+        """Enregistre la durée d'une phase pour un concurrent"""
+        with self._lock:
+            self.timings[competitor_name][phase] = round(seconds, 3)
+    
+    def phase_timings(self) -> Dict:
+        """Agrégats par phase : nombre, total, moyenne, max (secondes)"""
+        with self._lock:
+            summary = {}
+            for phase in PHASES:
+                values = [t[phase] for t in self.timings.values() if phase in t]
+                summary[phase] = {
+                    'count': len(values),
+                    'total_seconds': round(sum(values), 2),
+                    'avg_seconds': round(sum(values) / len(values), 2) if values else 0,
+                    'max_seconds': round(max(values), 2) if values else 0
+                }
+            return summary
         
     def update_status(self, message, step_increment=1):
         """Mettre à jour le statut avec logs"""
-        if step_increment:
-            self.current_step += step_increment
-        
-        self.current_message = message
-        
-        status = {
-            'is_running': self.is_running,
-            'current_step': self.current_step,
-            'total_steps': self.total_steps,
-            'progress_percent': round((self.current_step / self.total_steps * 100) if self.total_steps > 0 else 0),
-            'current_message': message,
-            'error': self.error,
-            'timestamp': time.time(),
-            'stats': self.stats
-        }
-        
-        try:
-            with open(self.status_file, 'w') as f:
-                json.dump(status, f, indent=2)
-        except:
-            pass
+        with self._lock:
+            if step_increment:
+                self.current_step += step_increment
+            
+            self.current_message = message
+            
+            status = {
+                'is_running': self.is_running,
+                'current_step': self.current_step,
+                'total_steps': self.total_steps,
+                'progress_percent': min(100, round((self.current_step / self.total_steps * 100) if self.total_steps > 0 else 0)),
+                'current_message': message,
+                'error': self.error,
+                'timestamp': time.time(),
+                'elapsed_seconds': round(time.time() - self.started_at, 1) if self.started_at else 0,
+                'stats': self.stats,
+                'phase_timings': self.phase_timings(),
+                'competitor_timings': dict(self.timings)
+            }
+            
+            try:
+                with open(self.status_file, 'w') as f:
+                    json.dump(status, f, indent=2)
+            except:
+                pass
         
         print(f"[ULTIMATE] {message}")
         
@@ -108,8 +193,10 @@ class UltimateRefreshProgress:
         # Générer rapport final
         final_report = {
             'completion_time': datetime.now().isoformat(),
-            'total_processing_time': time.time(),
+            'total_processing_time': round(time.time() - self.started_at, 1) if self.started_at else 0,
             'final_stats': self.stats,
+            'phase_timings': self.phase_timings(),
+            'competitor_timings': dict(self.timings),
             'detailed_log': self.detailed_log,
             'summary': self.generate_summary()
         }
@@ -120,7 +207,7 @@ class UltimateRefreshProgress:
         except:
             pass
             
-        summary_msg = f"""✅ ULTIMATE REFRESH TERMINÉ:
+        summary_msg = f"""✅ ULTIMATE REFRESH TERMINÉ en {final_report['total_processing_time']}s:
 🏢 {self.stats['competitors_processed']} concurrents traités
 📋 {self.stats['playlists_imported']} playlists importées
 📺 {self.stats['videos_updated']} vidéos mises à jour
@@ -128,6 +215,7 @@ class UltimateRefreshProgress:
 ⏱️ {self.stats['durations_fixed']} durées réparées
 🎯 {self.stats['classifications_applied']} classifications appliquées
 📊 {self.stats['metrics_recalculated']} métriques recalculées
+📡 {self.stats['api_units_used']} unités de quota API consommées
 🔄 Cache force-cleared partout"""
         
         self.update_status(summary_msg, 0)
@@ -144,13 +232,158 @@ class UltimateRefreshProgress:
             'total_improvements': sum(actions_by_type.values())
         }
 
+class QuotaExceeded(Exception):
+    """Budget de quota API YouTube épuisé pour ce refresh"""
+
+class QuotaBudget:
+    """Budget de quota partagé entre tous les workers réseau"""
+    
+    def __init__(self, units: int):
+        self.limit = units
+        self.used = 0
+        self._lock = threading.Lock()
+    
+    def consume(self, cost: int = 1):
+        with self._lock:
+            if self.used + cost > self.limit:
+                raise QuotaExceeded(f"Budget quota API épuisé ({self.used}/{self.limit} unités)")
+            self.used += cost
+    
+    def exhaust(self):
+        """Quota refusé par l'API : plus aucun appel pour ce refresh"""
+        with self._lock:
+            self.used = self.limit
+    
+    @property
+    def remaining(self) -> int:
+        return max(self.limit - self.used, 0)
+
+class YouTubeAPIGateway:
+    """Accès HTTP à l'API YouTube : session partagée (keep-alive) + budget de quota"""
+    
+    BASE_URL = "https://www.googleapis.com/youtube/v3/"
+    
+    def __init__(self, api_key: str, budget: QuotaBudget, max_connections: int):
+        self.api_key = api_key
+        self.budget = budget
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self.session.mount('https://', adapter)
+    
+    def get(self, endpoint: str, params: Dict, cost: int = 1) -> Optional[Dict]:
+        """GET sur l'API (1 unité par page list) ; None si la réponse n'est pas exploitable"""
+        self.budget.consume(cost)
+        response = self.session.get(self.BASE_URL + endpoint, params={**params, 'key': self.api_key}, timeout=30)
+        if response.status_code == 403 and 'quotaExceeded' in response.text:
+            self.budget.exhaust()
+            raise QuotaExceeded("Quota API YouTube dépassé (403 quotaExceeded)")
+        if response.status_code != 200:
+            return None
+        return response.json()
+    
+    def close(self):
+        self.session.close()
+
+class DatabaseWriter:
+    """Unique écrivain SQLite : chaque job reçoit un curseur et est commité sur un thread dédié"""
+    
+    POLL_INTERVAL = 1.0
+    
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._error = None  # Erreur de démarrage (connexion impossible) renvoyée à tous les appelants
+        self.jobs_written = 0
+    
+    def start(self):
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="UltimateRefreshWriter", daemon=True)
+        self._thread.start()
+    
+    def submit(self, func, *args) -> Future:
+        future = Future()
+        if self._error is not None:
+            future.set_exception(self._error)
+            return future
+        self._queue.put((future, func, args))
+        if self._error is not None:
+            # Le thread a échoué entre-temps : ne pas laisser ce job en attente
+            self._fail_pending()
+        return future
+    
+    def run(self, func, *args):
+        """Soumet un job d'écriture et attend son résultat (échoue si le thread écrivain est mort)"""
+        future = self.submit(func, *args)
+        while True:
+            try:
+                return future.result(timeout=self.POLL_INTERVAL)
+            except FuturesTimeoutError:
+                if self._thread is None or not self._thread.is_alive():
+                    if future.cancel() or not future.done():
+                        raise RuntimeError("Thread écrivain SQLite arrêté") from self._error
+    
+    def _fail_pending(self):
+        """Fait échouer les jobs restés dans la file avec l'erreur de démarrage"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None and item[0].set_running_or_notify_cancel():
+                item[0].set_exception(self._error)
+    
+    def _run(self):
+        try:
+            conn = get_db_connection()
+            conn.execute('PRAGMA busy_timeout = 30000')
+            conn.execute('PRAGMA journal_mode = WAL')
+        except BaseException as e:
+            print(f"❌ Écrivain SQLite indisponible: {e}")
+            self._error = e
+            self._fail_pending()
+            return
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                future, func, args = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    result = func(conn.cursor(), *args)
+                    conn.commit()
+                    self.jobs_written += 1
+                    future.set_result(result)
+                except BaseException as e:
+                    conn.rollback()
+                    future.set_exception(e)
+        finally:
+            conn.close()
+    
+    def stop(self):
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
 class UltimateGlobalRefreshSystem:
     """Système de rafraîchissement ULTIMATE - Tout en un"""
     
-    def __init__(self):
+    def __init__(self, network_workers: int = None, db_workers: int = None, quota_budget: int = None, incremental: bool = False):
         self.progress = UltimateRefreshProgress()
+        self.incremental = incremental
         self.api_key = self.get_youtube_api_key()
-        self.conn = None
+        self.network_workers = network_workers or int(os.getenv('ULTIMATE_REFRESH_WORKERS', 8))
+        self.db_workers = db_workers or int(os.getenv('ULTIMATE_REFRESH_DB_WORKERS', 4))
+        self.budget = QuotaBudget(quota_budget or int(os.getenv('ULTIMATE_REFRESH_QUOTA_BUDGET', 9000)))
+        self.api = YouTubeAPIGateway(self.api_key, self.budget, self.network_workers + self.db_workers)
+        self.writer = DatabaseWriter()
+        self.detector = ChannelChangeDetector(self.api.get)
+        self.linker = PlaylistLinker(self.api.get)
+        self._readers = threading.local()
+        self._reader_connections = []
+        self._readers_lock = threading.Lock()
         
     def get_youtube_api_key(self):
         """Récupérer la clé API YouTube"""
@@ -171,6 +404,27 @@ class UltimateGlobalRefreshSystem:
         
         raise ValueError("YouTube API key not found. Please set YOUTUBE_API_KEY in .env file")
     
+    def _read_connection(self) -> sqlite3.Connection:
+        """Connexion de lecture propre au thread courant (les écritures passent par self.writer)"""
+        conn = getattr(self._readers, 'conn', None)
+        if conn is None:
+            conn = get_db_connection(update_schema=False)
+            conn.execute('PRAGMA busy_timeout = 30000')
+            self._readers.conn = conn
+            with self._readers_lock:
+                self._reader_connections.append(conn)
+        return conn
+    
+    def _close_readers(self):
+        with self._readers_lock:
+            for conn in self._reader_connections:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._reader_connections = []
+        self._readers = threading.local()
+    
     def run_ultimate_refresh(self):
         """Exécuter le processus ULTIMATE complet"""
         
@@ -182,291 +436,252 @@ class UltimateGlobalRefreshSystem:
                 self.progress.error = "Clé API YouTube non trouvée"
                 return
             
-            self.conn = get_db_connection()
-            cursor = self.conn.cursor()
+            self.writer.start()
             
             # Étape 1: Récupérer tous les concurrents
             self.progress.update_status("🔍 Analyse des concurrents...")
             print("🆕 [NOUVELLE LOGIQUE] Protection simulated_dates désactivée - corrections avancées possibles")
             
-            cursor.execute("""
+            competitors = self._read_connection().execute("""
                 SELECT id, name, channel_id, channel_url
                 FROM concurrent 
                 WHERE channel_id IS NOT NULL 
                 AND channel_id != ''
                 ORDER BY name
-            """)
-            
-            competitors = cursor.fetchall()
+            """).fetchall()
             total_competitors = len(competitors)
             
             self.progress.update_status(f"📋 {total_competitors} concurrents identifiés")
-            self.progress.total_steps = 50 + (total_competitors * 10)  # Ajuster dynamiquement
-            
-            # PHASE 1: IMPORT API + CORRECTIONS
-            self.progress.update_status("📡 PHASE 1: Import API + Corrections YouTube", 5)
-            
-            for i, (competitor_id, name, channel_id, channel_url) in enumerate(competitors):
-                self.process_competitor_phase1(competitor_id, name, channel_id, i+1, total_competitors)
-            
-            # PHASE 2: PROPAGATION + CLASSIFICATION
-            self.progress.update_status("🎯 PHASE 2: Propagation + Classification", 5)
+            self.progress.total_steps = 50 + (total_competitors * 3)  # Ajuster dynamiquement
             
-            for i, (competitor_id, name, channel_id, channel_url) in enumerate(competitors):
-                self.process_competitor_phase2(competitor_id, name, i+1, total_competitors)
-            
-            # PHASE 3: RECALCUL MÉTRIQUES
-            self.progress.update_status("📊 PHASE 3: Recalcul Métriques", 5)
-            
-            for i, (competitor_id, name, channel_id, channel_url) in enumerate(competitors):
-                self.process_competitor_phase3(competitor_id, name, i+1, total_competitors)
+            # PHASES 1 → 3 EN PIPELINE
+            self.progress.update_status(
+                f"📡 PHASES 1-3 en pipeline ({'incrémental' if self.incremental else 'complet'}) : {self.network_workers} workers réseau, "
+                f"{self.db_workers} workers base, budget {self.budget.limit} unités", 5
+            )
+            self.run_competitor_pipeline(competitors)
             
             # PHASE 4: FORCE REFRESH CACHE
             self.progress.update_status("🔄 PHASE 4: Force Refresh Cache", 5)
             self.clear_all_caches()
             
-            # Finalisation
-            self.conn.commit()
-            self.conn.close()
-            
             self.progress.complete()
             
         except Exception as e:
             self.progress.error = f"Erreur ULTIMATE: {str(e)}"
-            if self.conn:
-                self.conn.close()
+        finally:
+            self.writer.stop()
+            self._close_readers()
+            self.api.close()
     
-    def process_competitor_phase1(self, competitor_id, name, channel_id, current, total):
-        """PHASE 1: SCAN D'ANOMALIES + Import API + Corrections pour un concurrent"""
+    def run_competitor_pipeline(self, competitors):
+        """Phase 1 en parallèle ; phases 2+3 d'un concurrent lancées dès la fin de sa phase 1"""
+        total = len(competitors)
+        network_pool = ThreadPoolExecutor(max_workers=self.network_workers, thread_name_prefix="UltimatePhase1")
+        db_pool = ThreadPoolExecutor(max_workers=self.db_workers, thread_name_prefix="UltimatePhase23")
         
-        self.progress.update_status(f"🔍 Phase 1: {name} ({current}/{total}) - Scan anomalies...")
-        cursor = self.conn.cursor()
+        try:
+            pending = {}
+            if self.incremental:
+                deltas = self.detector.probe_channels(competitors, WatermarkStore.load_all(self._read_connection()))
+                for i, delta in enumerate(deltas):
+                    future = network_pool.submit(self.process_competitor_incremental, delta, i+1, total)
+                    pending[future] = ('phase1', delta.concurrent_id, delta.name, i+1)
+            else:
+                # Scan d'anomalies global avant l'import ; la phase 2 ne corrige que les concurrents signalés
+                self.detect_and_log_anomalies(self._read_connection())
+                for i, (competitor_id, name, channel_id, channel_url) in enumerate(competitors):
+                    future = network_pool.submit(self.process_competitor_phase1, competitor_id, name, channel_id, i+1, total)
+                    pending[future] = ('phase1', competitor_id, name, i+1)
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, competitor_id, name, current = pending.pop(future)
+                    if stage == 'phase1':
+                        # Mode incrémental : phases 2-3 seulement si la chaîne a changé
+                        if future.result() is False:
+                            continue
+                        downstream = db_pool.submit(self.process_competitor_downstream, competitor_id, name, current, total)
+                        pending[downstream] = ('phase23', competitor_id, name, current)
+                    elif future.exception():
+                        self.progress.log_action(name, "PIPELINE_ERROR", str(future.exception()))
+        finally:
+            network_pool.shutdown(wait=True)
+            db_pool.shutdown(wait=True)
+            self.progress.stats['api_units_used'] = self.budget.used
+    
+    def process_competitor_downstream(self, competitor_id, name, current, total):
+        """Phases 2 puis 3 pour un concurrent dont la phase 1 est terminée"""
+        self.process_competitor_phase2(competitor_id, name, current, total)
+        self.process_competitor_phase3(competitor_id, name, current, total)
+    
+    def process_competitor_incremental(self, delta, current, total):
+        """PHASE 1 incrémentale : nouvelles vidéos, playlists si dues, stats des vidéos récentes"""
+        
+        name = delta.name
+        started = time.perf_counter()
+        changed = False
         
         try:
-            # 1.0: SCAN INTELLIGENT D'ANOMALIES
-            self.detect_and_log_anomalies(cursor, competitor_id, name)
-            
-            # 1.1: Import playlists via API
-            playlists = self.get_channel_playlists(channel_id)
+            conn = self._read_connection()
+            
+            # 1.1: Nouvelles vidéos depuis le watermark (playlist uploads)
+            new_videos = 0
+            if delta.scan_uploads:
+                new_ids = self.detector.fetch_new_uploads(delta, known_video_ids(conn, delta.concurrent_id))
+                if new_ids:
+                    details = self.detector.fetch_video_details(new_ids, delta)
+                    new_videos = self.writer.run(insert_new_videos, delta.concurrent_id, details)
+                    self.progress.increment('videos_imported', new_videos)
+                    self.progress.log_action(name, "VIDEOS_IMPORTED", f"{new_videos} nouvelles vidéos ({delta.reason})")
+            
+            # 1.2: Playlists uniquement si la chaîne a changé ou au contrôle périodique
             playlists_imported = 0
+            if delta.playlists_due:
+                playlists = self.get_channel_playlists(delta.channel_id)
+                playlists_imported = self.writer.run(self.import_playlists, delta.concurrent_id, playlists)
+                self.progress.increment('playlists_imported', playlists_imported)
+            
+            # 1.3: Stats des vidéos récentes selon le calendrier dégressif
+            stats_refreshed = 0
+            due = videos_due_for_stats(conn, delta.concurrent_id)
+            if due:
+                stats_refreshed = self.writer.run(apply_statistics, self.detector.fetch_statistics(due))
+                self.progress.increment('stats_refreshed', stats_refreshed)
+            
+            changed = bool(new_videos or playlists_imported or stats_refreshed)
+            if delta.uploads_complete:
+                self.writer.run(commit_watermark, delta, delta.playlists_due, changed)
+            else:
+                # Lecture partielle : watermark inchangé, la chaîne sera rescannée au prochain passage
+                self.progress.log_action(name, "WATERMARK_KEPT", "Pages ou détails manquants, watermark non avancé")
             
-            for playlist in playlists:
-                if self.import_or_update_playlist(cursor, competitor_id, playlist):
-                    playlists_imported += 1
+            if changed:
+                self.progress.update_status(f"🔍 Phase 1: {name} ({current}/{total}) - {new_videos} nouvelles vidéos, {stats_refreshed} stats")
+            else:
+                self.progress.increment('channels_unchanged')
+                self.progress.log_action(name, "UNCHANGED", "Aucun changement depuis le dernier watermark")
             
-            self.progress.stats['playlists_imported'] += playlists_imported
+        except QuotaExceeded as e:
+            self.progress.log_action(name, "QUOTA_EXHAUSTED", str(e))
+        except Exception as e:
+            self.progress.log_action(name, "PHASE1_ERROR", str(e))
+        finally:
+            self.progress.record_timing(name, 'phase1', time.perf_counter() - started)
+        
+        return changed
+    
+    def process_competitor_phase1(self, competitor_id, name, channel_id, current, total):
+        """PHASE 1: Import API + Corrections pour un concurrent (anomalies déjà détectées en une passe)"""
+        
+        self.progress.update_status(f"🔍 Phase 1: {name} ({current}/{total}) - Import API...")
+        started = time.perf_counter()
+        
+        try:
+            # 1.1: Import playlists via API (réseau) puis écriture groupée
+            try:
+                playlists = self.get_channel_playlists(channel_id)
+            except QuotaExceeded as e:
+                playlists = []
+                self.progress.log_action(name, "QUOTA_EXHAUSTED", str(e))
+            playlists_imported = self.writer.run(self.import_playlists, competitor_id, playlists)
+            
+            self.progress.increment('playlists_imported', playlists_imported)
             self.progress.log_action(name, "PLAYLISTS_IMPORTED", f"{playlists_imported} playlists")
             
             # 1.2: Correction des dates YouTube
-            dates_corrected = self.fix_youtube_dates(cursor, competitor_id)
-            self.progress.stats['dates_corrected'] += dates_corrected
+            dates_corrected = self.writer.run(self.fix_youtube_dates, competitor_id)
+            self.progress.increment('dates_corrected', dates_corrected)
             if dates_corrected > 0:
                 self.progress.log_action(name, "DATES_CORRECTED", f"{dates_corrected} vidéos")
             
             # 1.3: Correction des durées via API
-            durations_fixed = self.fix_video_durations(cursor, competitor_id)
-            self.progress.stats['durations_fixed'] += durations_fixed
+            durations_fixed = self.fix_video_durations(competitor_id)
+            self.progress.increment('durations_fixed', durations_fixed)
             if durations_fixed > 0:
                 self.progress.log_action(name, "DURATIONS_FIXED", f"{durations_fixed} vidéos")
             
-            self.conn.commit()  # Commit intermédiaire
-            
         except Exception as e:
             self.progress.log_action(name, "PHASE1_ERROR", str(e))
+        finally:
+            self.progress.record_timing(name, 'phase1', time.perf_counter() - started)
     
-    def detect_and_log_anomalies(self, cursor, competitor_id, name):
-        """🔍 DÉTECTION INTELLIGENTE D'ANOMALIES - Ultra Verbose"""
-        
-        print(f"\n🔍 [ANOMALY-SCAN] === {name} ===")
-        
-        # 1. Compter les vidéos
-        cursor.execute("SELECT COUNT(*) FROM video WHERE concurrent_id = ?", (competitor_id,))
-        video_count = cursor.fetchone()[0]
-        
-        if video_count == 0:
-            print(f"🚨 [CRITICAL] {name}: AUCUNE VIDÉO en base!")
-            self.progress.log_action(name, "ANOMALY_CRITICAL", "Aucune vidéo trouvée")
-            return
+    def detect_and_log_anomalies(self, conn):
+        """🔍 DÉTECTION D'ANOMALIES EN UNE PASSE sur tous les concurrents (lecture seule)"""
         
-        print(f"📺 [INFO] {name}: {video_count} vidéos")
+        table = AnomalyEngine().detect(conn)
+        flagged = table.by_competitor()
+        print(f"\n🔍 [ANOMALY-SCAN] {len(table)} anomalies sur {len(flagged)}/{table.competitors_scanned} concurrents en {table.elapsed * 1000:.0f} ms")
         
-        # 2. Analyser distribution HHH
-        cursor.execute("""
-            SELECT 
-                COUNT(CASE WHEN category = 'hero' THEN 1 END) as hero_count,
-                COUNT(CASE WHEN category = 'hub' THEN 1 END) as hub_count,
-                COUNT(CASE WHEN category = 'help' THEN 1 END) as help_count,
-                COUNT(CASE WHEN category IS NULL OR category = '' OR category = 'uncategorized' THEN 1 END) as uncategorized_count
-            FROM video WHERE concurrent_id = ?
-        """, (competitor_id,))
-        
-        hero, hub, help_count, uncategorized = cursor.fetchone()
-        classified_total = hero + hub + help_count
-        
-        print(f"🎯 [HHH] {name}: {hero} HERO, {hub} HUB, {help_count} HELP, {uncategorized} non-classifiées")
-        
-        # Détecter anomalies HHH
-        if uncategorized > 0:
-            percentage = (uncategorized / video_count) * 100
-            print(f"⚠️ [ANOMALY] {name}: {uncategorized} vidéos ({percentage:.1f}%) NON CLASSIFIÉES!")
-            self.progress.log_action(name, "ANOMALY_UNCATEGORIZED", f"{uncategorized} vidéos ({percentage:.1f}%)")
-        
-        if classified_total > 0:
-            hero_pct = (hero / classified_total) * 100
-            hub_pct = (hub / classified_total) * 100
-            help_pct = (help_count / classified_total) * 100
-            
-            print(f"📊 [DISTRIBUTION] {name}: {hero_pct:.1f}% HERO, {hub_pct:.1f}% HUB, {help_pct:.1f}% HELP")
-            
-            # Anomalies de distribution
-            if hero_pct == 0:
-                print(f"🚨 [ANOMALY] {name}: 0% HERO - PROBLÈME stratégique!")
-                self.progress.log_action(name, "ANOMALY_ZERO_HERO", f"0% HERO sur {classified_total} vidéos")
-            
-            if help_pct == 0 and classified_total > 20:
-                print(f"🚨 [ANOMALY] {name}: 0% HELP - Aucun contenu d'aide!")
-                self.progress.log_action(name, "ANOMALY_ZERO_HELP", f"0% HELP sur {classified_total} vidéos")
-            
-            if hub_pct > 95:
-                print(f"⚠️ [ANOMALY] {name}: {hub_pct:.1f}% HUB - Quasi-monopole déséquilibré!")
-                self.progress.log_action(name, "ANOMALY_HUB_MONOPOLY", f"{hub_pct:.1f}% HUB")
-        
-        # 3. Analyser durées
-        cursor.execute("""
-            SELECT 
-                COUNT(CASE WHEN duration_seconds > 0 THEN 1 END) as valid_durations,
-                COUNT(CASE WHEN duration_seconds = 0 OR duration_seconds IS NULL THEN 1 END) as invalid_durations,
-                AVG(duration_seconds) as avg_duration
-            FROM video WHERE concurrent_id = ?
-        """, (competitor_id,))
-        
-        valid_durations, invalid_durations, avg_duration = cursor.fetchone()
-        
-        if invalid_durations > 0:
-            percentage = (invalid_durations / video_count) * 100
-            print(f"⚠️ [ANOMALY] {name}: {invalid_durations} vidéos ({percentage:.1f}%) SANS DURÉE!")
-            self.progress.log_action(name, "ANOMALY_NO_DURATION", f"{invalid_durations} vidéos ({percentage:.1f}%)")
-        
-        if avg_duration and avg_duration > 0:
-            avg_minutes = avg_duration / 60
-            print(f"⏱️ [DURATION] {name}: {avg_minutes:.1f} min moyenne")
-            
-            if avg_minutes > 60:
-                print(f"🤔 [ANOMALY] {name}: {avg_minutes:.1f} min - Suspicieusement LONG pour YouTube!")
-                self.progress.log_action(name, "ANOMALY_VERY_LONG", f"{avg_minutes:.1f} min moyenne")
-            elif avg_minutes < 0.5:
-                print(f"🤔 [ANOMALY] {name}: {avg_minutes:.1f} min - Suspicieusement COURT!")
-                self.progress.log_action(name, "ANOMALY_VERY_SHORT", f"{avg_minutes:.1f} min moyenne")
-        else:
-            print(f"🚨 [ANOMALY] {name}: AUCUNE donnée de durée valide!")
-            self.progress.log_action(name, "ANOMALY_NO_DURATION_DATA", "Aucune durée valide")
-        
-        # 4. Analyser dates
-        cursor.execute("""
-            SELECT 
-                COUNT(DISTINCT DATE(published_at)) as distinct_dates,
-                COUNT(CASE WHEN DATE(published_at) IN ('2025-07-05', '2025-01-07', '2025-07-11') THEN 1 END) as suspicious_dates
-            FROM video WHERE concurrent_id = ?
-        """, (competitor_id,))
-        
-        distinct_dates, suspicious = cursor.fetchone()
-        
-        if suspicious > 0:
-            percentage = (suspicious / video_count) * 100
-            print(f"🚨 [ANOMALY] {name}: {suspicious} vidéos ({percentage:.1f}%) avec DATES D'IMPORT corrompues!")
-            self.progress.log_action(name, "ANOMALY_CORRUPT_DATES", f"{suspicious} vidéos ({percentage:.1f}%)")
-        
-        if distinct_dates < 3 and video_count > 10:
-            print(f"⚠️ [ANOMALY] {name}: Seulement {distinct_dates} dates distinctes pour {video_count} vidéos!")
-            self.progress.log_action(name, "ANOMALY_DATE_UNIFORMITY", f"{distinct_dates} dates pour {video_count} vidéos")
-        
-        # 5. Analyser playlists
-        cursor.execute("SELECT COUNT(*) FROM playlist WHERE concurrent_id = ?", (competitor_id,))
-        playlist_count = cursor.fetchone()[0]
-        
-        print(f"📋 [PLAYLISTS] {name}: {playlist_count} playlists")
-        
-        if playlist_count == 0:
-            print(f"⚠️ [ANOMALY] {name}: AUCUNE playlist en base!")
-            self.progress.log_action(name, "ANOMALY_NO_PLAYLISTS", "Aucune playlist")
-        
-        # 6. Analyser engagement
-        cursor.execute("""
-            SELECT 
-                SUM(view_count) as total_views,
-                SUM(like_count) as total_likes,
-                AVG(view_count) as avg_views
-            FROM video 
-            WHERE concurrent_id = ? 
-            AND view_count > 0 AND like_count > 0
-        """, (competitor_id,))
-        
-        total_views, total_likes, avg_views = cursor.fetchone()
+        severity_emoji = {"CRITICAL": "🚨", "HIGH": "⚠️", "MEDIUM": "🤔", "LOW": "ℹ️"}
+        for anomaly in table:
+            action = ANOMALY_ACTIONS.get(anomaly.type)
+            if action is None:
+                continue
+            print(f"{severity_emoji.get(anomaly.severity, '🔍')} [ANOMALY] {anomaly.competitor}: {anomaly.details}")
+            self.progress.log_action(anomaly.competitor, action, anomaly.details)
         
-        if total_views and total_likes and total_views > 0:
-            engagement_rate = (total_likes / total_views) * 100
-            print(f"❤️ [ENGAGEMENT] {name}: {engagement_rate:.3f}% ({avg_views:.0f} vues moy)")
-            
-            if engagement_rate < 0.1:
-                print(f"⚠️ [ANOMALY] {name}: Engagement {engagement_rate:.3f}% TRÈS FAIBLE!")
-                self.progress.log_action(name, "ANOMALY_LOW_ENGAGEMENT", f"{engagement_rate:.3f}%")
-            elif engagement_rate > 10:
-                print(f"🤔 [ANOMALY] {name}: Engagement {engagement_rate:.3f}% suspicieusement ÉLEVÉ!")
-                self.progress.log_action(name, "ANOMALY_HIGH_ENGAGEMENT", f"{engagement_rate:.3f}%")
-        
-        print(f"✅ [SCAN-COMPLETE] {name}: Anomalies détectées et loggées")
+        self.progress.stats['competitors_flagged'] = len(flagged)
+        return table
     
     def process_competitor_phase2(self, competitor_id, name, current, total):
         """PHASE 2: Propagation + Classification pour un concurrent"""
         
         self.progress.update_status(f"🎯 Phase 2: {name} ({current}/{total})")
-        cursor = self.conn.cursor()
+        started = time.perf_counter()
         
         try:
-            # 2.1: Création des liens playlist-vidéo
-            links_created = self.create_playlist_video_links(cursor, competitor_id)
-            self.progress.log_action(name, "LINKS_CREATED", f"{links_created} liens")
-            
-            # 2.2: Propagation des classifications depuis playlists humaines
-            videos_propagated = self.propagate_human_classifications(cursor, competitor_id)
-            self.progress.stats['classifications_applied'] += videos_propagated
-            if videos_propagated > 0:
-                self.progress.log_action(name, "HUMAN_PROPAGATED", f"{videos_propagated} vidéos")
+            # 2.1: Vidéos des playlists classifiées sans liens (réseau)
+            playlist_videos = self.linker.collect(self._read_connection(), competitor_id)
             
-            # 2.3: Classification intelligente des vidéos orphelines
-            orphans_classified = self.classify_orphaned_videos(cursor, competitor_id, name)
-            self.progress.stats['classifications_applied'] += orphans_classified
-            if orphans_classified > 0:
-                self.progress.log_action(name, "ORPHANS_CLASSIFIED", f"{orphans_classified} vidéos")
-            
-            # 2.4: CORRECTIONS INTELLIGENTES basées sur anomalies détectées
-            self.apply_intelligent_anomaly_fixes(cursor, competitor_id, name)
-            
-            # 2.5: Détection et correction 0% HERO (legacy)
-            hero_corrections = self.fix_zero_hero_content(cursor, competitor_id, name)
-            if hero_corrections > 0:
-                self.progress.log_action(name, "HERO_CORRECTIONS", f"{hero_corrections} vidéos reclassifiées")
-            
-            self.conn.commit()  # Commit intermédiaire
+            # 2.2 → 2.5 : écritures groupées sur le thread écrivain
+            self.writer.run(self.apply_phase2_writes, competitor_id, name, playlist_videos)
             
         except Exception as e:
             self.progress.log_action(name, "PHASE2_ERROR", str(e))
+        finally:
+            self.progress.record_timing(name, 'phase2', time.perf_counter() - started)
+    
+    def apply_phase2_writes(self, cursor, competitor_id, name, playlist_videos):
+        """Liens playlist-vidéo, propagation, classification et corrections (job d'écriture)"""
+        links_created = self.create_playlist_video_links(cursor, competitor_id, playlist_videos)
+        self.progress.log_action(name, "LINKS_CREATED", f"{links_created} liens")
+        
+        # Propagation des classifications depuis playlists humaines
+        videos_propagated = self.propagate_human_classifications(cursor, competitor_id)
+        self.progress.increment('classifications_applied', videos_propagated)
+        if videos_propagated > 0:
+            self.progress.log_action(name, "HUMAN_PROPAGATED", f"{videos_propagated} vidéos")
+        
+        # Classification intelligente des vidéos orphelines
+        orphans_classified = self.classify_orphaned_videos(cursor, competitor_id, name)
+        self.progress.increment('classifications_applied', orphans_classified)
+        if orphans_classified > 0:
+            self.progress.log_action(name, "ORPHANS_CLASSIFIED", f"{orphans_classified} vidéos")
+        
+        # CORRECTIONS INTELLIGENTES basées sur anomalies détectées
+        self.apply_intelligent_anomaly_fixes(cursor, competitor_id, name)
+        
+        # Détection et correction 0% HERO (legacy)
+        hero_corrections = self.fix_zero_hero_content(cursor, competitor_id, name)
+        if hero_corrections > 0:
+            self.progress.log_action(name, "HERO_CORRECTIONS", f"{hero_corrections} vidéos reclassifiées")
     
     def process_competitor_phase3(self, competitor_id, name, current, total):
         """PHASE 3: Recalcul complet des métriques pour un concurrent"""
         
         self.progress.update_status(f"📊 Phase 3: {name} ({current}/{total})")
-        cursor = self.conn.cursor()
+        started = time.perf_counter()
+        conn = self._read_connection()
         
         try:
             # 3.1: Récupérer toutes les vidéos du concurrent
-            cursor.execute("""
+            videos = conn.execute("""
                 SELECT * FROM video 
                 WHERE concurrent_id = ?
                 ORDER BY published_at DESC
-            """, (competitor_id,))
-            
-            videos = cursor.fetchall()
+            """, (competitor_id,)).fetchall()
             
             if not videos:
                 self.progress.log_action(name, "NO_VIDEOS", "Aucune vidéo trouvée")
@@ -474,14 +689,14 @@ class UltimateGlobalRefreshSystem:
             
             # 3.2: Utiliser le service avancé pour recalculer
             try:
-                service = CompetitorAdvancedMetricsService(self.conn)
+                service = CompetitorAdvancedMetricsService(conn)
                 metrics = service.calculate_key_metrics(competitor_id, videos)
                 
                 # 3.3: Sauvegarder les métriques en base
-                self.save_competitor_metrics(cursor, competitor_id, metrics)
+                self.writer.run(self.save_competitor_metrics, competitor_id, metrics)
                 
-                self.progress.stats['metrics_recalculated'] += 1
-                self.progress.stats['videos_updated'] += len(videos)
+                self.progress.increment('metrics_recalculated')
+                self.progress.increment('videos_updated', len(videos))
                 
                 self.progress.log_action(name, "METRICS_CALCULATED", {
                     'videos_count': len(videos),
@@ -493,12 +708,12 @@ class UltimateGlobalRefreshSystem:
             except Exception as e:
                 self.progress.log_action(name, "METRICS_ERROR", str(e))
             
-            self.conn.commit()  # Commit intermédiaire
+            self.progress.increment('competitors_processed')
             
         except Exception as e:
             self.progress.log_action(name, "PHASE3_ERROR", str(e))
-        
-        self.progress.stats['competitors_processed'] += 1
+        finally:
+            self.progress.record_timing(name, 'phase3', time.perf_counter() - started)
     
     def get_channel_playlists(self, channel_id):
         """Récupérer toutes les playlists d'une chaîne via API"""
@@ -506,24 +721,20 @@ class UltimateGlobalRefreshSystem:
         next_page_token = None
         
         while True:
-            url = "https://www.googleapis.com/youtube/v3/playlists"
             params = {
                 'part': 'snippet,contentDetails',
                 'channelId': channel_id,
-                'maxResults': 50,
-                'key': self.api_key
+                'maxResults': 50
             }
             
             if next_page_token:
                 params['pageToken'] = next_page_token
             
             try:
-                response = requests.get(url, params=params, timeout=30)
-                if response.status_code != 200:
+                data = self.api.get('playlists', params)
+                if data is None:
                     break
                 
-                data = response.json()
-                
                 for item in data.get('items', []):
                     playlist_info = {
                         'id': item['id'],
@@ -539,11 +750,17 @@ class UltimateGlobalRefreshSystem:
                 if not next_page_token:
                     break
                     
+            except QuotaExceeded:
+                raise
             except Exception:
                 break
         
         return playlists
     
+    def import_playlists(self, cursor, competitor_id, playlists):
+        """Importe un lot de playlists (job d'écriture) ; retourne le nombre de nouvelles playlists"""
+        return sum(1 for playlist in playlists if self.import_or_update_playlist(cursor, competitor_id, playlist))
+    
     def import_or_update_playlist(self, cursor, competitor_id, playlist):
         """Importer ou mettre à jour une playlist avec protection humaine"""
         
@@ -612,63 +829,54 @@ class UltimateGlobalRefreshSystem:
         
         return cursor.rowcount
     
-    def fix_video_durations(self, cursor, competitor_id):
-        """Corriger les durées vidéo via API YouTube"""
+    def fix_video_durations(self, competitor_id):
+        """Corriger les durées vidéo via API YouTube (lecture + réseau, écriture via le writer)"""
         
         # Trouver les vidéos avec durée 0 ou nulle
-        cursor.execute("""
+        videos_to_fix = [row[0] for row in self._read_connection().execute("""
             SELECT video_id FROM video 
             WHERE concurrent_id = ?
             AND (duration_seconds = 0 OR duration_seconds IS NULL OR duration_text = '00:00:00')
-        """, (competitor_id,))
-        
-        videos_to_fix = [row[0] for row in cursor.fetchall()]
+        """, (competitor_id,))]
         
         if not videos_to_fix:
             return 0
         
-        fixed_count = 0
+        updates = []
         
         # Traiter par batch de 50 (limite API)
         for i in range(0, len(videos_to_fix), 50):
             batch = videos_to_fix[i:i+50]
             
             try:
-                url = "https://www.googleapis.com/youtube/v3/videos"
-                params = {
-                    'part': 'contentDetails',
-                    'id': ','.join(batch),
-                    'key': self.api_key
-                }
-                
-                response = requests.get(url, params=params, timeout=30)
-                if response.status_code != 200:
+                data = self.api.get('videos', {'part': 'contentDetails', 'id': ','.join(batch)})
+                if data is None:
                     continue
                 
-                data = response.json()
-                
                 for item in data.get('items', []):
-                    video_id = item['id']
-                    duration_iso = item['contentDetails']['duration']
-                    
                     # Parser la durée ISO 8601 (PT1M30S)
-                    duration_seconds = self.parse_iso_duration(duration_iso)
+                    duration_seconds = self.parse_iso_duration(item['contentDetails']['duration'])
                     duration_text = self.seconds_to_duration_text(duration_seconds)
                     is_short = 1 if duration_seconds <= 60 else 0
+                    updates.append((duration_seconds, duration_text, is_short, item['id'], competitor_id))
                     
-                    # Mettre à jour en base
-                    cursor.execute("""
-                        UPDATE video 
-                        SET duration_seconds = ?, duration_text = ?, is_short = ?
-                        WHERE video_id = ? AND concurrent_id = ?
-                    """, (duration_seconds, duration_text, is_short, video_id, competitor_id))
-                    
-                    fixed_count += 1
-                    
+            except QuotaExceeded:
+                break
             except Exception:
                 continue
         
-        return fixed_count
+        if updates:
+            self.writer.run(self.apply_video_durations, updates)
+        return len(updates)
+    
+    def apply_video_durations(self, cursor, updates):
+        """Écrit les durées récupérées (job d'écriture)"""
+        cursor.executemany("""
+            UPDATE video 
+            SET duration_seconds = ?, duration_text = ?, is_short = ?
+            WHERE video_id = ? AND concurrent_id = ?
+        """, updates)
+        return len(updates)
     
     def parse_iso_duration(self, duration):
         """Parser durée ISO 8601 en secondes"""
@@ -704,60 +912,9 @@ class UltimateGlobalRefreshSystem:
         seconds = total_seconds % 60
         return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
     
-    def create_playlist_video_links(self, cursor, competitor_id):
-        """Créer les liens playlist-vidéo"""
-        
-        # Récupérer les playlists classifiées
-        cursor.execute("""
-            SELECT p.id, p.playlist_id, p.name, p.category
-            FROM playlist p
-            WHERE p.concurrent_id = ?
-            AND p.category IS NOT NULL
-            AND p.name NOT LIKE 'All Videos%'
-        """, (competitor_id,))
-        
-        classified_playlists = cursor.fetchall()
-        links_created = 0
-        
-        for db_id, youtube_playlist_id, playlist_name, category in classified_playlists:
-            
-            # Vérifier si les liens existent déjà
-            cursor.execute("SELECT COUNT(*) FROM playlist_video WHERE playlist_id = ?", (youtube_playlist_id,))
-            existing_links = cursor.fetchone()[0]
-            
-            if existing_links > 0:
-                continue
-            
-            # Récupérer les vidéos via API
-            playlist_videos = self.get_playlist_videos_from_api(youtube_playlist_id)
-            
-            if playlist_videos:
-                # Trouver les vidéos dans notre base
-                video_id_list = playlist_videos
-                placeholders = ','.join(['?' for _ in video_id_list])
-                
-                cursor.execute(f"""
-                    SELECT id, video_id FROM video 
-                    WHERE video_id IN ({placeholders})
-                    AND concurrent_id = ?
-                """, video_id_list + [competitor_id])
-                
-                found_videos = {row[1]: row[0] for row in cursor.fetchall()}
-                
-                # Créer les liens
-                for video_id in playlist_videos:
-                    if video_id in found_videos:
-                        db_video_id = found_videos[video_id]
-                        try:
-                            cursor.execute("""
-                                INSERT INTO playlist_video (playlist_id, video_id) 
-                                VALUES (?, ?)
-                            """, (youtube_playlist_id, db_video_id))
-                            links_created += 1
-                        except Exception:
-                            pass
-        
-        return links_created
+    def create_playlist_video_links(self, cursor, competitor_id, playlist_videos):
+        """Créer les liens playlist-vidéo à partir des vidéos récupérées (insertion ensembliste)"""
+        return PlaylistLinker.bulk_link(cursor, playlist_videos)
     
     def apply_intelligent_anomaly_fixes(self, cursor, competitor_id, name):
         """🔧 CORRECTIONS INTELLIGENTES basées sur les anomalies détectées"""
@@ -765,8 +922,8 @@ class UltimateGlobalRefreshSystem:
         print(f"\n🔧 [INTELLIGENT-FIX] === {name} ===")
         
         # Récupérer les anomalies pour ce concurrent depuis les logs
-        competitor_logs = [log for log in self.progress.detailed_log 
-                          if log['competitor'] == name and 'ANOMALY_' in log['action']]
+        competitor_logs = [log for log in self.progress.competitor_log(name)
+                          if 'ANOMALY_' in log['action']]
         
         if not competitor_logs:
             print(f"✅ [NO-ANOMALIES] {name}: Aucune anomalie à corriger")
@@ -1110,43 +1267,7 @@ class UltimateGlobalRefreshSystem:
     
     def get_playlist_videos_from_api(self, playlist_id):
         """Récupérer les vidéos d'une playlist via API"""
-        videos = []
-        next_page_token = None
-        
-        while True:
-            url = "https://www.googleapis.com/youtube/v3/playlistItems"
-            params = {
-                'part': 'snippet',
-                'playlistId': playlist_id,
-                'maxResults': 50,
-                'key': self.api_key
-            }
-            
-            if next_page_token:
-                params['pageToken'] = next_page_token
-            
-            try:
-                response = requests.get(url, params=params, timeout=30)
-                if response.status_code != 200:
-                    break
-                
-                data = response.json()
-                
-                for item in data.get('items', []):
-                    try:
-                        video_id = item['snippet']['resourceId']['videoId']
-                        videos.append(video_id)
-                    except KeyError:
-                        continue
-                
-                next_page_token = data.get('nextPageToken')
-                if not next_page_token:
-                    break
-                    
-            except Exception:
-                break
-        
-        return videos
+        return fetch_playlist_video_ids(self.api.get, playlist_id)
     
     def propagate_human_classifications(self, cursor, competitor_id):
         """Propager les classifications humaines depuis les playlists"""
@@ -1450,7 +1571,7 @@ class UltimateGlobalRefreshSystem:
 def main():
     """Interface en ligne de commande pour le système ULTIMATE"""
     
-    system = UltimateGlobalRefreshSystem()
+    system = UltimateGlobalRefreshSystem(incremental=incremental_mode_requested())
     
     print("🚀 ULTIMATE GLOBAL REFRESH SYSTEM")
     print("=" * 50)
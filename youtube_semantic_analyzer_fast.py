@@ -6,6 +6,7 @@ Version optimisée de l'analyseur sémantique YouTube
 - Version allégée pour analyse rapide
 """
 
+import argparse
 import json
 import numpy as np
 import pandas as pd
@@ -17,6 +18,14 @@ from tqdm import tqdm
 import os
 import pickle
 from datetime import datetime
+from yt_channel_analyzer.analytics_snapshot import load_records, snapshot_available
+from yt_channel_analyzer.topic_clustering import METHODS, TopicClusteringEngine
+
+# Colonnes du snapshot utilisées par l'analyse (les autres ne sont pas lues sur disque)
+SNAPSHOT_VIDEO_COLUMNS = ['video_id', 'title', 'description', 'view_count', 'country', 'competitor_name', 'category']
+
+# Modèle de clustering à grande échelle (PCA + centres + index ANN), réutilisé pour les nouvelles vidéos
+CLUSTER_MODEL_DIR = 'topic_clusters_fast'
 
 class FastYouTubeAnalyzer:
     def __init__(self, batch_size=100):
@@ -27,12 +36,18 @@ class FastYouTubeAnalyzer:
         self.model = SentenceTransformer('paraphrase-MiniLM-L6-v2')
         self.batch_size = batch_size
         self.checkpoint_file = 'analysis_checkpoint.pkl'
+        self.engine = None
         
-    def load_data(self, json_file='videos_only.json'):
-        """Charge seulement les vidéos (pas besoin du fichier complet)"""
-        print(f"📁 Chargement des vidéos depuis {json_file}...")
-        with open(json_file, 'r', encoding='utf-8') as f:
-            self.videos = json.load(f)
+    def load_data(self, json_file=None):
+        """Charge seulement les vidéos : snapshot colonnaire si disponible, sinon videos_only.json"""
+        if json_file is None and snapshot_available('videos'):
+            print("📁 Chargement des vidéos depuis le snapshot analytique (memory-map)...")
+            self.videos = load_records('videos', SNAPSHOT_VIDEO_COLUMNS)
+        else:
+            json_file = json_file or 'videos_only.json'
+            print(f"📁 Chargement des vidéos depuis {json_file}...")
+            with open(json_file, 'r', encoding='utf-8') as f:
+                self.videos = json.load(f)
         
         print(f"✅ {len(self.videos)} vidéos chargées")
         
@@ -82,31 +97,66 @@ class FastYouTubeAnalyzer:
         print(f"✅ {len(self.texts)} textes préparés")
         return len(self.texts)
     
-    def encode_with_checkpoint(self):
-        """Encode avec possibilité de reprendre en cas d'interruption"""
+    def encode_with_checkpoint(self, mmap=False):
+        """Encode avec possibilité de reprendre en cas d'interruption (mmap : lecture à la demande)
+
+        Les embeddings sauvegardés ne sont réutilisés que pour les mêmes vidéos dans le même ordre
+        (liste des video_id enregistrée à côté) ; sinon seules les vidéos inconnues sont encodées.
+        """
         embeddings_file = 'embeddings_fast.npy'
+        ids_file = 'embeddings_fast_ids.json'
+        video_ids = [m['video_id'] for m in self.metadata]
+        
+        # Vérifier si on a déjà des embeddings pour ces vidéos
+        saved_ids = None
+        if os.path.exists(embeddings_file) and os.path.exists(ids_file):
+            with open(ids_file, 'r', encoding='utf-8') as f:
+                saved_ids = json.load(f)
         
-        # Vérifier si on a déjà des embeddings
-        if os.path.exists(embeddings_file):
+        if saved_ids == video_ids:
             print("✅ Embeddings trouvés, chargement...")
-            self.embeddings = np.load(embeddings_file)
+            self.embeddings = np.load(embeddings_file, mmap_mode='r' if mmap else None)
             return self.embeddings
         
-        print(f"🧠 Encodage de {len(self.texts)} textes...")
+        previous = {}
+        if saved_ids is not None:
+            saved = np.load(embeddings_file, mmap_mode='r')
+            if len(saved) == len(saved_ids):
+                previous = {video_id: row for row, video_id in enumerate(saved_ids)}
+            print(f"♻️ Embeddings sauvegardés pour un autre jeu de vidéos ({len(saved_ids)} → {len(video_ids)})")
+        
+        missing = [i for i, video_id in enumerate(video_ids) if video_id not in previous]
+        print(f"🧠 Encodage de {len(missing)} textes ({len(video_ids) - len(missing)} réutilisés)...")
         
         # Encoder directement (MiniLM est rapide)
-        self.embeddings = self.model.encode(
-            self.texts,
+        encoded = self.model.encode(
+            [self.texts[i] for i in missing],
             batch_size=self.batch_size,
             show_progress_bar=True,
             convert_to_numpy=True,
             normalize_embeddings=True
         )
+        if previous:
+            self.embeddings = np.empty((len(video_ids), saved.shape[1]), dtype=saved.dtype)
+            reused = [i for i, video_id in enumerate(video_ids) if video_id in previous]
+            if reused:
+                self.embeddings[reused] = saved[[previous[video_ids[i]] for i in reused]]
+            if missing:
+                self.embeddings[missing] = encoded
+            del saved  # libère le memory-map avant de réécrire le fichier
+        else:
+            self.embeddings = encoded
         
-        # Sauvegarder
+        # Sauvegarder (liste des vidéos écrite en dernier : un fichier .npy sans liste n'est jamais réutilisé)
+        if os.path.exists(ids_file):
+            os.remove(ids_file)
         np.save(embeddings_file, self.embeddings)
+        with open(ids_file, 'w', encoding='utf-8') as f:
+            json.dump(video_ids, f)
         print(f"✅ Embeddings sauvegardés: {embeddings_file}")
         
+        if mmap:
+            self.embeddings = np.load(embeddings_file, mmap_mode='r')
         return self.embeddings
     
     def quick_clustering(self, n_clusters=30):
@@ -126,6 +176,48 @@ class FastYouTubeAnalyzer:
         
         return self.labels
     
+    def scalable_clustering(self, n_clusters=30, method='minibatch', model_dir=CLUSTER_MODEL_DIR):
+        """Clustering à grande échelle : PCA incrémentale float32, MiniBatchKMeans/HDBSCAN, index ANN sauvegardé"""
+        print(f"\n🎯 Clustering à grande échelle ({method}, {n_clusters} topics)...")
+        self.engine = TopicClusteringEngine(n_clusters=n_clusters, method=method)
+        self.labels = self.engine.fit(self.embeddings, [m['video_id'] for m in self.metadata])
+        self.engine.save(model_dir)
+        print(f"✅ Modèle sauvegardé: {model_dir}/")
+        return self.labels
+    
+    def assign_new_videos(self, model_dir=CLUSTER_MODEL_DIR):
+        """Rattache aux clusters existants les vidéos absentes du modèle (seules celles-ci sont encodées)"""
+        self.engine = TopicClusteringEngine.load(model_dir)
+        known = set(self.engine.keys)
+        new_positions = [i for i, m in enumerate(self.metadata) if m['video_id'] not in known]
+        print(f"\n🧩 {len(new_positions)} nouvelles vidéos à rattacher aux {len(self.engine.centroids)} topics existants")
+        
+        if new_positions:
+            embeddings = self.model.encode(
+                [self.texts[i] for i in new_positions],
+                batch_size=self.batch_size,
+                show_progress_bar=True,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+            _, novel = self.engine.assign(embeddings, [self.metadata[i]['video_id'] for i in new_positions])
+            if novel:
+                print(f"⚠️ {novel} vidéos éloignées de tous les topics : relancer un clustering complet (--scalable)")
+            self.engine.save(model_dir)
+        
+        self.labels = np.array([self.engine.label_of(m['video_id']) for m in self.metadata])
+        return self.labels
+    
+    def similar_videos(self, video_id, k=10):
+        """Vidéos les plus proches d'une vidéo (requête ANN, sans parcourir tous les embeddings)"""
+        if self.engine is None:
+            self.engine = TopicClusteringEngine.load(CLUSTER_MODEL_DIR)
+        by_id = {m['video_id']: m for m in self.metadata}
+        return [
+            dict(by_id.get(key, {'video_id': key}), distance=round(distance, 4))
+            for key, distance in self.engine.similar(video_id, k)
+        ]
+    
     def analyze_topics(self):
         """Analyse rapide des topics"""
         print("\n📊 Analyse des topics...")
@@ -141,6 +233,7 @@ class FastYouTubeAnalyzer:
         stopwords.update(self.competitor_brands)
         
         results = []
+        by_id = {m['video_id']: m for m in self.metadata}
         
         for cluster_id in range(max(self.labels) + 1):
             # Vidéos du cluster
@@ -185,6 +278,13 @@ class FastYouTubeAnalyzer:
                     } for v in sorted(cluster_videos, key=lambda x: x['views'], reverse=True)[:3]
                 ]
             })
+            
+            # Vidéos les plus proches du centre du topic (index ANN du clustering à grande échelle)
+            if self.engine is not None:
+                results[-1]['representative_videos'] = [
+                    {'video_id': key, 'title': by_id[key]['title']}
+                    for key in self.engine.representatives(cluster_id, 3) if key in by_id
+                ]
         
         # Trier par taille
         results.sort(key=lambda x: x['size'], reverse=True)
@@ -244,6 +344,15 @@ class FastYouTubeAnalyzer:
 
 def main():
     """Script principal optimisé"""
+    parser = argparse.ArgumentParser(description="Analyse sémantique rapide YouTube")
+    parser.add_argument('--scalable', action='store_true',
+                        help="PCA incrémentale + MiniBatchKMeans/HDBSCAN + index ANN (grands volumes)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Rattacher les nouvelles vidéos au modèle sauvegardé sans réentraîner")
+    parser.add_argument('--method', choices=METHODS, default='minibatch')
+    parser.add_argument('--clusters', type=int, default=30)
+    args = parser.parse_args()
+    
     print("⚡ ANALYSE SÉMANTIQUE RAPIDE YOUTUBE")
     print("="*50)
     
@@ -251,17 +360,21 @@ def main():
     analyzer = FastYouTubeAnalyzer(batch_size=100)
     
     # Charger les données
-    analyzer.load_data('videos_only.json')
+    analyzer.load_data()
     
     # Option: Analyser seulement un échantillon
     # analyzer.prepare_texts(sample_size=2000)  # Top 2000 vidéos
     analyzer.prepare_texts()  # Toutes les vidéos
     
-    # Encoder
-    analyzer.encode_with_checkpoint()
-    
-    # Clustering
-    analyzer.quick_clustering(n_clusters=30)
+    # Encoder puis clustering
+    if args.incremental and os.path.exists(CLUSTER_MODEL_DIR):
+        analyzer.assign_new_videos()
+    elif args.scalable or args.incremental:
+        analyzer.encode_with_checkpoint(mmap=True)
+        analyzer.scalable_clustering(n_clusters=args.clusters, method=args.method)
+    else:
+        analyzer.encode_with_checkpoint()
+        analyzer.quick_clustering(n_clusters=args.clusters)
     
     # Analyser
     results = analyzer.analyze_topics()
@@ -0,0 +1,354 @@
+"""
+Snapshot colonnaire (Arrow IPC / Parquet) des faits vidéos, playlists, concurrents et émotions
+- Un répertoire versionné par snapshot, publié atomiquement (manifest.json + pointeur LATEST)
+- Partitionnement hive par pays et par concurrent : un script ne lit que les partitions utiles
+- Chaînes répétitives (pays, catégorie, concurrent, émotion...) encodées en dictionnaire
+- Format Arrow IPC non compressé par défaut : lecture memory-mappée, colonnes sans copie
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from .database.base import DB_DIR, DB_PATH
+from .streaming_export import EMOTIONS_DB_PATH, FETCH_BATCH_SIZE, iter_batches
+
+SNAPSHOT_ROOT = DB_DIR / 'analytics_snapshots'
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_KEEP = 3
+SNAPSHOT_ROWS_PER_GROUP = 100_000
+LATEST_POINTER = 'LATEST'
+
+FILE_FORMATS = {
+    'arrow': 'ipc',        # non compressé : memory-map et lecture sans copie
+    'parquet': 'parquet',  # zstd : plus compact pour l'archivage et les outils externes
+}
+
+
+@dataclass(frozen=True)
+class SnapshotTable:
+    """Table du snapshot : requête SQL (colonnes nommées) et types des colonnes, dans l'ordre du SELECT"""
+    query: str
+    columns: Tuple[Tuple[str, str], ...]
+    partition_by: Tuple[str, ...] = ('country', 'competitor_id')
+    database: str = 'main'
+
+
+# 'dict' = chaîne encodée en dictionnaire (faible cardinalité)
+SNAPSHOT_TABLES: Dict[str, SnapshotTable] = {
+    'videos': SnapshotTable("""
+        SELECT v.id, v.video_id, COALESCE(v.title, '') AS title, v.description, v.published_at,
+               COALESCE(v.view_count, 0) AS view_count, COALESCE(v.like_count, 0) AS like_count,
+               COALESCE(v.comment_count, 0) AS comment_count, COALESCE(v.duration_seconds, 0) AS duration_seconds,
+               COALESCE(v.is_short, 0) AS is_short, v.category, v.classification_source,
+               COALESCE(v.is_human_validated, 0) AS is_human_validated,
+               c.name AS competitor_name, c.id AS competitor_id, c.country
+        FROM video v
+        JOIN concurrent c ON v.concurrent_id = c.id
+        ORDER BY c.country, c.id, v.id
+    """, (
+        ('id', 'int'), ('video_id', 'str'), ('title', 'str'), ('description', 'str'), ('published_at', 'str'),
+        ('view_count', 'int'), ('like_count', 'int'), ('comment_count', 'int'),
+        ('duration_seconds', 'int'), ('is_short', 'bool'), ('category', 'dict'),
+        ('classification_source', 'dict'), ('is_human_validated', 'bool'),
+        ('competitor_name', 'dict'), ('competitor_id', 'int'), ('country', 'str'),
+    )),
+    'playlists': SnapshotTable("""
+        SELECT p.id, p.playlist_id, p.name, p.description, p.category, COALESCE(p.video_count, 0) AS video_count,
+               p.classification_source, COALESCE(p.is_human_validated, 0) AS is_human_validated,
+               c.name AS competitor_name, c.id AS competitor_id, c.country
+        FROM playlist p
+        JOIN concurrent c ON p.concurrent_id = c.id
+        ORDER BY c.country, c.id, p.id
+    """, (
+        ('id', 'int'), ('playlist_id', 'str'), ('name', 'str'), ('description', 'str'), ('category', 'dict'),
+        ('video_count', 'int'), ('classification_source', 'dict'), ('is_human_validated', 'bool'),
+        ('competitor_name', 'dict'), ('competitor_id', 'int'), ('country', 'str'),
+    )),
+    'competitors': SnapshotTable("""
+        SELECT id AS competitor_id, name, channel_id, channel_url, language,
+               COALESCE(subscriber_count, 0) AS subscriber_count, COALESCE(view_count, 0) AS view_count,
+               COALESCE(video_count, 0) AS video_count, last_updated, country
+        FROM concurrent
+        ORDER BY country, id
+    """, (
+        ('competitor_id', 'int'), ('name', 'str'), ('channel_id', 'str'), ('channel_url', 'str'),
+        ('language', 'dict'), ('subscriber_count', 'int'), ('view_count', 'int'), ('video_count', 'int'),
+        ('last_updated', 'str'), ('country', 'str'),
+    ), partition_by=('country',)),
+    # Pas de texte ni d'auteur : les faits suffisent aux agrégats ; pays/concurrent ajoutés via la table video
+    'emotions': SnapshotTable("""
+        SELECT video_id, emotion_type, confidence, language, COALESCE(like_count, 0) AS like_count, published_at
+        FROM comment_emotions
+        ORDER BY video_id
+    """, (
+        ('video_id', 'dict'), ('emotion_type', 'dict'), ('confidence', 'float'), ('language', 'dict'),
+        ('like_count', 'int'), ('published_at', 'str'),
+        ('competitor_id', 'int'), ('country', 'str'),
+    ), database='emotions'),
+}
+
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow requis pour les snapshots colonnaires (pip install pyarrow)")
+
+
+def _arrow_field(name: str, kind: str):
+    arrow_type = {
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'bool': pa.bool_(),
+        'str': pa.string(),
+        'dict': pa.dictionary(pa.int32(), pa.string()),
+    }[kind]
+    return pa.field(name, arrow_type)
+
+
+def table_schema(table: SnapshotTable):
+    return pa.schema([_arrow_field(name, kind) for name, kind in table.columns])
+
+
+def partitioning(table: SnapshotTable):
+    schema = table_schema(table)
+    return ds.partitioning(pa.schema([schema.field(name) for name in table.partition_by]), flavor='hive')
+
+
+def _dictionaries(conn: sqlite3.Connection, table: SnapshotTable) -> Dict[str, 'pa.Array']:
+    """Dictionnaire global par colonne : les fichiers IPC n'admettent qu'un dictionnaire par champ"""
+    dictionaries = {}
+    for name, kind in table.columns:
+        if kind == 'dict':
+            values = [row[0] for row in conn.execute(
+                f'SELECT DISTINCT "{name}" FROM ({table.query}) WHERE "{name}" IS NOT NULL ORDER BY 1'
+            )]
+            dictionaries[name] = pa.array([str(v) for v in values], type=pa.string())
+    return dictionaries
+
+
+def _record_batches(schema, rows_batches: Iterator[List[tuple]], dictionaries: Dict[str, 'pa.Array']):
+    for rows in rows_batches:
+        columns = list(zip(*rows))
+        arrays = []
+        for values, field in zip(columns, schema):
+            if pa.types.is_dictionary(field.type):
+                dictionary = dictionaries[field.name]
+                strings = pa.array([None if v is None else str(v) for v in values], type=pa.string())
+                indices = pc.index_in(strings, value_set=dictionary).cast(pa.int32())
+                arrays.append(pa.DictionaryArray.from_arrays(indices, dictionary))
+            elif pa.types.is_boolean(field.type):
+                arrays.append(pa.array(values, type=pa.int64()).cast(pa.bool_()))  # drapeaux 0/1 SQLite
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _emotion_rows(cursor: sqlite3.Cursor, batch_size: int) -> Iterator[List[tuple]]:
+    """Lignes d'émotions complétées par (competitor_id, country) de la vidéo commentée"""
+    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    try:
+        owners = {video_id: (competitor_id, country) for video_id, competitor_id, country in conn.execute("""
+            SELECT v.video_id, c.id, c.country FROM video v JOIN concurrent c ON v.concurrent_id = c.id
+        """)}
+    finally:
+        conn.close()
+    for rows in iter_batches(cursor, batch_size):
+        yield [row + owners.get(row[0], (None, None)) for row in rows]
+
+
+def _open_source(table: SnapshotTable) -> Optional[sqlite3.Connection]:
+    """Connexion en lecture seule ; pyarrow consomme les lots depuis ses propres threads"""
+    path = EMOTIONS_DB_PATH if table.database == 'emotions' else DB_PATH
+    if not path.exists():
+        if table.database == 'emotions':
+            return None  # base sentiment optionnelle
+        raise FileNotFoundError(f"Base introuvable: {path}")
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+
+
+def _write_table(name: str, table: SnapshotTable, target: Path, file_format: str,
+                 batch_size: int) -> Optional[int]:
+    conn = _open_source(table)
+    if conn is None:
+        print(f"[SNAPSHOT] ⚠️ {name}: base source absente, table ignorée")
+        return None
+    try:
+        dictionaries = _dictionaries(conn, table)
+        cursor = conn.execute(table.query)
+        rows = _emotion_rows(cursor, batch_size) if name == 'emotions' else iter_batches(cursor, batch_size)
+        schema = table_schema(table)
+        written = 0
+
+        def counted():
+            nonlocal written
+            for batch in _record_batches(schema, rows, dictionaries):
+                written += batch.num_rows
+                yield batch
+
+        fmt = ds.ParquetFileFormat() if file_format == 'parquet' else ds.IpcFileFormat()
+        options = fmt.make_write_options(compression='zstd') if file_format == 'parquet' else None
+        ds.write_dataset(
+            counted(), str(target / name), schema=schema, format=fmt, file_options=options,
+            partitioning=partitioning(table), basename_template='part-{i}.' + FILE_FORMATS[file_format],
+            max_rows_per_group=SNAPSHOT_ROWS_PER_GROUP, min_rows_per_group=min(SNAPSHOT_ROWS_PER_GROUP, batch_size),
+            existing_data_behavior='error',
+        )
+        return written
+    finally:
+        conn.close()
+
+
+def write_snapshot(tables: Optional[Sequence[str]] = None, file_format: str = 'arrow',
+                   root: Path = SNAPSHOT_ROOT, keep: int = SNAPSHOT_KEEP,
+                   batch_size: int = FETCH_BATCH_SIZE) -> Dict:
+    """Construit un nouveau snapshot versionné et le publie comme dernier ; retourne le manifest"""
+    _require_pyarrow()
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"Format inconnu: {file_format} ({', '.join(FILE_FORMATS)})")
+
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    version = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    staging = root / f'.{version}.tmp'
+    staging.mkdir()
+
+    manifest = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'version': version,
+        'created_at': datetime.now().isoformat(),
+        'file_format': file_format,
+        'tables': {},
+    }
+    try:
+        for name in tables or SNAPSHOT_TABLES:
+            table = SNAPSHOT_TABLES[name]
+            started = datetime.now()
+            rows = _write_table(name, table, staging, file_format, batch_size)
+            if rows is None:
+                continue
+            manifest['tables'][name] = {
+                'rows': rows,
+                'columns': [column for column, _ in table.columns],
+                'partition_by': list(table.partition_by),
+            }
+            print(f"[SNAPSHOT] ✅ {name}: {rows:,} lignes ({(datetime.now() - started).total_seconds():.1f}s)")
+
+        with open(staging / 'manifest.json', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.rename(staging, root / version)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    # Pointeur remplacé atomiquement : les lecteurs voient l'ancien ou le nouveau snapshot, jamais un mélange
+    pointer_tmp = root / f'.{LATEST_POINTER}.tmp'
+    pointer_tmp.write_text(version, encoding='utf-8')
+    os.replace(pointer_tmp, root / LATEST_POINTER)
+
+    prune_snapshots(root, keep)
+    return manifest
+
+
+def list_snapshots(root: Path = SNAPSHOT_ROOT) -> List[str]:
+    """Versions publiées, de la plus ancienne à la plus récente"""
+    root = Path(root)
+    if not root.exists():
+        return []
+    return sorted(p.name for p in root.iterdir()
+                  if p.is_dir() and not p.name.startswith('.') and (p / 'manifest.json').exists())
+
+
+def prune_snapshots(root: Path = SNAPSHOT_ROOT, keep: int = SNAPSHOT_KEEP) -> List[str]:
+    """Supprime les anciennes versions (le dernier snapshot publié est toujours conservé)"""
+    root = Path(root)
+    latest = latest_snapshot(root)
+    removed = []
+    for version in list_snapshots(root)[:-max(1, keep)]:
+        if latest is not None and version == latest.name:
+            continue
+        shutil.rmtree(root / version, ignore_errors=True)
+        removed.append(version)
+    return removed
+
+
+def latest_snapshot(root: Path = SNAPSHOT_ROOT) -> Optional[Path]:
+    root = Path(root)
+    pointer = root / LATEST_POINTER
+    if not pointer.exists():
+        return None
+    path = root / pointer.read_text(encoding='utf-8').strip()
+    return path if (path / 'manifest.json').exists() else None
+
+
+def snapshot_available(table: str = 'videos', root: Path = SNAPSHOT_ROOT) -> bool:
+    if not PYARROW_AVAILABLE:
+        return False
+    snapshot = latest_snapshot(root)
+    return snapshot is not None and (snapshot / table).exists()
+
+
+def read_manifest(snapshot: Optional[Path] = None) -> Dict:
+    snapshot = snapshot or latest_snapshot()
+    if snapshot is None:
+        raise FileNotFoundError(f"Aucun snapshot analytique dans {SNAPSHOT_ROOT}")
+    with open(Path(snapshot) / 'manifest.json', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def open_dataset(name: str, snapshot: Optional[Path] = None):
+    """Dataset Arrow d'une table du snapshot, fichiers memory-mappés"""
+    _require_pyarrow()
+    snapshot = Path(snapshot) if snapshot else latest_snapshot()
+    if snapshot is None:
+        raise FileNotFoundError(f"Aucun snapshot analytique dans {SNAPSHOT_ROOT}")
+    manifest = read_manifest(snapshot)
+    if name not in manifest['tables']:
+        raise KeyError(f"Table absente du snapshot {manifest['version']}: {name}")
+    return ds.dataset(
+        str(snapshot / name), format=FILE_FORMATS[manifest['file_format']],
+        partitioning=partitioning(SNAPSHOT_TABLES[name]),
+        filesystem=pafs.LocalFileSystem(use_mmap=True),
+    )
+
+
+def load_table(name: str, columns: Optional[Sequence[str]] = None, country: Optional[str] = None,
+               competitor_id: Optional[int] = None, snapshot: Optional[Path] = None):
+    """Table Arrow filtrée ; les filtres pays/concurrent n'ouvrent que les partitions concernées"""
+    dataset = open_dataset(name, snapshot)
+    expression = None
+    if country is not None:
+        expression = pc.field('country') == country
+    if competitor_id is not None:
+        condition = pc.field('competitor_id') == competitor_id
+        expression = condition if expression is None else expression & condition
+    return dataset.to_table(columns=list(columns) if columns else None, filter=expression)
+
+
+def load_records(name: str, columns: Optional[Sequence[str]] = None, **filters) -> List[Dict]:
+    """Lignes en dictionnaires, pour le code existant qui travaillait sur les exports JSON"""
+    return load_table(name, columns, **filters).to_pylist()
+
+
+def competitor_metrics(country: Optional[str] = None, snapshot: Optional[Path] = None):
+    """Agrégats vidéo par concurrent calculés sur les colonnes (sans passer par SQLite)"""
+    videos = load_table('videos', ['competitor_id', 'competitor_name', 'country', 'view_count',
+                                   'like_count', 'comment_count', 'is_short'],
+                        country=country, snapshot=snapshot)
+    return videos.group_by(['competitor_id', 'competitor_name', 'country']).aggregate([
+        ('view_count', 'count'), ('view_count', 'sum'), ('view_count', 'mean'),
+        ('like_count', 'sum'), ('comment_count', 'sum'), ('is_short', 'sum'),
+    ]).sort_by([('view_count_sum', 'descending')])
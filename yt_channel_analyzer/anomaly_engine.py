@@ -0,0 +1,265 @@
+"""
+Moteur de détection d'anomalies en une passe
+- Une seule requête groupée construit le tableau d'agrégats par concurrent
+- Chaque règle est évaluée en vectoriel (numpy) sur tous les concurrents à la fois
+- Résultat : table d'anomalies classée par gravité, pour ne corriger que les concurrents signalés
+"""
+
+import sqlite3
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+SEVERITY_WEIGHTS = {'CRITICAL': 4, 'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
+
+# Dates d'import connues pour avoir écrasé published_at
+SUSPICIOUS_IMPORT_DATES = ('2025-07-05', '2025-01-07', '2025-07-11')
+_SUSPICIOUS_DATES_SQL = ', '.join(f"'{d}'" for d in SUSPICIOUS_IMPORT_DATES)
+
+AGGREGATE_QUERY = f"""
+    SELECT
+        c.id, c.name,
+        COUNT(v.id) AS video_count,
+        COUNT(CASE WHEN v.category = 'hero' THEN 1 END) AS hero,
+        COUNT(CASE WHEN v.category = 'hub' THEN 1 END) AS hub,
+        COUNT(CASE WHEN v.category = 'help' THEN 1 END) AS help,
+        COUNT(CASE WHEN v.id IS NOT NULL AND (v.category IS NULL OR v.category = '' OR v.category = 'uncategorized') THEN 1 END) AS uncategorized,
+        COUNT(CASE WHEN v.duration_seconds > 0 THEN 1 END) AS valid_durations,
+        COUNT(CASE WHEN v.id IS NOT NULL AND (v.duration_seconds = 0 OR v.duration_seconds IS NULL) THEN 1 END) AS invalid_durations,
+        AVG(v.duration_seconds) AS avg_duration,
+        COUNT(CASE WHEN v.duration_seconds > 0 AND v.duration_seconds <= 60 THEN 1 END) AS shorts,
+        COUNT(DISTINCT DATE(v.published_at)) AS distinct_dates,
+        COUNT(CASE WHEN DATE(v.published_at) IN ({_SUSPICIOUS_DATES_SQL}) THEN 1 END) AS suspicious_dates,
+        COUNT(julianday(v.published_at)) AS dated_videos,
+        CAST(MAX(julianday(v.published_at)) - MIN(julianday(v.published_at)) AS INTEGER) AS date_span_days,
+        COUNT(CASE WHEN v.view_count > 0 THEN 1 END) AS viewed_videos,
+        SUM(CASE WHEN v.view_count > 0 THEN v.view_count END) AS total_views,
+        MIN(CASE WHEN v.view_count > 0 THEN v.view_count END) AS min_views,
+        MAX(CASE WHEN v.view_count > 0 THEN v.view_count END) AS max_views,
+        SUM(CASE WHEN v.like_count > 0 THEN v.like_count END) AS total_likes,
+        COALESCE(p.playlist_count, 0) AS playlist_count
+    FROM concurrent c
+    LEFT JOIN video v ON v.concurrent_id = c.id
+    LEFT JOIN (
+        SELECT concurrent_id, COUNT(*) AS playlist_count FROM playlist GROUP BY concurrent_id
+    ) p ON p.concurrent_id = c.id
+    WHERE c.channel_id IS NOT NULL AND c.channel_id != ''
+    {{competitor_filter}}
+    GROUP BY c.id
+    ORDER BY c.name
+"""
+
+NUMERIC_COLUMNS = (
+    'video_count', 'hero', 'hub', 'help', 'uncategorized', 'valid_durations', 'invalid_durations',
+    'avg_duration', 'shorts', 'distinct_dates', 'suspicious_dates', 'dated_videos', 'date_span_days',
+    'viewed_videos', 'total_views', 'min_views', 'max_views', 'total_likes', 'playlist_count'
+)
+
+
+class CompetitorFrame:
+    """Agrégats par concurrent en colonnes numpy (NaN pour les valeurs SQL NULL)"""
+
+    def __init__(self, rows: List[tuple]):
+        self.ids = [row[0] for row in rows]
+        self.names = [row[1] for row in rows]
+        columns = list(zip(*rows)) if rows else [()] * (len(NUMERIC_COLUMNS) + 2)
+        self.columns = {
+            name: np.array(values, dtype=float)
+            for name, values in zip(NUMERIC_COLUMNS, columns[2:])
+        }
+        self._derive()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['columns'][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    @staticmethod
+    def _ratio(numerator, denominator, scale: float = 1.0):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1) * scale, np.nan)
+
+    def _derive(self):
+        c = self.columns
+        c['classified'] = c['hero'] + c['hub'] + c['help']
+        c['hero_pct'] = self._ratio(c['hero'], c['classified'], 100)
+        c['hub_pct'] = self._ratio(c['hub'], c['classified'], 100)
+        c['help_pct'] = self._ratio(c['help'], c['classified'], 100)
+        c['uncategorized_pct'] = self._ratio(c['uncategorized'], c['video_count'], 100)
+        c['invalid_durations_pct'] = self._ratio(c['invalid_durations'], c['video_count'], 100)
+        c['suspicious_dates_pct'] = self._ratio(c['suspicious_dates'], c['video_count'], 100)
+        c['avg_minutes'] = c['avg_duration'] / 60
+        c['avg_views'] = self._ratio(c['total_views'], c['viewed_videos'])
+        c['view_ratio'] = self._ratio(c['min_views'], c['max_views'])
+        c['engagement_rate'] = np.where(c['total_likes'] > 0, self._ratio(c['total_likes'], c['total_views'], 100), np.nan)
+        c['shorts_pct'] = self._ratio(c['shorts'], c['valid_durations'], 100)
+        c['frequency_per_week'] = np.where(
+            c['dated_videos'] >= 2, self._ratio(c['dated_videos'], c['date_span_days'], 7), np.nan
+        )
+
+
+@dataclass(frozen=True)
+class AnomalyRule:
+    """Règle vectorielle : masque booléen sur le tableau + description d'une ligne signalée"""
+    type: str
+    severity: str
+    mask: Callable[[CompetitorFrame], np.ndarray]
+    details: Callable[[CompetitorFrame, int], str]
+
+
+@dataclass
+class Anomaly:
+    """Anomalie détectée pour un concurrent"""
+    competitor_id: int
+    competitor: str
+    type: str
+    severity: str
+    details: str
+
+    @property
+    def weight(self) -> int:
+        return SEVERITY_WEIGHTS.get(self.severity, 0)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+RULES = (
+    # Volume
+    AnomalyRule('NO_VIDEOS', 'CRITICAL', lambda f: f.video_count == 0,
+                lambda f, i: "Aucune vidéo en base"),
+    # Distribution HHH
+    AnomalyRule('UNCATEGORIZED_VIDEOS', 'HIGH', lambda f: f.uncategorized > 0,
+                lambda f, i: f"{f.uncategorized[i]:.0f} vidéos ({f.uncategorized_pct[i]:.1f}%) non classifiées"),
+    AnomalyRule('ZERO_HERO', 'HIGH', lambda f: (f.classified > 0) & (f.hero == 0),
+                lambda f, i: f"0% de contenu HERO sur {f.classified[i]:.0f} vidéos"),
+    AnomalyRule('TOO_MUCH_HERO', 'MEDIUM', lambda f: f.hero_pct > 80,
+                lambda f, i: f"{f.hero_pct[i]:.1f}% HERO (déséquilibré)"),
+    AnomalyRule('ZERO_HELP', 'HIGH', lambda f: (f.classified > 20) & (f.help == 0),
+                lambda f, i: f"0% de contenu HELP sur {f.classified[i]:.0f} vidéos"),
+    AnomalyRule('TOO_MUCH_HELP', 'MEDIUM', lambda f: f.help_pct > 80,
+                lambda f, i: f"{f.help_pct[i]:.1f}% HELP (déséquilibré)"),
+    AnomalyRule('TOO_MUCH_HUB', 'HIGH', lambda f: f.hub_pct > 95,
+                lambda f, i: f"{f.hub_pct[i]:.1f}% HUB (quasi-monopole)"),
+    # Durées
+    AnomalyRule('INVALID_DURATIONS', 'MEDIUM', lambda f: f.invalid_durations > 0,
+                lambda f, i: f"{f.invalid_durations[i]:.0f} vidéos ({f.invalid_durations_pct[i]:.1f}%) sans durée"),
+    AnomalyRule('EXTREMELY_LONG_VIDEOS', 'MEDIUM', lambda f: (f.avg_duration > 0) & (f.avg_minutes > 60),
+                lambda f, i: f"Durée moyenne {f.avg_minutes[i]:.1f} min (suspicieusement long)"),
+    AnomalyRule('EXTREMELY_SHORT_VIDEOS', 'MEDIUM', lambda f: (f.avg_duration > 0) & (f.avg_minutes < 0.5),
+                lambda f, i: f"Durée moyenne {f.avg_minutes[i]:.1f} min (suspicieusement court)"),
+    AnomalyRule('NO_DURATION_DATA', 'HIGH', lambda f: ~(f.avg_duration > 0),
+                lambda f, i: "Aucune donnée de durée valide"),
+    # Dates
+    AnomalyRule('CORRUPTED_DATES', 'HIGH', lambda f: f.suspicious_dates > 0,
+                lambda f, i: f"{f.suspicious_dates[i]:.0f} vidéos ({f.suspicious_dates_pct[i]:.1f}%) avec dates d'import suspectes"),
+    AnomalyRule('DATE_UNIFORMITY', 'MEDIUM', lambda f: (f.distinct_dates < 3) & (f.video_count > 10),
+                lambda f, i: f"Seulement {f.distinct_dates[i]:.0f} dates distinctes pour {f.video_count[i]:.0f} vidéos"),
+    # Playlists
+    AnomalyRule('NO_PLAYLISTS', 'MEDIUM', lambda f: f.playlist_count == 0,
+                lambda f, i: "Aucune playlist en base"),
+    AnomalyRule('TOO_MANY_PLAYLISTS', 'LOW', lambda f: f.playlist_count > 100,
+                lambda f, i: f"{f.playlist_count[i]:.0f} playlists (potentiellement excessif)"),
+    # Vues et engagement
+    AnomalyRule('VERY_LOW_VIEWS', 'MEDIUM', lambda f: f.avg_views < 10,
+                lambda f, i: f"Moyenne {f.avg_views[i]:.0f} vues (très faible)"),
+    AnomalyRule('VERY_HIGH_VIEWS', 'LOW', lambda f: f.avg_views > 1000000,
+                lambda f, i: f"Moyenne {f.avg_views[i]:.0f} vues (exceptionnellement élevé)"),
+    AnomalyRule('EXTREME_VIEW_VARIANCE', 'LOW', lambda f: f.view_ratio < 0.001,
+                lambda f, i: f"Ratio min/max: {f.view_ratio[i]:.6f} (variance extrême)"),
+    AnomalyRule('LOW_ENGAGEMENT', 'MEDIUM', lambda f: f.engagement_rate < 0.1,
+                lambda f, i: f"Taux d'engagement {f.engagement_rate[i]:.3f}% très faible"),
+    AnomalyRule('SUSPICIOUSLY_HIGH_ENGAGEMENT', 'LOW', lambda f: f.engagement_rate > 10,
+                lambda f, i: f"Taux d'engagement {f.engagement_rate[i]:.3f}% suspicieusement élevé"),
+    # Shorts
+    AnomalyRule('ONLY_SHORTS', 'LOW', lambda f: (f.shorts_pct == 100) & (f.valid_durations > 5),
+                lambda f, i: "100% de shorts uniquement"),
+    AnomalyRule('NO_SHORTS', 'LOW', lambda f: (f.shorts_pct == 0) & (f.valid_durations > 10),
+                lambda f, i: "Aucun short créé"),
+    # Fréquence de publication
+    AnomalyRule('IMPOSSIBLE_FREQUENCY', 'HIGH', lambda f: f.frequency_per_week > 50,
+                lambda f, i: f"{f.frequency_per_week[i]:.1f} vidéos/semaine (impossible)"),
+    AnomalyRule('VERY_LOW_FREQUENCY', 'LOW', lambda f: (f.frequency_per_week < 0.1) & (f.video_count > 5),
+                lambda f, i: f"{f.frequency_per_week[i]:.2f} vidéos/semaine (très inactif)"),
+)
+
+
+class AnomalyTable:
+    """Anomalies classées : gravité décroissante, puis concurrents les plus touchés d'abord"""
+
+    def __init__(self, anomalies: List[Anomaly], competitors_scanned: int, elapsed: float):
+        scores = defaultdict(int)
+        for anomaly in anomalies:
+            scores[anomaly.competitor_id] += anomaly.weight
+        self.scores = dict(scores)
+        self.anomalies = sorted(
+            anomalies,
+            key=lambda a: (-a.weight, -scores[a.competitor_id], a.competitor, a.type)
+        )
+        self.competitors_scanned = competitors_scanned
+        self.elapsed = elapsed
+
+    def __len__(self):
+        return len(self.anomalies)
+
+    def __iter__(self):
+        return iter(self.anomalies)
+
+    def by_competitor(self) -> Dict[int, List[Anomaly]]:
+        """Anomalies regroupées par concurrent, concurrents classés par score de gravité"""
+        grouped = defaultdict(list)
+        for anomaly in self.anomalies:
+            grouped[anomaly.competitor_id].append(anomaly)
+        return dict(sorted(grouped.items(), key=lambda item: -self.scores[item[0]]))
+
+    def flagged_ids(self) -> List[int]:
+        return list(self.by_competitor())
+
+    def of_type(self, *types: str) -> List[Anomaly]:
+        return [a for a in self.anomalies if a.type in types]
+
+    def to_dicts(self) -> List[Dict]:
+        return [a.to_dict() for a in self.anomalies]
+
+
+class AnomalyEngine:
+    """Charge le tableau d'agrégats puis applique toutes les règles en une passe"""
+
+    def __init__(self, rules: Iterable[AnomalyRule] = RULES):
+        self.rules = tuple(rules)
+
+    def load_frame(self, conn: sqlite3.Connection, competitor_ids: Optional[Iterable[int]] = None) -> CompetitorFrame:
+        params = []
+        competitor_filter = ''
+        if competitor_ids is not None:
+            params = list(competitor_ids)
+            competitor_filter = f"AND c.id IN ({', '.join('?' * len(params))})" if params else "AND 0"
+        query = AGGREGATE_QUERY.format(competitor_filter=competitor_filter)
+        return CompetitorFrame(conn.execute(query, params).fetchall())
+
+    def evaluate(self, frame: CompetitorFrame) -> List[Anomaly]:
+        if not len(frame):
+            return []
+        # Un concurrent sans vidéo n'est signalé que par NO_VIDEOS
+        has_videos = frame.video_count > 0
+        anomalies = []
+        for rule in self.rules:
+            mask = rule.mask(frame)
+            if rule.type != 'NO_VIDEOS':
+                mask = mask & has_videos
+            for i in np.flatnonzero(mask):
+                anomalies.append(Anomaly(frame.ids[i], frame.names[i], rule.type, rule.severity, rule.details(frame, i)))
+        return anomalies
+
+    def detect(self, conn: sqlite3.Connection, competitor_ids: Optional[Iterable[int]] = None) -> AnomalyTable:
+        started = time.perf_counter()
+        frame = self.load_frame(conn, competitor_ids)
+        anomalies = self.evaluate(frame)
+        return AnomalyTable(anomalies, len(frame), time.perf_counter() - started)
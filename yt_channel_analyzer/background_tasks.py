@@ -3,17 +3,22 @@ import time
 import uuid
 from datetime import datetime
 from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, asdict, field, fields
 import json
 import os
 
+from .job_queue import (
+    SQLiteJobQueue, WorkerPool, JobContext, JobCancelled, PermanentJobError,
+    ProgressCoalescer, PRIORITY_NORMAL
+)
+
 @dataclass
 class BackgroundTask:
     """Représente une tâche en arrière-plan"""
     id: str
     channel_url: str
     channel_name: str
-    status: str  # 'running', 'completed', 'error', 'paused'
+    status: str  # 'queued', 'running', 'completed', 'error', 'paused'
     progress: int  # 0-100
     current_step: str
     videos_found: int
@@ -26,71 +31,125 @@ class BackgroundTask:
     task_type: str = 'channel_analysis'  # 'channel_analysis', 'sentiment_analysis', etc.
     description: str = ''
     extra_data: dict = field(default_factory=dict)
-    
+    priority: int = PRIORITY_NORMAL
+    attempts: int = 0
+    max_attempts: int = 3
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return self.channel_name
+
+    @classmethod
+    def from_row(cls, row: Dict) -> 'BackgroundTask':
+        known = {f.name for f in fields(cls)}
+        data = {k: v for k, v in row.items() if k in known}
+        for key in ('progress', 'videos_found', 'videos_processed', 'total_estimated', 'priority', 'attempts'):
+            data[key] = data.get(key) or 0
+        data['start_time'] = data.get('start_time') or data.get('created_at') or ''
+        data['current_step'] = data.get('current_step') or ''
+        data['description'] = data.get('description') or ''
+        data['task_type'] = data.get('task_type') or 'channel_analysis'
+        data['max_attempts'] = data.get('max_attempts') or 1
+        return cls(**data)
+
     def to_dict(self):
         return asdict(self)
 
+# Champs de progression coalescés ; les autres (statut, erreur...) sont écrits immédiatement
+PROGRESS_FIELDS = {'progress', 'current_step', 'videos_found', 'videos_processed', 'total_estimated'}
+
 class BackgroundTaskManager:
-    """Gestionnaire des tâches en arrière-plan"""
-    
-    def __init__(self):
-        self.tasks: Dict[str, BackgroundTask] = {}
-        self.running_tasks: Dict[str, threading.Thread] = {}
+    """Gestionnaire des tâches en arrière-plan (file durable SQLite + pool de workers borné)"""
+
+    def __init__(self, max_workers: int = None):
         self.task_file = "cache_recherches/background_tasks.json"
-        self.stop_flags: Dict[str, bool] = {}  # Flags d'arrêt pour chaque tâche
-        self.load_tasks()
-    
-    def load_tasks(self):
-        """Charge les tâches depuis le fichier"""
+        self.queue = SQLiteJobQueue()
+        self.pool = WorkerPool(
+            self.queue,
+            max_workers=max_workers or int(os.getenv('BACKGROUND_TASK_WORKERS', 3))
+        )
+        self.pool.register('channel_analysis', self._channel_analysis_job)
+        self.pool.register('post_import_workflow', self._post_import_job)
+        # Progression des tâches hors pool (start_generic_task) : une écriture par intervalle
+        self._progress: Dict[str, ProgressCoalescer] = {}
+        self._progress_lock = threading.Lock()
+        self._started = False
+
+    def start(self):
+        """Démarrage applicatif : migration de l'ancien fichier JSON et reprise des jobs en attente"""
+        if self._started:
+            return
+        self._started = True
+        self.migrate_to_database()
+        # Reprendre les jobs programmés (nouvelles tentatives, processus redémarré)
         try:
-            if os.path.exists(self.task_file):
-                with open(self.task_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for task_data in data:
-                        task = BackgroundTask(**task_data)
-                        # Marquer les tâches "running" comme interrompues au redémarrage
-                        if task.status == 'running':
-                            task.status = 'paused'
-                        self.tasks[task.id] = task
+            if self.queue.has_pending():
+                self.pool.start()
         except Exception as e:
-            print(f"[TASKS] Erreur lors du chargement des tâches: {e}")
-    
-    def save_tasks(self):
-        """Sauvegarde les tâches dans le fichier"""
+            print(f"[TASKS] Impossible de vérifier la file: {e}")
+
+    def migrate_to_database(self) -> int:
+        """Importe l'ancien fichier JSON dans la table background_tasks (une seule fois)"""
+        if not os.path.exists(self.task_file):
+            return 0
+
+        migrated = 0
         try:
-            os.makedirs(os.path.dirname(self.task_file), exist_ok=True)
-            with open(self.task_file, 'w', encoding='utf-8') as f:
-                tasks_data = [task.to_dict() for task in self.tasks.values()]
-                json.dump(tasks_data, f, indent=2, ensure_ascii=False)
+            with open(self.task_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            existing = {job['id'] for job in self.queue.list_jobs()}
+            for task_data in data:
+                if task_data.get('id') in existing:
+                    continue
+                task = BackgroundTask(**{k: v for k, v in task_data.items() if k != 'warning'})
+                # Les tâches "running" d'un ancien processus sont marquées interrompues
+                status = 'paused' if task.status == 'running' else task.status
+                self.queue.enqueue(
+                    task.id, task.task_type,
+                    channel_url=task.channel_url, channel_name=task.channel_name, schedule=False,
+                    status=status, progress=task.progress, current_step=task.current_step,
+                    videos_found=task.videos_found, videos_processed=task.videos_processed,
+                    total_estimated=task.total_estimated, start_time=task.start_time,
+                    end_time=task.end_time, error_message=task.error_message,
+                    channel_thumbnail=task.channel_thumbnail, description=task.description,
+                    extra_data=task.extra_data
+                )
+                migrated += 1
+
+            os.replace(self.task_file, self.task_file + '.migrated')
+            print(f"[TASKS] ✅ {migrated} tâches migrées du JSON vers la base de données")
         except Exception as e:
-            print(f"[TASKS] Erreur lors de la sauvegarde des tâches: {e}")
-    
+            print(f"[TASKS] Erreur lors de la migration des tâches: {e}")
+
+        return migrated
+
+    def start_workers(self):
+        """Démarre le pool de workers de ce processus"""
+        self.pool.start()
+
     def start_generic_task(self, task_id: str, task_type: str, description: str, total_estimated: int = 0, extra_data: dict = None) -> str:
-        """Crée une tâche générique (non-YouTube)"""
-        
-        task = BackgroundTask(
-            id=task_id,
+        """Crée une tâche générique (non-YouTube) exécutée hors pool par l'appelant"""
+        self.queue.enqueue(
+            task_id, task_type,
             channel_url=task_type,  # Utilise task_type comme identifiant
             channel_name=description,
+            schedule=False,
             status='running',
-            progress=0,
             current_step='Initialisation...',
-            videos_found=0,
-            videos_processed=0,
             total_estimated=total_estimated,
             start_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            task_type=task_type,
             description=description,
             extra_data=extra_data or {}
         )
-        self.tasks[task_id] = task
-        self.save_tasks()
         return task_id
-    
-    def create_task(self, channel_url: str, channel_name: str) -> str:
-        """Crée une nouvelle tâche"""
+
+    def create_task(self, channel_url: str, channel_name: str, priority: int = PRIORITY_NORMAL) -> str:
+        """Crée une nouvelle tâche (programmée par start_background_scraping)"""
         task_id = str(uuid.uuid4())
-        
+
         # Essayer de récupérer le thumbnail de la chaîne
         channel_thumbnail = None
         try:
@@ -103,35 +162,45 @@ class BackgroundTaskManager:
                 channel_name = channel_info['title']
         except Exception as e:
             print(f"[TASKS] Impossible de récupérer les infos chaîne: {e}")
-        
-        task = BackgroundTask(
-            id=task_id,
+
+        self.queue.enqueue(
+            task_id, 'channel_analysis',
             channel_url=channel_url,
             channel_name=channel_name,
-            status='running',
-            progress=0,
-            current_step='Initialisation...',
-            videos_found=0,
-            videos_processed=0,
-            total_estimated=0,
-            start_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            priority=priority,
+            schedule=False,
             channel_thumbnail=channel_thumbnail
         )
-        self.tasks[task_id] = task
-        self.save_tasks()
         return task_id
-    
+
+    def _coalescer(self, task_id: str) -> ProgressCoalescer:
+        with self._progress_lock:
+            coalescer = self._progress.get(task_id)
+            if coalescer is None:
+                coalescer = self._progress[task_id] = ProgressCoalescer(
+                    lambda pending: self.queue.update(task_id, pending)
+                )
+            return coalescer
+
     def update_task(self, task_id: str, **kwargs):
-        """Met à jour une tâche"""
-        if task_id in self.tasks:
-            for key, value in kwargs.items():
-                if hasattr(self.tasks[task_id], key):
-                    setattr(self.tasks[task_id], key, value)
-            self.save_tasks()
-    
+        """Met à jour une tâche ; la progression est coalescée, les changements de statut écrits tout de suite"""
+        progress_fields = {k: v for k, v in kwargs.items() if k in PROGRESS_FIELDS}
+        other_fields = {k: v for k, v in kwargs.items() if k not in PROGRESS_FIELDS}
+
+        coalescer = self._coalescer(task_id)
+        if other_fields:
+            self.queue.update(task_id, {**coalescer.drain(), **progress_fields, **other_fields})
+        elif progress_fields:
+            coalescer.update(**progress_fields)
+
+    def _finalize(self, task_id: str, **kwargs):
+        self.update_task(task_id, **kwargs)
+        with self._progress_lock:
+            self._progress.pop(task_id, None)
+
     def complete_task(self, task_id: str, videos_processed: int):
         """Marque une tâche comme terminée"""
-        self.update_task(
+        self._finalize(
             task_id,
             status='completed',
             progress=100,
@@ -139,115 +208,111 @@ class BackgroundTaskManager:
             videos_processed=videos_processed,
             end_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         )
-        if task_id in self.running_tasks:
-            del self.running_tasks[task_id]
-    
+
     def error_task(self, task_id: str, error_message: str):
         """Marque une tâche comme échouée"""
-        self.update_task(
+        self._finalize(
             task_id,
             status='error',
             current_step='Erreur',
             error_message=error_message,
             end_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         )
-        if task_id in self.running_tasks:
-            del self.running_tasks[task_id]
-    
+
+    def _to_task(self, row: Dict) -> BackgroundTask:
+        """Construit la tâche en y fusionnant la progression pas encore écrite"""
+        with self._progress_lock:
+            coalescer = self._progress.get(row['id'])
+        if coalescer:
+            row.update(coalescer.peek())
+        pool_context = self.pool.active.get(row['id'])
+        if pool_context:
+            row.update(pool_context._progress.peek())
+        return BackgroundTask.from_row(row)
+
     def get_task(self, task_id: str) -> Optional[BackgroundTask]:
         """Récupère une tâche par son ID"""
-        return self.tasks.get(task_id)
-    
+        row = self.queue.get(task_id)
+        return self._to_task(row) if row else None
+
     def get_all_tasks(self) -> List[BackgroundTask]:
         """Récupère toutes les tâches"""
-        return list(self.tasks.values())
-    
+        return [self._to_task(row) for row in self.queue.list_jobs()]
+
     def get_running_tasks(self) -> List[BackgroundTask]:
         """Récupère les tâches en cours"""
-        return [task for task in self.tasks.values() if task.status == 'running']
-    
-    def cancel_task(self, task_id: str):
-        """Annule une tâche en forçant l'arrêt"""
-        # Déclencher le flag d'arrêt
-        self.stop_flags[task_id] = True
-        
-        # Marquer comme annulée
-        self.update_task(task_id, status='paused', current_step='Arrêt en cours...')
-        
-        # Nettoyer après 3 secondes
-        def cleanup():
-            time.sleep(3)
-            if task_id in self.running_tasks:
-                del self.running_tasks[task_id]
-            if task_id in self.stop_flags:
-                del self.stop_flags[task_id]
-        
-        threading.Thread(target=cleanup, daemon=True).start()
-        print(f"[TASKS] Arrêt forcé demandé pour la tâche {task_id}")
-    
-    def resume_task(self, task_id: str):
+        return [self._to_task(row) for row in self.queue.list_jobs(['running'])]
+
+    def get_completed_tasks(self) -> List[BackgroundTask]:
+        """Récupère les tâches terminées"""
+        return [self._to_task(row) for row in self.queue.list_jobs(['completed'])]
+
+    def cancel_task(self, task_id: str) -> bool:
+        """Demande l'arrêt d'une tâche (pris en compte au prochain heartbeat du worker)"""
+        cancelled = self.queue.request_cancel(task_id)
+        context = self.pool.active.get(task_id)
+        if context:
+            context.cancelled.set()  # Worker local : arrêt immédiat
+        print(f"[TASKS] Arrêt demandé pour la tâche {task_id}")
+        return cancelled
+
+    def resume_task(self, task_id: str) -> bool:
         """Reprend une tâche interrompue depuis son état sauvegardé"""
         task = self.get_task(task_id)
         if not task:
             raise ValueError(f"Tâche {task_id} non trouvée")
-        
+
         if task.status == 'running':
             raise ValueError("Tâche déjà en cours")
-        
+
         # Permettre la reprise de plusieurs statuts
-        allowed_statuses = ['paused', 'error', 'stopped', 'completed', 'failed']
+        allowed_statuses = ['paused', 'error', 'stopped', 'completed', 'failed', 'queued']
         if task.status not in allowed_statuses:
             raise ValueError(f"Impossible de reprendre une tâche avec le statut '{task.status}'")
-        
+
         print(f"[TASKS] Reprise de la tâche {task_id} depuis le statut '{task.status}'")
-        
-        # Marquer comme en cours et reprendre
-        self.update_task(
-            task_id,
-            status='running',
-            current_step='Reprise de la tâche...',
-            end_time=None  # Réinitialiser l'heure de fin
-        )
-        
+
         # Relancer le scraping
         self.start_background_scraping(task_id, task.channel_url)
-        print(f"[TASKS] Tâche {task_id} relancée avec succès")
-    
-    def delete_task(self, task_id: str):
+        print(f"[TASKS] Tâche {task_id} reprogrammée avec succès")
+        return True
+
+    def delete_task(self, task_id: str) -> bool:
         """Supprime définitivement une tâche et ses données associées"""
         task = self.get_task(task_id)
         if not task:
             raise ValueError(f"Tâche {task_id} non trouvée")
-        
+
         # Arrêter la tâche si elle est en cours
-        if task_id in self.running_tasks:
+        if task.status in ('running', 'queued'):
             self.cancel_task(task_id)
-        
+
         # Supprimer les données du cache si elles existent
         try:
             from .cache_utils import load_cache, save_cache, get_channel_key
             cache_data = load_cache()
             channel_key = get_channel_key(task.channel_url)
-            
+
             if channel_key in cache_data:
                 del cache_data[channel_key]
                 save_cache(cache_data)
                 print(f"[TASKS] Données de cache supprimées pour {channel_key}")
         except Exception as e:
             print(f"[TASKS] Erreur lors de la suppression du cache: {e}")
-        
+
         # Supprimer la tâche
-        del self.tasks[task_id]
-        self.save_tasks()
+        self.queue.delete([task_id])
         print(f"[TASKS] Tâche {task_id} supprimée définitivement")
-    
+        return True
+
     def clean_duplicate_tasks(self):
         """Nettoie les tâches en double en gardant celle avec le plus de vidéos"""
         print("[TASKS] 🧹 Début du nettoyage des doublons...")
         
         # Grouper les tâches par nom de chaîne ET par channel_id si disponible
         channel_groups = {}
-        for task_id, task in self.tasks.items():
+        for task in self.get_all_tasks():
+            task_id = task.id
             # Utiliser le nom de chaîne comme clé principale
             channel_name = task.channel_name.lower().strip() if task.channel_name else "unknown"
             
@@ -282,7 +347,7 @@ class BackgroundTaskManager:
                 # Trier par nombre de vidéos (décroissant) puis par date (plus récent en premier)
                 tasks_list.sort(key=lambda x: (
                     -x[1].videos_found,  # Plus de vidéos en premier (négatif pour desc)
-                    -int(x[1].start_time.replace('-', '').replace(' ', '').replace(':', ''))  # Plus récent en premier
+                    -int(x[1].start_time.replace('-', '').replace(' ', '').replace(':', '') or 0)  # Plus récent en premier
                 ))
                 
                 # Garder le premier (celui avec le plus de vidéos et le plus récent)
@@ -294,19 +359,10 @@ class BackgroundTaskManager:
                     tasks_to_delete.append(task_id)
                     print(f"[TASKS] ❌ Supprime: {task.channel_name} ({task.videos_found} vidéos, {task.start_time}) - URL: {task.channel_url}")
         
-        # Supprimer les doublons
-        deleted_count = 0
-        for task_id in tasks_to_delete:
-            try:
-                # Supprimer sans toucher au cache (pour préserver les données)
-                del self.tasks[task_id]
-                deleted_count += 1
-            except KeyError:
-                print(f"[TASKS] ⚠️ Tâche {task_id} déjà supprimée")
+        # Supprimer les doublons (sans toucher au cache pour préserver les données)
+        deleted_count = self.queue.delete(tasks_to_delete)
         
-        # Sauvegarder les modifications
         if deleted_count > 0:
-            self.save_tasks()
             print(f"[TASKS] 🎉 Nettoyage terminé: {deleted_count} doublons supprimés sur {duplicates_found} groupes")
         else:
             print("[TASKS] ✨ Aucun doublon trouvé")
@@ -314,50 +370,50 @@ class BackgroundTaskManager:
         return deleted_count
     
     def start_background_scraping(self, task_id: str, channel_url: str, **kwargs):
-        """Lance le scraping en arrière-plan pour une tâche
+        """Programme le scraping d'une tâche dans la file durable
         
         Args:
             task_id: ID de la tâche
             channel_url: URL de la chaîne YouTube
-            **kwargs: Paramètres supplémentaires (max_videos, etc.)
+            **kwargs: Paramètres supplémentaires (max_videos, priority, etc.)
         """
         # 🚀 ACCEPTER les paramètres pour import complet
         max_videos = kwargs.get('max_videos', 1000)
         print(f"[TASKS] 📊 Paramètres reçus: max_videos={max_videos}")
-            
-        if task_id in self.running_tasks:
+        
+        task = self.queue.get(task_id)
+        if task and task['status'] == 'running' and task.get('lease_owner'):
             return  # Déjà en cours
         
-        # Réinitialiser le flag d'arrêt
-        self.stop_flags[task_id] = False
+        payload = {'channel_url': channel_url, 'max_videos': max_videos}
+        if task is None:
+            self.queue.enqueue(task_id, 'channel_analysis', payload, channel_url=channel_url,
+                               priority=kwargs.get('priority', PRIORITY_NORMAL))
+        else:
+            self.queue.schedule(task_id, payload=payload, priority=kwargs.get('priority'))
         
-        thread = threading.Thread(
-            target=self._background_scraping_worker,
-            args=(task_id, channel_url, max_videos),
-            daemon=True
-        )
-        self.running_tasks[task_id] = thread
-        thread.start()
+        self.pool.start()
+        self.pool.notify()
     
-    def _background_scraping_worker(self, task_id: str, channel_url: str, max_videos: int = 1000):
-        """Worker pour le scraping en arrière-plan avec API YouTube"""
+    def _channel_analysis_job(self, ctx: JobContext):
+        """Job de scraping en arrière-plan avec API YouTube"""
+        task_id = ctx.task_id
+        channel_url = ctx.payload.get('channel_url') or ctx.job['channel_url']
+        max_videos = ctx.payload.get('max_videos', 1000)
+        
         try:
             from .youtube_adapter import get_channel_videos_data_api
-            from .cache_utils import load_cache, get_channel_key, save_cache
+            from .cache_utils import load_cache, get_channel_key
             
             # Log du changement vers l'API
-            print(f"[TASKS] 🚀 Utilisation de l'API YouTube pour la tâche {task_id}")
-            self.update_task(task_id, current_step='🚀 Démarrage API YouTube...', progress=1)
-            
-            print(f"[TASKS] 📦 Import des modules terminé pour {task_id}")
-            self.update_task(task_id, current_step='📦 Modules chargés...', progress=3)
+            print(f"[TASKS] 🚀 Utilisation de l'API YouTube pour la tâche {task_id} (tentative {ctx.attempt})")
+            ctx.progress(current_step='🚀 Démarrage API YouTube...', progress=1)
             
             # Charger les données existantes
             print(f"[TASKS] 💾 Chargement du cache pour {task_id}")
-            self.update_task(task_id, current_step='💾 Chargement du cache...', progress=5)
+            ctx.progress(current_step='💾 Chargement du cache...', progress=5)
             
             cache_data = load_cache()
-            print(f"[TASKS] 🔑 Génération clé channel pour {task_id}: {channel_url}")
             channel_key = get_channel_key(channel_url)
             existing_videos = []
             
@@ -367,142 +423,141 @@ class BackgroundTaskManager:
             else:
                 print(f"[TASKS] 🆕 Nouveau channel, aucune vidéo en cache")
             
-            self.update_task(
-                task_id, 
+            ctx.progress(
                 current_step='🔍 Préparation API YouTube...', 
                 progress=10,
                 videos_found=len(existing_videos)
             )
             
             # Vérifier la clé API avant de continuer
-            import os
             api_key = os.getenv('YOUTUBE_API_KEY')
             if not api_key:
-                raise ValueError("❌ Clé API YouTube non configurée (YOUTUBE_API_KEY)")
+                raise PermanentJobError("❌ Clé API YouTube manquante - Contactez l'admin")
             
-            print(f"[TASKS] 🔑 Clé API trouvée: {api_key[:10]}...")
             print(f"[TASKS] 🎯 Lancement de l'API pour {channel_url}")
-            self.update_task(task_id, current_step='🎯 Connexion API YouTube...', progress=15)
-            
-            # Lancer le scraping avec callback de progression
-            def progress_callback(step: str, progress: int, videos_found: int, videos_processed: int):
-                # Vérifier le flag d'arrêt
-                if self.stop_flags.get(task_id, False):
-                    self.update_task(task_id, status='paused', current_step='Arrêté par l\'utilisateur')
-                    raise InterruptedError("Tâche arrêtée par l'utilisateur")
-                
-                self.update_task(
-                    task_id,
-                    current_step=step,
-                    progress=progress,
-                    videos_found=videos_found,
-                    videos_processed=videos_processed
-                )
+            ctx.progress(current_step='🎯 Connexion API YouTube...', progress=15)
             
             # Scraping complet en mode background avec API YouTube
-            print(f"[TASKS] ⚡ Appel get_channel_videos_data_api pour {task_id}")
-            self.update_task(task_id, current_step='⚡ Récupération vidéos via API...', progress=20)
+            ctx.progress(force=True, current_step='⚡ Récupération vidéos via API...', progress=20)
             
-            try:
-                # 🚀 UTILISER la limite reçue (0 = illimité)
-                video_limit = max_videos if max_videos > 0 else 10000  # 0 = illimité = 10000 max pour sécurité
-                print(f"[TASKS] 🎯 Limite vidéos: {video_limit} (max_videos={max_videos})")
-                
-                all_videos = get_channel_videos_data_api(
-                    channel_url, 
-                    video_limit=video_limit
-                )
-                print(f"[TASKS] ✅ API terminée, {len(all_videos) if all_videos else 0} vidéos récupérées")
-                self.update_task(task_id, current_step='✅ Vidéos récupérées...', progress=60)
-            except Exception as api_error:
-                print(f"[TASKS] ❌ Erreur API: {api_error}")
-                self.update_task(task_id, current_step=f'❌ Erreur API: {str(api_error)[:50]}...', progress=20)
-                raise api_error
+            # 🚀 UTILISER la limite reçue (0 = illimité)
+            video_limit = max_videos if max_videos > 0 else 10000  # 0 = illimité = 10000 max pour sécurité
+            print(f"[TASKS] 🎯 Limite vidéos: {video_limit} (max_videos={max_videos})")
             
-            # Mettre à jour le progress après récupération
-            if all_videos:
-                videos_found = len(all_videos)
-                self.update_task(task_id, 
-                    current_step=f'Processing {videos_found} videos...', 
-                    progress=80,
-                    videos_found=videos_found,
-                    videos_processed=0
-                )
+            all_videos = get_channel_videos_data_api(
+                channel_url, 
+                video_limit=video_limit
+            ) or []
+            print(f"[TASKS] ✅ API terminée, {len(all_videos)} vidéos récupérées")
+            
+            ctx.progress(
+                current_step=f'Processing {len(all_videos)} videos...', 
+                progress=80,
+                videos_found=len(all_videos),
+                videos_processed=0
+            )
             
             # Sauvegarder les résultats (même si c'est partiel)
-            self.update_task(task_id, current_step='Sauvegarde...', progress=95)
+            ctx.progress(force=True, current_step='Sauvegarde...', progress=95)
             
             print(f"[TASKS] 💾 Sauvegarde de {len(all_videos)} vidéos pour {channel_url}")
             
-            # Mise à jour du cache avec toutes les vidéos
             from .cache_utils import save_competitor_data
             try:
                 competitor_id = save_competitor_data(channel_url, all_videos)
                 print(f"[TASKS] ✅ Sauvegarde réussie pour {channel_url}")
                 
-                # 🚀 WORKFLOW AUTOMATIQUE COMPLET POST-IMPORT
+                # 🚀 WORKFLOW POST-IMPORT : job séparé, la tâche d'import se termine tout de suite
                 if competitor_id:
-                    print(f"[TASKS] 🚀 Lancement du workflow automatique pour competitor_id: {competitor_id}")
                     try:
-                        from .import_workflow import workflow_manager
-                        
-                        self.update_task(task_id, current_step='🚀 Workflow post-import...', progress=97)
-                        
-                        # Exécuter le workflow complet
-                        workflow_results = workflow_manager.run_post_import_workflow(
-                            competitor_id, channel_url
-                        )
-                        
-                        # Afficher les résultats
-                        print(f"[TASKS] ✅ Workflow terminé:")
-                        for step_name, step_result in workflow_results['steps'].items():
-                            status = step_result.get('status', 'unknown')
-                            print(f"[TASKS]    - {step_name}: {status}")
-                        
+                        workflow_task_id = self.enqueue_post_import(competitor_id, channel_url)
+                        print(f"[TASKS] 🚀 Workflow post-import programmé ({workflow_task_id})")
                     except Exception as workflow_error:
                         print(f"[TASKS] ⚠️ Erreur workflow (non critique): {workflow_error}")
-                        import traceback
-                        traceback.print_exc()
                     
             except Exception as save_error:
                 print(f"[TASKS] ❌ Erreur de sauvegarde: {save_error}")
                 import traceback
                 traceback.print_exc()
             
-            # Marquer comme terminé
-            self.complete_task(task_id, len(all_videos))
-            
             print(f"[TASKS] Tâche {task_id} terminée avec succès: {len(all_videos)} vidéos")
+            return {'videos_processed': len(all_videos), 'videos_found': len(all_videos)}
             
-        except InterruptedError as e:
-            # Tâche arrêtée volontairement
-            self.update_task(task_id, status='paused', current_step='Arrêté par l\'utilisateur')
-            print(f"[TASKS] Tâche {task_id} arrêtée par l'utilisateur")
+        except (JobCancelled, PermanentJobError):
+            raise
         except Exception as e:
             error_msg = str(e)
             print(f"[TASKS] ❌ Erreur dans la tâche {task_id}: {error_msg}")
-            import traceback
-            traceback.print_exc()
             
-            # Message d'erreur plus informatif selon le type
+            # Erreurs définitives : inutile de réessayer
             if "YOUTUBE_API_KEY" in error_msg:
-                user_error = "❌ Clé API YouTube manquante - Contactez l'admin"
+                raise PermanentJobError("❌ Clé API YouTube manquante - Contactez l'admin")
             elif "quota" in error_msg.lower():
-                user_error = "⚠️ Quota API dépassé - Réessayez demain"
+                raise PermanentJobError("⚠️ Quota API dépassé - Réessayez demain")
             elif "forbidden" in error_msg.lower() or "403" in error_msg:
-                user_error = "🚫 Accès refusé par YouTube"
+                raise PermanentJobError("🚫 Accès refusé par YouTube")
             elif "not found" in error_msg.lower() or "404" in error_msg:
-                user_error = "❓ Chaîne YouTube introuvable"
-            else:
-                user_error = f"❌ Erreur: {error_msg[:100]}..."
+                raise PermanentJobError("❓ Chaîne YouTube introuvable")
+            raise
+
+    def enqueue_post_import(self, competitor_id: int, channel_url: str, channel_name: str = '') -> str:
+        """Programme le workflow post-import d'un concurrent (un seul job actif par concurrent)"""
+        task_id = f"post-import-{competitor_id}"
+        payload = {'competitor_id': competitor_id, 'channel_url': channel_url}
+        job = self.queue.get(task_id)
+        if job and job['status'] == 'running' and job.get('lease_owner'):
+            # Import relancé pendant le workflow : le job le rejoue entièrement avant de se terminer
+            self.queue.update(task_id, {'payload': {**payload, 'rerun': True}})
+            return task_id
+        
+        self.queue.enqueue(
+            task_id, 'post_import_workflow', payload,
+            channel_url=channel_url,
+            channel_name=channel_name or f"Post-import #{competitor_id}",
+            description='Workflow post-import'
+        )
+        self.pool.start()
+        self.pool.notify()
+        return task_id
+
+    def _post_import_job(self, ctx: JobContext):
+        """Job du workflow post-import : reprend les étapes acquises lors des tentatives précédentes"""
+        from .import_workflow import POST_IMPORT_STEPS, workflow_manager
+        
+        competitor_id = ctx.payload['competitor_id']
+        channel_url = ctx.payload.get('channel_url') or ctx.job['channel_url']
+        previous = (ctx.job.get('extra_data') or {}).get('steps') or {}
+        
+        while True:
+            steps: Dict[str, Dict] = {}
+            
+            def on_step(name: str, step_result: Dict):
+                steps[name] = step_result
+                # Résultats persistés à chaque étape : une reprise ne rejoue que ce qui manque
+                self.queue.update(ctx.task_id, {'extra_data': {'steps': steps}}, worker_id=self.pool.worker_id)
+                ctx.progress(
+                    force=True,
+                    current_step=f"{name}: {step_result.get('status')} ({step_result.get('duration_seconds', 0)}s)",
+                    progress=int(100 * len(steps) / len(POST_IMPORT_STEPS))
+                )
+            
+            ctx.progress(force=True, current_step='🚀 Workflow post-import...', progress=1)
+            results = workflow_manager.run_post_import_workflow(
+                competitor_id, channel_url, previous=previous, on_step=on_step
+            )
             
-            self.error_task(task_id, user_error)
-        finally:
-            # Nettoyer les références
-            if task_id in self.running_tasks:
-                del self.running_tasks[task_id]
-            if task_id in self.stop_flags:
-                del self.stop_flags[task_id]
+            payload = (self.queue.get(ctx.task_id) or {}).get('payload') or {}
+            if not payload.get('rerun'):
+                break
+            # Nouvel import arrivé pendant l'exécution : tout rejouer sur les données fraîches
+            self.queue.update(ctx.task_id, {'payload': {**payload, 'rerun': False}}, worker_id=self.pool.worker_id)
+            previous = {}
+        
+        if results['failed_steps']:
+            raise RuntimeError(f"Étapes en échec: {', '.join(results['failed_steps'])}")
+        
+        timings = ', '.join(f"{name} {step.get('duration_seconds', 0)}s" for name, step in results['steps'].items())
+        return {'current_step': f"Terminé en {results['duration_seconds']}s ({timings})"}
 
     def check_orphaned_tasks(self):
         """Vérifie les tâches dont les concurrents n'existent plus en base de données"""
@@ -513,7 +568,7 @@ class BackgroundTaskManager:
             db_urls = set(get_all_competitors_urls())
             
             orphaned_tasks = []
-            for task_id, task in self.tasks.items():
+            for task in self.get_all_tasks():
                 # Vérifier si l'URL de la tâche existe en base
                 if task.channel_url not in db_urls:
                     orphaned_tasks.append(task)
@@ -628,4 +683,15 @@ class BackgroundTaskManager:
         return tasks
 
 # Instance globale du gestionnaire
-task_manager = BackgroundTaskManager() 
\ No newline at end of file
+task_manager = BackgroundTaskManager()
+
+
+if __name__ == '__main__':
+    # Processus worker dédié : python -m yt_channel_analyzer.background_tasks
+    task_manager.start()
+    task_manager.start_workers()
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        task_manager.pool.stop() 
\ No newline at end of file
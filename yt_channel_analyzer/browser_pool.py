@@ -0,0 +1,221 @@
+"""
+Pool de navigateurs headless (undetected-chromedriver) réutilisés entre les jobs de scraping
+- Drivers gardés chauds : pas de démarrage de Chrome (plusieurs secondes) par chaîne
+- Images, polices et flux vidéo bloqués par interception réseau (CDP)
+- Pages chargées en parallèle sur plusieurs drivers (taille du pool bornée)
+"""
+
+import atexit
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import undetected_chromedriver as uc
+    from selenium.common.exceptions import WebDriverException
+    SELENIUM_AVAILABLE = True
+except ImportError:
+    uc = None
+    WebDriverException = Exception
+    SELENIUM_AVAILABLE = False
+
+BROWSER_POOL_SIZE = int(os.getenv('BROWSER_POOL_SIZE', 2))
+BROWSER_IDLE_TIMEOUT = 600  # secondes avant de fermer un driver inutilisé
+BROWSER_MAX_USES = 200      # recyclage périodique (fuites mémoire de Chrome)
+
+# Ressources inutiles au scraping : le DOM et ytInitialData suffisent
+BLOCKED_URL_PATTERNS = [
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*i.ytimg.com/*', '*yt3.ggpht.com/*', '*googlevideo.com/*', '*doubleclick.net/*',
+]
+
+MOBILE_METRICS = {
+    "mobile": True,
+    "width": 375,
+    "height": 812,
+    "deviceScaleFactor": 3,
+    "screenOrientation": {"type": "portraitPrimary", "angle": 0}
+}
+MOBILE_USER_AGENT = ("Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 "
+                     "(KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1")
+
+
+def desktop_chrome_options():
+    """Options desktop communes (grand écran : plus de vidéos par scroll)"""
+    opts = uc.ChromeOptions()
+    opts.add_argument('--headless')
+    opts.add_argument('--disable-blink-features=AutomationControlled')
+    opts.add_argument('--disable-gpu')
+    opts.add_argument('--no-sandbox')
+    opts.add_argument('--disable-dev-shm-usage')
+    opts.add_argument('--disable-extensions')
+    opts.add_argument('--blink-settings=imagesEnabled=false')
+    opts.add_argument('--mute-audio')
+    opts.add_argument('--window-size=5120,2880')
+    return opts
+
+
+class BrowserPool:
+    """Pool borné de drivers Chrome headless réutilisables"""
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE, idle_timeout: float = BROWSER_IDLE_TIMEOUT,
+                 max_uses: int = BROWSER_MAX_USES,
+                 driver_factory: Optional[Callable[[], Any]] = None):
+        self.size = max(1, size)
+        self.idle_timeout = idle_timeout
+        self.max_uses = max_uses
+        self._driver_factory = driver_factory
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._idle: List[Tuple[Any, float]] = []  # (driver, dernière utilisation)
+        self._uses: Dict[int, int] = {}
+        self.created = 0
+        self.reused = 0
+
+    def _create_driver(self):
+        if self._driver_factory:
+            return self._driver_factory()
+        if not SELENIUM_AVAILABLE:
+            raise RuntimeError("undetected-chromedriver non installé (pip install undetected-chromedriver)")
+
+        try:
+            driver = uc.Chrome(options=desktop_chrome_options(), version_main=None)
+        except Exception as e:
+            try:
+                driver = uc.Chrome(options=desktop_chrome_options())
+            except Exception as e2:
+                raise RuntimeError(f"Erreur ChromeDriver : {str(e)} | Fallback : {str(e2)} | Mettez à jour Chrome ou réessayez.")
+
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            print(f"[BROWSER] ⚠️ Interception réseau indisponible: {e}")
+        return driver
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Réserve un driver (chaud si disponible) ; bloque tant que le pool est plein"""
+        # Semaphore.acquire(timeout=-1) ne bloque pas : attente illimitée seulement sans timeout
+        acquired = self._slots.acquire() if timeout is None else self._slots.acquire(timeout=timeout)
+        if not acquired:
+            raise TimeoutError("Aucun navigateur disponible dans le pool")
+
+        now = time.monotonic()
+        expired = []
+        driver = None
+        with self._lock:
+            while self._idle:
+                candidate, last_used = self._idle.pop()
+                if now - last_used > self.idle_timeout:
+                    expired.append(candidate)
+                    continue
+                driver = candidate
+                break
+        for stale in expired:
+            self._uses.pop(id(stale), None)
+            self._quit(stale)
+
+        if driver is not None:
+            self.reused += 1
+            return driver
+        try:
+            driver = self._create_driver()
+        except Exception:
+            self._slots.release()
+            raise
+        self.created += 1
+        print(f"[BROWSER] 🚀 Navigateur démarré ({self.created} créés, {self.reused} réutilisations)")
+        return driver
+
+    def release(self, driver, discard: bool = False):
+        """Rend un driver au pool ; un driver cassé ou trop utilisé est fermé"""
+        try:
+            uses = self._uses.get(id(driver), 0) + 1
+            if not discard and uses < self.max_uses:
+                try:
+                    # Page vide : libère la mémoire de la page précédente, garde les cookies (consentement)
+                    driver.get('about:blank')
+                except Exception:
+                    discard = True
+            else:
+                discard = True
+
+            if discard:
+                self._uses.pop(id(driver), None)
+                self._quit(driver)
+            else:
+                with self._lock:
+                    self._uses[id(driver)] = uses
+                    self._idle.append((driver, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None, mobile: bool = False):
+        """Driver emprunté le temps d'un bloc with (fermé s'il a planté)"""
+        driver = self.acquire(timeout)
+        broken = False
+        try:
+            if mobile:
+                desktop_user_agent = driver.execute_script("return navigator.userAgent")
+                driver.execute_cdp_cmd('Emulation.setDeviceMetricsOverride', MOBILE_METRICS)
+                driver.execute_cdp_cmd('Emulation.setUserAgentOverride', {"userAgent": MOBILE_USER_AGENT})
+            yield driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            if mobile and not broken:
+                try:
+                    driver.execute_cdp_cmd('Emulation.clearDeviceMetricsOverride', {})
+                    driver.execute_cdp_cmd('Emulation.setUserAgentOverride', {"userAgent": desktop_user_agent})
+                except Exception:
+                    broken = True
+            self.release(driver, discard=broken)
+
+    def map_pages(self, urls: Iterable[str], handler: Callable[[Any, str], Any],
+                  max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Charge plusieurs pages en parallèle (un driver par page en cours) ; None en cas d'échec"""
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+
+        def visit(url: str):
+            try:
+                with self.driver() as driver:
+                    return url, handler(driver, url)
+            except Exception as e:
+                print(f"[BROWSER] ⚠️ Échec {url}: {e}")
+                return url, None
+
+        workers = min(max_workers or self.size, self.size, len(urls))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='Browser') as executor:
+            return dict(executor.map(visit, urls))
+
+    def shutdown(self):
+        """Ferme les drivers inactifs (ceux en cours d'utilisation sont fermés à leur retour)"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._uses.clear()
+        for driver, _ in idle:
+            self._quit(driver)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'size': self.size, 'idle': len(self._idle), 'created': self.created, 'reused': self.reused}
+
+
+# Instance globale partagée par les scrapers (fermée à l'arrêt du processus)
+browser_pool = BrowserPool()
+atexit.register(browser_pool.shutdown)
@@ -0,0 +1,215 @@
+"""
+Codecs de sérialisation pour le cache Redis
+Remplace pickle par un format sûr (orjson/msgpack) avec en-tête typé
+et compression optionnelle (zstd/lz4) au-delà d'un seuil de taille
+"""
+
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+# En-tête : MAGIC (2 octets) + tag codec (1 octet) + tag compression (1 octet)
+MAGIC = b'YC'
+HEADER_SIZE = 4
+
+
+class CodecError(ValueError):
+    """Valeur de cache illisible (format inconnu ou corrompu)"""
+
+
+def _default(obj: Any) -> Any:
+    """Conversion des types non natifs JSON/msgpack"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, bytes):
+        return obj.decode('utf-8', errors='replace')
+    if hasattr(obj, 'keys') and hasattr(obj, '__getitem__'):
+        # sqlite3.Row et assimilés
+        return {k: obj[k] for k in obj.keys()}
+    raise TypeError(f"Type non sérialisable: {type(obj).__name__}")
+
+
+class JSONCodec:
+    """Codec JSON (orjson si disponible, sinon json standard)"""
+
+    tag = b'j'
+    name = 'orjson' if orjson else 'json'
+
+    def encode(self, value: Any) -> bytes:
+        if orjson:
+            return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(value, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def decode(self, data: bytes) -> Any:
+        if orjson:
+            return orjson.loads(data)
+        return json.loads(data.decode('utf-8'))
+
+
+class MsgpackCodec:
+    """Codec msgpack (binaire compact)"""
+
+    tag = b'm'
+    name = 'msgpack'
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack non installé")
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=_default, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+class ZstdCompressor:
+    """Compression zstd"""
+
+    tag = b'z'
+    name = 'zstd'
+
+    def __init__(self, level: int = 3):
+        if zstandard is None:
+            raise ImportError("zstandard non installé")
+        self._level = level
+
+    def compress(self, data: bytes) -> bytes:
+        # Les (dé)compresseurs zstd ne sont pas thread-safe : une instance par appel
+        return zstandard.ZstdCompressor(level=self._level).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zstandard.ZstdDecompressor().decompress(data)
+
+
+class LZ4Compressor:
+    """Compression lz4 (plus rapide, ratio plus faible)"""
+
+    tag = b'l'
+    name = 'lz4'
+
+    def __init__(self):
+        if lz4_frame is None:
+            raise ImportError("lz4 non installé")
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4_frame.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4_frame.decompress(data)
+
+
+NO_COMPRESSION = b'0'
+
+
+class CacheSerializer:
+    """Sérialiseur avec en-tête typé : le codec et la compression sont relus depuis la valeur"""
+
+    def __init__(self, codec=None, compressor=None, compress_min_bytes: int = 1024):
+        self.codec = codec or JSONCodec()
+        self.compressor = compressor
+        self.compress_min_bytes = compress_min_bytes
+        # Tous les codecs/compresseurs connus restent décodables, quel que soit le choix d'écriture
+        self._codecs = {JSONCodec.tag: JSONCodec()}
+        if msgpack:
+            self._codecs[MsgpackCodec.tag] = MsgpackCodec()
+        self._codecs[self.codec.tag] = self.codec
+        self._compressors = {}
+        if zstandard:
+            self._compressors[ZstdCompressor.tag] = ZstdCompressor()
+        if lz4_frame:
+            self._compressors[LZ4Compressor.tag] = LZ4Compressor()
+        if compressor:
+            self._compressors[compressor.tag] = compressor
+
+    def dumps(self, value: Any) -> bytes:
+        payload = self.codec.encode(value)
+        comp_tag = NO_COMPRESSION
+        if self.compressor and len(payload) >= self.compress_min_bytes:
+            compressed = self.compressor.compress(payload)
+            if len(compressed) < len(payload):
+                payload = compressed
+                comp_tag = self.compressor.tag
+        return MAGIC + self.codec.tag + comp_tag + payload
+
+    def loads(self, data: bytes) -> Any:
+        if not is_tagged(data):
+            raise CodecError("En-tête de cache absent")
+        codec_tag = data[2:3]
+        comp_tag = data[3:4]
+        payload = data[HEADER_SIZE:]
+        if comp_tag != NO_COMPRESSION:
+            compressor = self._compressors.get(comp_tag)
+            if compressor is None:
+                raise CodecError(f"Compression inconnue: {comp_tag!r}")
+            payload = compressor.decompress(payload)
+        codec = self._codecs.get(codec_tag)
+        if codec is None:
+            raise CodecError(f"Codec inconnu: {codec_tag!r}")
+        return codec.decode(payload)
+
+    def describe(self) -> Dict:
+        return {
+            'codec': self.codec.name,
+            'compression': self.compressor.name if self.compressor else None,
+            'compress_min_bytes': self.compress_min_bytes
+        }
+
+
+def is_tagged(data: Optional[bytes]) -> bool:
+    """Indique si la valeur a été écrite par CacheSerializer"""
+    return bool(data) and len(data) >= HEADER_SIZE and data[:2] == MAGIC
+
+
+def _build_codec(name: str):
+    name = (name or 'auto').lower()
+    if msgpack and (name == 'msgpack' or (name == 'auto' and not orjson)):
+        return MsgpackCodec()
+    return JSONCodec()
+
+
+def _build_compressor(name: str):
+    name = (name or 'auto').lower()
+    if name in ('none', 'off', '0', ''):
+        return None
+    if zstandard and name in ('zstd', 'auto'):
+        return ZstdCompressor()
+    if lz4_frame and name in ('lz4', 'auto'):
+        return LZ4Compressor()
+    # Bibliothèque absente : pas de compression plutôt qu'un échec au démarrage
+    return None
+
+
+def create_serializer_from_env() -> CacheSerializer:
+    """Construit le sérialiseur depuis REDIS_CACHE_CODEC / REDIS_CACHE_COMPRESSION / REDIS_CACHE_COMPRESS_MIN_BYTES"""
+    return CacheSerializer(
+        codec=_build_codec(os.getenv('REDIS_CACHE_CODEC', 'auto')),
+        compressor=_build_compressor(os.getenv('REDIS_CACHE_COMPRESSION', 'auto')),
+        compress_min_bytes=int(os.getenv('REDIS_CACHE_COMPRESS_MIN_BYTES', 1024))
+    )
@@ -5,13 +5,18 @@ Utilise Redis pour cache, sessions et file d'attente de tâches
 
 import redis
 import json
-import pickle
 import hashlib
 from datetime import datetime, timedelta
-from typing import Any, Optional, List, Dict
+from typing import Any, Callable, Optional, List, Dict, Iterable
 import os
+import time
+import uuid
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from functools import wraps
+from .cache_codecs import create_serializer_from_env, is_tagged
+from .request_metrics import record_cache
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +29,7 @@ class RedisManager:
             'host': os.getenv('REDIS_HOST', 'localhost'),
             'port': int(os.getenv('REDIS_PORT', 6379)),
             'password': os.getenv('REDIS_PASSWORD'),
-            'decode_responses': False,  # Pour gérer pickle
+            'decode_responses': False,  # Valeurs binaires (codec + compression)
             'socket_connect_timeout': 5,
             'socket_timeout': 5,
             'max_connections': 50,  # Pool de connexions
@@ -32,6 +37,7 @@ class RedisManager:
         
         self.redis_client = None
         self.is_available = False
+        self.serializer = create_serializer_from_env()
         self._connect()
     
     def _connect(self):
@@ -46,24 +52,38 @@ class RedisManager:
             logger.warning(f"❌ Redis non disponible: {e}")
             self.is_available = False
     
+    def _encode(self, value: Any) -> bytes:
+        """Sérialise une valeur (codec + compression selon la taille)"""
+        return self.serializer.dumps(value)
+    
+    def _decode(self, key: str, raw: Optional[bytes], default=None) -> Any:
+        """Désérialise une valeur ; jamais de pickle"""
+        if raw is None:
+            return default
+        
+        if is_tagged(raw):
+            try:
+                return self.serializer.loads(raw)
+            except Exception as e:
+                logger.warning(f"Valeur Redis illisible {key}: {e}")
+                return default
+        
+        # Anciennes valeurs (JSON brut) : lues en JSON, les pickles sont ignorés (cache miss)
+        try:
+            return json.loads(raw.decode('utf-8'))
+        except (UnicodeDecodeError, ValueError):
+            logger.debug(f"Valeur Redis héritée ignorée {key}")
+            return default
+    
     def get(self, key: str, default=None) -> Any:
         """Récupère une valeur depuis Redis"""
         if not self.is_available:
             return default
         
         try:
-            value = self.redis_client.get(key)
-            if value is None:
-                return default
-            
-            # Tenter de désérialiser avec pickle d'abord, puis JSON
-            try:
-                return pickle.loads(value)
-            except:
-                try:
-                    return json.loads(value.decode('utf-8'))
-                except:
-                    return value.decode('utf-8')
+            raw = self.redis_client.get(key)
+            record_cache(raw is not None)
+            return self._decode(key, raw, default)
         except Exception as e:
             logger.error(f"Erreur Redis GET {key}: {e}")
             return default
@@ -74,19 +94,39 @@ class RedisManager:
             return False
         
         try:
-            # Sérialiser avec pickle pour les objets complexes
-            if isinstance(value, (dict, list, tuple, set)):
-                serialized_value = pickle.dumps(value)
-            elif isinstance(value, (str, int, float, bool)):
-                serialized_value = json.dumps(value).encode('utf-8')
-            else:
-                serialized_value = pickle.dumps(value)
-            
-            return self.redis_client.setex(key, ttl, serialized_value)
+            return self.redis_client.setex(key, ttl, self._encode(value))
         except Exception as e:
             logger.error(f"Erreur Redis SET {key}: {e}")
             return False
     
+    def mget(self, keys: List[str], default=None) -> Dict[str, Any]:
+        """Récupère plusieurs valeurs en un seul aller-retour"""
+        if not self.is_available or not keys:
+            return {key: default for key in keys}
+        
+        try:
+            raw_values = self.redis_client.mget(keys)
+            for raw in raw_values:
+                record_cache(raw is not None)
+            return {key: self._decode(key, raw, default) for key, raw in zip(keys, raw_values)}
+        except Exception as e:
+            logger.error(f"Erreur Redis MGET ({len(keys)} clés): {e}")
+            return {key: default for key in keys}
+    
+    def mset(self, mapping: Dict[str, Any], ttl: int = 3600) -> bool:
+        """Stocke plusieurs valeurs avec TTL via un pipeline (un seul aller-retour)"""
+        if not self.is_available or not mapping:
+            return False
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in mapping.items():
+                pipe.setex(key, ttl, self._encode(value))
+            return all(pipe.execute())
+        except Exception as e:
+            logger.error(f"Erreur Redis MSET ({len(mapping)} clés): {e}")
+            return False
+    
     def delete(self, key: str) -> bool:
         """Supprime une clé de Redis"""
         if not self.is_available:
@@ -98,16 +138,35 @@ class RedisManager:
             logger.error(f"Erreur Redis DELETE {key}: {e}")
             return False
     
-    def clear_pattern(self, pattern: str) -> int:
+    def _scan_batches(self, pattern: str, batch_size: int) -> Iterable[List[bytes]]:
+        """Parcourt les clés correspondant au pattern par lots"""
+        batch = []
+        for key in self.redis_client.scan_iter(match=pattern, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def _unlink(self, keys: List[bytes]) -> int:
+        """Suppression non bloquante (UNLINK) avec repli sur DELETE"""
+        try:
+            return self.redis_client.unlink(*keys)
+        except redis.exceptions.ResponseError:
+            return self.redis_client.delete(*keys)
+    
+    def clear_pattern(self, pattern: str, batch_size: int = 500) -> int:
         """Supprime toutes les clés correspondant au pattern"""
         if not self.is_available:
             return 0
         
         try:
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                return self.redis_client.delete(*keys)
-            return 0
+            # SCAN incrémental au lieu de KEYS (bloquant sur une grosse base)
+            deleted = 0
+            for batch in self._scan_batches(pattern, batch_size):
+                deleted += self._unlink(batch)
+            return deleted
         except Exception as e:
             logger.error(f"Erreur Redis CLEAR PATTERN {pattern}: {e}")
             return 0
@@ -152,6 +211,165 @@ class CacheManager:
             return wrapper
         return decorator
 
+class SingleFlight:
+    """Coalesce les calculs concurrents d'une même clé (un seul calcul par clé froide)"""
+    
+    LOCK_PREFIX = "lock:"
+    
+    def __init__(self, lock_ttl: int = 60, wait_timeout: float = 30.0, poll_interval: float = 0.05):
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._inflight: Dict[str, Future] = {}
+        self._guard = threading.Lock()
+        self._refreshing = set()
+        self._refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="CacheRefresh")
+    
+    def _acquire_distributed(self, key: str) -> Optional[str]:
+        """Verrou Redis (SET NX PX) partagé entre processus ; None si déjà pris"""
+        if not redis_manager.is_available:
+            return "local"
+        token = uuid.uuid4().hex
+        try:
+            acquired = redis_manager.redis_client.set(
+                self.LOCK_PREFIX + key, token, nx=True, px=self.lock_ttl * 1000
+            )
+            return token if acquired else None
+        except Exception as e:
+            logger.warning(f"Verrou Redis indisponible {key}: {e}")
+            return "local"
+    
+    def _release_distributed(self, key: str, token: str):
+        if token == "local" or not redis_manager.is_available:
+            return
+        try:
+            # Ne libérer que notre propre verrou
+            lock_key = self.LOCK_PREFIX + key
+            if redis_manager.redis_client.get(lock_key) == token.encode():
+                redis_manager.redis_client.delete(lock_key)
+        except Exception as e:
+            logger.warning(f"Libération verrou Redis {key}: {e}")
+    
+    @staticmethod
+    def _store(key: str, value: Any, ttl: int, stale_ttl: int):
+        envelope = {"value": value, "fresh_until": time.time() + ttl}
+        redis_manager.set(key, envelope, ttl + stale_ttl)
+    
+    @staticmethod
+    def _load(key: str) -> Optional[Dict]:
+        envelope = redis_manager.get(key)
+        if isinstance(envelope, dict) and "fresh_until" in envelope:
+            return envelope
+        return None
+    
+    def _compute_and_store(self, key: str, compute: Callable[[], Any], ttl: int, stale_ttl: int) -> Any:
+        value = compute()
+        self._store(key, value, ttl, stale_ttl)
+        return value
+    
+    def _refresh_in_background(self, key: str, compute: Callable[[], Any], ttl: int, stale_ttl: int):
+        """Rafraîchit une valeur périmée sans bloquer l'appelant (un seul rafraîchissement par clé)"""
+        with self._guard:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
+        def refresh():
+            token = self._acquire_distributed(key)
+            try:
+                if token is None:
+                    return  # Un autre processus rafraîchit déjà
+                self._compute_and_store(key, compute, ttl, stale_ttl)
+                logger.debug(f"Cache REFRESH: {key}")
+            except Exception as e:
+                logger.error(f"Erreur rafraîchissement cache {key}: {e}")
+            finally:
+                if token:
+                    self._release_distributed(key, token)
+                with self._guard:
+                    self._refreshing.discard(key)
+        
+        self._refresh_executor.submit(refresh)
+    
+    def _compute_as_leader(self, key: str, compute: Callable[[], Any], ttl: int, stale_ttl: int) -> Any:
+        """Calcul par le thread leader ; attend le résultat d'un autre processus si le verrou Redis est pris"""
+        deadline = time.time() + self.wait_timeout
+        while True:
+            token = self._acquire_distributed(key)
+            if token is not None:
+                try:
+                    logger.debug(f"Cache SET: {key}")
+                    return self._compute_and_store(key, compute, ttl, stale_ttl)
+                finally:
+                    self._release_distributed(key, token)
+            
+            time.sleep(self.poll_interval)
+            envelope = self._load(key)
+            if envelope is not None:
+                return envelope["value"]
+            if time.time() >= deadline:
+                logger.warning(f"Attente verrou expirée, calcul direct: {key}")
+                return self._compute_and_store(key, compute, ttl, stale_ttl)
+    
+    def get_or_compute(self, key: str, compute: Callable[[], Any], ttl: int, stale_ttl: int) -> Any:
+        """Retourne la valeur fraîche, sinon la valeur périmée (et rafraîchit), sinon calcule une seule fois"""
+        envelope = self._load(key)
+        if envelope is not None:
+            if envelope["fresh_until"] < time.time():
+                self._refresh_in_background(key, compute, ttl, stale_ttl)
+            logger.debug(f"Cache HIT: {key}")
+            return envelope["value"]
+        
+        # Clé froide : les threads du processus partagent le résultat du leader
+        with self._guard:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._inflight[key] = Future()
+        
+        if not is_leader:
+            try:
+                return future.result(timeout=self.wait_timeout)
+            except FutureTimeoutError:
+                logger.warning(f"Attente leader expirée, calcul direct: {key}")
+                return compute()
+        
+        try:
+            value = self._compute_as_leader(key, compute, ttl, stale_ttl)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._guard:
+                self._inflight.pop(key, None)
+
+
+single_flight = SingleFlight()
+
+
+def cache_single_flight(ttl: int = 3600, key_prefix: str = "", stale_ttl: int = None):
+    """Décorateur de cache avec protection contre l'effet stampede
+    
+    - valeur fraîche pendant ``ttl`` secondes
+    - valeur périmée servie pendant ``stale_ttl`` secondes supplémentaires
+      pendant qu'un rafraîchissement unique tourne en arrière-plan
+    """
+    if stale_ttl is None:
+        stale_ttl = ttl
+    
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = f"{key_prefix}:{func.__name__}:{CacheManager.generate_cache_key(*args, **kwargs)}"
+            return single_flight.get_or_compute(
+                cache_key, lambda: func(*args, **kwargs), ttl, stale_ttl
+            )
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
 class SessionManager:
     """Gestionnaire de sessions Redis"""
     
@@ -222,31 +440,58 @@ class SpecializedCaches:
     
     # Cache vidéos (plus long car données stables)
     @staticmethod
-    @CacheManager.cache_result(ttl=7200, key_prefix="videos")  # 2h
+    @cache_single_flight(ttl=7200, key_prefix="videos")  # 2h
     def get_top_videos(limit=100, category=None, sort_by="view_count"):
-        """Cache pour top vidéos - sera implémenté dans database"""
-        pass
+        """Top vidéos tous concurrents confondus"""
+        from .database.videos import get_top_videos
+        return get_top_videos(limit=limit, category=category, sort_by=sort_by)
     
     # Cache concurrent (moyennement long)
     @staticmethod
-    @CacheManager.cache_result(ttl=3600, key_prefix="competitors")  # 1h
+    @cache_single_flight(ttl=3600, key_prefix="competitors")  # 1h
     def get_competitors_stats():
-        """Cache pour stats concurrents"""
-        pass
+        """Concurrents avec leurs statistiques précalculées"""
+        from .database.competitors import get_all_competitors_with_videos
+        return get_all_competitors_with_videos()
     
     # Cache insights (court car données calculées)
     @staticmethod
-    @CacheManager.cache_result(ttl=1800, key_prefix="insights")  # 30min
+    @cache_single_flight(ttl=1800, key_prefix="insights")  # 30min
     def get_country_insights(country):
-        """Cache pour insights pays"""
-        pass
+        """Insights d'un pays"""
+        from .database.analytics import get_country_insights
+        return get_country_insights(country)
     
     # Cache API YouTube (très long car limité)
     @staticmethod
-    @CacheManager.cache_result(ttl=86400, key_prefix="youtube_api")  # 24h
+    @cache_single_flight(ttl=86400, key_prefix="youtube_api", stale_ttl=7 * 86400)  # 24h
     def get_channel_info(channel_url):
-        """Cache pour info chaîne YouTube"""
-        pass
+        """Infos d'une chaîne via l'API YouTube"""
+        from .youtube_api_client import create_youtube_client
+        return create_youtube_client().get_channel_info(channel_url)
+    
+    @staticmethod
+    def warm_up(countries: Optional[List[str]] = None, top_limits: Iterable[int] = (100,)) -> Dict:
+        """Précharge les caches critiques (appelé au démarrage)"""
+        results = {}
+        
+        def run(name, func, *args, **kwargs):
+            start = time.time()
+            try:
+                func(*args, **kwargs)
+                results[name] = round(time.time() - start, 3)
+            except Exception as e:
+                logger.error(f"Erreur préchargement {name}: {e}")
+                results[name] = f"error: {e}"
+        
+        run("competitors_stats", SpecializedCaches.get_competitors_stats)
+        for limit in top_limits:
+            run(f"top_videos_{limit}", SpecializedCaches.get_top_videos, limit=limit)
+        for country in countries or []:
+            run(f"country_insights_{country}", SpecializedCaches.get_country_insights, country)
+        
+        logger.info(f"🔥 Caches préchargés: {results}")
+        return results
 
 def clear_all_cache():
     """Vide tout le cache - utile pour maintenance"""
@@ -274,7 +519,8 @@ def get_cache_stats() -> Dict:
             "total_commands_processed": info.get("total_commands_processed", 0),
             "keyspace_hits": info.get("keyspace_hits", 0),
             "keyspace_misses": info.get("keyspace_misses", 0),
-            "hit_rate": round(info.get("keyspace_hits", 0) / max(info.get("keyspace_hits", 0) + info.get("keyspace_misses", 0), 1) * 100, 2)
+            "hit_rate": round(info.get("keyspace_hits", 0) / max(info.get("keyspace_hits", 0) + info.get("keyspace_misses", 0), 1) * 100, 2),
+            "serializer": redis_manager.serializer.describe()
         }
     except Exception as e:
         return {"status": "error", "error": str(e)}
\ No newline at end of file
@@ -23,6 +23,8 @@ def init_db():
         from .base import DatabaseSchema, get_db_connection
         conn = get_db_connection()
         result = DatabaseSchema.update_database_schema(conn)
+        # Migrations lourdes (FTS5...) : une seule fois par base, hors du chemin de chaque connexion
+        DatabaseSchema.run_migrations(conn)
         conn.close()
         return result
     except Exception as e:
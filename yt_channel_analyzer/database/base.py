@@ -9,11 +9,41 @@ from typing import List, Dict, Optional, Tuple
 import os
 from pathlib import Path
 
+from .. import request_metrics
+from .indexes import ensure_indexes, workload_recorder
+from ..search_index import ensure_search_index
+
 # Obtenir le chemin absolu du projet
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DB_DIR = PROJECT_ROOT / 'instance'
 DB_PATH = DB_DIR / 'database.db'
 
+# Colonnes de la file de tâches durable (job_queue) ajoutées à background_tasks
+BACKGROUND_TASK_COLUMNS = {
+    'task_type': "TEXT DEFAULT 'channel_analysis'",
+    'description': "TEXT DEFAULT ''",
+    'extra_data': "TEXT DEFAULT '{}'",
+    'payload': "TEXT DEFAULT '{}'",
+    'priority': 'INTEGER DEFAULT 0',
+    'attempts': 'INTEGER DEFAULT 0',
+    'max_attempts': 'INTEGER DEFAULT 3',
+    'next_run_at': 'REAL',
+    'lease_owner': 'TEXT',
+    'lease_expires_at': 'REAL',
+    'heartbeat_at': 'REAL',
+    'cancel_requested': 'INTEGER DEFAULT 0',
+}
+
+# Migrations coûteuses (version, libellé, fonction) : appliquées une seule fois par base au démarrage
+# (init_db ou scripts/migrate_database.py), version courante dans PRAGMA user_version
+SCHEMA_MIGRATIONS = (
+    (1, 'Index plein texte créés', ensure_search_index),
+    (2, 'Index créés', ensure_indexes),
+)
+SCHEMA_VERSION = SCHEMA_MIGRATIONS[-1][0]
+# Tables dont les migrations dépendent : base encore vide => migration reportée au prochain démarrage
+MIGRATION_TABLES = ('concurrent', 'video', 'playlist')
+
 
 class DatabaseConnection:
     """Gestionnaire de connexions à la base de données."""
@@ -42,9 +72,16 @@ def get_db_connection(update_schema=True):
     if not DB_DIR.exists():
         DB_DIR.mkdir(parents=True, exist_ok=True)
         
-    conn = sqlite3.connect(str(DB_PATH))
+    # Connexion instrumentée (requêtes SQL comptées par requête HTTP) si le monitoring est actif
+    factory = request_metrics.connection_factory()
+    conn = sqlite3.connect(str(DB_PATH), factory=factory) if factory else sqlite3.connect(str(DB_PATH))
     conn.row_factory = sqlite3.Row
     
+    # Capture de la charge SQL pour le conseiller d'index (SQL_WORKLOAD_LOG=<fichier>)
+    recorder = workload_recorder()
+    if recorder is not None:
+        recorder.attach(conn)
+    
     # Mettre à jour le schéma si nécessaire
     if update_schema:
         try:
@@ -271,6 +308,39 @@ class DatabaseSchema:
                 )
             ''')
             
+            cursor.execute("PRAGMA table_info(background_tasks)")
+            task_cols = [col[1] for col in cursor.fetchall()]
+            for column, definition in BACKGROUND_TASK_COLUMNS.items():
+                if column not in task_cols:
+                    cursor.execute(f'ALTER TABLE background_tasks ADD COLUMN {column} {definition}')
+                    print(f"✅ Colonne '{column}' ajoutée à la table background_tasks")
+            
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_background_tasks_claim
+                ON background_tasks(status, next_run_at, priority)
+            ''')
+            
+            # Watermarks du rafraîchissement incrémental (refresh_watermarks)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS channel_refresh_state (
+                    concurrent_id INTEGER PRIMARY KEY,
+                    channel_id TEXT NOT NULL,
+                    uploads_playlist_id TEXT,
+                    uploads_etag TEXT,
+                    uploads_item_count INTEGER,
+                    channel_video_count INTEGER,
+                    latest_published_at TEXT,
+                    playlists_checked_at TIMESTAMP,
+                    checked_at TIMESTAMP,
+                    changed_at TIMESTAMP,
+                    playlists_video_count INTEGER
+                )
+            ''')
+            cursor.execute("PRAGMA table_info(channel_refresh_state)")
+            if 'playlists_video_count' not in [col[1] for col in cursor.fetchall()]:
+                cursor.execute('ALTER TABLE channel_refresh_state ADD COLUMN playlists_video_count INTEGER')
+                print("✅ Colonne 'playlists_video_count' ajoutée à la table channel_refresh_state")
+            
             # Ajouter des colonnes manquantes si nécessaire
             cursor.execute("PRAGMA table_info(video)")
             columns = [column[1] for column in cursor.fetchall()]
@@ -294,6 +364,10 @@ class DatabaseSchema:
                 cursor.execute('ALTER TABLE video ADD COLUMN is_human_validated INTEGER DEFAULT 0')
                 print("✅ Colonne 'is_human_validated' ajoutée à la table video")
             
+            if 'stats_refreshed_at' not in columns:
+                cursor.execute('ALTER TABLE video ADD COLUMN stats_refreshed_at TIMESTAMP')
+                print("✅ Colonne 'stats_refreshed_at' ajoutée à la table video")
+            
             # === PLAYLIST TABLE Upgrades ===
             cursor.execute("PRAGMA table_info(playlist)")
             playlist_cols = [col[1] for col in cursor.fetchall()]
@@ -320,6 +394,33 @@ class DatabaseSchema:
         except Exception as e:
             print(f"❌ Erreur lors de la mise à jour du schéma: {e}")
             conn.rollback()
+    
+    @staticmethod
+    def run_migrations(conn, force: bool = False) -> List[str]:
+        """Applique les migrations au-delà de PRAGMA user_version ; retourne les objets créés"""
+        current = 0 if force else conn.execute('PRAGMA user_version').fetchone()[0]
+        if current >= SCHEMA_VERSION:
+            return []
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if not all(table in existing for table in MIGRATION_TABLES):
+            return []
+        
+        created = []
+        for version, label, migrate in SCHEMA_MIGRATIONS:
+            if version <= current:
+                continue
+            done = migrate(conn)
+            if done:
+                print(f"✅ {label}: {', '.join(done)}")
+            created.extend(done)
+            conn.execute(f'PRAGMA user_version = {version}')
+            conn.commit()
+        return created
+
+
+def create_performance_indexes(cursor) -> List[str]:
+    """Crée les index de performance recommandés (utilisé par scripts/optimize_database.py)"""
+    return ensure_indexes(cursor.connection)
 
 
 # Instances globales pour la compatibilité
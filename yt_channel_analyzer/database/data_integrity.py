@@ -1,16 +1,21 @@
 """
 Module de validation et contrôle d'intégrité des données
 Système ultra-robuste pour garantir la cohérence des stats européennes
+- Règles déclaratives : un seul scan par table, compteurs CASE pour toutes ses règles
+- Tables indépendantes scannées en parallèle sur des connexions de lecture séparées
+- Corrections ensemblistes (un UPDATE par règle) et mode incrémental par triggers
 """
 
 import sqlite3
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 import logging
+from collections import Counter
 
 from .base import get_db_connection, DatabaseUtils
 
@@ -34,12 +39,143 @@ class ValidationError:
     expected_value: Optional[Any] = None
     auto_fixable: bool = False
     
+@dataclass(frozen=True)
+class IntegrityRule:
+    """Règle évaluée dans le scan unique de sa table (prédicat SQL sur la ligne)"""
+    name: str
+    table: str
+    field: str
+    severity: SeverityLevel
+    predicate: str
+    message: str                       # format : {value}, {expected}, {count}
+    columns: Tuple[str, ...] = ()      # colonnes requises (règle ignorée si absentes)
+    expected: Optional[str] = None     # expression SQL de la valeur attendue
+    fix: Optional[str] = None          # clause SET de la correction ensembliste
+    auto_fixable: bool = False         # réservé aux règles qui ont une clause fix
+    aggregate: bool = False            # une seule erreur (record_id 0) avec le nombre de lignes
+
+
+# Source de chaque scan : colonnes de la table + agrégats dérivés, restreinte par {scope}
+TABLE_SOURCES = {
+    'concurrent': """
+        SELECT c.*, COALESCE(a.actual_video_count, 0) AS actual_video_count,
+               a.actual_total_views, a.actual_avg_views
+        FROM concurrent c
+        LEFT JOIN (
+            SELECT concurrent_id, COUNT(*) AS actual_video_count,
+                   SUM(view_count) AS actual_total_views, AVG(view_count) AS actual_avg_views
+            FROM video WHERE {video_scope} GROUP BY concurrent_id
+        ) a ON a.concurrent_id = c.id
+        WHERE {scope}
+    """,
+    'video': "SELECT v.* FROM video v WHERE {scope}",
+    'playlist': """
+        SELECT p.*, COALESCE(a.actual_video_count, 0) AS actual_video_count
+        FROM playlist p
+        LEFT JOIN (
+            SELECT playlist_id, COUNT(*) AS actual_video_count
+            FROM playlist_video WHERE {link_scope} GROUP BY playlist_id
+        ) a ON a.playlist_id = p.id
+        WHERE {scope}
+    """,
+    'playlist_video': "SELECT pv.* FROM playlist_video pv",
+}
+
+# Mode incrémental : lignes marquées par les triggers depuis la dernière validation
+_DIRTY = "(SELECT row_id FROM integrity_dirty WHERE table_name = '{table}' AND seq <= :max_seq)"
+INCREMENTAL_SCOPES = {
+    'concurrent': {'scope': f"c.id IN {_DIRTY.format(table='concurrent')}",
+                   'video_scope': f"concurrent_id IN {_DIRTY.format(table='concurrent')}"},
+    'video': {'scope': f"v.id IN {_DIRTY.format(table='video')}"},
+    'playlist': {'scope': f"p.id IN {_DIRTY.format(table='playlist')}",
+                 'link_scope': f"playlist_id IN {_DIRTY.format(table='playlist')}"},
+}
+FULL_SCOPE = {'scope': '1', 'video_scope': '1', 'link_scope': '1'}
+
+# Triggers de suivi : une modification marque la ligne (et les agrégats dépendants) à revalider
+TRACKING_TRIGGERS = {
+    'video': [
+        ('ai', 'AFTER INSERT', "('video', new.id), ('concurrent', new.concurrent_id)"),
+        ('au', 'AFTER UPDATE', "('video', new.id), ('concurrent', new.concurrent_id), ('concurrent', old.concurrent_id)"),
+        ('ad', 'AFTER DELETE', "('concurrent', old.concurrent_id)"),
+    ],
+    'concurrent': [
+        ('ai', 'AFTER INSERT', "('concurrent', new.id)"),
+        ('au', 'AFTER UPDATE', "('concurrent', new.id)"),
+    ],
+    'playlist': [
+        ('ai', 'AFTER INSERT', "('playlist', new.id)"),
+        ('au', 'AFTER UPDATE', "('playlist', new.id)"),
+    ],
+    'playlist_video': [
+        ('ai', 'AFTER INSERT', "('playlist', new.playlist_id)"),
+        ('ad', 'AFTER DELETE', "('playlist', old.playlist_id)"),
+    ],
+}
+
+# Erreurs détaillées (record_id) conservées par règle ; les compteurs restent exacts au-delà
+ERROR_SAMPLE_LIMIT = 500
+MAX_PARALLEL_SCANS = 4
+
+VALID_CATEGORIES = ('hero', 'hub', 'help', 'uncategorized')
+VALID_SOURCES = ('human', 'ai', 'playlist', 'keyword', 'multilingual', 'auto')
+
+
+def _sql_list(values) -> str:
+    return ', '.join(f"'{value}'" for value in values)
+
+
+def ensure_integrity_tracking(conn: sqlite3.Connection):
+    """Migration idempotente : table des lignes modifiées + triggers de suivi"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS integrity_dirty (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER,
+            UNIQUE(table_name, row_id) ON CONFLICT REPLACE
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS integrity_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mode TEXT NOT NULL,
+            started_at TIMESTAMP,
+            duration_seconds REAL,
+            rows_checked INTEGER,
+            errors_found INTEGER,
+            max_seq INTEGER
+        )
+    """)
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()}
+    for table, triggers in TRACKING_TRIGGERS.items():
+        if table not in existing:
+            continue
+        for suffix, event, values in triggers:
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS integrity_{table}_{suffix} {event} ON {table}
+                BEGIN INSERT INTO integrity_dirty (table_name, row_id) VALUES {values}; END
+            """)
+    # Suppression d'un concurrent : ses vidéos et playlists deviennent orphelines
+    if 'concurrent' in existing:
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS integrity_concurrent_ad AFTER DELETE ON concurrent
+            BEGIN
+                INSERT INTO integrity_dirty (table_name, row_id) SELECT 'video', id FROM video WHERE concurrent_id = old.id;
+                INSERT INTO integrity_dirty (table_name, row_id) SELECT 'playlist', id FROM playlist WHERE concurrent_id = old.id;
+            END
+        """)
+
+
 class DataIntegrityValidator:
-    """Validateur d'intégrité des données ultra-robuste"""
+    """Validateur d'intégrité : un scan par table (compteurs CASE), tables scannées en parallèle,
+    corrections ensemblistes et mode incrémental (lignes modifiées depuis la dernière validation)"""
     
     def __init__(self):
         self.db_utils = DatabaseUtils()
         self.errors = []
+        self.rules = []
+        self.rule_counts = {}
+        self.hidden_errors = Counter()
         self.stats = {
             'total_checks': 0,
             'errors_found': 0,
@@ -62,54 +198,208 @@ class DataIntegrityValidator:
             'view_count_consistency': 0.1      # 10% de tolérance
         }
     
-    def validate_complete_dataset(self, fix_errors: bool = False) -> Dict:
-        """Validation complète de l'intégrité des données"""
-        print("🔍 Démarrage de la validation complète d'intégrité")
+    def build_rules(self) -> List[IntegrityRule]:
+        """Règles de cohérence, dans l'ordre d'application des corrections"""
+        t = self.COHERENCE_THRESHOLDS
+        shorts = t['shorts_duration_threshold']
+        tolerance = t['view_count_consistency']
+        S = SeverityLevel
+        return [
+            # Concurrents
+            IntegrityRule('concurrent_name_empty', 'concurrent', 'name', S.CRITICAL,
+                          "name IS NULL OR trim(name) = ''", "Nom du concurrent vide",
+                          fix="name = 'Concurrent ' || id", auto_fixable=True),
+            IntegrityRule('concurrent_channel_id_format', 'concurrent', 'channel_id', S.HIGH,
+                          "channel_id IS NOT NULL AND channel_id != '' AND (length(channel_id) != 24 "
+                          "OR substr(channel_id, 1, 2) != 'UC' OR channel_id GLOB '*[^a-zA-Z0-9_-]*')",
+                          "Format de channel_id invalide", columns=('channel_id',)),
+            IntegrityRule('concurrent_subscribers_negative', 'concurrent', 'subscriber_count', S.CRITICAL,
+                          "subscriber_count < 0", "Nombre d'abonnés négatif", columns=('subscriber_count',),
+                          expected='0', fix='subscriber_count = 0', auto_fixable=True),
+            IntegrityRule('concurrent_video_count_negative', 'concurrent', 'video_count', S.CRITICAL,
+                          "video_count < 0", "Nombre de vidéos négatif", columns=('video_count',),
+                          expected='0', fix='video_count = 0', auto_fixable=True),
+            IntegrityRule('concurrent_total_views_negative', 'concurrent', 'total_views', S.CRITICAL,
+                          "total_views < 0", "Vues totales négatives", columns=('total_views',),
+                          expected='0', fix='total_views = 0', auto_fixable=True),
+            IntegrityRule('concurrent_avg_views_inconsistent', 'concurrent', 'avg_views', S.MEDIUM,
+                          f"video_count > 0 AND total_views IS NOT NULL AND avg_views IS NOT NULL "
+                          f"AND abs(total_views * 1.0 / video_count - avg_views) > total_views * 1.0 / video_count * {tolerance}",
+                          "Incohérence avg_views: calculé={expected:.0f}, stocké={value:.0f}",
+                          columns=('video_count', 'total_views', 'avg_views'),
+                          expected='total_views * 1.0 / video_count',
+                          fix='avg_views = total_views * 1.0 / video_count', auto_fixable=True),
+            IntegrityRule('concurrent_video_count_mismatch', 'concurrent', 'video_count', S.MEDIUM,
+                          "video_count IS NOT actual_video_count",
+                          "Video count incorrect: {value} vs {expected}", columns=('video_count',),
+                          expected='actual_video_count',
+                          fix='video_count = (SELECT COUNT(*) FROM video v WHERE v.concurrent_id = concurrent.id)',
+                          auto_fixable=True),
+            IntegrityRule('concurrent_total_views_mismatch', 'concurrent', 'total_views', S.MEDIUM,
+                          "total_views IS NOT NULL AND actual_total_views IS NOT NULL "
+                          "AND abs(total_views - actual_total_views) > actual_total_views * 0.05",
+                          "Total views incorrect: {value} vs {expected}", columns=('total_views',),
+                          expected='actual_total_views',
+                          fix='total_views = (SELECT SUM(view_count) FROM video v WHERE v.concurrent_id = concurrent.id)',
+                          auto_fixable=True),
+            IntegrityRule('concurrent_avg_views_mismatch', 'concurrent', 'avg_views', S.MEDIUM,
+                          "avg_views IS NOT NULL AND actual_avg_views IS NOT NULL "
+                          "AND abs(avg_views - actual_avg_views) > actual_avg_views * 0.05",
+                          "Avg views incorrect: {value:.0f} vs {expected:.0f}", columns=('avg_views',),
+                          expected='actual_avg_views',
+                          fix='avg_views = (SELECT AVG(view_count) FROM video v WHERE v.concurrent_id = concurrent.id)',
+                          auto_fixable=True),
+            # Vidéos
+            IntegrityRule('video_id_format', 'video', 'video_id', S.CRITICAL,
+                          "video_id IS NULL OR length(video_id) != 11 OR video_id GLOB '*[^a-zA-Z0-9_-]*'",
+                          "Format video_id invalide"),
+            IntegrityRule('video_title_empty', 'video', 'title', S.HIGH,
+                          "title IS NULL OR trim(title) = ''", "Titre de vidéo vide",
+                          fix="title = 'Video ' || id", auto_fixable=True),
+            IntegrityRule('video_views_negative', 'video', 'view_count', S.CRITICAL,
+                          "view_count < 0", "Nombre de vues négatif", columns=('view_count',),
+                          expected='0', fix='view_count = 0', auto_fixable=True),
+            IntegrityRule('video_duration_too_short', 'video', 'duration_seconds', S.HIGH,
+                          f"duration_seconds < {t['min_video_duration']}", "Durée vidéo trop courte",
+                          columns=('duration_seconds',)),
+            IntegrityRule('video_duration_too_long', 'video', 'duration_seconds', S.HIGH,
+                          f"duration_seconds > {t['max_video_duration']}", "Durée vidéo trop longue",
+                          columns=('duration_seconds',)),
+            IntegrityRule('video_is_short_mismatch', 'video', 'is_short', S.MEDIUM,
+                          f"duration_seconds IS NOT NULL AND is_short IS NOT NULL "
+                          f"AND (is_short != 0) != (duration_seconds <= {shorts})",
+                          "Incohérence is_short: is_short={value}, attendu={expected}",
+                          columns=('duration_seconds', 'is_short'),
+                          expected=f"CASE WHEN duration_seconds <= {shorts} THEN 1 ELSE 0 END",
+                          fix=f"is_short = CASE WHEN duration_seconds <= {shorts} THEN 1 ELSE 0 END",
+                          auto_fixable=True),
+            IntegrityRule('video_dates_identical', 'video', 'published_at', S.MEDIUM,
+                          "date(published_at) = date(youtube_published_at)",
+                          "Dates de publication identiques (possiblement fausse date)",
+                          columns=('published_at', 'youtube_published_at')),
+            IntegrityRule('video_published_at_invalid', 'video', 'published_at', S.CRITICAL,
+                          "published_at IS NOT NULL AND published_at != '' AND julianday(published_at) IS NULL",
+                          "Format de date invalide", columns=('published_at',)),
+            IntegrityRule('video_published_at_range', 'video', 'published_at', S.HIGH,
+                          "CAST(strftime('%Y', published_at) AS INTEGER) NOT BETWEEN :min_year AND :max_year",
+                          "Date de publication hors plage acceptable: {value}", columns=('published_at',)),
+            IntegrityRule('video_youtube_published_at_invalid', 'video', 'youtube_published_at', S.CRITICAL,
+                          "youtube_published_at IS NOT NULL AND youtube_published_at != '' "
+                          "AND julianday(youtube_published_at) IS NULL",
+                          "Format de date YouTube invalide", columns=('youtube_published_at',)),
+            IntegrityRule('video_youtube_published_at_range', 'video', 'youtube_published_at', S.HIGH,
+                          "CAST(strftime('%Y', youtube_published_at) AS INTEGER) NOT BETWEEN :min_year AND :max_year",
+                          "Date YouTube hors plage acceptable: {value}", columns=('youtube_published_at',)),
+            IntegrityRule('video_category_invalid', 'video', 'category', S.HIGH,
+                          f"category IS NOT NULL AND category NOT IN ({_sql_list(VALID_CATEGORIES)})",
+                          "Catégorie invalide: {value}", columns=('category',)),
+            IntegrityRule('video_classification_source_invalid', 'video', 'classification_source', S.MEDIUM,
+                          f"category IS NOT NULL AND (classification_source IS NULL "
+                          f"OR classification_source NOT IN ({_sql_list(VALID_SOURCES)}))",
+                          "Source de classification invalide: {value}",
+                          columns=('category', 'classification_source')),
+            IntegrityRule('video_human_validation_mismatch', 'video', 'is_human_validated', S.HIGH,
+                          "category IS NOT NULL AND is_human_validated AND classification_source IS NOT 'human'",
+                          "Validation humaine incohérente avec la source de classification",
+                          columns=('category', 'classification_source', 'is_human_validated')),
+            IntegrityRule('video_orphan', 'video', 'concurrent_id', S.CRITICAL,
+                          "NOT EXISTS (SELECT 1 FROM concurrent c WHERE c.id = t.concurrent_id)",
+                          "{count} vidéos orphelines sans concurrent", aggregate=True),
+            # Playlists
+            IntegrityRule('playlist_name_empty', 'playlist', 'name', S.HIGH,
+                          "name IS NULL OR trim(name) = ''", "Nom de playlist vide",
+                          fix="name = 'Playlist ' || id", auto_fixable=True),
+            IntegrityRule('playlist_video_count_negative', 'playlist', 'video_count', S.CRITICAL,
+                          "video_count < 0", "Nombre de vidéos négatif", columns=('video_count',),
+                          expected='0', fix='video_count = 0', auto_fixable=True),
+            IntegrityRule('playlist_video_count_mismatch', 'playlist', 'video_count', S.MEDIUM,
+                          "video_count IS NOT NULL AND video_count != actual_video_count",
+                          "Incohérence video_count: attendu={expected}, stocké={value}", columns=('video_count',),
+                          expected='actual_video_count',
+                          fix='video_count = (SELECT COUNT(*) FROM playlist_video pv WHERE pv.playlist_id = playlist.id)',
+                          auto_fixable=True),
+            IntegrityRule('playlist_orphan', 'playlist', 'concurrent_id', S.CRITICAL,
+                          "NOT EXISTS (SELECT 1 FROM concurrent c WHERE c.id = t.concurrent_id)",
+                          "{count} playlists orphelines sans concurrent", aggregate=True),
+            # Relations
+            IntegrityRule('playlist_video_missing_video', 'playlist_video', 'video_id', S.HIGH,
+                          "NOT EXISTS (SELECT 1 FROM video v WHERE v.id = t.video_id)",
+                          "{count} relations vers vidéos inexistantes", aggregate=True),
+        ]
+    
+    def validate_complete_dataset(self, fix_errors: bool = False, incremental: bool = False) -> Dict:
+        """Validation d'intégrité : complète, ou limitée aux lignes modifiées depuis la dernière validation"""
+        print("🔍 Démarrage de la validation d'intégrité")
         print("=" * 60)
         
         self.errors = []
+        self.rule_counts = {}
+        self.hidden_errors = Counter()
         self.stats = {'total_checks': 0, 'errors_found': 0, 'critical_errors': 0, 'auto_fixes_applied': 0}
+        started = datetime.now()
         
         try:
             conn = get_db_connection()
-            
-            # 1. Validation des concurrents
-            print("\n1️⃣ Validation des concurrents...")
-            self._validate_competitors(conn)
-            
-            # 2. Validation des vidéos
-            print("\n2️⃣ Validation des vidéos...")
-            self._validate_videos(conn)
-            
-            # 3. Validation des playlists
-            print("\n3️⃣ Validation des playlists...")
-            self._validate_playlists(conn)
-            
-            # 4. Validation des relations
-            print("\n4️⃣ Validation des relations...")
-            self._validate_relationships(conn)
-            
-            # 5. Validation des calculs dérivés
-            print("\n5️⃣ Validation des calculs dérivés...")
-            self._validate_calculated_fields(conn)
-            
-            # 6. Validation des dates
-            print("\n6️⃣ Validation des dates...")
-            self._validate_dates(conn)
-            
-            # 7. Validation des classifications
-            print("\n7️⃣ Validation des classifications...")
-            self._validate_classifications(conn)
-            
-            # 8. Correction automatique si demandée
-            if fix_errors:
-                print("\n8️⃣ Correction automatique des erreurs...")
-                self._auto_fix_errors(conn)
-            
-            conn.close()
+            try:
+                mode = 'incremental' if incremental and self._has_full_run(conn) else 'full'
+                if incremental and mode == 'full':
+                    print("ℹ️  Aucune validation complète antérieure : validation complète")
+                ensure_integrity_tracking(conn)
+                conn.commit()
+                max_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM integrity_dirty").fetchone()[0]
+                
+                rules = self.rules = self._applicable_rules(conn)
+                params = {
+                    'max_seq': max_seq,
+                    'min_year': datetime.now().year - self.COHERENCE_THRESHOLDS['date_range_years'],
+                    'max_year': datetime.now().year + 1,
+                }
+                
+                # 1. Un scan par table, tables indépendantes en parallèle (connexions de lecture séparées)
+                by_table: Dict[str, List[IntegrityRule]] = {}
+                for rule in rules:
+                    by_table.setdefault(rule.table, []).append(rule)
+                print(f"\n1️⃣ Scan {mode} de {len(by_table)} tables ({len(rules)} règles)...")
+                with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_SCANS, len(by_table) or 1)) as executor:
+                    futures = {
+                        table: executor.submit(self._scan_table, table, table_rules, mode, params)
+                        for table, table_rules in by_table.items()
+                    }
+                    scans = {table: future.result() for table, future in futures.items()}
+                for table, (rows_checked, counts, _) in scans.items():
+                    print(f"   📊 {table}: {rows_checked} lignes, {sum(1 for c in counts.values() if c)} règles déclenchées")
+                
+                # 2. Rapport des règles déclenchées (dans l'ordre des règles)
+                print("\n2️⃣ Analyse des résultats...")
+                for rule in rules:
+                    rows_checked, counts, samples = scans[rule.table]
+                    count = counts.get(rule.name, 0)
+                    self.rule_counts[rule.name] = count
+                    if count:
+                        self._record_rule(rule, count, samples.get(rule.name, []))
+                self.stats['total_checks'] = sum(scan[0] for scan in scans.values())
+                
+                # 3. Corrections ensemblistes
+                if fix_errors:
+                    print("\n3️⃣ Correction automatique des erreurs...")
+                    self._auto_fix_errors(conn, rules, mode, params)
+                
+                duration = (datetime.now() - started).total_seconds()
+                conn.execute("DELETE FROM integrity_dirty WHERE seq <= ?", (max_seq,))
+                conn.execute("""
+                    INSERT INTO integrity_runs (mode, started_at, duration_seconds, rows_checked, errors_found, max_seq)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (mode, started.isoformat(), duration, self.stats['total_checks'],
+                      self.stats['errors_found'], max_seq))
+                conn.commit()
+            finally:
+                conn.close()
             
             # Générer le rapport final
-            return self._generate_validation_report()
+            report = self._generate_validation_report()
+            report.update({'mode': mode, 'duration_seconds': round(duration, 3), 'rule_counts': self.rule_counts})
+            print(f"\n✅ Validation {mode} terminée en {duration:.2f}s ({self.stats['total_checks']} lignes)")
+            return report
             
         except Exception as e:
             print(f"❌ Erreur lors de la validation: {e}")
@@ -121,368 +411,96 @@ class DataIntegrityValidator:
                 'stats': self.stats
             }
     
-    def _validate_competitors(self, conn: sqlite3.Connection):
-        """Valider la cohérence des données de concurrents"""
-        cursor = conn.cursor()
-        
-        # Vérifier les données de base
-        cursor.execute("""
-            SELECT id, name, channel_id, subscriber_count, video_count, total_views, avg_views
-            FROM concurrent
-        """)
-        
-        competitors = cursor.fetchall()
-        self.stats['total_checks'] += len(competitors)
-        
-        for comp in competitors:
-            comp_id, name, channel_id, sub_count, video_count, total_views, avg_views = comp
-            
-            # Vérification 1: Nom non vide
-            if not name or name.strip() == '':
-                self._add_error('concurrent', 'name', comp_id, SeverityLevel.CRITICAL,
-                              "Nom du concurrent vide", name, auto_fixable=True)
-            
-            # Vérification 2: Channel ID format
-            if channel_id and not re.match(r'^UC[a-zA-Z0-9_-]{22}$', channel_id):
-                self._add_error('concurrent', 'channel_id', comp_id, SeverityLevel.HIGH,
-                              "Format de channel_id invalide", channel_id)
-            
-            # Vérification 3: Nombre d'abonnés cohérent
-            if sub_count is not None and sub_count < 0:
-                self._add_error('concurrent', 'subscriber_count', comp_id, SeverityLevel.CRITICAL,
-                              "Nombre d'abonnés négatif", sub_count, 0, auto_fixable=True)
-            
-            # Vérification 4: Nombre de vidéos cohérent
-            if video_count is not None and video_count < 0:
-                self._add_error('concurrent', 'video_count', comp_id, SeverityLevel.CRITICAL,
-                              "Nombre de vidéos négatif", video_count, 0, auto_fixable=True)
-            
-            # Vérification 5: Vues totales cohérentes
-            if total_views is not None and total_views < 0:
-                self._add_error('concurrent', 'total_views', comp_id, SeverityLevel.CRITICAL,
-                              "Vues totales négatives", total_views, 0, auto_fixable=True)
-            
-            # Vérification 6: Cohérence entre total_views et avg_views
-            if (total_views is not None and avg_views is not None and 
-                video_count is not None and video_count > 0):
-                calculated_avg = total_views / video_count
-                if abs(calculated_avg - avg_views) > (calculated_avg * 0.1):  # 10% de tolérance
-                    self._add_error('concurrent', 'avg_views', comp_id, SeverityLevel.MEDIUM,
-                                  f"Incohérence avg_views: calculé={calculated_avg:.0f}, stocké={avg_views:.0f}",
-                                  avg_views, calculated_avg, auto_fixable=True)
-    
-    def _validate_videos(self, conn: sqlite3.Connection):
-        """Valider la cohérence des données de vidéos"""
-        cursor = conn.cursor()
-        
-        # Vérifier les données de base
-        cursor.execute("""
-            SELECT id, video_id, title, view_count, duration_seconds, is_short, 
-                   published_at, youtube_published_at, concurrent_id
-            FROM video
-        """)
-        
-        videos = cursor.fetchall()
-        self.stats['total_checks'] += len(videos)
-        
-        for video in videos:
-            (vid_id, video_id, title, view_count, duration, is_short, 
-             published_at, youtube_published_at, concurrent_id) = video
-            
-            # Vérification 1: Video ID format YouTube
-            if not re.match(r'^[a-zA-Z0-9_-]{11}$', video_id):
-                self._add_error('video', 'video_id', vid_id, SeverityLevel.CRITICAL,
-                              "Format video_id invalide", video_id)
-            
-            # Vérification 2: Titre non vide
-            if not title or title.strip() == '':
-                self._add_error('video', 'title', vid_id, SeverityLevel.HIGH,
-                              "Titre de vidéo vide", title, auto_fixable=True)
-            
-            # Vérification 3: Nombre de vues cohérent
-            if view_count is not None and view_count < 0:
-                self._add_error('video', 'view_count', vid_id, SeverityLevel.CRITICAL,
-                              "Nombre de vues négatif", view_count, 0, auto_fixable=True)
-            
-            # Vérification 4: Durée cohérente
-            if duration is not None:
-                if duration < self.COHERENCE_THRESHOLDS['min_video_duration']:
-                    self._add_error('video', 'duration_seconds', vid_id, SeverityLevel.HIGH,
-                                  "Durée vidéo trop courte", duration)
-                elif duration > self.COHERENCE_THRESHOLDS['max_video_duration']:
-                    self._add_error('video', 'duration_seconds', vid_id, SeverityLevel.HIGH,
-                                  "Durée vidéo trop longue", duration)
-            
-            # Vérification 5: Cohérence is_short / duration
-            if duration is not None and is_short is not None:
-                expected_is_short = duration <= self.COHERENCE_THRESHOLDS['shorts_duration_threshold']
-                if bool(is_short) != expected_is_short:
-                    self._add_error('video', 'is_short', vid_id, SeverityLevel.MEDIUM,
-                                  f"Incohérence is_short: durée={duration}s, is_short={is_short}",
-                                  is_short, expected_is_short, auto_fixable=True)
-            
-            # Vérification 6: Dates de publication
-            if published_at and youtube_published_at:
-                try:
-                    pub_date = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-                    yt_date = datetime.fromisoformat(youtube_published_at.replace('Z', '+00:00'))
-                    
-                    # Si les dates sont identiques, c'est suspect (import date)
-                    if pub_date.date() == yt_date.date():
-                        self._add_error('video', 'published_at', vid_id, SeverityLevel.MEDIUM,
-                                      "Dates de publication identiques (possiblement fausse date)",
-                                      published_at, auto_fixable=True)
-                except Exception:
-                    self._add_error('video', 'published_at', vid_id, SeverityLevel.HIGH,
-                                  "Format de date invalide", published_at)
+    def _has_full_run(self, conn: sqlite3.Connection) -> bool:
+        try:
+            return conn.execute("SELECT 1 FROM integrity_runs WHERE mode = 'full' LIMIT 1").fetchone() is not None
+        except sqlite3.OperationalError:
+            return False
     
-    def _validate_playlists(self, conn: sqlite3.Connection):
-        """Valider la cohérence des données de playlists"""
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, name, description, video_count, concurrent_id
-            FROM playlist
-        """)
-        
-        playlists = cursor.fetchall()
-        self.stats['total_checks'] += len(playlists)
-        
-        for playlist in playlists:
-            playlist_id, name, description, video_count, concurrent_id = playlist
-            
-            # Vérification 1: Nom non vide
-            if not name or name.strip() == '':
-                self._add_error('playlist', 'name', playlist_id, SeverityLevel.HIGH,
-                              "Nom de playlist vide", name, auto_fixable=True)
-            
-            # Vérification 2: Video count cohérent
-            if video_count is not None and video_count < 0:
-                self._add_error('playlist', 'video_count', playlist_id, SeverityLevel.CRITICAL,
-                              "Nombre de vidéos négatif", video_count, 0, auto_fixable=True)
-            
-            # Vérification 3: Cohérence avec les relations playlist_video
-            cursor.execute("""
-                SELECT COUNT(*) FROM playlist_video WHERE playlist_id = ?
-            """, (playlist_id,))
-            actual_count = cursor.fetchone()[0]
-            
-            if video_count is not None and actual_count != video_count:
-                self._add_error('playlist', 'video_count', playlist_id, SeverityLevel.MEDIUM,
-                              f"Incohérence video_count: attendu={actual_count}, stocké={video_count}",
-                              video_count, actual_count, auto_fixable=True)
+    def _applicable_rules(self, conn: sqlite3.Connection) -> List[IntegrityRule]:
+        """Règles dont la table et les colonnes existent (schémas anciens tolérés)"""
+        columns = {}
+        for table in TABLE_SOURCES:
+            columns[table] = {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+        return [rule for rule in self.build_rules()
+                if columns.get(rule.table) and all(col in columns[rule.table] for col in rule.columns)]
     
-    def _validate_relationships(self, conn: sqlite3.Connection):
-        """Valider la cohérence des relations entre tables"""
-        cursor = conn.cursor()
-        
-        # Vérifier les orphelins
-        print("   🔍 Vérification des orphelins...")
-        
-        # Vidéos sans concurrent
-        cursor.execute("""
-            SELECT COUNT(*) FROM video v 
-            LEFT JOIN concurrent c ON v.concurrent_id = c.id 
-            WHERE c.id IS NULL
-        """)
-        orphan_videos = cursor.fetchone()[0]
-        if orphan_videos > 0:
-            self._add_error('video', 'concurrent_id', 0, SeverityLevel.CRITICAL,
-                          f"{orphan_videos} vidéos orphelines sans concurrent", orphan_videos)
-        
-        # Playlists sans concurrent
-        cursor.execute("""
-            SELECT COUNT(*) FROM playlist p 
-            LEFT JOIN concurrent c ON p.concurrent_id = c.id 
-            WHERE c.id IS NULL
-        """)
-        orphan_playlists = cursor.fetchone()[0]
-        if orphan_playlists > 0:
-            self._add_error('playlist', 'concurrent_id', 0, SeverityLevel.CRITICAL,
-                          f"{orphan_playlists} playlists orphelines sans concurrent", orphan_playlists)
-        
-        # Relations playlist_video avec vidéos inexistantes
-        cursor.execute("""
-            SELECT COUNT(*) FROM playlist_video pv 
-            LEFT JOIN video v ON pv.video_id = v.id 
-            WHERE v.id IS NULL
-        """)
-        invalid_relations = cursor.fetchone()[0]
-        if invalid_relations > 0:
-            self._add_error('playlist_video', 'video_id', 0, SeverityLevel.HIGH,
-                          f"{invalid_relations} relations vers vidéos inexistantes", invalid_relations)
-        
-        self.stats['total_checks'] += 3
-    
-    def _validate_calculated_fields(self, conn: sqlite3.Connection):
-        """Valider les champs calculés et dérivés"""
-        cursor = conn.cursor()
-        
-        # Vérifier les statistiques de concurrents
-        cursor.execute("""
-            SELECT c.id, c.name, c.video_count, c.total_views, c.avg_views,
-                   COUNT(v.id) as actual_video_count,
-                   SUM(v.view_count) as actual_total_views,
-                   AVG(v.view_count) as actual_avg_views
-            FROM concurrent c
-            LEFT JOIN video v ON c.id = v.concurrent_id
-            GROUP BY c.id, c.name, c.video_count, c.total_views, c.avg_views
-        """)
-        
-        for row in cursor.fetchall():
-            (comp_id, name, stored_video_count, stored_total_views, stored_avg_views,
-             actual_video_count, actual_total_views, actual_avg_views) = row
-            
-            # Vérifier video_count
-            if stored_video_count != actual_video_count:
-                self._add_error('concurrent', 'video_count', comp_id, SeverityLevel.MEDIUM,
-                              f"Video count incorrect: {stored_video_count} vs {actual_video_count}",
-                              stored_video_count, actual_video_count, auto_fixable=True)
-            
-            # Vérifier total_views
-            if (stored_total_views is not None and actual_total_views is not None and 
-                abs(stored_total_views - actual_total_views) > (actual_total_views * 0.05)):
-                self._add_error('concurrent', 'total_views', comp_id, SeverityLevel.MEDIUM,
-                              f"Total views incorrect: {stored_total_views} vs {actual_total_views}",
-                              stored_total_views, actual_total_views, auto_fixable=True)
-            
-            # Vérifier avg_views
-            if (stored_avg_views is not None and actual_avg_views is not None and 
-                abs(stored_avg_views - actual_avg_views) > (actual_avg_views * 0.05)):
-                self._add_error('concurrent', 'avg_views', comp_id, SeverityLevel.MEDIUM,
-                              f"Avg views incorrect: {stored_avg_views:.0f} vs {actual_avg_views:.0f}",
-                              stored_avg_views, actual_avg_views, auto_fixable=True)
-        
-        self.stats['total_checks'] += len(cursor.fetchall())
+    def _source(self, table: str, mode: str) -> str:
+        scope = INCREMENTAL_SCOPES.get(table, FULL_SCOPE) if mode == 'incremental' else FULL_SCOPE
+        return TABLE_SOURCES[table].format(**{**FULL_SCOPE, **scope})
     
-    def _validate_dates(self, conn: sqlite3.Connection):
-        """Valider la cohérence des dates"""
-        cursor = conn.cursor()
-        
-        current_year = datetime.now().year
-        min_year = current_year - self.COHERENCE_THRESHOLDS['date_range_years']
-        max_year = current_year + 1
-        
-        # Vérifier les dates de vidéos
-        cursor.execute("""
-            SELECT id, video_id, published_at, youtube_published_at
-            FROM video
-            WHERE published_at IS NOT NULL OR youtube_published_at IS NOT NULL
-        """)
-        
-        for row in cursor.fetchall():
-            video_id, vid_id, published_at, youtube_published_at = row
-            
-            # Vérifier published_at
-            if published_at:
-                try:
-                    pub_date = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-                    if pub_date.year < min_year or pub_date.year > max_year:
-                        self._add_error('video', 'published_at', video_id, SeverityLevel.HIGH,
-                                      f"Date de publication hors plage acceptable: {pub_date.year}",
-                                      published_at)
-                except Exception:
-                    self._add_error('video', 'published_at', video_id, SeverityLevel.CRITICAL,
-                                  "Format de date invalide", published_at)
-            
-            # Vérifier youtube_published_at
-            if youtube_published_at:
-                try:
-                    yt_date = datetime.fromisoformat(youtube_published_at.replace('Z', '+00:00'))
-                    if yt_date.year < min_year or yt_date.year > max_year:
-                        self._add_error('video', 'youtube_published_at', video_id, SeverityLevel.HIGH,
-                                      f"Date YouTube hors plage acceptable: {yt_date.year}",
-                                      youtube_published_at)
-                except Exception:
-                    self._add_error('video', 'youtube_published_at', video_id, SeverityLevel.CRITICAL,
-                                  "Format de date YouTube invalide", youtube_published_at)
-        
-        self.stats['total_checks'] += len(cursor.fetchall())
+    def _scan_table(self, table: str, rules: List[IntegrityRule], mode: str,
+                    params: Dict) -> Tuple[int, Dict[str, int], Dict[str, List]]:
+        """Toutes les règles d'une table en un seul passage (compteurs CASE), puis détail des règles déclenchées"""
+        source = self._source(table, mode)
+        counters = ',\n'.join(
+            f"SUM(CASE WHEN ({rule.predicate}) THEN 1 ELSE 0 END) AS \"{rule.name}\"" for rule in rules
+        )
+        conn = get_db_connection(update_schema=False)
+        try:
+            row = conn.execute(f"SELECT COUNT(*) AS rows_checked, {counters} FROM ({source}) t", params).fetchone()
+            rows_checked = row['rows_checked']
+            counts = {rule.name: row[rule.name] or 0 for rule in rules}
+            
+            samples = {}
+            for rule in rules:
+                if not counts[rule.name] or rule.aggregate:
+                    continue
+                expected = rule.expected or 'NULL'
+                samples[rule.name] = conn.execute(f"""
+                    SELECT id, {rule.field} AS value, {expected} AS expected
+                    FROM ({source}) t WHERE {rule.predicate} LIMIT {ERROR_SAMPLE_LIMIT}
+                """, params).fetchall()
+            return rows_checked, counts, samples
+        finally:
+            conn.close()
     
-    def _validate_classifications(self, conn: sqlite3.Connection):
-        """Valider la cohérence des classifications"""
-        cursor = conn.cursor()
-        
-        # Vérifier les classifications de vidéos
-        cursor.execute("""
-            SELECT id, category, classification_source, is_human_validated
-            FROM video
-            WHERE category IS NOT NULL
-        """)
+    def _record_rule(self, rule: IntegrityRule, count: int, samples: List[sqlite3.Row]):
+        if rule.aggregate:
+            self._add_error(rule.table, rule.field, 0, rule.severity, rule.message.format(count=count), count)
+            return
         
-        valid_categories = ['hero', 'hub', 'help', 'uncategorized']
-        valid_sources = ['human', 'ai', 'playlist', 'keyword', 'multilingual', 'auto']
-        
-        for row in cursor.fetchall():
-            video_id, category, classification_source, is_human_validated = row
-            
-            # Vérifier catégorie valide
-            if category not in valid_categories:
-                self._add_error('video', 'category', video_id, SeverityLevel.HIGH,
-                              f"Catégorie invalide: {category}", category, auto_fixable=True)
-            
-            # Vérifier source valide
-            if classification_source not in valid_sources:
-                self._add_error('video', 'classification_source', video_id, SeverityLevel.MEDIUM,
-                              f"Source de classification invalide: {classification_source}",
-                              classification_source, auto_fixable=True)
-            
-            # Vérifier cohérence human validation
-            if is_human_validated and classification_source != 'human':
-                self._add_error('video', 'is_human_validated', video_id, SeverityLevel.HIGH,
-                              f"Validation humaine incohérente avec source: {classification_source}",
-                              is_human_validated, auto_fixable=True)
-        
-        self.stats['total_checks'] += len(cursor.fetchall())
+        for sample in samples:
+            try:
+                message = rule.message.format(value=sample['value'], expected=sample['expected'], count=count)
+            except (TypeError, ValueError):
+                message = rule.message.split(':')[0]
+            self._add_error(rule.table, rule.field, sample['id'], rule.severity, message,
+                            sample['value'], sample['expected'], rule.auto_fixable, verbose=False)
+        
+        # Au-delà de l'échantillon, les erreurs sont comptées sans être détaillées
+        hidden = count - len(samples)
+        self.stats['errors_found'] += hidden
+        if rule.severity == SeverityLevel.CRITICAL:
+            self.stats['critical_errors'] += hidden
+        if hidden:
+            self.hidden_errors[(rule.severity.value, rule.table)] += hidden
+        
+        icon = {SeverityLevel.CRITICAL: '❌', SeverityLevel.HIGH: '⚠️ '}.get(rule.severity, 'ℹ️ ')
+        print(f"   {icon} {rule.severity.value.upper()}: {rule.message.split(':')[0].format(count=count)} ({count} lignes)")
     
-    def _auto_fix_errors(self, conn: sqlite3.Connection):
-        """Corriger automatiquement les erreurs réparables"""
+    def _auto_fix_errors(self, conn: sqlite3.Connection, rules: List[IntegrityRule], mode: str, params: Dict):
+        """Corriger automatiquement les erreurs réparables : un UPDATE par règle déclenchée"""
         cursor = conn.cursor()
         
-        for error in self.errors:
-            if not error.auto_fixable:
+        for rule in rules:
+            if not rule.fix or not self.rule_counts.get(rule.name):
                 continue
-            
             try:
-                if error.table == 'concurrent':
-                    if error.field == 'name' and not error.current_value:
-                        cursor.execute("UPDATE concurrent SET name = ? WHERE id = ?",
-                                     (f"Concurrent {error.record_id}", error.record_id))
-                    elif error.field in ['subscriber_count', 'video_count', 'total_views'] and error.current_value < 0:
-                        cursor.execute(f"UPDATE concurrent SET {error.field} = 0 WHERE id = ?",
-                                     (error.record_id,))
-                    elif error.field == 'avg_views' and error.expected_value is not None:
-                        cursor.execute("UPDATE concurrent SET avg_views = ? WHERE id = ?",
-                                     (error.expected_value, error.record_id))
-                
-                elif error.table == 'video':
-                    if error.field == 'title' and not error.current_value:
-                        cursor.execute("UPDATE video SET title = ? WHERE id = ?",
-                                     (f"Video {error.record_id}", error.record_id))
-                    elif error.field == 'view_count' and error.current_value < 0:
-                        cursor.execute("UPDATE video SET view_count = 0 WHERE id = ?",
-                                     (error.record_id,))
-                    elif error.field == 'is_short' and error.expected_value is not None:
-                        cursor.execute("UPDATE video SET is_short = ? WHERE id = ?",
-                                     (error.expected_value, error.record_id))
-                
-                elif error.table == 'playlist':
-                    if error.field == 'name' and not error.current_value:
-                        cursor.execute("UPDATE playlist SET name = ? WHERE id = ?",
-                                     (f"Playlist {error.record_id}", error.record_id))
-                    elif error.field == 'video_count' and error.expected_value is not None:
-                        cursor.execute("UPDATE playlist SET video_count = ? WHERE id = ?",
-                                     (error.expected_value, error.record_id))
-                
-                self.stats['auto_fixes_applied'] += 1
-                
+                cursor.execute(f"""
+                    UPDATE {rule.table} SET {rule.fix}
+                    WHERE id IN (SELECT id FROM ({self._source(rule.table, mode)}) t WHERE {rule.predicate})
+                """, params)
+                self.stats['auto_fixes_applied'] += cursor.rowcount
+                print(f"   🔧 {rule.name}: {cursor.rowcount} lignes corrigées")
             except Exception as e:
-                print(f"   ⚠️  Erreur lors de la correction automatique: {e}")
+                print(f"   ⚠️  Erreur lors de la correction automatique ({rule.name}): {e}")
         
         conn.commit()
     
     def _add_error(self, table: str, field: str, record_id: int, severity: SeverityLevel,
-                   message: str, current_value: Any, expected_value: Any = None, auto_fixable: bool = False):
+                   message: str, current_value: Any, expected_value: Any = None, auto_fixable: bool = False,
+                   verbose: bool = True):
         """Ajouter une erreur de validation"""
         error = ValidationError(
             table=table,
@@ -500,23 +518,24 @@ class DataIntegrityValidator:
         
         if severity == SeverityLevel.CRITICAL:
             self.stats['critical_errors'] += 1
+        if not verbose:
+            return
+        if severity == SeverityLevel.CRITICAL:
             print(f"   ❌ CRITIQUE: {message}")
         elif severity == SeverityLevel.HIGH:
             print(f"   ⚠️  ÉLEVÉ: {message}")
     
     def _generate_validation_report(self) -> Dict:
         """Générer le rapport de validation final"""
-        errors_by_severity = {}
-        for severity in SeverityLevel:
-            errors_by_severity[severity.value] = [
-                error for error in self.errors if error.severity == severity
-            ]
-        
-        errors_by_table = {}
+        # Erreurs détaillées + erreurs comptées au-delà de l'échantillon
+        errors_by_severity = Counter({severity.value: 0 for severity in SeverityLevel})
+        errors_by_table = Counter()
         for error in self.errors:
-            if error.table not in errors_by_table:
-                errors_by_table[error.table] = []
-            errors_by_table[error.table].append(error)
+            errors_by_severity[error.severity.value] += 1
+            errors_by_table[error.table] += 1
+        for (severity, table), count in self.hidden_errors.items():
+            errors_by_severity[severity] += count
+            errors_by_table[table] += count
         
         # Déterminer le niveau de santé global
         health_status = "excellent"
@@ -531,12 +550,8 @@ class DataIntegrityValidator:
             'success': True,
             'health_status': health_status,
             'stats': self.stats,
-            'errors_by_severity': {
-                severity: len(errors) for severity, errors in errors_by_severity.items()
-            },
-            'errors_by_table': {
-                table: len(errors) for table, errors in errors_by_table.items()
-            },
+            'errors_by_severity': dict(errors_by_severity),
+            'errors_by_table': dict(errors_by_table),
             'critical_errors': [
                 {
                     'table': error.table,
@@ -574,7 +589,8 @@ class DataIntegrityValidator:
         if self.stats['auto_fixes_applied'] > 0:
             recommendations.append(f"✅ {self.stats['auto_fixes_applied']} corrections automatiques appliquées")
         
-        auto_fixable_count = sum(1 for error in self.errors if error.auto_fixable and error.severity != SeverityLevel.CRITICAL)
+        auto_fixable_count = sum(self.rule_counts.get(rule.name, 0) for rule in self.rules
+                                 if rule.auto_fixable and rule.severity != SeverityLevel.CRITICAL)
         if auto_fixable_count > 0:
             recommendations.append(f"🔧 {auto_fixable_count} erreurs peuvent être corrigées automatiquement")
         
@@ -588,9 +604,9 @@ class DataIntegrityValidator:
 data_validator = DataIntegrityValidator()
 
 # Fonctions d'interface
-def validate_data_integrity(fix_errors: bool = False) -> Dict:
-    """Valider l'intégrité complète des données"""
-    return data_validator.validate_complete_dataset(fix_errors=fix_errors)
+def validate_data_integrity(fix_errors: bool = False, incremental: bool = False) -> Dict:
+    """Valider l'intégrité des données (incremental : lignes modifiées depuis la dernière validation)"""
+    return data_validator.validate_complete_dataset(fix_errors=fix_errors, incremental=incremental)
 
 def get_data_health_status() -> Dict:
     """Obtenir rapidement le statut de santé des données"""
@@ -0,0 +1,238 @@
+"""
+Index de performance et conseiller d'index basé sur la charge réelle
+- Jeu d'index recommandé (colonnes, index couvrants et index sur expressions)
+- Capture de la charge SQL via sqlite3 set_trace_callback (opt-in : SQL_WORKLOAD_LOG=<fichier>)
+- EXPLAIN QUERY PLAN sur la charge capturée : scans complets et tris temporaires
+- Benchmark avant/après
+"""
+
+import atexit
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """Index recommandé ; pattern = motif SQL (minuscules) qu'il accélère"""
+    name: str
+    table: str
+    columns: Tuple[str, ...]
+    pattern: str
+    database: str = 'main'
+
+    @property
+    def ddl(self) -> str:
+        return f"CREATE INDEX IF NOT EXISTS {self.name} ON {self.table}({', '.join(self.columns)})"
+
+    @property
+    def required_columns(self) -> List[str]:
+        return re.findall(r'\b([a-z_]+)\b(?!\s*\()', ' '.join(self.columns).lower())
+
+    def matches(self, sql: str) -> bool:
+        return re.search(self.pattern, sql.lower()) is not None
+
+
+RECOMMENDED_INDEXES: Tuple[IndexSpec, ...] = (
+    # video : filtres par concurrent, catégorie et date
+    IndexSpec('idx_video_concurrent_id', 'video', ('concurrent_id',), r'concurrent_id\s*(=|in\b)'),
+    IndexSpec('idx_video_video_id', 'video', ('video_id',), r'video_id\s*(=|in\b)'),
+    IndexSpec('idx_video_concurrent_category', 'video', ('concurrent_id', 'category'), r'concurrent_id\s*=.*category'),
+    IndexSpec('idx_video_concurrent_published', 'video', ('concurrent_id', 'published_at'), r'concurrent_id\s*=.*published_at'),
+    IndexSpec('idx_video_published_date', 'video', ('date(published_at)',), r'date\(\s*(\w+\.)?published_at\s*\)'),
+    IndexSpec('idx_video_category_lower', 'video', ('lower(category)',), r'lower\(\s*(\w+\.)?category\s*\)'),
+    IndexSpec('idx_video_view_count', 'video', ('view_count',), r'order by\s+(\w+\.)?view_count'),
+    # concurrent
+    IndexSpec('idx_concurrent_country', 'concurrent', ('country',), r'country\s*(=|in\b)'),
+    IndexSpec('idx_concurrent_channel_id', 'concurrent', ('channel_id',), r'channel_id\s*='),
+    # playlist / liens
+    IndexSpec('idx_playlist_concurrent_id', 'playlist', ('concurrent_id',), r'concurrent_id\s*(=|in\b)'),
+    IndexSpec('idx_playlist_playlist_id', 'playlist', ('playlist_id',), r'playlist_id\s*='),
+    IndexSpec('idx_playlist_video_playlist_id', 'playlist_video', ('playlist_id',), r'playlist_id\s*='),
+    IndexSpec('idx_playlist_video_video_id', 'playlist_video', ('video_id',), r'video_id\s*='),
+    # Base sentiment : agrégats par vidéo servis par un index couvrant
+    IndexSpec('idx_comment_emotions_video_cover', 'comment_emotions',
+              ('video_id', 'emotion_type', 'confidence'), r'comment_emotions', database='emotions'),
+)
+
+
+def _existing_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1].lower() for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def ensure_indexes(conn: sqlite3.Connection, database: str = 'main',
+                   specs: Iterable[IndexSpec] = RECOMMENDED_INDEXES) -> List[str]:
+    """Migration idempotente : crée les index manquants dont la table et les colonnes existent"""
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()}
+    created = []
+    for spec in specs:
+        if spec.database != database or spec.name in existing:
+            continue
+        columns = _existing_columns(conn, spec.table)
+        if not columns or not all(col in columns for col in spec.required_columns):
+            continue
+        conn.execute(spec.ddl)
+        created.append(spec.name)
+    return created
+
+
+# === Capture de la charge ===
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_CAPTURED_PREFIXES = ('select', 'with', 'update', 'delete')
+
+
+def normalize_sql(sql: str) -> str:
+    """Clé de regroupement : littéraux remplacés par ?, espaces compactés"""
+    return ' '.join(_LITERALS.sub('?', sql).split())
+
+
+class WorkloadRecorder:
+    """Compte les requêtes exécutées (callback de trace) ; garde un exemple concret par requête"""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.samples: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def record(self, sql: str):
+        statement = sql.strip()
+        if not statement.lower().startswith(_CAPTURED_PREFIXES):
+            return
+        key = normalize_sql(statement)
+        with self._lock:
+            self.counts[key] += 1
+            self.samples.setdefault(key, statement)
+
+    def attach(self, conn: sqlite3.Connection):
+        conn.set_trace_callback(self.record)
+
+    def workload(self) -> List[Tuple[str, int]]:
+        """(requête concrète, nombre d'exécutions), les plus fréquentes d'abord"""
+        with self._lock:
+            return [(self.samples[key], count) for key, count in self.counts.most_common()]
+
+    def dump(self, path: str):
+        """Fusionne la charge capturée dans un fichier JSON"""
+        data = load_workload(path, as_dict=True)
+        for sql, count in self.workload():
+            data[sql] = data.get(sql, 0) + count
+        Path(path).write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+
+
+def load_workload(path: str, as_dict: bool = False):
+    try:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        data = {}
+    return data if as_dict else sorted(data.items(), key=lambda item: -item[1])
+
+
+_workload_recorder: Optional[WorkloadRecorder] = None
+
+
+def workload_recorder() -> Optional[WorkloadRecorder]:
+    """Enregistreur global si SQL_WORKLOAD_LOG est défini (sauvegardé à la sortie du processus)"""
+    global _workload_recorder
+    path = os.getenv('SQL_WORKLOAD_LOG')
+    if not path:
+        return None
+    if _workload_recorder is None:
+        _workload_recorder = WorkloadRecorder()
+        atexit.register(_workload_recorder.dump, path)
+    return _workload_recorder
+
+
+# === Analyse des plans ===
+
+@dataclass
+class PlanReport:
+    """Plan d'une requête de la charge"""
+    sql: str
+    executions: int
+    plan: List[str]
+    full_scans: List[str] = field(default_factory=list)
+    temp_btrees: List[str] = field(default_factory=list)
+    recommended: List[IndexSpec] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def explain(conn: sqlite3.Connection, sql: str) -> List[str]:
+    params = [None] * sql.count('?')
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+
+
+def _scanned_table(detail: str) -> Optional[str]:
+    """Nom (ou alias) de la table d'un SCAN complet, None si le scan passe par un index"""
+    match = re.match(r'SCAN (?:TABLE )?(\w+)(.*)', detail)
+    if not match or 'INDEX' in match.group(2):
+        return None
+    return match.group(1)
+
+
+def _alias_map(sql: str) -> Dict[str, str]:
+    aliases = {}
+    for table, alias in re.findall(r'\b(?:from|join)\s+(\w+)(?:\s+(?:as\s+)?(\w+))?', sql, re.IGNORECASE):
+        aliases[table.lower()] = table.lower()
+        if alias and alias.lower() not in ('where', 'on', 'join', 'left', 'inner', 'group', 'order', 'limit'):
+            aliases[alias.lower()] = table.lower()
+    return aliases
+
+
+def analyze_workload(conn: sqlite3.Connection, workload: Sequence[Tuple[str, int]],
+                     database: str = 'main', specs: Iterable[IndexSpec] = RECOMMENDED_INDEXES) -> List[PlanReport]:
+    """EXPLAIN QUERY PLAN de chaque requête + index recommandés pour les tables scannées"""
+    specs = [spec for spec in specs if spec.database == database]
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()}
+    reports = []
+
+    for sql, executions in workload:
+        try:
+            plan = explain(conn, sql)
+        except sqlite3.Error as e:
+            reports.append(PlanReport(sql, executions, [], error=str(e)))
+            continue
+
+        report = PlanReport(sql, executions, plan)
+        aliases = _alias_map(sql)
+        for detail in plan:
+            if 'TEMP B-TREE' in detail:
+                report.temp_btrees.append(detail)
+            scanned = _scanned_table(detail)
+            if scanned is None:
+                continue
+            report.full_scans.append(detail)
+            table = aliases.get(scanned.lower(), scanned.lower())
+            for spec in specs:
+                if spec.table == table and spec.name not in existing and spec.matches(sql) and spec not in report.recommended:
+                    report.recommended.append(spec)
+        reports.append(report)
+
+    return reports
+
+
+def benchmark(conn: sqlite3.Connection, workload: Sequence[Tuple[str, int]], repeat: int = 3) -> Dict[str, float]:
+    """Meilleur temps (ms) de chaque requête de lecture sur `repeat` exécutions"""
+    timings = {}
+    for sql, _ in workload:
+        if not sql.lower().startswith(('select', 'with')):
+            continue
+        params = [None] * sql.count('?')
+        best = None
+        try:
+            for _ in range(repeat):
+                started = time.perf_counter()
+                conn.execute(sql, params).fetchall()
+                elapsed = (time.perf_counter() - started) * 1000
+                best = elapsed if best is None else min(best, elapsed)
+        except sqlite3.Error:
+            continue
+        timings[sql] = best
+    return timings
@@ -15,6 +15,7 @@ from typing import List, Dict, Optional, Tuple
 import re
 
 from .base import get_db_connection, DatabaseUtils
+from ..playlist_linker import PlaylistLinker
 
 
 class VideoManager:
@@ -213,28 +214,14 @@ class VideoManager:
         return False
     
     def link_playlist_videos(self, playlist_db_id: int, video_ids: List[str]):
-        """Lier des vidéos à une playlist"""
+        """Lier des vidéos à une playlist (remplace les liens existants)"""
         conn = get_db_connection()
         cursor = conn.cursor()
         
         try:
-            # Supprimer les liens existants
-            cursor.execute('DELETE FROM playlist_video WHERE playlist_id = ?', (playlist_db_id,))
-            
-            # Créer les nouveaux liens
-            for video_id in video_ids:
-                # Trouver l'ID de la vidéo dans la base
-                cursor.execute('SELECT id FROM video WHERE video_id = ?', (video_id,))
-                video_row = cursor.fetchone()
-                
-                if video_row:
-                    cursor.execute('''
-                        INSERT INTO playlist_video (playlist_id, video_id)
-                        VALUES (?, ?)
-                    ''', (playlist_db_id, video_row[0]))
-            
+            links_created = PlaylistLinker.bulk_link(cursor, {(playlist_db_id, None): video_ids}, replace=True)
             conn.commit()
-            print(f"✅ {len(video_ids)} vidéos liées à la playlist {playlist_db_id}")
+            print(f"✅ {links_created}/{len(video_ids)} vidéos liées à la playlist {playlist_db_id}")
             
         except Exception as e:
             conn.rollback()
@@ -517,6 +504,50 @@ class VideoClassificationManager:
             conn.close()
 
 
+TOP_VIDEOS_SORT_COLUMNS = {
+    'view_count': 'v.view_count',
+    'like_count': 'v.like_count',
+    'comment_count': 'v.comment_count',
+    'published_at': 'v.published_at',
+    'engagement': '(COALESCE(v.like_count, 0) + COALESCE(v.comment_count, 0)) * 1.0 / NULLIF(v.view_count, 0)'
+}
+
+
+def get_top_videos(limit: int = 100, category: str = None, sort_by: str = 'view_count') -> List[Dict]:
+    """Récupérer les meilleures vidéos tous concurrents confondus"""
+    order_column = TOP_VIDEOS_SORT_COLUMNS.get(sort_by)
+    if order_column is None:
+        raise ValueError(f"Tri non supporté: {sort_by}")
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        params = []
+        where = ''
+        if category:
+            where = 'WHERE LOWER(v.category) = ?'
+            params.append(category.lower())
+        params.append(int(limit))
+        
+        cursor.execute(f'''
+            SELECT 
+                v.id, v.video_id, v.title, v.url, v.thumbnail_url,
+                v.published_at, v.view_count, v.like_count, v.comment_count,
+                v.category, v.duration_seconds, v.is_short,
+                c.id as competitor_id, c.name as competitor_name, c.country
+            FROM video v
+            JOIN concurrent c ON v.concurrent_id = c.id
+            {where}
+            ORDER BY {order_column} DESC
+            LIMIT ?
+        ''', params)
+        
+        return [dict(row) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
 def auto_update_frequency_stats(competitor_id: int):
     """Recalculer automatiquement les statistiques de fréquence pour un concurrent"""
     try:
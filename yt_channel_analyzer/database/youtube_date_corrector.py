@@ -26,6 +26,7 @@ import logging
 import json
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
@@ -42,6 +43,10 @@ except ImportError:
     YOUTUBE_API_AVAILABLE = False
 
 from .base import get_db_connection, DB_PATH
+from ..youtube_api_client import QuotaLedger
+
+API_BATCH_SIZE = 50
+BULK_FETCH_WORKERS = 4
 
 
 @dataclass
@@ -89,16 +94,21 @@ class YouTubeDateCorrectionAgent:
     - published_at > youtube_published_at = incohérent
     """
     
-    def __init__(self, youtube_api_key: Optional[str] = None, dry_run: bool = True):
+    def __init__(self, youtube_api_key: Optional[str] = None, dry_run: bool = True,
+                 max_workers: int = BULK_FETCH_WORKERS, quota_ledger: Optional[QuotaLedger] = None):
         """
         Initialiser l'agent de correction de dates
         
         Args:
             youtube_api_key: Clé API YouTube v3 (si disponible)
             dry_run: Mode dry-run par défaut (sécurité)
+            max_workers: Requêtes API concurrentes en mode bulk
+            quota_ledger: Registre de quota partagé (1 unité par lot de 50 vidéos)
         """
         self.youtube_api_key = youtube_api_key
         self.dry_run = dry_run
+        self.max_workers = max_workers
+        self.quota_ledger = quota_ledger or QuotaLedger()
         self.backup_table_name = f"video_dates_backup_{int(time.time())}"
         
         # Configuration des logs
@@ -269,31 +279,7 @@ class YouTubeDateCorrectionAgent:
         
         try:
             with get_db_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Créer la table de backup
-                cursor.execute(f"""
-                CREATE TABLE IF NOT EXISTS {self.backup_table_name} (
-                    id INTEGER,
-                    video_id TEXT,
-                    concurrent_id INTEGER,
-                    title TEXT,
-                    published_at DATETIME,
-                    youtube_published_at DATETIME,
-                    backup_created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    PRIMARY KEY (id)
-                )
-                """)
-                
-                # Copier toutes les données de dates
-                cursor.execute(f"""
-                INSERT INTO {self.backup_table_name} 
-                (id, video_id, concurrent_id, title, published_at, youtube_published_at)
-                SELECT id, video_id, concurrent_id, title, published_at, youtube_published_at
-                FROM video
-                """)
-                
-                backup_count = cursor.rowcount
+                backup_count = self._snapshot_dates(conn.cursor())
                 conn.commit()
                 
                 self.logger.info(f"✅ Backup créé : table '{self.backup_table_name}' avec {backup_count} entrées")
@@ -303,6 +289,31 @@ class YouTubeDateCorrectionAgent:
             self.logger.error(f"❌ Erreur lors du backup : {e}")
             return False
     
+    def _snapshot_dates(self, cursor, source_filter: str = "") -> int:
+        """
+        Snapshot ensembliste des dates dans la table de backup
+        
+        Crée la table par CREATE TABLE ... AS SELECT, puis n'ajoute que les vidéos
+        absentes : appeler plusieurs fois (backup complet puis correction) est sans risque.
+        """
+        columns = "id, video_id, concurrent_id, title, published_at, youtube_published_at, CURRENT_TIMESTAMP AS backup_created_at"
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (self.backup_table_name,)
+        ).fetchone()
+        
+        if not exists:
+            cursor.execute(f"""
+            CREATE TABLE {self.backup_table_name} AS
+            SELECT {columns} FROM video WHERE 1 {source_filter}
+            """)
+            cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{self.backup_table_name}_id ON {self.backup_table_name}(id)")
+        else:
+            cursor.execute(f"""
+            INSERT OR IGNORE INTO {self.backup_table_name}
+            SELECT {columns} FROM video WHERE 1 {source_filter}
+            """)
+        return cursor.execute(f"SELECT COUNT(*) FROM {self.backup_table_name}").fetchone()[0]
+    
     def fetch_youtube_dates(self, video_ids: List[str]) -> Dict[str, Optional[str]]:
         """
         Récupérer les vraies dates de publication depuis YouTube API v3
@@ -397,6 +408,98 @@ class YouTubeDateCorrectionAgent:
         
         return dates_map
     
+    def _ensure_date_cache(self, cursor):
+        """Cache permanent publishedAt par vidéo (la date YouTube ne change jamais)"""
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS youtube_published_at_cache (
+            video_id TEXT PRIMARY KEY,
+            published_at DATETIME NOT NULL,
+            fetched_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """)
+    
+    def _cached_dates(self, cursor, video_ids: List[str]) -> Dict[str, str]:
+        """Dates déjà connues, lues via une table temporaire (pas de limite de paramètres)"""
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS temp_date_lookup (video_id TEXT PRIMARY KEY)")
+        cursor.execute("DELETE FROM temp_date_lookup")
+        cursor.executemany("INSERT OR IGNORE INTO temp_date_lookup VALUES (?)", [(v,) for v in video_ids])
+        rows = cursor.execute("""
+        SELECT c.video_id, c.published_at
+        FROM youtube_published_at_cache c
+        JOIN temp_date_lookup t ON t.video_id = c.video_id
+        """).fetchall()
+        cursor.execute("DELETE FROM temp_date_lookup")
+        return {row[0]: row[1] for row in rows}
+    
+    def _fetch_date_batch(self, batch: List[str]) -> Dict[str, Optional[str]]:
+        """Un appel videos.list (1 unité) ; None pour les vidéos introuvables ou hors quota"""
+        if not self.quota_ledger.reserve(1):
+            self.logger.warning(f"⚠️ Quota journalier atteint - lot de {len(batch)} vidéos ignoré")
+            return {video_id: None for video_id in batch}
+        
+        params = urllib.parse.urlencode({
+            'part': 'snippet',
+            'id': ','.join(batch),
+            'fields': 'items(id,snippet/publishedAt)',
+            'key': self.youtube_api_key
+        })
+        try:
+            with urllib.request.urlopen(f"https://www.googleapis.com/youtube/v3/videos?{params}", timeout=30) as response:
+                items = json.loads(response.read().decode('utf-8')).get('items', [])
+        except Exception as e:
+            self.logger.error(f"❌ Erreur API YouTube pour lot de {len(batch)} vidéos: {e}")
+            return {video_id: None for video_id in batch}
+        
+        dates_map = {video_id: None for video_id in batch}
+        for item in items:
+            date_obj = datetime.fromisoformat(item['snippet']['publishedAt'].replace('Z', '+00:00'))
+            dates_map[item['id']] = date_obj.strftime('%Y-%m-%d %H:%M:%S')
+        return dates_map
+    
+    def fetch_youtube_dates_bulk(self, video_ids: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Récupération des dates en mode bulk
+        
+        - Cache permanent consulté d'abord : seules les vidéos inconnues coûtent du quota
+        - Lots de 50 récupérés en parallèle, chaque lot réservé dans le registre de quota
+        - Sans clé API : repli sur fetch_youtube_dates pour les vidéos manquantes
+        """
+        video_ids = list(dict.fromkeys(video_ids))
+        
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            self._ensure_date_cache(cursor)
+            dates_map: Dict[str, Optional[str]] = dict(self._cached_dates(cursor, video_ids))
+        
+        missing = [video_id for video_id in video_ids if video_id not in dates_map]
+        self.logger.info(
+            f"🌐 PHASE 3 (bulk) : {len(video_ids) - len(missing)} dates en cache, {len(missing)} à récupérer"
+        )
+        if not missing:
+            return dates_map
+        
+        if not self.youtube_api_key:
+            fetched = self.fetch_youtube_dates(missing)
+        else:
+            batches = [missing[i:i + API_BATCH_SIZE] for i in range(0, len(missing), API_BATCH_SIZE)]
+            fetched = {}
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches)), thread_name_prefix="DateFetch") as executor:
+                for batch_dates in executor.map(self._fetch_date_batch, batches):
+                    fetched.update(batch_dates)
+        
+        found = [(video_id, date) for video_id, date in fetched.items() if date]
+        if found:
+            with get_db_connection() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO youtube_published_at_cache (video_id, published_at) VALUES (?, ?)",
+                    found
+                )
+                conn.commit()
+        
+        self.logger.info(f"✅ Dates récupérées : {len(found)}/{len(missing)} vidéos via API")
+        dates_map.update(fetched)
+        return dates_map
+    
     def _fetch_dates_via_scraping(self, video_ids: List[str]) -> Dict[str, Optional[str]]:
         """
         Récupération légère par scraping (fallback sans API)
@@ -461,81 +564,94 @@ class YouTubeDateCorrectionAgent:
         Returns:
             List[DateCorrectionResult]: Résultats des corrections
         """
-        self.logger.info(f"🔧 PHASE 4 : Application des corrections pour concurrent {competitor_id}")
+        return self.apply_corrections_bulk([competitor_id], confirm)
+    
+    def apply_corrections_bulk(self, competitor_ids: List[int], confirm: bool = False) -> List[DateCorrectionResult]:
+        """
+        Appliquer les corrections de dates pour plusieurs concurrents en une passe
+        
+        🚀 MODE BULK :
+        - Une lecture des vidéos, dates via cache permanent + API concurrente
+        - Corrections chargées dans une table temporaire
+        - Backup = snapshot ensembliste des seules lignes modifiées
+        - Un unique UPDATE ... FROM, dans une transaction (rollback complet en cas d'erreur)
+        
+        Args:
+            competitor_ids: IDs des concurrents à corriger
+            confirm: True pour appliquer réellement (False = dry-run)
+            
+        Returns:
+            List[DateCorrectionResult]: Résultats des corrections
+        """
+        self.logger.info(f"🔧 PHASE 4 : Application des corrections pour {len(competitor_ids)} concurrent(s)")
         self.logger.info(f"📊 Mode: {'PRODUCTION' if confirm else 'DRY-RUN'}")
         
-        if confirm and not self.backup_current_dates():
-            self.logger.error("❌ Impossible de créer le backup - abandon")
+        if not competitor_ids:
             return []
         
+        with get_db_connection() as conn:
+            placeholders = ','.join('?' * len(competitor_ids))
+            videos = conn.execute(f"""
+            SELECT id, video_id, published_at
+            FROM video 
+            WHERE concurrent_id IN ({placeholders})
+            ORDER BY id
+            """, list(competitor_ids)).fetchall()
+        
+        youtube_dates = self.fetch_youtube_dates_bulk([v['video_id'] for v in videos])
+        
         corrections = []
+        pending = []
+        for video in videos:
+            video_id = video['video_id']
+            current_date = video['published_at']
+            youtube_date = youtube_dates.get(video_id)
+            
+            if youtube_date and youtube_date != current_date:
+                pending.append((video['id'], youtube_date))
+                corrections.append(DateCorrectionResult(video_id, current_date, youtube_date, True))
+            elif not youtube_date:
+                corrections.append(DateCorrectionResult(
+                    video_id, current_date, None, False, "Date YouTube non récupérable"
+                ))
         
-        try:
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Récupérer les vidéos à corriger
-                cursor.execute("""
-                SELECT id, video_id, title, published_at, youtube_published_at
-                FROM video 
-                WHERE concurrent_id = ?
-                ORDER BY id
-                """, (competitor_id,))
-                
-                videos = cursor.fetchall()
-                video_ids = [v['video_id'] for v in videos]
-                
-                # Récupérer les vraies dates YouTube
-                youtube_dates = self.fetch_youtube_dates(video_ids)
-                
-                # Appliquer les corrections
-                for video in videos:
-                    video_id = video['video_id']
-                    current_date = video['published_at']
-                    youtube_date = youtube_dates.get(video_id)
-                    
-                    if youtube_date and youtube_date != current_date:
-                        if confirm:
-                            # Appliquer la correction en base
-                            cursor.execute("""
-                            UPDATE video 
-                            SET published_at = ?, youtube_published_at = ?, last_updated = CURRENT_TIMESTAMP
-                            WHERE id = ?
-                            """, (youtube_date, youtube_date, video['id']))
-                        
-                        correction = DateCorrectionResult(
-                            video_id=video_id,
-                            old_date=current_date,
-                            new_date=youtube_date,
-                            success=True
-                        )
-                        corrections.append(correction)
-                        
-                        self.logger.info(
-                            f"{'✅ CORRIGÉ' if confirm else '🔍 À CORRIGER'}: {video_id} "
-                            f"{current_date} → {youtube_date}"
-                        )
-                    
-                    elif not youtube_date:
-                        correction = DateCorrectionResult(
-                            video_id=video_id,
-                            old_date=current_date,
-                            new_date=None,
-                            success=False,
-                            error_message="Date YouTube non récupérable"
-                        )
-                        corrections.append(correction)
-                
-                if confirm:
-                    conn.commit()
-                    self.logger.info(f"✅ {len(corrections)} corrections appliquées en base")
-                else:
-                    self.logger.info(f"🔍 {len(corrections)} corrections simulées (dry-run)")
+        if not confirm:
+            self.logger.info(f"🔍 {len(pending)} corrections simulées (dry-run)")
+            return corrections
         
+        if not pending:
+            self.logger.info("✅ Aucune date à modifier")
+            return corrections
+        
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS temp_date_corrections (id INTEGER PRIMARY KEY, new_date DATETIME)")
+            cursor.execute("DELETE FROM temp_date_corrections")
+            cursor.executemany("INSERT INTO temp_date_corrections (id, new_date) VALUES (?, ?)", pending)
+            
+            backup_count = self._snapshot_dates(cursor, "AND id IN (SELECT id FROM temp_date_corrections)")
+            self.logger.info(f"💾 Snapshot '{self.backup_table_name}' : {backup_count} entrées")
+            
+            cursor.execute("""
+            UPDATE video
+            SET published_at = t.new_date, youtube_published_at = t.new_date, last_updated = CURRENT_TIMESTAMP
+            FROM temp_date_corrections t
+            WHERE video.id = t.id
+            """)
+            updated = cursor.rowcount
+            cursor.execute("DELETE FROM temp_date_corrections")
+            conn.commit()
+            self.logger.info(f"✅ {updated} corrections appliquées en base (UPDATE ensembliste)")
         except Exception as e:
-            self.logger.error(f"❌ Erreur lors des corrections : {e}")
-            if confirm:
-                conn.rollback()
+            conn.rollback()
+            self.logger.error(f"❌ Erreur lors des corrections, transaction annulée : {e}")
+            for correction in corrections:
+                if correction.success:
+                    correction.success = False
+                    correction.error_message = str(e)
+        finally:
+            conn.close()
         
         return corrections
     
@@ -694,8 +810,17 @@ class YouTubeDateCorrectionAgent:
                 )
                 
                 if not cursor.fetchone():
-                    self.logger.error(f"❌ Table de backup '{self.backup_table_name}' introuvable")
-                    return False
+                    # Nouvel agent (CLI --rollback) : utiliser le snapshot le plus récent
+                    latest = cursor.execute("""
+                    SELECT name FROM sqlite_master
+                    WHERE type='table' AND name LIKE 'video_dates_backup_%'
+                    ORDER BY name DESC LIMIT 1
+                    """).fetchone()
+                    if not latest:
+                        self.logger.error(f"❌ Table de backup '{self.backup_table_name}' introuvable")
+                        return False
+                    self.backup_table_name = latest[0]
+                    self.logger.info(f"📋 Utilisation du backup le plus récent : {self.backup_table_name}")
                 
                 # Restaurer les dates depuis le backup
                 cursor.execute(f"""
@@ -869,13 +994,10 @@ def main():
                       f"vidéos avec date {anomaly.most_common_date} (confiance: {anomaly.confidence_score:.1%})")
             
             if args.fix:
-                # Phase 2: Application des corrections
-                all_corrections = []
-                
-                for anomaly in anomalies:
-                    print(f"\n🔧 Correction de {anomaly.competitor_name}...")
-                    corrections = agent.apply_corrections(anomaly.competitor_id, args.confirm)
-                    all_corrections.extend(corrections)
+                # Phase 2: Application des corrections (une passe pour tous les concurrents)
+                competitor_ids = list(dict.fromkeys(a.competitor_id for a in anomalies))
+                print(f"\n🔧 Correction de {len(competitor_ids)} concurrent(s) en mode bulk...")
+                all_corrections = agent.apply_corrections_bulk(competitor_ids, args.confirm)
                 
                 # Phase 3: Génération du rapport
                 report = agent.generate_report(anomalies, all_corrections)
@@ -1,82 +1,154 @@
 """
 Import Workflow Manager
 Gère le workflow automatique post-import des vidéos
+- Petit graphe de tâches : dates ∥ thumbnail, classification dès que les dates sont corrigées,
+  statistiques puis caches en dernier
+- Chronométrage, nouvelles tentatives et reprise idempotente par étape
 """
 
 import os
-import requests
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Optional, Tuple
 from .database import get_db_connection
 from .youtube_api_client import create_youtube_client
 from .database.classification import classify_videos_directly_with_keywords
 from .database.videos import calculate_publication_frequency
+from .thumbnail_service import blob_path, thumbnail_service
+
+# Statuts d'étape considérés comme acquis lors d'une reprise
+DONE_STATUSES = ('success', 'skipped')
+STEP_RETRIES = 2
+STEP_RETRY_DELAY = 2.0
+
+
+@dataclass(frozen=True)
+class WorkflowStep:
+    """Étape du graphe post-import : ne démarre qu'une fois ses dépendances terminées"""
+    name: str
+    label: str
+    method: str
+    depends_on: Tuple[str, ...] = ()
+    needs_url: bool = False
+
+
+POST_IMPORT_STEPS: Tuple[WorkflowStep, ...] = (
+    WorkflowStep('dates', '📅 Correction des dates de publication', '_fix_publication_dates'),
+    WorkflowStep('thumbnail', '🖼️  Téléchargement de la thumbnail', '_download_thumbnail', needs_url=True),
+    WorkflowStep('classification', '🏷️  Classification automatique HHH', '_run_classification', ('dates',)),
+    WorkflowStep('statistics', '📊 Calcul des statistiques', '_calculate_statistics', ('classification', 'thumbnail')),
+    WorkflowStep('cache', '🔄 Rafraîchissement des caches', '_refresh_caches', ('statistics',)),
+    WorkflowStep('similarity', '🧭 Index de similarité (vidéos et chaîne)', '_update_similarity_index'),
+)
 
 
 class ImportWorkflowManager:
     """Gestionnaire du workflow automatique post-import"""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 2):
         self.youtube_client = None
+        self.max_workers = max_workers
         self.static_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static')
     
-    def run_post_import_workflow(self, competitor_id: int, channel_url: str) -> Dict:
+    def run_post_import_workflow(self, competitor_id: int, channel_url: str,
+                                 previous: Optional[Dict[str, Dict]] = None,
+                                 on_step: Optional[Callable[[str, Dict], None]] = None) -> Dict:
         """
-        Exécute le workflow complet après l'import des vidéos
+        Exécute le graphe d'étapes après l'import des vidéos
         
-        Étapes:
-        1. Corriger les dates de publication
-        2. Télécharger et sauvegarder la thumbnail
-        3. Lancer la classification automatique
-        4. Calculer les statistiques
-        5. Rafraîchir l'affichage
+        Étapes (parallèles quand leurs dépendances le permettent):
+        1. Corriger les dates de publication        | 2. Télécharger la thumbnail
+        3. Classification (après les dates)
+        4. Statistiques (après classification et thumbnail)
+        5. Rafraîchir les caches
+        
+        Args:
+            previous: résultats d'une tentative précédente ; les étapes réussies sont sautées
+                      tant qu'aucune de leurs dépendances n'est rejouée
+            on_step: rappel (nom, résultat) à la fin de chaque étape (progression du job)
         
         Returns:
-            Dict avec les résultats de chaque étape
+            Dict avec les résultats (statut, durée, tentatives) de chaque étape
         """
+        previous = previous or {}
         results = {
             'competitor_id': competitor_id,
             'channel_url': channel_url,
             'steps': {}
         }
+        steps = {step.name: step for step in POST_IMPORT_STEPS}
+        replayed = set()
+        started = time.monotonic()
         
         print(f"\n🚀 WORKFLOW POST-IMPORT pour concurrent ID {competitor_id}")
         print("=" * 60)
         
-        # Étape 1: Corriger les dates
-        print("\n📅 ÉTAPE 1: Correction des dates de publication")
-        date_results = self._fix_publication_dates(competitor_id)
-        results['steps']['dates'] = date_results
-        
-        # Étape 2: Télécharger la thumbnail
-        print("\n🖼️  ÉTAPE 2: Téléchargement de la thumbnail")
-        thumbnail_results = self._download_thumbnail(competitor_id, channel_url)
-        results['steps']['thumbnail'] = thumbnail_results
+        def finish(name: str, step_result: Dict):
+            results['steps'][name] = step_result
+            print(f"   {'✅' if step_result.get('status') in DONE_STATUSES else '❌'} {name}: "
+                  f"{step_result.get('status')} ({step_result.get('duration_seconds', 0):.1f}s)")
+            if on_step:
+                on_step(name, step_result)
         
-        # Étape 3: Classification automatique
-        print("\n🏷️  ÉTAPE 3: Classification automatique HHH")
-        classification_results = self._run_classification(competitor_id)
-        results['steps']['classification'] = classification_results
-        
-        # Étape 4: Calculer les statistiques
-        print("\n📊 ÉTAPE 4: Calcul des statistiques")
-        stats_results = self._calculate_statistics(competitor_id)
-        results['steps']['statistics'] = stats_results
+        pending = dict(steps)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='PostImport') as executor:
+            while pending or running:
+                for name, step in list(pending.items()):
+                    if any(dep not in results['steps'] for dep in step.depends_on):
+                        continue
+                    del pending[name]
+                    earlier = previous.get(name) or {}
+                    if earlier.get('status') in DONE_STATUSES and not replayed.intersection(step.depends_on):
+                        # Idempotence : étape déjà acquise lors d'une tentative précédente
+                        finish(name, {**earlier, 'resumed': True})
+                        continue
+                    replayed.add(name)
+                    print(f"\n{step.label}")
+                    args = (competitor_id, channel_url) if step.needs_url else (competitor_id,)
+                    running[executor.submit(self._run_step, step, args)] = name
+                
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(running.pop(future), future.result())
         
-        # Étape 5: Rafraîchir les caches
-        print("\n🔄 ÉTAPE 5: Rafraîchissement des caches")
-        cache_results = self._refresh_caches(competitor_id)
-        results['steps']['cache'] = cache_results
+        results['duration_seconds'] = round(time.monotonic() - started, 2)
+        results['failed_steps'] = [name for name, step_result in results['steps'].items()
+                                   if step_result.get('status') not in DONE_STATUSES]
         
-        print("\n✅ WORKFLOW TERMINÉ!")
+        print(f"\n✅ WORKFLOW TERMINÉ en {results['duration_seconds']}s!")
         print("=" * 60)
         
         return results
     
+    def _run_step(self, step: WorkflowStep, args: tuple) -> Dict:
+        """Exécute une étape avec nouvelles tentatives ; ajoute durée et nombre de tentatives"""
+        started = time.monotonic()
+        for attempt in range(1, STEP_RETRIES + 2):
+            try:
+                step_result = getattr(self, step.method)(*args)
+            except Exception as e:
+                step_result = {'status': 'error', 'error': str(e)}
+            if step_result.get('status') != 'error' or attempt > STEP_RETRIES:
+                break
+            print(f"   🔁 {step.name}: nouvelle tentative {attempt + 1}/{STEP_RETRIES + 1}")
+            time.sleep(STEP_RETRY_DELAY * attempt)
+        
+        step_result['attempts'] = attempt
+        step_result['duration_seconds'] = round(time.monotonic() - started, 2)
+        step_result['finished_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return step_result
+    
     def _fix_publication_dates(self, competitor_id: int) -> Dict:
         """Corrige les dates de publication en utilisant l'API YouTube"""
+        # Schéma déjà migré par l'import : connexion légère, une par étape (threads distincts)
+        conn = get_db_connection(update_schema=False)
         try:
-            conn = get_db_connection()
             cursor = conn.cursor()
             
             # Vérifier si les dates nécessitent une correction
@@ -152,8 +224,8 @@ class ImportWorkflowManager:
     
     def _download_thumbnail(self, competitor_id: int, channel_url: str) -> Dict:
         """Télécharge et sauvegarde la thumbnail de la chaîne"""
+        conn = get_db_connection(update_schema=False)
         try:
-            conn = get_db_connection()
             cursor = conn.cursor()
             
             # Vérifier si la thumbnail existe déjà
@@ -189,24 +261,23 @@ class ImportWorkflowManager:
                 thumbnail_url = result[0]
             
             if thumbnail_url:
-                # Télécharger l'image
+                # Téléchargement via le service (stockage adressé par contenu + variantes WebP)
                 print(f"   📥 Téléchargement depuis: {thumbnail_url[:50]}...")
-                response = requests.get(thumbnail_url, timeout=10)
-                response.raise_for_status()
+                result = thumbnail_service.fetch_all([thumbnail_url])[thumbnail_url]
+                if result.status == 'error':
+                    return {'status': 'error', 'error': result.error}
                 
-                # Créer le répertoire si nécessaire
+                # Copie au chemin historique pour les templates qui le référencent directement
                 os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
-                
-                # Sauvegarder l'image
-                with open(thumbnail_path, 'wb') as f:
-                    f.write(response.content)
+                shutil.copyfile(blob_path(result.sha256, result.ext), thumbnail_path)
                 
                 print(f"   ✅ Thumbnail sauvegardée: {thumbnail_path}")
                 
                 return {
                     'status': 'success',
                     'path': thumbnail_path,
-                    'size': len(response.content)
+                    'size': result.size,
+                    'sha256': result.sha256
                 }
             else:
                 return {
@@ -244,8 +315,8 @@ class ImportWorkflowManager:
     
     def _calculate_statistics(self, competitor_id: int) -> Dict:
         """Calcule et met à jour les statistiques du concurrent"""
+        conn = get_db_connection(update_schema=False)
         try:
-            conn = get_db_connection()
             cursor = conn.cursor()
             
             # Calculer les statistiques de base
@@ -305,6 +376,18 @@ class ImportWorkflowManager:
         finally:
             conn.close()
     
+    def _update_similarity_index(self, competitor_id: int) -> Dict:
+        """Encode les vidéos nouvelles ou modifiées du concurrent et met à jour son centroïde"""
+        from .similarity_service import EMBEDDINGS_AVAILABLE, similarity_service
+        
+        if not EMBEDDINGS_AVAILABLE:
+            return {'status': 'skipped', 'reason': 'sentence-transformers non installé'}
+        try:
+            return similarity_service.update([competitor_id])
+        except Exception as e:
+            print(f"   ❌ Erreur index de similarité: {e}")
+            return {'status': 'error', 'error': str(e)}
+    
     def _refresh_caches(self, competitor_id: int) -> Dict:
         """Rafraîchit les caches et métriques"""
         try:
@@ -0,0 +1,619 @@
+"""
+File de tâches durable adossée à SQLite (table background_tasks)
+- Réservation atomique avec bail (lease) renouvelé par heartbeat
+- Pool de workers borné, priorités
+- Annulation coopérative et nouvelles tentatives avec backoff exponentiel
+- Partageable entre plusieurs processus (WAL + BEGIN IMMEDIATE)
+"""
+
+import json
+import os
+import random
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .database.base import DB_PATH, DB_DIR, DatabaseSchema
+
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 0
+PRIORITY_LOW = -10
+
+# Colonnes modifiables via update() (protège la requête dynamique)
+UPDATABLE_COLUMNS = {
+    'channel_url', 'channel_name', 'status', 'progress', 'current_step', 'videos_found',
+    'videos_processed', 'total_estimated', 'start_time', 'end_time', 'error_message',
+    'channel_thumbnail', 'task_type', 'description', 'extra_data', 'payload', 'priority',
+    'max_attempts', 'next_run_at'
+}
+JSON_COLUMNS = ('extra_data', 'payload')
+
+
+class JobCancelled(Exception):
+    """Levée dans un job quand l'annulation a été demandée"""
+
+
+class PermanentJobError(Exception):
+    """Erreur définitive : pas de nouvelle tentative"""
+
+
+def _now_str() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+class SQLiteJobQueue:
+    """File de jobs persistée dans background_tasks"""
+
+    def __init__(self, db_path=DB_PATH, lease_seconds: int = 120,
+                 backoff_base: float = 30.0, backoff_max: float = 3600.0):
+        self.db_path = Path(db_path)
+        self.lease_seconds = lease_seconds
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # Schéma vérifié à la première connexion : l'import du module ne touche pas la base
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    self._ensure_schema()
+                    self._schema_ready = True
+        # isolation_level=None : transactions gérées explicitement (BEGIN IMMEDIATE)
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA busy_timeout = 30000')
+        return conn
+
+    def _ensure_schema(self):
+        if self.db_path == DB_PATH and not DB_DIR.exists():
+            DB_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            # WAL : lecteurs non bloqués pendant les écritures des workers
+            conn.execute('PRAGMA journal_mode = WAL')
+            DatabaseSchema.update_database_schema(conn)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        for column in JSON_COLUMNS:
+            try:
+                job[column] = json.loads(job.get(column) or '{}')
+            except (TypeError, ValueError):
+                job[column] = {}
+        return job
+
+    # --- Producteur ---
+
+    def enqueue(self, task_id: str, job_type: str, payload: Dict = None, *,
+                channel_url: str = '', channel_name: str = '', priority: int = PRIORITY_NORMAL,
+                max_attempts: int = 3, schedule: bool = True, **fields) -> str:
+        """Ajoute un job ; schedule=False le crée sans le rendre réservable
+
+        Un job existant est réinitialisé seulement s'il n'est pas en cours : le bail et les
+        tentatives d'un job détenu par un worker ne sont jamais écrasés.
+        """
+        columns = {
+            'id': task_id,
+            'channel_url': channel_url or job_type,
+            'channel_name': channel_name or job_type,
+            'status': 'queued',
+            'progress': 0,
+            'current_step': 'En attente...',
+            'task_type': job_type,
+            'payload': json.dumps(payload or {}),
+            'priority': priority,
+            'attempts': 0,
+            'max_attempts': max_attempts,
+            'next_run_at': time.time() if schedule else None,
+            'cancel_requested': 0,
+            'lease_owner': None,
+            'lease_expires_at': None,
+            'heartbeat_at': None,
+            'start_time': None,
+            'end_time': None,
+            'error_message': None,
+            'videos_found': 0,
+            'videos_processed': 0,
+            'total_estimated': 0,
+            'channel_thumbnail': None,
+            'description': '',
+            'extra_data': '{}',
+            'created_at': _now_str(),
+            'updated_at': _now_str(),
+        }
+        for key, value in fields.items():
+            if key in UPDATABLE_COLUMNS:
+                columns[key] = json.dumps(value) if key in JSON_COLUMNS else value
+
+        placeholders = ', '.join('?' for _ in columns)
+        updates = ', '.join(f"{column} = excluded.{column}" for column in columns if column != 'id')
+        conn = self._connect()
+        try:
+            conn.execute(f'''
+                INSERT INTO background_tasks ({', '.join(columns)}) VALUES ({placeholders})
+                ON CONFLICT(id) DO UPDATE SET {updates}
+                WHERE background_tasks.status != 'running' OR background_tasks.lease_owner IS NULL
+            ''', list(columns.values()))
+        finally:
+            conn.close()
+        return task_id
+
+    def schedule(self, task_id: str, payload: Dict = None, priority: int = None, reset_attempts: bool = True) -> bool:
+        """(Re)programme un job existant non actif"""
+        sets = ["status = 'queued'", "next_run_at = ?", "cancel_requested = 0",
+                "lease_owner = NULL", "lease_expires_at = NULL", "end_time = NULL",
+                "error_message = NULL", "updated_at = ?"]
+        params: List[Any] = [time.time(), _now_str()]
+        if reset_attempts:
+            sets.append("attempts = 0")
+        if payload is not None:
+            sets.append("payload = ?")
+            params.append(json.dumps(payload))
+        if priority is not None:
+            sets.append("priority = ?")
+            params.append(priority)
+        params.append(task_id)
+
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"UPDATE background_tasks SET {', '.join(sets)} "
+                f"WHERE id = ? AND (status != 'running' OR lease_owner IS NULL)",
+                params
+            )
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+
+    # --- Consommateur ---
+
+    def claim(self, worker_id: str, job_types: Optional[List[str]] = None) -> Optional[Dict]:
+        """Réserve atomiquement le prochain job (priorité puis ancienneté)
+
+        Les jobs 'running' dont le bail a expiré (worker mort) sont repris tant qu'il reste
+        des tentatives ; sinon ils passent en erreur.
+        """
+        now = time.time()
+        type_filter = ''
+        params: List[Any] = [now, now]
+        if job_types:
+            type_filter = f"AND task_type IN ({', '.join('?' for _ in job_types)})"
+            params.extend(job_types)
+
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            # Jobs annulés dont le worker a disparu : suspendus plutôt que repris
+            conn.execute('''
+                UPDATE background_tasks
+                SET status = 'paused', current_step = 'Annulée', lease_owner = NULL, lease_expires_at = NULL
+                WHERE status = 'running' AND cancel_requested = 1
+                  AND lease_owner IS NOT NULL AND lease_expires_at < ?
+            ''', (now,))
+            # Bail expiré après la dernière tentative (worker mort pendant le job) : erreur définitive,
+            # sinon un job qui fait planter son worker serait repris indéfiniment
+            conn.execute('''
+                UPDATE background_tasks
+                SET status = 'error', current_step = 'Erreur',
+                    error_message = 'Worker perdu pendant la dernière tentative (bail expiré)',
+                    lease_owner = NULL, lease_expires_at = NULL, end_time = ?, updated_at = ?
+                WHERE status = 'running' AND lease_owner IS NOT NULL AND lease_expires_at < ?
+                  AND attempts >= COALESCE(max_attempts, 1)
+            ''', (_now_str(), _now_str(), now))
+            row = conn.execute(f'''
+                SELECT id FROM background_tasks
+                WHERE ((status = 'queued' AND next_run_at IS NOT NULL AND next_run_at <= ?)
+                       OR (status = 'running' AND lease_owner IS NOT NULL AND lease_expires_at < ?))
+                  AND cancel_requested = 0
+                  {type_filter}
+                ORDER BY priority DESC, next_run_at ASC, created_at ASC
+                LIMIT 1
+            ''', params).fetchone()
+
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+
+            conn.execute('''
+                UPDATE background_tasks
+                SET status = 'running', lease_owner = ?, lease_expires_at = ?, heartbeat_at = ?,
+                    attempts = attempts + 1, start_time = COALESCE(start_time, ?),
+                    end_time = NULL, error_message = NULL, updated_at = ?
+                WHERE id = ?
+            ''', (worker_id, now + self.lease_seconds, now, _now_str(), _now_str(), row['id']))
+            job = conn.execute('SELECT * FROM background_tasks WHERE id = ?', (row['id'],)).fetchone()
+            conn.execute('COMMIT')
+            return self._row_to_dict(job)
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def heartbeat(self, task_ids: List[str], worker_id: str) -> Dict[str, bool]:
+        """Renouvelle les baux ; retourne {task_id: annulation demandée} pour les jobs encore détenus"""
+        if not task_ids:
+            return {}
+        now = time.time()
+        placeholders = ', '.join('?' for _ in task_ids)
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute(f'''
+                UPDATE background_tasks SET lease_expires_at = ?, heartbeat_at = ?
+                WHERE lease_owner = ? AND status = 'running' AND id IN ({placeholders})
+            ''', [now + self.lease_seconds, now, worker_id, *task_ids])
+            rows = conn.execute(f'''
+                SELECT id, cancel_requested FROM background_tasks
+                WHERE lease_owner = ? AND status = 'running' AND id IN ({placeholders})
+            ''', [worker_id, *task_ids]).fetchall()
+            conn.execute('COMMIT')
+            return {row['id']: bool(row['cancel_requested']) for row in rows}
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def update(self, task_id: str, fields: Dict[str, Any], worker_id: str = None) -> bool:
+        """Met à jour des colonnes (restreint au détenteur du bail si worker_id est fourni)"""
+        fields = {k: v for k, v in fields.items() if k in UPDATABLE_COLUMNS}
+        if not fields:
+            return False
+        values = [json.dumps(v) if k in JSON_COLUMNS else v for k, v in fields.items()]
+        sets = ', '.join(f"{column} = ?" for column in fields)
+        where = 'id = ?'
+        params = [*values, _now_str(), task_id]
+        if worker_id:
+            where += ' AND lease_owner = ?'
+            params.append(worker_id)
+
+        conn = self._connect()
+        try:
+            cursor = conn.execute(f"UPDATE background_tasks SET {sets}, updated_at = ? WHERE {where}", params)
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+
+    def complete(self, task_id: str, worker_id: str = None, **fields) -> bool:
+        fields.setdefault('progress', 100)
+        fields.setdefault('current_step', 'Terminé')
+        fields.update(status='completed', end_time=_now_str())
+        return self._finish(task_id, worker_id, fields)
+
+    def pause(self, task_id: str, worker_id: str = None, current_step: str = "Arrêté par l'utilisateur") -> bool:
+        return self._finish(task_id, worker_id, {'status': 'paused', 'current_step': current_step})
+
+    def fail(self, task_id: str, worker_id: str, error_message: str, retry: bool = True) -> str:
+        """Échec d'une tentative : reprogrammation avec backoff ou erreur définitive. Retourne le statut final."""
+        job = self.get(task_id)
+        if job is None:
+            return 'missing'
+        attempts = job.get('attempts') or 0
+        max_attempts = job.get('max_attempts') or 1
+
+        if retry and attempts < max_attempts and not job.get('cancel_requested'):
+            delay = self.backoff_delay(attempts)
+            self._finish(task_id, worker_id, {
+                'status': 'queued',
+                'next_run_at': time.time() + delay,
+                'error_message': error_message,
+                'current_step': f"Nouvelle tentative {attempts + 1}/{max_attempts} dans {int(delay)}s"
+            })
+            return 'queued'
+
+        self._finish(task_id, worker_id, {
+            'status': 'error',
+            'current_step': 'Erreur',
+            'error_message': error_message,
+            'end_time': _now_str()
+        })
+        return 'error'
+
+    def backoff_delay(self, attempts: int) -> float:
+        """Backoff exponentiel plafonné avec jitter (évite les reprises synchronisées)"""
+        delay = min(self.backoff_base * (2 ** max(attempts - 1, 0)), self.backoff_max)
+        return delay * random.uniform(0.8, 1.2)
+
+    def _finish(self, task_id: str, worker_id: Optional[str], fields: Dict[str, Any]) -> bool:
+        """Change le statut et libère le bail"""
+        conn = self._connect()
+        try:
+            values = [json.dumps(v) if k in JSON_COLUMNS else v for k, v in fields.items()]
+            sets = ', '.join(f"{column} = ?" for column in fields)
+            where = 'id = ?'
+            params = [*values, _now_str(), task_id]
+            if worker_id:
+                where += ' AND lease_owner = ?'
+                params.append(worker_id)
+            cursor = conn.execute(f'''
+                UPDATE background_tasks
+                SET {sets}, lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+                WHERE {where}
+            ''', params)
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+
+    # --- Contrôle ---
+
+    def request_cancel(self, task_id: str) -> bool:
+        """Demande l'annulation ; un job en attente est suspendu immédiatement"""
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.execute('''
+                UPDATE background_tasks
+                SET status = 'paused', current_step = 'Annulée', next_run_at = NULL, updated_at = ?
+                WHERE id = ? AND status = 'queued'
+            ''', (_now_str(), task_id))
+            if cursor.rowcount == 0:
+                cursor = conn.execute('''
+                    UPDATE background_tasks
+                    SET cancel_requested = 1, current_step = 'Arrêt en cours...', updated_at = ?
+                    WHERE id = ? AND status = 'running'
+                ''', (_now_str(), task_id))
+            conn.execute('COMMIT')
+            return cursor.rowcount > 0
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def get(self, task_id: str) -> Optional[Dict]:
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT * FROM background_tasks WHERE id = ?', (task_id,)).fetchone()
+            return self._row_to_dict(row) if row else None
+        finally:
+            conn.close()
+
+    def list_jobs(self, statuses: Optional[List[str]] = None) -> List[Dict]:
+        query = 'SELECT * FROM background_tasks'
+        params: List[Any] = []
+        if statuses:
+            query += f" WHERE status IN ({', '.join('?' for _ in statuses)})"
+            params.extend(statuses)
+        query += ' ORDER BY created_at DESC'
+        conn = self._connect()
+        try:
+            return [self._row_to_dict(row) for row in conn.execute(query, params).fetchall()]
+        finally:
+            conn.close()
+
+    def delete(self, task_ids: List[str]) -> int:
+        if not task_ids:
+            return 0
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"DELETE FROM background_tasks WHERE id IN ({', '.join('?' for _ in task_ids)})",
+                list(task_ids)
+            )
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def has_pending(self) -> bool:
+        """Jobs programmés ou baux expirés en attente d'un worker"""
+        conn = self._connect()
+        try:
+            row = conn.execute('''
+                SELECT 1 FROM background_tasks
+                WHERE (status = 'queued' AND next_run_at IS NOT NULL)
+                   OR (status = 'running' AND lease_owner IS NOT NULL AND lease_expires_at < ?)
+                LIMIT 1
+            ''', (time.time(),)).fetchone()
+            return row is not None
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        conn = self._connect()
+        try:
+            rows = conn.execute('SELECT status, COUNT(*) AS n FROM background_tasks GROUP BY status').fetchall()
+            return {row['status']: row['n'] for row in rows}
+        finally:
+            conn.close()
+
+
+class ProgressCoalescer:
+    """Regroupe les mises à jour de progression : au plus une écriture par intervalle"""
+
+    def __init__(self, flush: Callable[[Dict[str, Any]], Any], min_interval: float = 2.0):
+        self._flush = flush
+        self.min_interval = min_interval
+        self._pending: Dict[str, Any] = {}
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, force: bool = False, **fields):
+        with self._lock:
+            self._pending.update(fields)
+            due = force or (time.monotonic() - self._last_flush) >= self.min_interval
+            if not due:
+                return
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if pending:
+            self._flush(pending)
+
+    def flush(self):
+        self.update(force=True)
+
+    def drain(self) -> Dict[str, Any]:
+        """Retire la progression en attente (à écrire avec un changement de statut)"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        return pending
+
+    def peek(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._pending)
+
+
+class JobContext:
+    """Contexte passé au handler d'un job"""
+
+    def __init__(self, pool: 'WorkerPool', job: Dict):
+        self.pool = pool
+        self.job = job
+        self.task_id = job['id']
+        self.payload = job.get('payload') or {}
+        self.attempt = job.get('attempts') or 1
+        self.cancelled = threading.Event()
+        self._progress = ProgressCoalescer(
+            lambda fields: pool.queue.update(self.task_id, fields, worker_id=pool.worker_id),
+            min_interval=pool.progress_interval
+        )
+
+    def progress(self, force: bool = False, **fields):
+        """Progression coalescée (écrite au plus toutes les progress_interval secondes)"""
+        self.raise_if_cancelled()
+        self._progress.update(force=force, **fields)
+
+    def flush(self):
+        self._progress.flush()
+
+    def raise_if_cancelled(self):
+        if self.cancelled.is_set():
+            raise JobCancelled(f"Tâche {self.task_id} annulée")
+
+
+class WorkerPool:
+    """Pool borné de workers consommant la file SQLite"""
+
+    def __init__(self, queue: SQLiteJobQueue, max_workers: int = 3, poll_interval: float = 2.0,
+                 heartbeat_interval: float = 15.0, progress_interval: float = 2.0):
+        self.queue = queue
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.progress_interval = progress_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.handlers: Dict[str, Callable[[JobContext], Any]] = {}
+        self.active: Dict[str, JobContext] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def register(self, job_type: str, handler: Callable[[JobContext], Any]):
+        self.handlers[job_type] = handler
+
+    @property
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self):
+        """Démarre les workers (idempotent)"""
+        with self._lock:
+            if self._threads and any(t.is_alive() for t in self._threads):
+                return
+            self._stopping.clear()
+            self._threads = [
+                threading.Thread(target=self._worker_loop, name=f"JobWorker-{i}", daemon=True)
+                for i in range(self.max_workers)
+            ]
+            self._threads.append(threading.Thread(target=self._heartbeat_loop, name="JobHeartbeat", daemon=True))
+            for thread in self._threads:
+                thread.start()
+        print(f"[JOBS] 🚀 {self.max_workers} workers démarrés ({self.worker_id})")
+
+    def stop(self, timeout: float = 10.0):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def notify(self):
+        """Réveille les workers après un enqueue (évite d'attendre le polling)"""
+        self._wakeup.set()
+
+    def _worker_loop(self):
+        while not self._stopping.is_set():
+            try:
+                job = self.queue.claim(self.worker_id, list(self.handlers) or None)
+            except sqlite3.Error as e:
+                print(f"[JOBS] ⚠️ Erreur de réservation: {e}")
+                job = None
+
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            self._run(job)
+
+    def _run(self, job: Dict):
+        context = JobContext(self, job)
+        handler = self.handlers.get(job.get('task_type'))
+        with self._lock:
+            self.active[context.task_id] = context
+
+        try:
+            if handler is None:
+                raise PermanentJobError(f"Aucun handler pour le type '{job.get('task_type')}'")
+            result = handler(context)
+            context.flush()
+            fields = result if isinstance(result, dict) else {}
+            self.queue.complete(context.task_id, self.worker_id, **fields)
+        except JobCancelled:
+            self.queue.pause(context.task_id, self.worker_id)
+            print(f"[JOBS] ⏹️ Tâche {context.task_id} arrêtée par l'utilisateur")
+        except PermanentJobError as e:
+            context.flush()
+            self.queue.fail(context.task_id, self.worker_id, str(e), retry=False)
+            print(f"[JOBS] ❌ Tâche {context.task_id} en erreur définitive: {e}")
+        except Exception as e:
+            context.flush()
+            status = self.queue.fail(context.task_id, self.worker_id, f"❌ Erreur: {str(e)[:100]}")
+            print(f"[JOBS] ❌ Tâche {context.task_id} échouée ({status}): {e}")
+        finally:
+            with self._lock:
+                self.active.pop(context.task_id, None)
+
+    def _heartbeat_loop(self):
+        """Renouvelle les baux, vide la progression en attente et propage les annulations"""
+        while not self._stopping.wait(self.heartbeat_interval):
+            with self._lock:
+                contexts = dict(self.active)
+            if not contexts:
+                continue
+            try:
+                for context in contexts.values():
+                    context._progress.flush()
+                owned = self.queue.heartbeat(list(contexts), self.worker_id)
+            except sqlite3.Error as e:
+                print(f"[JOBS] ⚠️ Heartbeat échoué: {e}")
+                continue
+            for task_id, context in contexts.items():
+                # Bail perdu (repris ailleurs) ou annulation demandée : arrêt coopératif
+                if owned.get(task_id, True):
+                    context.cancelled.set()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            active = list(self.active)
+        return {
+            'worker_id': self.worker_id,
+            'max_workers': self.max_workers,
+            'running': self.running,
+            'active_jobs': active,
+            'queue': self.queue.stats()
+        }
@@ -5,15 +5,19 @@ Gestionnaire de performance optimisé pour infrastructure haute performance
 
 import threading
 import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
 import queue
 import time
 import psutil
 import os
+from array import array
 from typing import List, Dict, Callable, Any, Optional
 from datetime import datetime
 import logging
+from collections import deque
 from dataclasses import dataclass
-from .cache_manager import redis_manager, TaskQueue
+from .cache_manager import redis_manager, TaskQueue, SpecializedCaches, get_cache_stats
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +41,7 @@ class ThreadPoolManager:
             thread_name_prefix="YTAnalyzer"
         )
         self.active_tasks = {}
+        self.running_tasks = 0
         self.completed_tasks = 0
         self.failed_tasks = 0
         self._lock = threading.Lock()
@@ -62,6 +67,8 @@ class ThreadPoolManager:
     def _execute_with_metrics(self, func: Callable, task_id: str, *args, **kwargs):
         """Exécute une fonction avec métriques"""
         start_time = time.time()
+        with self._lock:
+            self.running_tasks += 1
         
         try:
             result = func(*args, **kwargs)
@@ -84,6 +91,9 @@ class ThreadPoolManager:
             
             logger.error(f"❌ Tâche {task_id} échouée: {e}")
             raise
+        finally:
+            with self._lock:
+                self.running_tasks -= 1
     
     def get_task_status(self, task_id: str) -> Optional[Dict]:
         """Récupère le statut d'une tâche"""
@@ -109,16 +119,145 @@ class ThreadPoolManager:
             return {
                 'max_workers': self.max_workers,
                 'active_tasks': len(self.active_tasks),
+                'running_tasks': self.running_tasks,
+                'queue_depth': max(len(self.active_tasks) - self.running_tasks, 0),
+                'utilisation': round(self.running_tasks / self.max_workers * 100, 2),
+                'completed_tasks': self.completed_tasks,
+                'failed_tasks': self.failed_tasks,
+                'success_rate': round(self.completed_tasks / max(self.completed_tasks + self.failed_tasks, 1) * 100, 2)
+            }
+
+class ProcessPoolManager:
+    """Pool de processus persistant pour le travail CPU (contourne le GIL)
+    
+    Les workers sont démarrés à la première soumission et initialisés une seule fois
+    (patterns compilés, modèles) via ``initializer``.
+    """
+    
+    def __init__(self, max_workers: int = None, initializer: Callable = None, initargs: tuple = ()):
+        cpu_count = os.cpu_count() or 2
+        self.max_workers = max_workers or max(cpu_count - 2, 1)  # Garder 2 cores pour Flask/threads
+        self.initializer = initializer
+        self.initargs = initargs
+        # spawn : pas de fork d'un processus multi-threadé (verrous hérités)
+        self._mp_context = multiprocessing.get_context(os.getenv('PROCESS_POOL_START_METHOD', 'spawn'))
+        self.executor = None
+        self.active_tasks = {}
+        self.completed_tasks = 0
+        self.failed_tasks = 0
+        self._lock = threading.Lock()
+    
+    def configure(self, initializer: Callable, initargs: tuple = ()):
+        """Change l'initialiseur ; les workers existants sont recréés"""
+        with self._lock:
+            self.initializer = initializer
+            self.initargs = initargs
+            executor, self.executor = self.executor, None
+        if executor:
+            executor.shutdown(wait=False)
+    
+    def _ensure_executor(self):
+        with self._lock:
+            if self.executor is None:
+                self.executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=self._mp_context,
+                    initializer=self.initializer,
+                    initargs=self.initargs
+                )
+                logger.info(f"🚀 ProcessPool initialisé avec {self.max_workers} workers")
+            return self.executor
+    
+    def submit_task(self, func: Callable, *args, task_id: str = None, **kwargs) -> concurrent.futures.Future:
+        """Soumet une fonction picklable (niveau module) au pool de processus"""
+        if task_id is None:
+            task_id = f"ptask_{int(time.time() * 1000)}"
+        
+        try:
+            future = self._ensure_executor().submit(func, *args, **kwargs)
+        except BrokenProcessPool:
+            # Un worker est mort (OOM...) : recréer le pool une fois
+            logger.error("❌ ProcessPool cassé, recréation")
+            with self._lock:
+                self.executor = None
+            future = self._ensure_executor().submit(func, *args, **kwargs)
+        
+        with self._lock:
+            self.active_tasks[task_id] = {
+                'future': future,
+                'start_time': datetime.now(),
+                'function': func.__name__
+            }
+        future.add_done_callback(lambda f, tid=task_id: self._on_done(tid, f))
+        return future
+    
+    def _on_done(self, task_id: str, future: concurrent.futures.Future):
+        with self._lock:
+            self.active_tasks.pop(task_id, None)
+            if future.cancelled() or future.exception() is not None:
+                self.failed_tasks += 1
+            else:
+                self.completed_tasks += 1
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"❌ Tâche processus {task_id} échouée: {future.exception()}")
+    
+    def get_stats(self) -> Dict:
+        """Statistiques du pool de processus"""
+        with self._lock:
+            running = sum(1 for t in self.active_tasks.values() if t['future'].running())
+            return {
+                'max_workers': self.max_workers,
+                'started': self.executor is not None,
+                'active_tasks': len(self.active_tasks),
+                'running_tasks': running,
+                'queue_depth': len(self.active_tasks) - running,
+                'utilisation': round(running / self.max_workers * 100, 2),
                 'completed_tasks': self.completed_tasks,
                 'failed_tasks': self.failed_tasks,
                 'success_rate': round(self.completed_tasks / max(self.completed_tasks + self.failed_tasks, 1) * 100, 2)
             }
+    
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self.executor = self.executor, None
+        if executor:
+            executor.shutdown(wait=wait)
+
+class ExecutionRouter:
+    """Route les tâches vers le pool de threads (I/O) ou de processus (CPU) selon leur type"""
+    
+    CPU_BOUND_TASKS = {'classification', 'clustering', 'embedding', 'validation'}
+    
+    def __init__(self, thread_pool: ThreadPoolManager, process_pool: ProcessPoolManager):
+        self.thread_pool = thread_pool
+        self.process_pool = process_pool
+        self.routed = {'thread': 0, 'process': 0}
+    
+    def is_cpu_bound(self, task_type: str) -> bool:
+        return task_type in self.CPU_BOUND_TASKS
+    
+    def submit(self, task_type: str, func: Callable, *args, task_id: str = None, **kwargs):
+        """Retourne un Future (processus) ou un task_id (threads)"""
+        if self.is_cpu_bound(task_type):
+            self.routed['process'] += 1
+            return self.process_pool.submit_task(func, *args, task_id=task_id, **kwargs)
+        self.routed['thread'] += 1
+        return self.thread_pool.submit_task(func, *args, task_id=task_id, **kwargs)
+    
+    def get_stats(self) -> Dict:
+        return {
+            'routed': dict(self.routed),
+            'thread_pool': self.thread_pool.get_stats(),
+            'process_pool': self.process_pool.get_stats()
+        }
 
 class BatchProcessor:
     """Processeur de batch optimisé pour les grosses opérations"""
     
-    def __init__(self, thread_pool: ThreadPoolManager):
+    def __init__(self, thread_pool: ThreadPoolManager, router: 'ExecutionRouter' = None):
         self.thread_pool = thread_pool
+        self.router = router
+        self._write_lock = threading.Lock()
     
     def process_competitors_batch(self, competitor_ids: List[int], batch_size: int = 5) -> List[str]:
         """Traite un batch de concurrents en parallèle"""
@@ -144,35 +283,115 @@ class BatchProcessor:
         from .database import refresh_competitor_data
         return refresh_competitor_data(competitor_id)
     
-    def process_videos_classification_batch(self, video_ids: List[int], batch_size: int = 10) -> List[str]:
-        """Classifie un batch de vidéos en parallèle"""
-        task_ids = []
+    def process_videos_classification_batch(self, video_ids: List[int], batch_size: int = 500) -> List[str]:
+        """Classifie des vidéos par lots répartis sur les processus du pool
         
-        for i in range(0, len(video_ids), batch_size):
-            batch = video_ids[i:i + batch_size]
-            
-            task_id = self.thread_pool.submit_task(
-                self._classify_videos_batch,
-                batch,
-                task_id=f"classify_batch_{i}"
-            )
-            task_ids.append(task_id)
+        Les lots partent en tableaux compacts (ids + tuples de textes) ; les résultats
+        sont écrits en base depuis le pool de threads.
+        """
+        from .database import get_db_connection
+        from .process_workers import classify_chunk
+        
+        if self.router is None:
+            raise RuntimeError("BatchProcessor sans ExecutionRouter")
+        
+        _configure_classification_workers()
+        
+        conn = get_db_connection(update_schema=False)
+        task_ids = []
+        try:
+            cursor = conn.cursor()
+            for i in range(0, len(video_ids), 900):  # Limite SQLite des paramètres
+                id_slice = video_ids[i:i + 900]
+                placeholders = ','.join('?' for _ in id_slice)
+                cursor.execute(f'''
+                    SELECT id, title, COALESCE(description, '') FROM video
+                    WHERE id IN ({placeholders})
+                      AND COALESCE(is_human_validated, 0) = 0
+                      AND COALESCE(classification_source, '') != 'human'
+                ''', id_slice)
+                rows = cursor.fetchall()
+                
+                for j in range(0, len(rows), batch_size):
+                    chunk = rows[j:j + batch_size]
+                    task_id = f"classify_batch_{i + j}"
+                    future = self.router.submit(
+                        'classification',
+                        classify_chunk,
+                        array('q', (r[0] for r in chunk)),
+                        tuple(r[1] or '' for r in chunk),
+                        tuple(r[2] for r in chunk),
+                        task_id=task_id
+                    )
+                    future.add_done_callback(self._schedule_classification_write)
+                    task_ids.append(task_id)
+        finally:
+            conn.close()
         
         return task_ids
     
-    def _classify_videos_batch(self, video_ids: List[int]):
-        """Classifie un lot de vidéos"""
-        # Placeholder - sera implémenté avec votre classificateur
-        from .semantic_classifier import classify_videos_batch
-        return classify_videos_batch(video_ids)
+    def _schedule_classification_write(self, future: concurrent.futures.Future):
+        """Les écritures SQLite partent sur le pool de threads (pas dans le thread de résultats)"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.thread_pool.submit_task(self._apply_classification_chunk, future.result())
+    
+    def _apply_classification_chunk(self, chunk_result) -> int:
+        """Applique un lot de résultats en une seule transaction"""
+        from .database import get_db_connection
+        from .process_workers import CATEGORY_CODES
+        
+        video_ids, categories, _languages, scores = chunk_result
+        now = datetime.now()
+        updates = [
+            (CATEGORY_CODES[code], now, video_id)
+            for video_id, code, score in zip(video_ids, categories, scores)
+            if code != 0 and score > 0
+        ]
+        if not updates:
+            return 0
+        
+        with self._write_lock:
+            conn = get_db_connection(update_schema=False)
+            try:
+                conn.executemany('''
+                    UPDATE video
+                    SET category = ?, classification_source = 'keyword', last_updated = ?
+                    WHERE id = ? AND COALESCE(is_human_validated, 0) = 0
+                ''', updates)
+                conn.commit()
+            finally:
+                conn.close()
+        return len(updates)
+
+def _load_classification_pattern_sets() -> Dict:
+    """Patterns par langue (défauts + règles personnalisées) envoyés aux workers"""
+    from .database.classification import ClassificationPatternManager
+    manager = ClassificationPatternManager()
+    return {language: manager.get_classification_patterns(language) for language in ('fr', 'en', 'de', 'nl')}
+
+def _configure_classification_workers():
+    """Initialise les workers de classification une seule fois (patterns recompilés si modifiés)"""
+    from .process_workers import init_classification_worker
+    
+    pattern_sets = _load_classification_pattern_sets()
+    preload_semantic = os.getenv('PROCESS_POOL_PRELOAD_SEMANTIC', 'false').lower() == 'true'
+    initargs = (pattern_sets, preload_semantic)
+    if process_pool_manager.initializer is not init_classification_worker or process_pool_manager.initargs != initargs:
+        process_pool_manager.configure(init_classification_worker, initargs)
 
 class PerformanceMonitor:
-    """Moniteur de performance système"""
+    """Moniteur de performance système (opt-in, échantillons dans un buffer circulaire)"""
     
-    def __init__(self):
-        self.metrics_history = []
+    def __init__(self, history_size: int = 120):
+        self.metrics_history: deque = deque(maxlen=history_size)
         self.monitoring = False
         self.monitor_thread = None
+        self._stop_event = threading.Event()
+        self._process = psutil.Process()
+        # Amorce les compteurs CPU : les appels suivants avec interval=None ne bloquent pas
+        psutil.cpu_percent(interval=None)
+        self._process.cpu_percent(interval=None)
     
     def start_monitoring(self, interval: int = 30):
         """Démarre le monitoring"""
@@ -180,9 +399,11 @@ class PerformanceMonitor:
             return
         
         self.monitoring = True
+        self._stop_event.clear()
         self.monitor_thread = threading.Thread(
             target=self._monitor_loop,
             args=(interval,),
+            name="PerformanceMonitor",
             daemon=True
         )
         self.monitor_thread.start()
@@ -191,20 +412,18 @@ class PerformanceMonitor:
     def stop_monitoring(self):
         """Arrête le monitoring"""
         self.monitoring = False
+        self._stop_event.set()
         if self.monitor_thread:
             self.monitor_thread.join()
+            self.monitor_thread = None
     
     def _monitor_loop(self, interval: int):
         """Boucle de monitoring"""
-        while self.monitoring:
+        while not self._stop_event.is_set():
             try:
                 metrics = self.get_current_metrics()
                 self.metrics_history.append(metrics)
                 
-                # Garder seulement les 100 dernières métriques
-                if len(self.metrics_history) > 100:
-                    self.metrics_history.pop(0)
-                
                 # Log d'alerte si ressources élevées
                 if metrics.cpu_usage > 80:
                     logger.warning(f"🔥 CPU usage élevé: {metrics.cpu_usage}%")
@@ -212,26 +431,23 @@ class PerformanceMonitor:
                 if metrics.memory_usage > 85:
                     logger.warning(f"🔥 Memory usage élevé: {metrics.memory_usage}%")
                 
-                time.sleep(interval)
-                
             except Exception as e:
                 logger.error(f"Erreur monitoring: {e}")
-                time.sleep(interval)
+            
+            self._stop_event.wait(interval)
     
     def get_current_metrics(self) -> PerformanceMetrics:
-        """Récupère les métriques actuelles"""
-        cpu_usage = psutil.cpu_percent(interval=1)
+        """Récupère les métriques actuelles (non bloquant : CPU mesuré depuis l'appel précédent)"""
+        cpu_usage = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
         
         # Compter les threads actifs de l'application
-        current_process = psutil.Process()
-        active_threads = current_process.num_threads()
+        active_threads = self._process.num_threads()
         
         # Taille de la file d'attente Redis
         queue_size = TaskQueue.get_queue_size()
         
         # Taux de hit du cache
-        from .cache_manager import get_cache_stats
         cache_stats = get_cache_stats()
         cache_hit_rate = cache_stats.get('hit_rate', 0)
         
@@ -246,17 +462,18 @@ class PerformanceMonitor:
     
     def get_performance_report(self) -> Dict:
         """Génère un rapport de performance"""
-        if not self.metrics_history:
-            return {"error": "Aucune métrique disponible"}
-        
-        recent_metrics = self.metrics_history[-10:]  # 10 dernières mesures
+        current = self.metrics_history[-1] if self.metrics_history else self.get_current_metrics()
+        recent_metrics = list(self.metrics_history)[-10:] or [current]  # 10 dernières mesures
         
         avg_cpu = sum(m.cpu_usage for m in recent_metrics) / len(recent_metrics)
         avg_memory = sum(m.memory_usage for m in recent_metrics) / len(recent_metrics)
         avg_cache_hit = sum(m.cache_hit_rate for m in recent_metrics) / len(recent_metrics)
+        memory = psutil.virtual_memory()
         
         return {
-            "current": self.get_current_metrics().__dict__,
+            "monitoring": self.monitoring,
+            "samples": len(self.metrics_history),
+            "current": current.__dict__,
             "averages": {
                 "cpu_usage": round(avg_cpu, 2),
                 "memory_usage": round(avg_memory, 2),
@@ -264,8 +481,8 @@ class PerformanceMonitor:
             },
             "system_info": {
                 "cpu_count": psutil.cpu_count(),
-                "total_memory_gb": round(psutil.virtual_memory().total / (1024**3), 2),
-                "available_memory_gb": round(psutil.virtual_memory().available / (1024**3), 2)
+                "total_memory_gb": round(memory.total / (1024**3), 2),
+                "available_memory_gb": round(memory.available / (1024**3), 2)
             }
         }
 
@@ -310,17 +527,26 @@ class OptimizedDatabaseManager:
 
 # Instances globales optimisées pour votre infrastructure
 thread_pool_manager = ThreadPoolManager(max_workers=20)  # 20 sur 24 threads
-batch_processor = BatchProcessor(thread_pool_manager)
+process_pool_manager = ProcessPoolManager()  # Démarré à la première tâche CPU
+execution_router = ExecutionRouter(thread_pool_manager, process_pool_manager)
+batch_processor = BatchProcessor(thread_pool_manager, execution_router)
 performance_monitor = PerformanceMonitor()
 database_manager = OptimizedDatabaseManager(thread_pool_manager)
 
-# Démarrer le monitoring automatiquement
-performance_monitor.start_monitoring(interval=60)  # Toutes les minutes
+def enable_monitoring(app=None, interval: int = None):
+    """Active l'échantillonnage système et, si une app Flask est fournie, l'instrumentation des requêtes"""
+    from . import request_metrics
+    
+    performance_monitor.start_monitoring(interval=interval or int(os.getenv('PERFORMANCE_MONITORING_INTERVAL', 60)))
+    if app is not None:
+        request_metrics.init_app(app)
 
 def get_optimization_status() -> Dict:
     """Retourne le statut d'optimisation général"""
     return {
         "thread_pool": thread_pool_manager.get_stats(),
+        "process_pool": process_pool_manager.get_stats(),
+        "routing": execution_router.routed,
         "performance": performance_monitor.get_performance_report(),
         "redis": redis_manager.is_available,
         "cache_stats": get_cache_stats() if redis_manager.is_available else {},
@@ -335,9 +561,11 @@ def optimize_for_production():
     if os.getenv('ENVIRONMENT') == 'production':
         global thread_pool_manager
         thread_pool_manager = ThreadPoolManager(max_workers=22)  # Plus agressif en prod
+        execution_router.thread_pool = thread_pool_manager
+        batch_processor.thread_pool = thread_pool_manager
         logger.info("📈 Thread pool étendu à 22 workers pour la production")
     
-    # Précharger les caches critiques
+    # Précharger les caches critiques (les requêtes concurrentes sur une clé froide sont coalescées)
     _preload_critical_caches()
     
     logger.info("✅ Optimisations production activées")
@@ -348,16 +576,21 @@ def _preload_critical_caches():
         # Lancer le préchargement en arrière-plan
         thread_pool_manager.submit_task(_preload_competitors_cache, task_id="preload_competitors")
         thread_pool_manager.submit_task(_preload_top_videos_cache, task_id="preload_videos")
+        thread_pool_manager.submit_task(_preload_country_insights_cache, task_id="preload_country_insights")
         logger.info("🔄 Préchargement des caches lancé")
     except Exception as e:
         logger.error(f"Erreur préchargement caches: {e}")
 
 def _preload_competitors_cache():
     """Précharge le cache des concurrents"""
-    from .database.competitors import get_all_competitors_with_stats
-    get_all_competitors_with_stats()
+    SpecializedCaches.get_competitors_stats()
 
 def _preload_top_videos_cache():
     """Précharge le cache des top vidéos"""
-    from .database.videos import get_top_videos
-    get_top_videos(limit=100)
\ No newline at end of file
+    SpecializedCaches.get_top_videos(limit=100)
+
+def _preload_country_insights_cache():
+    """Précharge les insights des pays suivis"""
+    from .database.competitors import get_all_competitors_with_videos
+    countries = sorted({c.get('country') for c in get_all_competitors_with_videos() if c.get('country')})
+    SpecializedCaches.warm_up(countries=countries, top_limits=())
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""
+Moteur unique de liaison playlist ↔ vidéos (playlist_video)
+- Une seule requête pour trouver les playlists classifiées sans liens
+- Récupération concurrente des items (avec pagination) via une fonction d'accès API
+- Résolution des IDs YouTube par jointure sur une table temporaire
+- INSERT OR IGNORE en masse, garanti par l'index unique (playlist_id, video_id)
+
+Note : selon les appelants, playlist_video.playlist_id contient l'ID YouTube de la
+playlist (scripts de refresh) ou son ID en base (VideoManager) ; link_key le précise.
+"""
+
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Fonction d'accès API : (endpoint, params) -> JSON ou None
+ApiGet = Callable[[str, Dict], Optional[Dict]]
+
+LINK_KEYS = ('playlist_id', 'id')
+MAX_FETCH_WORKERS = 8
+
+
+def fetch_playlist_video_ids(api_get: ApiGet, playlist_id: str) -> List[str]:
+    """IDs des vidéos d'une playlist, toutes pages confondues (1 unité de quota par page)"""
+    video_ids = []
+    page_token = None
+
+    while True:
+        params = {'part': 'contentDetails', 'playlistId': playlist_id, 'maxResults': 50}
+        if page_token:
+            params['pageToken'] = page_token
+
+        data = api_get('playlistItems', params)
+        if not data:
+            break
+
+        for item in data.get('items', []):
+            video_id = item.get('contentDetails', {}).get('videoId')
+            if video_id:
+                video_ids.append(video_id)
+
+        page_token = data.get('nextPageToken')
+        if not page_token:
+            break
+
+    return video_ids
+
+
+def ensure_unique_index(conn: sqlite3.Connection):
+    """Dédoublonne playlist_video puis crée l'index unique (une seule fois)"""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_playlist_video_unique'"
+    ).fetchone()
+    if exists:
+        return
+    conn.execute("""
+        DELETE FROM playlist_video
+        WHERE rowid NOT IN (SELECT MIN(rowid) FROM playlist_video GROUP BY playlist_id, video_id)
+    """)
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_playlist_video_unique ON playlist_video(playlist_id, video_id)")
+
+
+class PlaylistLinker:
+    """Crée les liens playlist_video de façon ensembliste"""
+
+    def __init__(self, api_get: Optional[ApiGet] = None, link_key: str = 'playlist_id', max_workers: int = MAX_FETCH_WORKERS):
+        if link_key not in LINK_KEYS:
+            raise ValueError(f"link_key invalide: {link_key}")
+        self.api_get = api_get
+        self.link_key = link_key
+        self.max_workers = max_workers
+        self.errors: Dict[str, str] = {}
+
+    def find_unlinked_playlists(self, conn: sqlite3.Connection, competitor_id: Optional[int] = None) -> List[Tuple]:
+        """(clé de lien, ID YouTube, concurrent) des playlists classifiées sans aucun lien"""
+        query = f"""
+            SELECT p.{self.link_key}, p.playlist_id, p.concurrent_id
+            FROM playlist p
+            WHERE p.category IS NOT NULL
+            AND p.name NOT LIKE 'All Videos%'
+            AND NOT EXISTS (SELECT 1 FROM playlist_video pv WHERE pv.playlist_id = p.{self.link_key})
+        """
+        params = []
+        if competitor_id is not None:
+            query += " AND p.concurrent_id = ?"
+            params.append(competitor_id)
+        return conn.execute(query, params).fetchall()
+
+    def fetch_items(self, playlists: Iterable[Tuple]) -> Dict:
+        """Récupère en parallèle les vidéos de chaque playlist : {(clé, concurrent): [video_id, ...]}"""
+        playlists = list(playlists)
+        if not playlists or self.api_get is None:
+            return {}
+
+        def fetch(playlist):
+            key, youtube_id, competitor_id = playlist
+            try:
+                return (key, competitor_id), fetch_playlist_video_ids(self.api_get, youtube_id)
+            except Exception as e:
+                self.errors[youtube_id] = str(e)
+                return (key, competitor_id), []
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(playlists)), thread_name_prefix="PlaylistLinker") as executor:
+            return {key: video_ids for key, video_ids in executor.map(fetch, playlists) if video_ids}
+
+    @staticmethod
+    def bulk_link(cursor: sqlite3.Cursor, playlist_items: Dict, replace: bool = False) -> int:
+        """Insère les liens en masse ; playlist_items = {(clé, concurrent|None): [video_id YouTube, ...]}"""
+        if not playlist_items:
+            return 0
+
+        ensure_unique_index(cursor.connection)
+        cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS temp_playlist_items (
+                playlist_key, youtube_video_id TEXT, concurrent_id INTEGER, position INTEGER
+            )
+        """)
+        cursor.execute("DELETE FROM temp_playlist_items")
+        cursor.executemany(
+            "INSERT INTO temp_playlist_items VALUES (?, ?, ?, ?)",
+            [
+                (key, video_id, competitor_id, position)
+                for (key, competitor_id), video_ids in playlist_items.items()
+                for position, video_id in enumerate(video_ids)
+            ]
+        )
+
+        if replace:
+            cursor.executemany(
+                "DELETE FROM playlist_video WHERE playlist_id = ?",
+                [(key,) for key, _ in playlist_items]
+            )
+
+        cursor.execute("""
+            INSERT OR IGNORE INTO playlist_video (playlist_id, video_id)
+            SELECT t.playlist_key, v.id
+            FROM temp_playlist_items t
+            JOIN video v ON v.video_id = t.youtube_video_id
+            AND (t.concurrent_id IS NULL OR v.concurrent_id = t.concurrent_id)
+            ORDER BY t.playlist_key, t.position
+        """)
+        links_created = cursor.rowcount
+        cursor.execute("DELETE FROM temp_playlist_items")
+        return links_created
+
+    def collect(self, conn: sqlite3.Connection, competitor_id: Optional[int] = None) -> Dict:
+        """Étape réseau : playlists sans liens → vidéos via API (sans écriture)"""
+        return self.fetch_items(self.find_unlinked_playlists(conn, competitor_id))
+
+    def link_unlinked(self, conn: sqlite3.Connection, competitor_id: Optional[int] = None) -> int:
+        """Trouve, récupère et lie en une passe (lecture et écriture sur la même connexion)"""
+        return self.bulk_link(conn.cursor(), self.collect(conn, competitor_id))
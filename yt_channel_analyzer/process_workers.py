@@ -0,0 +1,99 @@
+"""
+Fonctions exécutées dans les processus du ProcessPool (travail CPU sans GIL partagé)
+Chaque worker est initialisé une seule fois : patterns compilés, modèle optionnel.
+Les lots voyagent sous forme de tableaux compacts (array + tuples) plutôt que de dicts.
+"""
+
+import re
+from array import array
+from typing import Dict, List, Tuple
+
+# Codes compacts des catégories renvoyées par les workers
+CATEGORY_CODES = ('uncategorized', 'hero', 'hub', 'help')
+CATEGORY_INDEX = {name: code for code, name in enumerate(CATEGORY_CODES)}
+LANGUAGE_CODES = ('en', 'fr', 'de', 'nl')
+LANGUAGE_INDEX = {name: code for code, name in enumerate(LANGUAGE_CODES)}
+
+# État propre à chaque processus worker (rempli par l'initialiseur)
+_WORKER_STATE: Dict = {}
+
+
+def _normalize_pattern(pattern: str) -> str:
+    """Même normalisation que ClassificationPatternManager.normalize_pattern"""
+    return re.sub(r'\s+', r'[\\s\\-\\._]*', pattern.lower())
+
+
+def compile_pattern_sets(pattern_sets: Dict[str, Dict[str, List[str]]]) -> Dict:
+    """Compile une fois les patterns : {langue: [(catégorie, [(regex, poids), ...]), ...]}"""
+    compiled = {}
+    for language, categories in pattern_sets.items():
+        compiled[language] = [
+            (category, [(re.compile(_normalize_pattern(p)), len(p.split())) for p in patterns])
+            for category, patterns in categories.items()
+        ]
+    return compiled
+
+
+def init_classification_worker(pattern_sets: Dict[str, Dict[str, List[str]]], preload_semantic: bool = False):
+    """Initialiseur du ProcessPool : exécuté une fois par processus"""
+    from .database.base import DatabaseUtils
+
+    _WORKER_STATE['detect_language'] = DatabaseUtils.detect_language
+    _WORKER_STATE['patterns'] = compile_pattern_sets(pattern_sets)
+    _WORKER_STATE['semantic'] = None
+
+    if preload_semantic:
+        try:
+            from .semantic_classifier import create_lightweight_classifier
+            _WORKER_STATE['semantic'] = create_lightweight_classifier()
+        except Exception as e:
+            print(f"[PROCESS-POOL] ⚠️ Modèle sémantique non chargé dans le worker: {e}")
+
+
+def _weighted_score(text_lower: str, matchers) -> int:
+    return sum(len(regex.findall(text_lower)) * weight for regex, weight in matchers)
+
+
+def _classify_one(title: str, description: str) -> Tuple[int, int, int]:
+    """Reproduit VideoClassifier.classify_video_with_language avec des regex précompilées"""
+    language = _WORKER_STATE['detect_language'](f"{title} {description}")
+    compiled = _WORKER_STATE['patterns'].get(language) or _WORKER_STATE['patterns'].get('fr', [])
+    title_lower = title.lower()
+    description_lower = description.lower()
+
+    best_category, best_score = None, None
+    for category, matchers in compiled:
+        score = _weighted_score(title_lower, matchers) * 2 + _weighted_score(description_lower, matchers)
+        if best_score is None or score > best_score:
+            best_category, best_score = category, score
+
+    language_code = LANGUAGE_INDEX.get(language, 0)
+    if best_category is not None and best_score >= 1:
+        return CATEGORY_INDEX.get(best_category, 0), language_code, int(best_score)
+    return 0, language_code, 0
+
+
+def classify_chunk(video_ids: array, titles: Tuple[str, ...], descriptions: Tuple[str, ...]) -> Tuple[array, bytes, bytes, array]:
+    """Classifie un lot ; retourne (ids, codes catégorie, codes langue, scores)"""
+    if 'patterns' not in _WORKER_STATE:
+        raise RuntimeError("Worker non initialisé (init_classification_worker)")
+
+    categories = bytearray(len(video_ids))
+    languages = bytearray(len(video_ids))
+    scores = array('i', bytes(4 * len(video_ids)))
+    semantic = _WORKER_STATE.get('semantic')
+
+    for i, (title, description) in enumerate(zip(titles, descriptions)):
+        category, language, score = _classify_one(title or '', description or '')
+        if category == 0 and semantic is not None:
+            # Repli sémantique uniquement pour les vidéos sans match de mots-clés
+            try:
+                label, confidence, _ = semantic.classify_text(title or '', description or '')
+                category, score = CATEGORY_INDEX.get(label, 0), int(confidence * 100)
+            except Exception:
+                pass
+        categories[i] = category
+        languages[i] = language
+        scores[i] = score
+
+    return video_ids, bytes(categories), bytes(languages), scores
@@ -0,0 +1,364 @@
+"""
+Rafraîchissement incrémental des chaînes (delta-only)
+- Watermarks par chaîne : dernière vidéo publiée, etag et itemCount de la playlist uploads,
+  videoCount de la chaîne, date et videoCount du dernier contrôle des playlists
+- Détection de changement groupée (channels.list : 1 unité pour 50 chaînes)
+- Lecture de la playlist uploads uniquement jusqu'au watermark
+- Rafraîchissement des statistiques des vidéos récentes selon un calendrier dégressif
+"""
+
+import os
+import re
+import sqlite3
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+# (âge max de la vidéo, intervalle entre deux rafraîchissements des stats)
+STATS_REFRESH_SCHEDULE = (
+    (timedelta(days=2), timedelta(hours=6)),
+    (timedelta(days=7), timedelta(days=1)),
+    (timedelta(days=30), timedelta(days=7)),
+    (timedelta(days=365), timedelta(days=30)),
+)
+
+# Contrôle complet (etag uploads + playlists) même sans changement de videoCount
+FULL_RECHECK_INTERVAL = timedelta(days=7)
+PLAYLIST_RECHECK_INTERVAL = timedelta(days=7)
+API_BATCH_SIZE = 50
+
+# Fonction d'accès API : (endpoint, params) -> JSON ou None
+ApiGet = Callable[[str, Dict], Optional[Dict]]
+
+
+@dataclass
+class ChannelWatermark:
+    """État connu d'une chaîne au dernier rafraîchissement"""
+    concurrent_id: int
+    channel_id: str
+    uploads_playlist_id: Optional[str] = None
+    uploads_etag: Optional[str] = None
+    uploads_item_count: Optional[int] = None
+    channel_video_count: Optional[int] = None
+    latest_published_at: Optional[str] = None
+    playlists_checked_at: Optional[str] = None
+    checked_at: Optional[str] = None
+    changed_at: Optional[str] = None
+    playlists_video_count: Optional[int] = None
+
+
+@dataclass
+class ChannelDelta:
+    """Résultat de la détection de changement pour une chaîne"""
+    concurrent_id: int
+    name: str
+    channel_id: str
+    watermark: ChannelWatermark
+    video_count: Optional[int] = None
+    scan_uploads: bool = False
+    playlists_due: bool = False
+    reason: str = ''
+    new_video_ids: List[str] = field(default_factory=list)
+    # Watermark des uploads à appliquer seulement si toutes les pages et tous les détails ont été lus
+    pending_uploads: Dict = field(default_factory=dict)
+    uploads_complete: bool = True
+
+    @property
+    def changed(self) -> bool:
+        return self.scan_uploads or self.playlists_due
+
+
+def _now() -> datetime:
+    # UTC naïf : comparable aux horodatages stockés en base
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _timestamp(value: datetime) -> str:
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _older_than(timestamp: Optional[str], interval: timedelta) -> bool:
+    if not timestamp:
+        return True
+    try:
+        return datetime.fromisoformat(timestamp.replace('Z', '')) <= _now() - interval
+    except ValueError:
+        return True
+
+
+def iso_duration_to_seconds(duration: str) -> int:
+    """Durée ISO 8601 (PT1H2M3S) en secondes"""
+    match = re.match(r'P(?:(\d+)D)?T?(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?', duration or '')
+    if not match:
+        return 0
+    days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return days * 86400 + hours * 3600 + minutes * 60 + seconds
+
+
+class WatermarkStore:
+    """Lecture/écriture de la table channel_refresh_state"""
+
+    COLUMNS = (
+        'concurrent_id', 'channel_id', 'uploads_playlist_id', 'uploads_etag', 'uploads_item_count',
+        'channel_video_count', 'latest_published_at', 'playlists_checked_at', 'checked_at', 'changed_at',
+        'playlists_video_count'
+    )
+
+    @staticmethod
+    def load_all(conn: sqlite3.Connection) -> Dict[int, ChannelWatermark]:
+        rows = conn.execute(f"SELECT {', '.join(WatermarkStore.COLUMNS)} FROM channel_refresh_state").fetchall()
+        return {row[0]: ChannelWatermark(*row) for row in rows}
+
+    @staticmethod
+    def save(cursor: sqlite3.Cursor, watermark: ChannelWatermark):
+        values = [getattr(watermark, column) for column in WatermarkStore.COLUMNS]
+        placeholders = ', '.join('?' for _ in WatermarkStore.COLUMNS)
+        cursor.execute(
+            f"INSERT OR REPLACE INTO channel_refresh_state ({', '.join(WatermarkStore.COLUMNS)}) VALUES ({placeholders})",
+            values
+        )
+
+
+class ChannelChangeDetector:
+    """Détecte les chaînes modifiées et ne récupère que le delta"""
+
+    def __init__(self, api_get: ApiGet):
+        self._get = api_get
+
+    def probe_channels(self, competitors: Iterable, watermarks: Dict[int, ChannelWatermark],
+                       playlists_only: bool = False) -> List[ChannelDelta]:
+        """Compare videoCount / uploads de chaque chaîne à son watermark (1 appel pour 50 chaînes)
+
+        playlists_only : passe limitée aux playlists (uploads non lus) ; seul le watermark
+        des playlists décide, celui des uploads reste réservé au rafraîchissement complet.
+        """
+        competitors = [(row[0], row[1], row[2]) for row in competitors]
+        channel_info = {}
+
+        for i in range(0, len(competitors), API_BATCH_SIZE):
+            batch = competitors[i:i + API_BATCH_SIZE]
+            data = self._get('channels', {
+                'part': 'contentDetails,statistics',
+                'id': ','.join(channel_id for _, _, channel_id in batch),
+                'maxResults': API_BATCH_SIZE
+            })
+            for item in (data or {}).get('items', []):
+                channel_info[item['id']] = {
+                    'uploads': item.get('contentDetails', {}).get('relatedPlaylists', {}).get('uploads'),
+                    'video_count': int(item.get('statistics', {}).get('videoCount', 0) or 0)
+                }
+
+        deltas = []
+        for competitor_id, name, channel_id in competitors:
+            watermark = watermarks.get(competitor_id) or ChannelWatermark(competitor_id, channel_id)
+            info = channel_info.get(channel_id, {})
+            watermark.uploads_playlist_id = info.get('uploads') or watermark.uploads_playlist_id
+            delta = ChannelDelta(competitor_id, name, channel_id, watermark, video_count=info.get('video_count'))
+
+            if playlists_only:
+                if _older_than(watermark.playlists_checked_at, PLAYLIST_RECHECK_INTERVAL):
+                    delta.playlists_due, delta.reason = True, 'contrôle des playlists'
+                elif delta.video_count is not None and delta.video_count != watermark.playlists_video_count:
+                    delta.playlists_due = True
+                    delta.reason = f"videoCount {watermark.playlists_video_count} → {delta.video_count}"
+                deltas.append(delta)
+                continue
+
+            if watermark.checked_at is None:
+                delta.scan_uploads, delta.reason = True, 'premier passage'
+            elif delta.video_count is not None and delta.video_count != watermark.channel_video_count:
+                delta.scan_uploads, delta.reason = True, f"videoCount {watermark.channel_video_count} → {delta.video_count}"
+            elif _older_than(watermark.checked_at, FULL_RECHECK_INTERVAL):
+                delta.scan_uploads, delta.reason = True, 'contrôle périodique'
+
+            delta.playlists_due = delta.scan_uploads or _older_than(watermark.playlists_checked_at, PLAYLIST_RECHECK_INTERVAL)
+            deltas.append(delta)
+
+        return deltas
+
+    def fetch_new_uploads(self, delta: ChannelDelta, known_video_ids: set) -> List[str]:
+        """Lit la playlist uploads (plus récentes d'abord) jusqu'au watermark ; retourne les nouveaux IDs"""
+        watermark = delta.watermark
+        if not watermark.uploads_playlist_id:
+            return []
+
+        new_ids = []
+        latest_seen = None
+        page_token = None
+        first_page = True
+
+        while True:
+            params = {'part': 'contentDetails', 'playlistId': watermark.uploads_playlist_id, 'maxResults': API_BATCH_SIZE}
+            if page_token:
+                params['pageToken'] = page_token
+            data = self._get('playlistItems', params)
+            if not data:
+                # Page manquante : les vidéos plus anciennes non lues ne doivent pas passer sous le watermark
+                delta.uploads_complete = False
+                break
+
+            if first_page:
+                first_page = False
+                if data.get('etag') and data.get('etag') == watermark.uploads_etag:
+                    # Première page identique : aucune nouvelle vidéo
+                    break
+                delta.pending_uploads['uploads_etag'] = data.get('etag')
+                delta.pending_uploads['uploads_item_count'] = data.get('pageInfo', {}).get('totalResults')
+
+            reached_watermark = False
+            page_known = 0
+            for item in data.get('items', []):
+                details = item.get('contentDetails', {})
+                video_id = details.get('videoId')
+                published_at = details.get('videoPublishedAt')
+                if watermark.latest_published_at and published_at and published_at <= watermark.latest_published_at:
+                    reached_watermark = True
+                    break
+                if video_id in known_video_ids:
+                    page_known += 1
+                elif video_id:
+                    new_ids.append(video_id)
+                if published_at and (latest_seen is None or published_at > latest_seen):
+                    latest_seen = published_at
+
+            # Page entièrement connue sans watermark (premier passage) : le reste l'est aussi
+            page_token = data.get('nextPageToken')
+            if reached_watermark or not page_token or page_known == len(data.get('items', [])):
+                break
+
+        if latest_seen and (not watermark.latest_published_at or latest_seen > watermark.latest_published_at):
+            delta.pending_uploads['latest_published_at'] = latest_seen
+        delta.new_video_ids = new_ids
+        return new_ids
+
+    def fetch_video_details(self, video_ids: List[str], delta: Optional[ChannelDelta] = None) -> List[Dict]:
+        """Détails + statistiques des vidéos (1 appel pour 50 vidéos) ; un lot en échec rend le delta incomplet"""
+        videos = []
+        for i in range(0, len(video_ids), API_BATCH_SIZE):
+            data = self._get('videos', {
+                'part': 'snippet,contentDetails,statistics',
+                'id': ','.join(video_ids[i:i + API_BATCH_SIZE])
+            })
+            if data is None and delta is not None:
+                delta.uploads_complete = False
+            for item in (data or {}).get('items', []):
+                snippet = item.get('snippet', {})
+                statistics = item.get('statistics', {})
+                duration_seconds = iso_duration_to_seconds(item.get('contentDetails', {}).get('duration', ''))
+                videos.append({
+                    'video_id': item['id'],
+                    'title': snippet.get('title', '')[:200],
+                    'description': snippet.get('description', ''),
+                    'thumbnail_url': snippet.get('thumbnails', {}).get('high', {}).get('url', ''),
+                    'published_at': snippet.get('publishedAt'),
+                    'duration_seconds': duration_seconds,
+                    'view_count': int(statistics.get('viewCount', 0) or 0),
+                    'like_count': int(statistics.get('likeCount', 0) or 0),
+                    'comment_count': int(statistics.get('commentCount', 0) or 0),
+                })
+        return videos
+
+    def fetch_statistics(self, video_ids: List[str]) -> List[tuple]:
+        """Statistiques seules : (vues, likes, commentaires, video_id)"""
+        rows = []
+        for i in range(0, len(video_ids), API_BATCH_SIZE):
+            data = self._get('videos', {'part': 'statistics', 'id': ','.join(video_ids[i:i + API_BATCH_SIZE])})
+            for item in (data or {}).get('items', []):
+                statistics = item.get('statistics', {})
+                rows.append((
+                    int(statistics.get('viewCount', 0) or 0),
+                    int(statistics.get('likeCount', 0) or 0),
+                    int(statistics.get('commentCount', 0) or 0),
+                    item['id']
+                ))
+        return rows
+
+
+def incremental_mode_requested(argv: List[str] = None) -> bool:
+    """Mode incrémental via --incremental ou REFRESH_MODE=incremental"""
+    argv = sys.argv[1:] if argv is None else argv
+    return '--incremental' in argv or os.getenv('REFRESH_MODE', '').lower() == 'incremental'
+
+
+def known_video_ids(conn: sqlite3.Connection, competitor_id: int) -> set:
+    return {row[0] for row in conn.execute("SELECT video_id FROM video WHERE concurrent_id = ?", (competitor_id,))}
+
+
+def videos_due_for_stats(conn: sqlite3.Connection, competitor_id: int) -> List[str]:
+    """Vidéos récentes dont les stats sont à rafraîchir selon STATS_REFRESH_SCHEDULE"""
+    published = "datetime(COALESCE(NULLIF(youtube_published_at, ''), published_at))"
+    cases, params = [], []
+    for max_age, interval in STATS_REFRESH_SCHEDULE:
+        cases.append(f"WHEN {published} >= datetime('now', ?) THEN datetime('now', ?)")
+        params.extend([f"-{int(max_age.total_seconds())} seconds", f"-{int(interval.total_seconds())} seconds"])
+    oldest = f"-{int(STATS_REFRESH_SCHEDULE[-1][0].total_seconds())} seconds"
+
+    query = f"""
+        SELECT video_id FROM video
+        WHERE concurrent_id = ?
+        AND {published} >= datetime('now', ?)
+        AND (stats_refreshed_at IS NULL OR datetime(stats_refreshed_at) <= CASE {' '.join(cases)} END)
+    """
+    return [row[0] for row in conn.execute(query, [competitor_id, oldest] + params)]
+
+
+def insert_new_videos(cursor: sqlite3.Cursor, competitor_id: int, videos: List[Dict]) -> int:
+    """Insère les nouvelles vidéos (ignore celles déjà présentes)"""
+    now = _timestamp(_now())
+    inserted = 0
+    for video in videos:
+        cursor.execute("SELECT 1 FROM video WHERE video_id = ? AND concurrent_id = ?", (video['video_id'], competitor_id))
+        if cursor.fetchone():
+            continue
+        seconds = video['duration_seconds']
+        cursor.execute("""
+            INSERT INTO video (
+                concurrent_id, video_id, title, description, url, thumbnail_url,
+                published_at, youtube_published_at, duration_seconds, duration_text, view_count,
+                like_count, comment_count, is_short, created_at, last_updated, stats_refreshed_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            competitor_id, video['video_id'], video['title'], video['description'],
+            f"https://www.youtube.com/watch?v={video['video_id']}", video['thumbnail_url'],
+            video['published_at'], video['published_at'], seconds,
+            f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}",
+            video['view_count'], video['like_count'], video['comment_count'],
+            1 if 0 < seconds <= 60 else 0, now, now, now
+        ))
+        inserted += 1
+    return inserted
+
+
+def apply_statistics(cursor: sqlite3.Cursor, rows: List[tuple]) -> int:
+    """Met à jour vues/likes/commentaires et l'horodatage de rafraîchissement"""
+    now = _timestamp(_now())
+    cursor.executemany("""
+        UPDATE video
+        SET view_count = ?, like_count = ?, comment_count = ?, stats_refreshed_at = ?, last_updated = ?
+        WHERE video_id = ?
+    """, [(views, likes, comments, now, now, video_id) for views, likes, comments, video_id in rows])
+    return len(rows)
+
+
+def commit_watermark(cursor: sqlite3.Cursor, delta: ChannelDelta, playlists_checked: bool = False, changed: bool = False):
+    """Enregistre le watermark après traitement de la chaîne
+
+    Le watermark des uploads n'avance que si toutes les pages et tous les détails ont été lus :
+    sinon la chaîne sera rescannée au prochain passage.
+    """
+    watermark = delta.watermark
+    now = _timestamp(_now())
+    if delta.scan_uploads and delta.uploads_complete:
+        for column, value in delta.pending_uploads.items():
+            setattr(watermark, column, value)
+        watermark.checked_at = now
+        if delta.video_count is not None:
+            watermark.channel_video_count = delta.video_count
+    if playlists_checked:
+        watermark.playlists_checked_at = now
+        if delta.video_count is not None:
+            watermark.playlists_video_count = delta.video_count
+    if changed:
+        watermark.changed_at = now
+    WatermarkStore.save(cursor, watermark)
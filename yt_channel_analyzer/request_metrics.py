@@ -0,0 +1,296 @@
+"""
+Instrumentation des requêtes Flask (opt-in via PERFORMANCE_MONITORING=true)
+- Histogrammes de latence par endpoint (buckets log-linéaires façon HDR)
+- Nombre et durée des requêtes SQL par requête HTTP
+- Hits/misses du cache par requête
+- Export JSON et format texte Prometheus
+"""
+
+import contextvars
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+class LatencyHistogram:
+    """Histogramme log-linéaire (précision relative ~1/sub_buckets) sur des microsecondes"""
+
+    def __init__(self, sub_bucket_bits: int = 5, max_exponent: int = 36):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_buckets = 1 << sub_bucket_bits
+        self.counts = [0] * (self.sub_buckets * (max_exponent + 1))
+        self.total_count = 0
+        self.total_sum = 0.0
+        self.max_value = 0
+
+    def _index(self, value_us: int) -> int:
+        if value_us < self.sub_buckets:
+            return value_us
+        exponent = value_us.bit_length() - self.sub_bucket_bits
+        sub = value_us >> exponent  # dans [sub_buckets/2 .. sub_buckets)
+        return min(exponent * self.sub_buckets + sub, len(self.counts) - 1)
+
+    def _upper_bound(self, index: int) -> int:
+        """Borne haute (µs) du bucket"""
+        exponent, sub = divmod(index, self.sub_buckets)
+        if exponent == 0:
+            return sub
+        return ((sub + 1) << exponent) - 1
+
+    def record(self, seconds: float):
+        value_us = max(int(seconds * 1_000_000), 0)
+        self.counts[self._index(value_us)] += 1
+        self.total_count += 1
+        self.total_sum += seconds
+        self.max_value = max(self.max_value, value_us)
+
+    def percentile(self, p: float) -> float:
+        """Percentile en millisecondes (borne haute du bucket)"""
+        if not self.total_count:
+            return 0.0
+        target = max(1, int(round(p / 100 * self.total_count)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._upper_bound(index), self.max_value) / 1000
+        return self.max_value / 1000
+
+    def cumulative_buckets(self, bounds_seconds: List[float]) -> List[int]:
+        """Comptes cumulés pour des bornes fixes (format Prometheus `le`)"""
+        result = []
+        for bound in bounds_seconds:
+            bound_us = int(bound * 1_000_000)
+            result.append(sum(c for i, c in enumerate(self.counts) if c and self._upper_bound(i) <= bound_us))
+        return result
+
+    def summary(self) -> Dict:
+        return {
+            'count': self.total_count,
+            'avg_ms': round(self.total_sum / self.total_count * 1000, 2) if self.total_count else 0,
+            'p50_ms': round(self.percentile(50), 2),
+            'p90_ms': round(self.percentile(90), 2),
+            'p99_ms': round(self.percentile(99), 2),
+            'max_ms': round(self.max_value / 1000, 2)
+        }
+
+
+@dataclass
+class RequestStats:
+    """Compteurs d'une requête HTTP en cours"""
+    sql_count: int = 0
+    sql_time: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+
+class EndpointMetrics:
+    """Agrégats d'un endpoint"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.sql_latency = LatencyHistogram()
+        self.errors = 0
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def to_dict(self) -> Dict:
+        requests = self.latency.total_count
+        return {
+            'latency': self.latency.summary(),
+            'errors': self.errors,
+            'sql_queries': self.sql_count,
+            'sql_queries_per_request': round(self.sql_count / requests, 2) if requests else 0,
+            'sql_time_ms': round(self.sql_time * 1000, 2),
+            'sql_time_per_request_ms': self.sql_latency.summary(),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses
+        }
+
+
+_current: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar('request_stats', default=None)
+
+PROMETHEUS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestMetricsRegistry:
+    """Registre global des métriques par endpoint"""
+
+    def __init__(self):
+        self.enabled = False
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _endpoint(self, name: str) -> EndpointMetrics:
+        metrics = self.endpoints.get(name)
+        if metrics is None:
+            with self._lock:
+                metrics = self.endpoints.setdefault(name, EndpointMetrics())
+        return metrics
+
+    def begin(self):
+        return _current.set(RequestStats())
+
+    def end(self, token, endpoint: str, duration: float, status_code: int):
+        stats = _current.get()
+        _current.reset(token)
+        if stats is None:
+            return
+        metrics = self._endpoint(endpoint or 'unknown')
+        with self._lock:
+            metrics.latency.record(duration)
+            metrics.sql_latency.record(stats.sql_time)
+            metrics.sql_count += stats.sql_count
+            metrics.sql_time += stats.sql_time
+            metrics.cache_hits += stats.cache_hits
+            metrics.cache_misses += stats.cache_misses
+            if status_code >= 500:
+                metrics.errors += 1
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}
+            self.started_at = time.time()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            endpoints = {name: m.to_dict() for name, m in sorted(self.endpoints.items())}
+        return {
+            'enabled': self.enabled,
+            'since': self.started_at,
+            'endpoints': endpoints
+        }
+
+    def to_prometheus(self, system: Optional[Dict] = None) -> str:
+        """Export au format texte Prometheus (exposition 0.0.4)"""
+        lines = [
+            '# HELP yt_http_request_duration_seconds Latence des requêtes HTTP par endpoint',
+            '# TYPE yt_http_request_duration_seconds histogram'
+        ]
+        with self._lock:
+            items = sorted(self.endpoints.items())
+            for name, m in items:
+                cumulative = m.latency.cumulative_buckets(list(PROMETHEUS_BUCKETS))
+                for bound, count in zip(PROMETHEUS_BUCKETS, cumulative):
+                    lines.append(f'yt_http_request_duration_seconds_bucket{{endpoint="{name}",le="{bound}"}} {count}')
+                lines.append(f'yt_http_request_duration_seconds_bucket{{endpoint="{name}",le="+Inf"}} {m.latency.total_count}')
+                lines.append(f'yt_http_request_duration_seconds_sum{{endpoint="{name}"}} {m.latency.total_sum:.6f}')
+                lines.append(f'yt_http_request_duration_seconds_count{{endpoint="{name}"}} {m.latency.total_count}')
+
+            counters = [
+                ('yt_http_request_errors_total', 'Réponses 5xx par endpoint', lambda m: m.errors),
+                ('yt_sql_queries_total', 'Requêtes SQL exécutées par endpoint', lambda m: m.sql_count),
+                ('yt_sql_duration_seconds_total', 'Temps SQL cumulé par endpoint', lambda m: round(m.sql_time, 6)),
+                ('yt_cache_hits_total', 'Hits du cache par endpoint', lambda m: m.cache_hits),
+                ('yt_cache_misses_total', 'Misses du cache par endpoint', lambda m: m.cache_misses),
+            ]
+            for metric, help_text, getter in counters:
+                lines.append(f'# HELP {metric} {help_text}')
+                lines.append(f'# TYPE {metric} counter')
+                for name, m in items:
+                    lines.append(f'{metric}{{endpoint="{name}"}} {getter(m)}')
+
+        for key, value in (system or {}).items():
+            if isinstance(value, (int, float)):
+                lines.append(f'# TYPE yt_system_{key} gauge')
+                lines.append(f'yt_system_{key} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = RequestMetricsRegistry()
+
+
+def record_sql(duration: float):
+    """Appelé par les curseurs instrumentés"""
+    stats = _current.get()
+    if stats is not None:
+        stats.sql_count += 1
+        stats.sql_time += duration
+
+
+def record_cache(hit: bool):
+    """Appelé par le cache Redis"""
+    stats = _current.get()
+    if stats is not None:
+        if hit:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Curseur SQLite qui mesure chaque exécution"""
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            record_sql(time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            record_sql(time.perf_counter() - start)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connexion SQLite dont les curseurs (et execute direct) sont instrumentés"""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def monitoring_enabled() -> bool:
+    """Le monitoring est opt-in (PERFORMANCE_MONITORING=true)"""
+    return os.getenv('PERFORMANCE_MONITORING', 'false').lower() in ('1', 'true', 'yes')
+
+
+def connection_factory():
+    """Fabrique de connexion à passer à sqlite3.connect (None si le monitoring est désactivé)"""
+    return InstrumentedConnection if registry.enabled else None
+
+
+def init_app(app):
+    """Installe les hooks before/after_request sur l'application Flask"""
+    from flask import g, request
+
+    if registry.enabled:
+        return
+    registry.enabled = True
+
+    @app.before_request
+    def _metrics_before_request():
+        g._metrics_token = registry.begin()
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _metrics_after_request(response):
+        token = g.pop('_metrics_token', None)
+        if token is not None:
+            duration = time.perf_counter() - g.pop('_metrics_start', time.perf_counter())
+            registry.end(token, request.endpoint, duration, response.status_code)
+        return response
+
+    @app.teardown_request
+    def _metrics_teardown(exc):
+        # Requête terminée par une exception non gérée : after_request n'a pas tourné
+        token = g.pop('_metrics_token', None)
+        if token is not None:
+            duration = time.perf_counter() - g.pop('_metrics_start', time.perf_counter())
+            registry.end(token, request.endpoint, duration, 500)
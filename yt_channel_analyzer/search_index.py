@@ -0,0 +1,266 @@
+"""
+Index plein texte FTS5 (concurrents, vidéos, playlists)
+- Tables FTS5 à contenu externe synchronisées par triggers (pas de copie des données)
+- Requêtes par préfixe classées par bm25 : autocomplétion en quelques ms
+- Recherche YouTube distante seulement en repli (peu de résultats locaux), avec cache et anti-rebond
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Nombre minimal de résultats locaux en dessous duquel l'API YouTube est interrogée
+LOCAL_RESULTS_THRESHOLD = 3
+REMOTE_MIN_QUERY_LENGTH = 3
+REMOTE_CACHE_TTL = 6 * 3600
+REMOTE_MIN_INTERVAL = 0.5  # secondes entre deux appels search.list (100 unités chacun)
+
+
+@dataclass(frozen=True)
+class FtsSource:
+    """Table source indexée : la table FTS utilise son rowid (id)"""
+    fts_table: str
+    table: str
+    columns: Tuple[str, ...]
+
+
+FTS_SOURCES: Tuple[FtsSource, ...] = (
+    FtsSource('concurrent_fts', 'concurrent', ('name', 'description')),
+    FtsSource('video_fts', 'video', ('title', 'description')),
+    FtsSource('playlist_fts', 'playlist', ('name', 'description')),
+)
+
+# Poids bm25 par colonne : le nom / titre compte plus que la description
+BM25_WEIGHTS = '10.0, 1.0'
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def fts5_available(conn: sqlite3.Connection) -> bool:
+    try:
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS temp._fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp._fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def _trigger_ddl(source: FtsSource) -> List[str]:
+    cols = ', '.join(source.columns)
+    new_values = ', '.join(f"new.{col}" for col in source.columns)
+    old_values = ', '.join(f"old.{col}" for col in source.columns)
+    delete = f"INSERT INTO {source.fts_table}({source.fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_values});"
+    insert = f"INSERT INTO {source.fts_table}(rowid, {cols}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {source.fts_table}_ai AFTER INSERT ON {source.table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {source.fts_table}_ad AFTER DELETE ON {source.table} BEGIN {delete} END",
+        # Seules les colonnes indexées déclenchent la resynchronisation (pas les rafraîchissements de stats)
+        f"CREATE TRIGGER IF NOT EXISTS {source.fts_table}_au AFTER UPDATE OF {cols} ON {source.table} "
+        f"BEGIN {delete} {insert} END",
+    ]
+
+
+def ensure_search_index(conn: sqlite3.Connection) -> List[str]:
+    """Migration idempotente : crée les tables FTS5 + triggers et les remplit à la création"""
+    if not fts5_available(conn):
+        return []
+
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()}
+    created = []
+    for source in FTS_SOURCES:
+        if source.table not in existing:
+            continue
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({source.table})").fetchall()}
+        if not all(col in columns for col in source.columns):
+            continue
+
+        if source.fts_table not in existing:
+            conn.execute(f"""
+                CREATE VIRTUAL TABLE {source.fts_table} USING fts5(
+                    {', '.join(source.columns)},
+                    content='{source.table}', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            """)
+            conn.execute(f"INSERT INTO {source.fts_table}({source.fts_table}) VALUES ('rebuild')")
+            created.append(source.fts_table)
+        for ddl in _trigger_ddl(source):
+            conn.execute(ddl)
+    return created
+
+
+def rebuild_search_index(conn: sqlite3.Connection):
+    """Reconstruction complète (après un import massif fait triggers désactivés, par ex.)"""
+    for source in FTS_SOURCES:
+        conn.execute(f"INSERT INTO {source.fts_table}({source.fts_table}) VALUES ('rebuild')")
+        conn.execute(f"INSERT INTO {source.fts_table}({source.fts_table}) VALUES ('optimize')")
+    conn.commit()
+
+
+def fts_query(text: str) -> Optional[str]:
+    """Requête FTS5 : chaque mot en terme exact, le dernier en préfixe (saisie en cours)"""
+    tokens = _TOKEN.findall(text or '')
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_competitors(conn: sqlite3.Connection, q: str, limit: int = 5) -> List[sqlite3.Row]:
+    """Concurrents par pertinence bm25 sur le nom (puis description), avec nombre de vidéos"""
+    match = fts_query(q)
+    if not match:
+        return []
+    if not _has_table(conn, 'concurrent_fts'):
+        # Index pas encore créé (schéma non migré ou SQLite sans FTS5) : ancien filtre LIKE
+        return conn.execute("""
+            SELECT c.id, c.name, c.channel_url AS url, c.country, c.thumbnail_url,
+                   (SELECT COUNT(*) FROM video v WHERE v.concurrent_id = c.id) AS video_count
+            FROM concurrent c
+            WHERE c.name LIKE ?
+            ORDER BY CASE WHEN c.name LIKE ? THEN 1 ELSE 2 END, video_count DESC
+            LIMIT ?
+        """, (f"%{q}%", f"{q}%", limit)).fetchall()
+    return conn.execute(f"""
+        SELECT c.id, c.name, c.channel_url AS url, c.country, c.thumbnail_url,
+               (SELECT COUNT(*) FROM video v WHERE v.concurrent_id = c.id) AS video_count
+        FROM concurrent_fts f
+        JOIN concurrent c ON c.id = f.rowid
+        WHERE concurrent_fts MATCH ?
+        ORDER BY bm25(concurrent_fts, {BM25_WEIGHTS})
+        LIMIT ?
+    """, (match, limit)).fetchall()
+
+
+def search_videos(conn: sqlite3.Connection, q: str, limit: int = 20,
+                  competitor_id: Optional[int] = None) -> List[sqlite3.Row]:
+    match = fts_query(q)
+    if not match:
+        return []
+    competitor_filter = "AND v.concurrent_id = ?" if competitor_id is not None else ""
+    competitor_params = [competitor_id] if competitor_id is not None else []
+    if not _has_table(conn, 'video_fts'):
+        # Index pas encore créé : ancien filtre LIKE sur le titre
+        return conn.execute(f"""
+            SELECT v.id, v.video_id, v.title, v.view_count, v.category, v.published_at,
+                   v.thumbnail_url, c.id AS competitor_id, c.name AS competitor_name
+            FROM video v
+            JOIN concurrent c ON c.id = v.concurrent_id
+            WHERE v.title LIKE ? {competitor_filter}
+            ORDER BY v.view_count DESC
+            LIMIT ?
+        """, [f"%{q}%"] + competitor_params + [limit]).fetchall()
+    params = [match] + competitor_params + [limit]
+    return conn.execute(f"""
+        SELECT v.id, v.video_id, v.title, v.view_count, v.category, v.published_at,
+               v.thumbnail_url, c.id AS competitor_id, c.name AS competitor_name
+        FROM video_fts f
+        JOIN video v ON v.id = f.rowid
+        JOIN concurrent c ON c.id = v.concurrent_id
+        WHERE video_fts MATCH ? {competitor_filter}
+        ORDER BY bm25(video_fts, {BM25_WEIGHTS})
+        LIMIT ?
+    """, params).fetchall()
+
+
+def search_playlists(conn: sqlite3.Connection, q: str, limit: int = 20) -> List[sqlite3.Row]:
+    match = fts_query(q)
+    if not match:
+        return []
+    if not _has_table(conn, 'playlist_fts'):
+        # Index pas encore créé : ancien filtre LIKE sur le nom
+        return conn.execute("""
+            SELECT p.id, p.playlist_id, p.name, p.category, p.video_count,
+                   c.id AS competitor_id, c.name AS competitor_name
+            FROM playlist p
+            JOIN concurrent c ON c.id = p.concurrent_id
+            WHERE p.name LIKE ?
+            ORDER BY CASE WHEN p.name LIKE ? THEN 1 ELSE 2 END, p.video_count DESC
+            LIMIT ?
+        """, (f"%{q}%", f"{q}%", limit)).fetchall()
+    return conn.execute(f"""
+        SELECT p.id, p.playlist_id, p.name, p.category, p.video_count,
+               c.id AS competitor_id, c.name AS competitor_name
+        FROM playlist_fts f
+        JOIN playlist p ON p.id = f.rowid
+        JOIN concurrent c ON c.id = p.concurrent_id
+        WHERE playlist_fts MATCH ?
+        ORDER BY bm25(playlist_fts, {BM25_WEIGHTS})
+        LIMIT ?
+    """, (match, limit)).fetchall()
+
+
+class RemoteChannelSearch:
+    """Repli sur la recherche YouTube : cache TTL par requête normalisée + anti-rebond
+
+    Une requête arrivée moins de min_interval après l'appel précédent attend la fin de l'intervalle ;
+    si une frappe plus récente est arrivée entre-temps, elle cède la place (résultats du dernier appel)
+    et seule la dernière saisie interroge l'API.
+    """
+
+    def __init__(self, search_fn: Optional[Callable[[str, int], List[Dict]]] = None,
+                 ttl: float = REMOTE_CACHE_TTL, min_interval: float = REMOTE_MIN_INTERVAL,
+                 min_length: int = REMOTE_MIN_QUERY_LENGTH):
+        self._search_fn = search_fn
+        self.ttl = ttl
+        self.min_interval = min_interval
+        self.min_length = min_length
+        self._cache: Dict[str, Tuple[float, List[Dict]]] = {}
+        self._last_call = 0.0
+        self._last_results: List[Dict] = []
+        self._latest_ticket = 0
+        self._lock = threading.Lock()
+        self.api_calls = 0
+
+    def _default_search(self, q: str, max_results: int) -> List[Dict]:
+        from .youtube_api import YouTubeAPI
+        return YouTubeAPI().search_channels(q, max_results=max_results)
+
+    def search(self, q: str, max_results: int = 10) -> List[Dict]:
+        key = ' '.join(_TOKEN.findall(q.lower()))
+        if len(key) < self.min_length:
+            return []
+
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and now - cached[0] < self.ttl:
+                return cached[1]
+            self._latest_ticket += 1
+            ticket = self._latest_ticket
+            wait = self._last_call + self.min_interval - now
+
+        if wait > 0:
+            # Anti-rebond : frappe rapprochée de l'appel précédent, on attend la fin de l'intervalle
+            time.sleep(wait)
+        with self._lock:
+            if ticket != self._latest_ticket:
+                # Saisie plus récente en attente : elle seule interrogera l'API
+                return self._last_results
+            cached = self._cache.get(key)
+            if cached and time.monotonic() - cached[0] < self.ttl:
+                return cached[1]
+            self._last_call = time.monotonic()
+
+        results = (self._search_fn or self._default_search)(q, max_results)
+        with self._lock:
+            self.api_calls += 1
+            self._last_results = results
+            self._cache[key] = (time.monotonic(), results)
+            if len(self._cache) > 1000:
+                oldest = sorted(self._cache, key=lambda k: self._cache[k][0])[:500]
+                for k in oldest:
+                    del self._cache[k]
+        return results
+
+
+# Instance globale partagée par les requêtes Flask
+remote_channel_search = RemoteChannelSearch()
@@ -6,12 +6,23 @@ Based on youtube_emotion_analysis_pipeline.md
 import time
 import random
 import sqlite3
-from typing import List, Dict, Optional
+import threading
+from typing import List, Dict, Optional, Tuple
 import logging
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import os
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import requests
+from requests.adapters import HTTPAdapter
+
+from yt_channel_analyzer.youtube_api_client import QuotaLedger
+from yt_channel_analyzer.sentiment_pipeline.fast_comment_scraper import (
+    COMMENT_THREADS_COST, COMMENT_THREADS_URL, DEFAULT_UNITS_PER_SECOND, TokenBucket
+)
+
+DELTA_FLUSH_VIDEOS = 50  # vidéos par transaction en mode incrémental
 
 class YouTubeCommentScraper:
     """Scraper pour extraire massivement les commentaires YouTube"""
@@ -72,6 +83,17 @@ class YouTubeCommentScraper:
                 )
             ''')
             
+            # Filigrane par vidéo : commentaire le plus récent déjà récolté (mode incrémental)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS comment_watermarks (
+                    video_id TEXT PRIMARY KEY,
+                    newest_published_at TEXT,
+                    newest_comment_id TEXT,
+                    last_harvest_at TIMESTAMP,
+                    last_new_comments INTEGER DEFAULT 0
+                )
+            ''')
+            
             conn.commit()
             self.logger.info("✅ Database setup completed for sentiment analysis")
     
@@ -286,6 +308,219 @@ class YouTubeCommentScraper:
             'database_path': str(self.db_path)
         }
     
+    # === Mode incrémental : seulement les commentaires publiés depuis la dernière récolte ===
+    
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            self._local.session = session
+        return session
+    
+    def seed_watermarks(self):
+        """Initialise les filigranes manquants depuis les commentaires déjà en base (une seule requête)"""
+        with sqlite3.connect(str(self.db_path)) as conn:
+            conn.execute('''
+                INSERT OR IGNORE INTO comment_watermarks (video_id, newest_published_at, last_harvest_at)
+                SELECT video_id, MAX(published_at), MAX(scraped_at)
+                FROM comments_raw
+                WHERE instr(comment_id, '.') = 0  -- fils uniquement (id de réponse = parent.réponse)
+                GROUP BY video_id
+            ''')
+            conn.commit()
+    
+    def load_watermarks(self) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        with sqlite3.connect(str(self.db_path)) as conn:
+            return {
+                video_id: (published_at, comment_id)
+                for video_id, published_at, comment_id in conn.execute(
+                    'SELECT video_id, newest_published_at, newest_comment_id FROM comment_watermarks'
+                )
+            }
+    
+    def fetch_new_comments(self, video_id: str, since: Optional[str] = None, since_comment_id: Optional[str] = None,
+                           max_comments: int = 1000) -> Dict:
+        """Pages commentThreads en order=time jusqu'au premier fil déjà vu
+
+        max_comments ne borne que le premier passage (sans filigrane) : en incrémental la pagination
+        continue jusqu'au filigrane, sinon il avancerait au-dessus de commentaires jamais récoltés.
+        La borne porte sur des fils entiers (un fil n'est jamais séparé de ses réponses).
+        """
+        comments = []
+        newest = None
+        pages = 0
+        page_token = None
+        error = None
+        capped = False
+        
+        while True:
+            if not self.quota_ledger.reserve(COMMENT_THREADS_COST):
+                error = 'quota'
+                break
+            self.rate_limiter.acquire(COMMENT_THREADS_COST)
+            pages += 1
+            try:
+                response = self._session().get(COMMENT_THREADS_URL, params={
+                    'part': 'snippet,replies',
+                    'videoId': video_id,
+                    'maxResults': 100,
+                    'order': 'time',
+                    'textFormat': 'plainText',
+                    'pageToken': page_token or '',
+                    'key': self.api_key
+                }, timeout=30)
+            except requests.RequestException as e:
+                error = str(e)
+                break
+            if response.status_code != 200:
+                if not (response.status_code == 403 and 'commentsDisabled' in response.text):
+                    error = 'quota' if 'quotaExceeded' in response.text else f"HTTP {response.status_code}"
+                break
+            
+            data = response.json()
+            reached_seen = False
+            for item in data.get('items', []):
+                top = item['snippet']['topLevelComment']
+                top_data = top['snippet']
+                # Fils triés du plus récent au plus ancien : arrêt au premier fil déjà récolté
+                if since and (top['id'] == since_comment_id or top_data['publishedAt'] < since):
+                    reached_seen = True
+                    break
+                if not since and len(comments) >= max_comments:
+                    capped = True
+                    break
+                if newest is None:
+                    newest = (top_data['publishedAt'], top['id'])
+                
+                comments.append({
+                    'video_id': video_id,
+                    'comment_id': top['id'],
+                    'text': top_data['textDisplay'],
+                    'like_count': top_data.get('likeCount', 0),
+                    'published_at': top_data['publishedAt'],
+                    'author_name': top_data.get('authorDisplayName', 'Unknown')
+                })
+                for reply in item.get('replies', {}).get('comments', []):
+                    reply_data = reply['snippet']
+                    comments.append({
+                        'video_id': video_id,
+                        'comment_id': reply['id'],
+                        'text': reply_data['textDisplay'],
+                        'like_count': reply_data.get('likeCount', 0),
+                        'published_at': reply_data['publishedAt'],
+                        'author_name': reply_data.get('authorDisplayName', 'Unknown')
+                    })
+            
+            page_token = data.get('nextPageToken')
+            if reached_seen or capped or not page_token:
+                break
+        
+        return {'video_id': video_id, 'comments': comments, 'newest': newest,
+                'pages': pages, 'error': error, 'capped': capped}
+    
+    def _save_delta(self, conn: sqlite3.Connection, results: List[Dict]) -> int:
+        """Insère les nouveaux commentaires (file processed = 0 de l'analyse d'émotions) et avance les filigranes"""
+        before = conn.total_changes
+        with conn:
+            conn.executemany('''
+                INSERT OR IGNORE INTO comments_raw 
+                (video_id, comment_id, comment_text, like_count, published_at, author_name)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [
+                (c['video_id'], c['comment_id'], c['text'], c['like_count'], c['published_at'], c['author_name'])
+                for result in results for c in result['comments']
+            ])
+            inserted = conn.total_changes - before
+            # Filigrane avancé seulement si la récolte de la vidéo est complète (sinon reprise au même point)
+            conn.executemany('''
+                INSERT INTO comment_watermarks (video_id, newest_published_at, newest_comment_id, last_harvest_at, last_new_comments)
+                VALUES (?, ?, ?, datetime('now'), ?)
+                ON CONFLICT(video_id) DO UPDATE SET
+                    newest_published_at = COALESCE(excluded.newest_published_at, newest_published_at),
+                    newest_comment_id = COALESCE(excluded.newest_comment_id, newest_comment_id),
+                    last_harvest_at = excluded.last_harvest_at,
+                    last_new_comments = excluded.last_new_comments
+            ''', [
+                (r['video_id'], r['newest'][0] if r['newest'] else None, r['newest'][1] if r['newest'] else None,
+                 len(r['comments']))
+                for r in results if not r['error']
+            ])
+        return inserted
+    
+    def scrape_new_comments(self, video_ids: Optional[List[str]] = None, max_workers: int = 4,
+                            max_comments_per_video: int = 1000,
+                            units_per_second: float = DEFAULT_UNITS_PER_SECOND,
+                            quota_ledger: Optional[QuotaLedger] = None) -> Dict:
+        """Récolte incrémentale : pour chaque vidéo, uniquement les commentaires postérieurs au filigrane.
+        Les nouveaux commentaires arrivent dans comments_raw (processed = 0), la file de l'EmotionAnalyzer."""
+        video_ids = video_ids or self.get_all_video_ids()
+        self.quota_ledger = quota_ledger or QuotaLedger()
+        self.rate_limiter = TokenBucket(units_per_second)
+        self._local = threading.local()
+        
+        self.seed_watermarks()
+        watermarks = self.load_watermarks()
+        
+        self.logger.info(f"🔄 Incremental harvest: {len(video_ids):,} videos ({len(watermarks):,} with watermark), "
+                         f"{self.quota_ledger.remaining():,} quota units left")
+        
+        start_time = time.time()
+        stats = {'videos_processed': 0, 'videos_with_new': 0, 'new_comments': 0, 'api_calls': 0,
+                 'errors': 0, 'quota_stopped': False}
+        pending: List[Dict] = []
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute('PRAGMA journal_mode = WAL')
+        
+        def collect(result):
+            nonlocal pending
+            stats['videos_processed'] += 1
+            stats['api_calls'] += result['pages']
+            if result['error'] == 'quota':
+                stats['quota_stopped'] = True
+            if result['error']:
+                stats['errors'] += 1
+            if result['comments']:
+                stats['videos_with_new'] += 1
+            pending.append(result)
+            if len(pending) >= DELTA_FLUSH_VIDEOS:
+                stats['new_comments'] += self._save_delta(conn, pending)
+                pending = []
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Fenêtre bornée de vidéos en vol ; écriture sur ce thread uniquement
+                remaining = iter(video_ids)
+                in_flight = set()
+                while True:
+                    while not stats['quota_stopped'] and len(in_flight) < max_workers * 2:
+                        video_id = next(remaining, None)
+                        if video_id is None:
+                            break
+                        since, since_id = watermarks.get(video_id, (None, None))
+                        in_flight.add(executor.submit(self.fetch_new_comments, video_id, since, since_id,
+                                                      max_comments_per_video))
+                    if not in_flight:
+                        break
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+            if pending:
+                stats['new_comments'] += self._save_delta(conn, pending)
+        finally:
+            conn.close()
+        
+        elapsed = time.time() - start_time
+        stats['processing_time'] = elapsed
+        self.logger.info(f"""
+        🔄 INCREMENTAL HARVEST COMPLETED!
+        ├── Videos checked: {stats['videos_processed']:,} ({stats['videos_with_new']:,} with new comments)
+        ├── New comments queued for emotion analysis: {stats['new_comments']:,}
+        ├── API calls (quota units): {stats['api_calls']:,}{' - stopped on quota' if stats['quota_stopped'] else ''}
+        └── Processing time: {elapsed/60:.1f} minutes
+        """)
+        return stats
+    
     def get_scraping_stats(self) -> Dict:
         """Get current scraping statistics"""
         with sqlite3.connect(str(self.db_path)) as conn:
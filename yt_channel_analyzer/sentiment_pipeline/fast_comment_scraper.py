@@ -5,24 +5,118 @@ Scrapes only top 20 comments per video for quality analysis
 """
 import time
 import sqlite3
+import threading
 from typing import List, Dict, Optional
 import logging
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import requests
+from requests.adapters import HTTPAdapter
 import os
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from yt_channel_analyzer.youtube_api_client import QuotaLedger
+
+COMMENT_THREADS_URL = 'https://www.googleapis.com/youtube/v3/commentThreads'
+COMMENT_THREADS_COST = 1  # unités de quota par appel commentThreads.list
+DEFAULT_UNITS_PER_SECOND = 10.0
+FLUSH_COMMENTS = 5000  # commentaires par transaction d'écriture
+FLUSH_VIDEOS = 200
+
+
+class TokenBucket:
+    """Limiteur de débit en unités de quota/s (rafale bornée à `capacity`)"""
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, cost: float = 1.0):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return
+                wait_time = (cost - self._tokens) / self.rate
+            time.sleep(wait_time)
+
+
+class CommentBatchWriter:
+    """Unique écrivain : une connexion, commentaires + progression + checkpoint commités par gros lots"""
+    
+    def __init__(self, db_path: Path, flush_comments: int = FLUSH_COMMENTS, flush_videos: int = FLUSH_VIDEOS):
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.execute('PRAGMA synchronous = NORMAL')
+        self.flush_comments = flush_comments
+        self.flush_videos = flush_videos
+        self.comments: List[tuple] = []
+        self.progress: List[tuple] = []
+        self.done_ids: List[tuple] = []
+        self.comments_written = 0
+        self.transactions = 0
+    
+    def add(self, result: Dict):
+        self.comments.extend(
+            (c['video_id'], c['comment_id'], c['text'], c['author'], c['like_count'], c['published_at'])
+            for c in result['comments']
+        )
+        self.progress.append((
+            result['video_id'],
+            len(result['comments']),
+            'completed' if result['success'] else 'failed',
+            result.get('error') or result.get('note'),
+            result['quota_used']
+        ))
+        # Échec définitif ou non : la vidéo quitte le checkpoint (statut 'failed' => reprise via les vidéos en attente),
+        # sauf arrêt sur quota où elle reste à traiter au prochain run
+        if not result.get('quota_exceeded'):
+            self.done_ids.append((result['video_id'],))
+        if len(self.comments) >= self.flush_comments or len(self.progress) >= self.flush_videos:
+            self.flush()
+    
+    def flush(self):
+        if not self.progress:
+            return
+        with self.conn:
+            self.conn.executemany('''
+                INSERT OR IGNORE INTO fast_comments 
+                (video_id, comment_id, comment_text, author_name, like_count, published_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', self.comments)
+            self.conn.executemany('''
+                INSERT OR REPLACE INTO fast_scraping_progress 
+                (video_id, comments_scraped, status, scraped_at, error_message, quota_used)
+                VALUES (?, ?, ?, datetime('now'), ?, ?)
+            ''', self.progress)
+            self.conn.executemany('DELETE FROM fast_scraping_checkpoint WHERE video_id = ?', self.done_ids)
+        self.comments_written += len(self.comments)
+        self.transactions += 1
+        self.comments, self.progress, self.done_ids = [], [], []
+    
+    def close(self):
+        self.flush()
+        self.conn.close()
+
 
 class FastYouTubeScraper:
     """Optimized scraper for top 20 comments per video"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, quota_ledger: Optional[QuotaLedger] = None):
         self.api_key = api_key or os.getenv('YOUTUBE_API_KEY')
         if not self.api_key:
             raise ValueError("YouTube API key is required")
         
-        self.youtube = build('youtube', 'v3', developerKey=self.api_key)
         self.logger = logging.getLogger(__name__)
+        self.quota_ledger = quota_ledger or QuotaLedger()
+        self.rate_limiter: Optional[TokenBucket] = None
+        # Une session HTTP (keep-alive) par thread worker
+        self._local = threading.local()
         
         # Database setup
         self.db_path = Path(__file__).parent.parent.parent / 'instance' / 'youtube_emotions_fast.db'
@@ -65,24 +159,59 @@ class FastYouTubeScraper:
                 )
             ''')
             
+            # Vidéos restant à traiter pour le run en cours (reprise sans rescanner la table video)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS fast_scraping_checkpoint (
+                    video_id TEXT PRIMARY KEY
+                )
+            ''')
+            
             conn.commit()
             self.logger.info("✅ Fast database setup completed")
     
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            self._local.session = session
+        return session
+    
     def get_top_20_comments(self, video_id: str) -> Dict:
         """Récupérer top 20 commentaires (1 seule requête API)"""
+        if self.rate_limiter:
+            self.rate_limiter.acquire(COMMENT_THREADS_COST)
         try:
-            request = self.youtube.commentThreads().list(
-                part='snippet',
-                videoId=video_id,
-                maxResults=20,
-                order='relevance',
-                textFormat='plainText'
-            )
+            response = self._session().get(COMMENT_THREADS_URL, params={
+                'part': 'snippet',
+                'videoId': video_id,
+                'maxResults': 20,
+                'order': 'relevance',
+                'textFormat': 'plainText',
+                'key': self.api_key
+            }, timeout=30)
             
-            response = request.execute()
-            comments = []
+            if response.status_code != 200:
+                if response.status_code == 403 and 'commentsDisabled' in response.text:
+                    # Comments disabled on this video
+                    return {
+                        'video_id': video_id,
+                        'comments': [],
+                        'success': True,  # Not an error, just no comments
+                        'quota_used': COMMENT_THREADS_COST,
+                        'note': 'Comments disabled'
+                    }
+                return {
+                    'video_id': video_id,
+                    'comments': [],
+                    'success': False,
+                    'quota_used': COMMENT_THREADS_COST,
+                    'error': f"HTTP {response.status_code}: {response.text[:200]}",
+                    'quota_exceeded': response.status_code == 403 and 'quotaExceeded' in response.text
+                }
             
-            for item in response['items']:
+            comments = []
+            for item in response.json().get('items', []):
                 comment_data = item['snippet']['topLevelComment']['snippet']
                 comments.append({
                     'video_id': video_id,
@@ -97,33 +226,15 @@ class FastYouTubeScraper:
                 'video_id': video_id,
                 'comments': comments,
                 'success': True,
-                'quota_used': 1  # Une seule requête !
+                'quota_used': COMMENT_THREADS_COST  # Une seule requête !
             }
             
-        except HttpError as e:
-            if 'commentsDisabled' in str(e) or 'disabled comments' in str(e):
-                # Comments disabled on this video
-                return {
-                    'video_id': video_id,
-                    'comments': [],
-                    'success': True,  # Not an error, just no comments
-                    'quota_used': 1,
-                    'note': 'Comments disabled'
-                }
-            else:
-                return {
-                    'video_id': video_id,
-                    'comments': [],
-                    'success': False,
-                    'quota_used': 1,
-                    'error': str(e)
-                }
         except Exception as e:
             return {
                 'video_id': video_id,
                 'comments': [],
                 'success': False,
-                'quota_used': 1,
+                'quota_used': COMMENT_THREADS_COST,
                 'error': str(e)
             }
     
@@ -192,102 +303,163 @@ class FastYouTubeScraper:
         self.logger.info(f"📋 Found {len(pending_ids)} pending videos (out of {len(all_video_ids)} total)")
         return pending_ids
     
-    def scrape_all_videos_fast(self, max_workers: int = 5, resume: bool = True):
+    def load_checkpoint(self) -> List[str]:
+        """Vidéos restantes du run précédent (vide si aucun run interrompu)"""
+        with sqlite3.connect(str(self.db_path)) as conn:
+            return [row[0] for row in conn.execute('SELECT video_id FROM fast_scraping_checkpoint ORDER BY rowid')]
+    
+    def save_checkpoint(self, video_ids: List[str]):
+        with sqlite3.connect(str(self.db_path)) as conn:
+            conn.execute('DELETE FROM fast_scraping_checkpoint')
+            conn.executemany('INSERT OR IGNORE INTO fast_scraping_checkpoint (video_id) VALUES (?)',
+                             [(vid,) for vid in video_ids])
+            conn.commit()
+    
+    def scrape_all_videos_fast(self, max_workers: int = 5, resume: bool = True,
+                               max_in_flight: Optional[int] = None,
+                               units_per_second: float = DEFAULT_UNITS_PER_SECOND):
         """Scraper 8,800 vidéos rapidement avec 20 commentaires chacune"""
         
         if resume:
-            video_ids = self.get_pending_video_ids()
+            # Reste du run interrompu d'abord, puis vidéos en attente (nouvelles importations, échecs précédents)
+            video_ids = self.load_checkpoint()
+            if video_ids:
+                self.logger.info(f"♻️ Resuming from checkpoint: {len(video_ids):,} videos left")
+            checkpointed = set(video_ids)
+            video_ids += [vid for vid in self.get_pending_video_ids() if vid not in checkpointed]
         else:
             video_ids = self.get_all_video_ids()
+        self.save_checkpoint(video_ids)
         
         if not video_ids:
             self.logger.info("✅ All videos already scraped!")
-            return self.get_scraping_stats()
+            # Même résumé qu'un passage complet (à zéro) + statistiques cumulées de la base
+            return {
+                'videos_processed': 0,
+                'successful_videos': 0,
+                'failed_videos': 0,
+                'comments_scraped': 0,
+                'quota_used': 0,
+                'quota_stopped': False,
+                'processing_time': 0.0,
+                'comments_per_sec': 0.0,
+                'write_transactions': 0,
+                'database_path': str(self.db_path),
+                **self.get_scraping_stats()
+            }
         
         total_videos = len(video_ids)
         total_quota = 0
         total_comments = 0
         successful_videos = 0
         failed_videos = 0
+        processed = 0
+        quota_stopped = False
+        
+        self.rate_limiter = TokenBucket(units_per_second)
+        max_in_flight = max_in_flight or max_workers * 4
+        writer = CommentBatchWriter(self.db_path)
         
         self.logger.info(f"🚀 Starting fast scraping: {total_videos} videos × 20 comments = {total_videos * 20:,} target comments")
-        self.logger.info(f"📊 Estimated quota usage: {total_videos} (out of 10,000 daily limit)")
+        self.logger.info(f"📊 Estimated quota usage: {total_videos} ({self.quota_ledger.remaining():,} left today)")
         
         start_time = time.time()
+        pending_ids = iter(video_ids)
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all jobs
-            future_to_video = {
-                executor.submit(self.get_top_20_comments, video_id): video_id 
-                for video_id in video_ids
-            }
-            
-            # Process results as they complete
-            for i, future in enumerate(as_completed(future_to_video)):
-                video_id = future_to_video[future]
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                in_flight = set()
+                
+                def refill():
+                    # Fenêtre bornée : au plus max_in_flight requêtes soumises, quota réservé avant chaque soumission
+                    nonlocal quota_stopped
+                    while not quota_stopped and len(in_flight) < max_in_flight:
+                        video_id = next(pending_ids, None)
+                        if video_id is None:
+                            return
+                        if not self.quota_ledger.reserve(COMMENT_THREADS_COST):
+                            quota_stopped = True
+                            self.logger.warning("⛔ Daily quota reached, remaining videos kept in checkpoint")
+                            return
+                        in_flight.add(executor.submit(self.get_top_20_comments, video_id))
                 
-                try:
-                    result = future.result()
-                    total_quota += result['quota_used']
+                refill()
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    in_flight -= done
                     
-                    if result['success']:
-                        successful_videos += 1
-                        comments_count = len(result['comments'])
-                        total_comments += comments_count
+                    for future in done:
+                        processed += 1
+                        result = future.result()
+                        video_id = result['video_id']
+                        total_quota += result['quota_used']
                         
-                        if comments_count > 0:
-                            self.logger.info(f"✅ [{i+1}/{total_videos}] {video_id}: {comments_count} commentaires")
+                        if result['success']:
+                            successful_videos += 1
+                            comments_count = len(result['comments'])
+                            total_comments += comments_count
+                            
+                            if comments_count > 0:
+                                self.logger.debug(f"✅ [{processed}/{total_videos}] {video_id}: {comments_count} commentaires")
+                            else:
+                                note = result.get('note', 'No comments')
+                                self.logger.debug(f"⚪ [{processed}/{total_videos}] {video_id}: {note}")
                         else:
-                            note = result.get('note', 'No comments')
-                            self.logger.info(f"⚪ [{i+1}/{total_videos}] {video_id}: {note}")
-                    else:
-                        failed_videos += 1
-                        error = result.get('error', 'Unknown error')
-                        self.logger.warning(f"❌ [{i+1}/{total_videos}] {video_id}: {error}")
-                    
-                    # Save to database
-                    self.save_video_comments(result)
-                    
-                    # Progress report every 100 videos
-                    if (i + 1) % 100 == 0:
-                        elapsed = time.time() - start_time
-                        rate = (i + 1) / elapsed
-                        eta = (total_videos - i - 1) / rate if rate > 0 else 0
+                            failed_videos += 1
+                            error = result.get('error', 'Unknown error')
+                            self.logger.warning(f"❌ [{processed}/{total_videos}] {video_id}: {error}")
+                            if result.get('quota_exceeded') and not quota_stopped:
+                                quota_stopped = True
+                                self.logger.warning("⛔ API quotaExceeded, remaining videos kept in checkpoint")
+                        
+                        # Écriture groupée (commit par lots)
+                        writer.add(result)
                         
-                        self.logger.info(f"""
-                        📊 PROGRESS REPORT:
-                        ├── Videos processed: {i+1:,}/{total_videos:,} ({(i+1)/total_videos*100:.1f}%)
-                        ├── Successful: {successful_videos:,} | Failed: {failed_videos:,}
-                        ├── Comments scraped: {total_comments:,}
-                        ├── Quota used: {total_quota:,}/10,000
-                        ├── Rate: {rate:.1f} videos/sec
-                        └── ETA: {eta/60:.1f} minutes
-                        """)
+                        # Progress report every 100 videos
+                        if processed % 100 == 0:
+                            elapsed = time.time() - start_time
+                            rate = processed / elapsed
+                            eta = (total_videos - processed) / rate if rate > 0 else 0
+                            
+                            self.logger.info(f"""
+                            📊 PROGRESS REPORT:
+                            ├── Videos processed: {processed:,}/{total_videos:,} ({processed/total_videos*100:.1f}%)
+                            ├── Successful: {successful_videos:,} | Failed: {failed_videos:,}
+                            ├── Comments scraped: {total_comments:,} ({total_comments/elapsed:.1f} comments/sec)
+                            ├── Quota used: {total_quota:,}
+                            ├── Rate: {rate:.1f} videos/sec
+                            └── ETA: {eta/60:.1f} minutes
+                            """)
                     
-                except Exception as e:
-                    failed_videos += 1
-                    self.logger.error(f"❌ [{i+1}/{total_videos}] {video_id}: Unexpected error: {e}")
+                    refill()
+        finally:
+            writer.close()
         
         # Final report
         elapsed_time = time.time() - start_time
+        comments_per_sec = total_comments / elapsed_time if elapsed_time > 0 else 0
         self.logger.info(f"""
         🎉 FAST SCRAPING COMPLETED!
-        ├── Total videos processed: {total_videos:,}
+        ├── Total videos processed: {processed:,}/{total_videos:,}
         ├── Successful: {successful_videos:,} | Failed: {failed_videos:,}
         ├── Total comments scraped: {total_comments:,}
-        ├── Quota used: {total_quota:,}/10,000 ({total_quota/10000*100:.1f}%)
-        ├── Average comments per video: {total_comments/successful_videos:.1f}
+        ├── Quota used: {total_quota:,} ({self.quota_ledger.remaining():,} left today)
+        ├── Average comments per video: {total_comments/max(successful_videos, 1):.1f}
         ├── Processing time: {elapsed_time/60:.1f} minutes
-        └── Rate: {total_videos/elapsed_time:.1f} videos/sec
+        ├── Write transactions: {writer.transactions:,}
+        └── Throughput: {comments_per_sec:.1f} comments/sec | {processed/max(elapsed_time, 1e-9):.1f} videos/sec
         """)
         
         return {
-            'videos_processed': total_videos,
+            'videos_processed': processed,
             'successful_videos': successful_videos,
             'failed_videos': failed_videos,
             'comments_scraped': total_comments,
             'quota_used': total_quota,
+            'quota_stopped': quota_stopped,
             'processing_time': elapsed_time,
+            'comments_per_sec': comments_per_sec,
+            'write_transactions': writer.transactions,
             'database_path': str(self.db_path)
         }
     
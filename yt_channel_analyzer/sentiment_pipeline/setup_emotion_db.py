@@ -49,7 +49,9 @@ def setup_emotion_database():
             'CREATE INDEX IF NOT EXISTS idx_comment_emotions_language ON comment_emotions(language)',
             'CREATE INDEX IF NOT EXISTS idx_comment_emotions_confidence ON comment_emotions(confidence)',
             'CREATE INDEX IF NOT EXISTS idx_comment_emotions_published_at ON comment_emotions(published_at)',
-            'CREATE INDEX IF NOT EXISTS idx_comment_emotions_composite ON comment_emotions(video_id, emotion_type, language)'
+            'CREATE INDEX IF NOT EXISTS idx_comment_emotions_composite ON comment_emotions(video_id, emotion_type, language)',
+            # Covering index for per-video aggregates (see database/indexes.py)
+            'CREATE INDEX IF NOT EXISTS idx_comment_emotions_video_cover ON comment_emotions(video_id, emotion_type, confidence)'
         ]
         
         for index_sql in indexes:
@@ -144,9 +144,11 @@ class UnifiedFixService:
         try:
             # Valider et corriger automatiquement
             auto_fix = options.get('auto_fix_errors', True)
-            self._log('debug', f"Appel validate_data_integrity avec auto_fix={auto_fix}", step="DATA_INTEGRITY")
+            incremental = options.get('incremental_integrity', False)
+            self._log('debug', f"Appel validate_data_integrity avec auto_fix={auto_fix}, incremental={incremental}",
+                      step="DATA_INTEGRITY")
             
-            result = validate_data_integrity(fix_errors=auto_fix)
+            result = validate_data_integrity(fix_errors=auto_fix, incremental=incremental)
             
             self._log('debug', "Résultat validate_data_integrity", {'result': result}, "DATA_INTEGRITY")
             
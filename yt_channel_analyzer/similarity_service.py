@@ -0,0 +1,418 @@
+"""
+Recherche de vidéos et de chaînes similaires par index vectoriel (HNSW)
+- Un embedding par vidéo (titre + début de description), un centroïde par concurrent
+- Mise à jour incrémentale : seules les vidéos nouvelles ou dont le texte a changé sont encodées
+- Index publiés dans un répertoire versionné (pointeur CURRENT) : les lecteurs rechargent la nouvelle version
+- Mise à jour sur une copie hors verrou de lecture, sérialisée entre processus par un verrou de fichier
+- Requêtes servies depuis la mémoire (quelques dixièmes de ms), détails lus par clé primaire
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows : mises à jour sérialisées dans le processus seulement
+    fcntl = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+    EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    SentenceTransformer = None
+    EMBEDDINGS_AVAILABLE = False
+
+from .database.base import DB_DIR, get_db_connection
+from .vector_index import VectorIndex
+
+SIMILARITY_MODEL = os.getenv('SIMILARITY_MODEL', 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2')
+VECTOR_INDEX_DIR = DB_DIR / 'vector_index'
+CURRENT_POINTER = 'CURRENT'
+UPDATE_LOCK_FILE = '.update.lock'
+VERSIONS_KEPT = 2  # la version précédente reste lisible le temps qu'un lecteur bascule
+ENCODE_BATCH_SIZE = 64
+DESCRIPTION_CHARS = 300
+RELOAD_CHECK_INTERVAL = 5.0  # secondes entre deux vérifications du pointeur CURRENT
+# Une version remplacée n'est supprimée qu'après ce délai : un lecteur qui vient de la résoudre finit de la charger
+VERSION_GRACE_SECONDS = 12 * RELOAD_CHECK_INTERVAL
+
+
+def video_text(title: Optional[str], description: Optional[str]) -> str:
+    title = (title or '').strip()
+    description = (description or '').strip()[:DESCRIPTION_CHARS]
+    return f"{title}. {description}" if description else title
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class IndexNotReady(RuntimeError):
+    """Premier chargement de l'index encore en cours (aucune version servie)"""
+
+
+@dataclass
+class IndexState:
+    """Version chargée de l'index : remplacée en bloc, jamais modifiée une fois publiée"""
+    videos: Optional[VectorIndex] = None
+    competitors: Optional[VectorIndex] = None
+    owners: Dict[int, int] = field(default_factory=dict)   # video.id -> concurrent.id
+    hashes: Dict[int, str] = field(default_factory=dict)   # video.id -> empreinte du texte encodé
+    version: Optional[str] = None
+
+
+class SimilarityService:
+    """Index HNSW des vidéos et des centroïdes de concurrents, mis à jour après les imports"""
+
+    def __init__(self, index_dir: Path = VECTOR_INDEX_DIR, model_name: str = SIMILARITY_MODEL,
+                 encoder: Optional[Callable[[List[str]], np.ndarray]] = None):
+        self.index_dir = Path(index_dir)
+        self.model_name = model_name
+        self._encoder = encoder
+        self._model = None
+        self._state = IndexState()
+        self._lock = threading.Lock()          # bascule de self._state uniquement (quelques µs)
+        self._load_lock = threading.Lock()     # un seul rechargement à la fois, les autres servent l'état courant
+        self._update_lock = threading.Lock()   # une mise à jour à la fois dans le processus
+        self._checked_at = float('-inf')
+
+    # Instantané courant : les requêtes en cours gardent leur version même si une autre est chargée
+
+    @property
+    def videos(self) -> Optional[VectorIndex]:
+        return self._state.videos
+
+    @property
+    def competitors(self) -> Optional[VectorIndex]:
+        return self._state.competitors
+
+    @property
+    def owners(self) -> Dict[int, int]:
+        return self._state.owners
+
+    @property
+    def hashes(self) -> Dict[int, str]:
+        return self._state.hashes
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._state.version
+
+    def _swap(self, state: IndexState):
+        with self._lock:
+            # Un rechargement lent ne remplace pas une version plus récente (noms horodatés triables)
+            if self._state.version is None or (state.version or '') >= self._state.version:
+                self._state = state
+
+    # ------------------------------------------------------------------ chargement
+
+    def _current_version(self) -> Optional[Dict]:
+        pointer = self.index_dir / CURRENT_POINTER
+        if not pointer.exists():
+            return None
+        return json.loads(pointer.read_text(encoding='utf-8'))
+
+    def _load_state(self, version: str) -> IndexState:
+        """Lit une version publiée (objets neufs, indépendants de l'état servi)"""
+        path = self.index_dir / version
+        meta = np.load(path / 'videos_meta.npz')
+        ids = meta['ids'].tolist()
+        return IndexState(
+            videos=VectorIndex.load(path / 'videos') if VectorIndex.exists(path / 'videos') else None,
+            competitors=VectorIndex.load(path / 'competitors') if VectorIndex.exists(path / 'competitors') else None,
+            owners=dict(zip(ids, meta['owners'].tolist())),
+            hashes=dict(zip(ids, meta['hashes'].tolist())),
+            version=version,
+        )
+
+    def _ensure_loaded(self, force: bool = False):
+        """Vérifie périodiquement la version publiée ; le chargement se fait dans un thread dédié
+
+        Les requêtes ne chargent jamais d'index elles-mêmes : elles servent self._state jusqu'à la bascule.
+        force : chargement synchrone (scripts, préchargement).
+        """
+        now = time.monotonic()
+        if not force and now - self._checked_at < RELOAD_CHECK_INTERVAL:
+            return
+        # Rechargement déjà en cours : on continue de servir l'état courant
+        if not self._load_lock.acquire(blocking=force):
+            return
+        self._checked_at = now
+        if force:
+            self._reload()
+            return
+        try:
+            threading.Thread(target=self._reload, name='similarity-reload', daemon=True).start()
+        except RuntimeError:
+            self._load_lock.release()
+
+    def loading(self) -> bool:
+        return self._load_lock.locked()
+
+    def _reload(self):
+        """Charge la version publiée si elle a changé puis bascule l'état (libère _load_lock)"""
+        try:
+            current = self._current_version()
+            if current is None or current['version'] == self.version:
+                return
+            if current.get('model') != self.model_name:
+                print(f"[SIMILARITY] ⚠️ Index construit avec {current.get('model')}, reconstruction nécessaire")
+                return
+            try:
+                state = self._load_state(current['version'])
+            except (OSError, ValueError, KeyError) as e:
+                # Version supprimée ou en cours d'écriture : nouvel essai au prochain intervalle
+                print(f"[SIMILARITY] ⚠️ Chargement de l'index {current['version']} impossible: {e}")
+                return
+            self._swap(state)
+            print(f"[SIMILARITY] 📂 Index {state.version} chargé ({len(state.owners)} vidéos)")
+        finally:
+            self._load_lock.release()
+
+    def available(self) -> bool:
+        self._ensure_loaded()
+        videos = self.videos
+        return videos is not None and len(videos) > 0
+
+    def _require(self, index: Optional[VectorIndex], item_id: int, missing: str):
+        if index is None and self.loading():
+            raise IndexNotReady("Index de similarité en cours de chargement")
+        if index is None or item_id not in index:
+            raise KeyError(missing)
+
+    # ------------------------------------------------------------------ construction
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        if self._encoder is not None:
+            return np.asarray(self._encoder(texts), dtype=np.float32)
+        if not EMBEDDINGS_AVAILABLE:
+            raise RuntimeError("sentence-transformers requis pour l'index de similarité")
+        if self._model is None:
+            print(f"[SIMILARITY] 🧠 Chargement du modèle {self.model_name}")
+            self._model = SentenceTransformer(self.model_name, device='cpu')
+        return self._model.encode(texts, batch_size=ENCODE_BATCH_SIZE, convert_to_numpy=True,
+                                  normalize_embeddings=True).astype(np.float32)
+
+    @contextmanager
+    def _exclusive_update(self):
+        """Une seule mise à jour à la fois, dans ce processus et entre processus (verrou de fichier)"""
+        with self._update_lock:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.index_dir / UPDATE_LOCK_FILE, 'a+') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def update(self, competitor_ids: Optional[Iterable[int]] = None, rebuild: bool = False) -> Dict:
+        """Encode les vidéos nouvelles/modifiées (de certains concurrents ou de toutes), retire les supprimées
+
+        Le travail se fait sur une copie relue depuis CURRENT sous verrou de fichier : les requêtes continuent
+        sur l'état courant et les encodages publiés entre-temps par un autre processus sont conservés.
+        """
+        scope = sorted(set(competitor_ids)) if competitor_ids is not None else None
+        with self._exclusive_update():
+            current = self._current_version()
+            state = IndexState()
+            if not rebuild and current is not None and current.get('model') == self.model_name:
+                state = self._load_state(current['version'])
+
+            conn = get_db_connection(update_schema=False)
+            try:
+                query = "SELECT id, concurrent_id, title, description FROM video"
+                params: Sequence = ()
+                if scope is not None:
+                    query += f" WHERE concurrent_id IN ({','.join('?' * len(scope))})"
+                    params = scope
+                rows = conn.execute(query, params).fetchall()
+            finally:
+                conn.close()
+
+            present = {}
+            changed: List[Tuple[int, int, str, str]] = []
+            for video_id, competitor_id, title, description in rows:
+                present[video_id] = competitor_id
+                text = video_text(title, description)
+                digest = text_hash(text)
+                if state.hashes.get(video_id) != digest or state.owners.get(video_id) != competitor_id:
+                    changed.append((video_id, competitor_id, text, digest))
+
+            scoped = set(scope) if scope is not None else None
+            removed = [video_id for video_id, owner in state.owners.items()
+                       if video_id not in present and (scoped is None or owner in scoped)]
+            affected = {competitor_id for _, competitor_id, _, _ in changed}
+            affected.update(state.owners[video_id] for video_id in removed)
+            affected.update(state.owners[video_id] for video_id, _, _, _ in changed if video_id in state.owners)
+
+            started = time.monotonic()
+            for start in range(0, len(changed), ENCODE_BATCH_SIZE * 16):
+                batch = changed[start:start + ENCODE_BATCH_SIZE * 16]
+                vectors = self._encode([text for _, _, text, _ in batch])
+                if state.videos is None:
+                    state.videos = VectorIndex(vectors.shape[1], space='cosine', capacity=max(len(rows), 1))
+                state.videos.add([video_id for video_id, _, _, _ in batch], vectors)
+                for video_id, competitor_id, _, digest in batch:
+                    state.owners[video_id] = competitor_id
+                    state.hashes[video_id] = digest
+                print(f"[SIMILARITY] 🧠 {min(start + len(batch), len(changed))}/{len(changed)} vidéos encodées")
+
+            if removed and state.videos is not None:
+                state.videos.remove(removed)
+            for video_id in removed:
+                state.owners.pop(video_id, None)
+                state.hashes.pop(video_id, None)
+
+            if affected and state.videos is not None:
+                self._update_centroids(state, affected)
+            if changed or removed or rebuild:
+                self._publish(state)
+
+            # Bascule de l'état servi (courte section critique)
+            if state.version != self.version:
+                self._swap(state)
+            self._checked_at = time.monotonic()
+
+            return {
+                'status': 'success',
+                'encoded': len(changed),
+                'removed': len(removed),
+                'competitors_updated': len(affected),
+                'videos_indexed': len(state.owners),
+                'encode_seconds': round(time.monotonic() - started, 2),
+                'version': state.version,
+            }
+
+    @staticmethod
+    def _update_centroids(state: IndexState, competitor_ids: Iterable[int]):
+        """Centroïde normalisé des embeddings des vidéos de chaque concurrent touché"""
+        by_competitor = defaultdict(list)
+        for video_id, owner in state.owners.items():
+            by_competitor[owner].append(video_id)
+        if state.competitors is None:
+            state.competitors = VectorIndex(state.videos.dim, space='cosine')
+        emptied = []
+        for competitor_id in competitor_ids:
+            video_ids = by_competitor.get(competitor_id)
+            if not video_ids:
+                emptied.append(competitor_id)
+                continue
+            centroid = _normalize(state.videos.get_vectors(video_ids).mean(axis=0))
+            state.competitors.add([competitor_id], centroid)
+        state.competitors.remove(emptied)
+
+    def _publish(self, state: IndexState):
+        """Écrit une nouvelle version complète puis bascule le pointeur CURRENT (sous verrou de mise à jour)"""
+        version = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        path = self.index_dir / version
+        path.mkdir(parents=True)
+        if state.videos is not None:
+            state.videos.save(path / 'videos')
+        if state.competitors is not None:
+            state.competitors.save(path / 'competitors')
+        ids = np.fromiter(state.owners, dtype=np.int64, count=len(state.owners))
+        np.savez(path / 'videos_meta.npz', ids=ids,
+                 owners=np.array([state.owners[i] for i in ids.tolist()], dtype=np.int64),
+                 hashes=np.array([state.hashes[i] for i in ids.tolist()], dtype='<U16'))
+
+        pointer_tmp = self.index_dir / f'.{CURRENT_POINTER}.tmp'
+        pointer_tmp.write_text(json.dumps({'version': version, 'model': self.model_name,
+                                           'videos': len(state.owners)}), encoding='utf-8')
+        os.replace(pointer_tmp, self.index_dir / CURRENT_POINTER)
+        state.version = version
+        self._prune_versions()
+
+    def _prune_versions(self):
+        """Supprime les anciennes versions remplacées depuis plus de VERSION_GRACE_SECONDS"""
+        versions = sorted(p for p in self.index_dir.iterdir() if p.is_dir())
+        now = time.time()
+        for old, successor in zip(versions[:-VERSIONS_KEPT], versions[1:]):
+            # La version suivante a été créée au moment où celle-ci a cessé d'être CURRENT
+            if now - successor.stat().st_mtime > VERSION_GRACE_SECONDS:
+                shutil.rmtree(old, ignore_errors=True)
+
+    # ------------------------------------------------------------------ requêtes
+
+    def similar_videos(self, video_id: int, k: int = 10, other_competitors: bool = True) -> List[Tuple[int, float]]:
+        """Vidéos les plus proches : (video.id, similarité cosinus) ; par défaut hors du même concurrent"""
+        self._ensure_loaded()
+        state = self._state  # instantané cohérent même si une version est rechargée
+        videos, owners = state.videos, state.owners
+        self._require(videos, video_id, f"Vidéo {video_id} absente de l'index de similarité")
+        vector = videos.get_vectors([video_id])
+        own = owners.get(video_id)
+        # Exclusion du concurrent appliquée pendant la recherche (filtre HNSW), sans sur-échantillonnage
+        allowed = (lambda i: owners.get(i) != own) if other_competitors else None
+        hits = videos.query(vector, k=k, exclude=[video_id], allowed=allowed)[0]
+        return [(i, round(1.0 - d, 4)) for i, d in hits]
+
+    def similar_competitors(self, competitor_id: int, k: int = 10) -> List[Tuple[int, float]]:
+        """Concurrents dont le centroïde est le plus proche : (concurrent.id, similarité cosinus)"""
+        self._ensure_loaded()
+        competitors = self._state.competitors
+        self._require(competitors, competitor_id, f"Concurrent {competitor_id} absent de l'index de similarité")
+        vector = competitors.get_vectors([competitor_id])
+        return [(i, round(1.0 - d, 4)) for i, d in competitors.query(vector, k=k, exclude=[competitor_id])[0]]
+
+    def stats(self) -> Dict:
+        self._ensure_loaded()
+        state = self._state
+        return {
+            'version': state.version,
+            'model': self.model_name,
+            'videos': len(state.videos) if state.videos else 0,
+            'competitors': len(state.competitors) if state.competitors else 0,
+            'backend': state.videos.backend if state.videos else None,
+        }
+
+
+def video_details(conn: sqlite3.Connection, hits: List[Tuple[int, float]]) -> List[Dict]:
+    """Détails des vidéos trouvées, dans l'ordre de similarité (lecture par clé primaire)"""
+    if not hits:
+        return []
+    rows = conn.execute(f"""
+        SELECT v.id, v.video_id, v.title, v.thumbnail_url, v.view_count, v.published_at, v.category,
+               c.id AS competitor_id, c.name AS competitor_name, c.country
+        FROM video v
+        JOIN concurrent c ON v.concurrent_id = c.id
+        WHERE v.id IN ({','.join('?' * len(hits))})
+    """, [video_id for video_id, _ in hits]).fetchall()
+    by_id = {row[0]: dict(zip(('id', 'video_id', 'title', 'thumbnail_url', 'view_count', 'published_at',
+                               'category', 'competitor_id', 'competitor_name', 'country'), row)) for row in rows}
+    return [dict(by_id[video_id], similarity=score) for video_id, score in hits if video_id in by_id]
+
+
+def competitor_details(conn: sqlite3.Connection, hits: List[Tuple[int, float]]) -> List[Dict]:
+    if not hits:
+        return []
+    rows = conn.execute(f"""
+        SELECT id, name, country, channel_url, subscriber_count, video_count
+        FROM concurrent WHERE id IN ({','.join('?' * len(hits))})
+    """, [competitor_id for competitor_id, _ in hits]).fetchall()
+    by_id = {row[0]: dict(zip(('id', 'name', 'country', 'channel_url', 'subscriber_count', 'video_count'), row))
+             for row in rows}
+    return [dict(by_id[competitor_id], similarity=score) for competitor_id, score in hits if competitor_id in by_id]
+
+
+# Instance globale partagée par l'API et le workflow post-import
+similarity_service = SimilarityService()
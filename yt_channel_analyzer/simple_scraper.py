@@ -1,6 +1,32 @@
 import requests
 from bs4 import BeautifulSoup, Tag
 from datetime import datetime
+from .yt_initial_data import extract_channel_page
+
+def _channel_page_entries(html):
+    """(titre, url, date) des vidéos de la page : ytInitialData d'abord, balises HTML en repli"""
+    page = extract_channel_page(html)
+    if page['videos']:
+        return [(video['title'], f"https://www.youtube.com/watch?v={video['video_id']}", video['published_text'] or None)
+                for video in page['videos']]
+
+    entries = []
+    soup = BeautifulSoup(html, 'html.parser')
+    for a in soup.select('a#video-title'):
+        title = a.get('title')
+        href = a.get('href')
+        if not href or not isinstance(href, str):
+            continue
+        url = 'https://www.youtube.com' + href
+        # Essayer de récupérer la date de publication si possible
+        parent = a.find_parent('ytd-grid-video-renderer') or a.find_parent('ytd-rich-item-renderer')
+        date_str = None
+        if parent and isinstance(parent, Tag):
+            meta_span = parent.select_one('#metadata-line span')
+            if meta_span:
+                date_str = meta_span.text.strip()
+        entries.append((title, url, date_str))
+    return entries
 
 def simple_scrape_youtube_videos(channel_url, max_videos=None, start_date=None, end_date=None):
     """
@@ -16,21 +42,8 @@ def simple_scrape_youtube_videos(channel_url, max_videos=None, start_date=None,
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
     }
     resp = requests.get(videos_url, headers=headers, timeout=10)
-    soup = BeautifulSoup(resp.text, 'html.parser')
     videos = []
-    for a in soup.select('a#video-title'):
-        title = a.get('title')
-        href = a.get('href')
-        if not href or not isinstance(href, str):
-            continue
-        url = 'https://www.youtube.com' + href
-        # Essayer de récupérer la date de publication si possible
-        parent = a.find_parent('ytd-grid-video-renderer') or a.find_parent('ytd-rich-item-renderer')
-        date_str = None
-        if parent and isinstance(parent, Tag):
-            meta_span = parent.select_one('#metadata-line span')
-            if meta_span:
-                date_str = meta_span.text.strip()
+    for title, url, date_str in _channel_page_entries(resp.text):
         video = {'title': title, 'url': url, 'date': date_str}
         # Si dates fournies, essayer de filtrer (approximatif)
         if start_date or end_date:
@@ -0,0 +1,271 @@
+"""
+Exports en flux (NDJSON / CSV / JSON / Parquet)
+- Le curseur est parcouru par fetchmany : mémoire bornée quelle que soit la taille de la table
+- Compression gzip à la volée (zlib, sans buffer complet)
+- Parquet optionnel via pyarrow : un row group par lot, fichier temporaire relu par morceaux
+- Schéma Parquet fixé avant la première ligne (types déclarés ou PRAGMA table_info)
+"""
+
+import csv
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from .database.base import DB_DIR, get_db_connection
+
+EMOTIONS_DB_PATH = DB_DIR / 'youtube_emotions_massive.db'
+
+FETCH_BATCH_SIZE = 5000
+PARQUET_ROW_GROUP_SIZE = 100_000
+FILE_CHUNK_SIZE = 1 << 20
+
+FORMATS = {
+    'json': ('application/json', 'json'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+@dataclass(frozen=True)
+class ExportSource:
+    """Requête d'export ; les colonnes sont lues depuis cursor.description
+
+    Types Parquet : columns (nom, 'int' / 'float' / 'str') ou, pour un SELECT *, ceux déclarés
+    dans la table (PRAGMA table_info). Colonne non typée : texte.
+    """
+    query: str
+    database: str = 'main'
+    columns: Tuple[Tuple[str, str], ...] = ()
+    table: Optional[str] = None
+
+
+EXPORT_SOURCES: Dict[str, ExportSource] = {
+    'competitors': ExportSource("""
+        SELECT id, name, channel_url, country, subscriber_count, created_at, last_updated
+        FROM concurrent
+        ORDER BY name
+    """, columns=(
+        ('id', 'int'), ('name', 'str'), ('channel_url', 'str'), ('country', 'str'), ('subscriber_count', 'int'),
+        ('created_at', 'str'), ('last_updated', 'str'),
+    )),
+    'videos': ExportSource("""
+        SELECT v.id, v.video_id, v.title, v.view_count, v.like_count, v.comment_count,
+               v.published_at, v.duration_seconds, v.category, c.name as competitor_name
+        FROM video v
+        JOIN concurrent c ON v.concurrent_id = c.id
+        ORDER BY v.id
+    """, columns=(
+        ('id', 'int'), ('video_id', 'str'), ('title', 'str'), ('view_count', 'int'), ('like_count', 'int'),
+        ('comment_count', 'int'), ('published_at', 'str'), ('duration_seconds', 'int'), ('category', 'str'),
+        ('competitor_name', 'str'),
+    )),
+    'playlists': ExportSource("""
+        SELECT p.id, p.name, p.description, p.category, p.video_count,
+               c.name as competitor_name
+        FROM playlist p
+        JOIN concurrent c ON p.concurrent_id = c.id
+        ORDER BY p.video_count DESC
+    """, columns=(
+        ('id', 'int'), ('name', 'str'), ('description', 'str'), ('category', 'str'), ('video_count', 'int'),
+        ('competitor_name', 'str'),
+    )),
+    # Schéma variable selon le pipeline d'origine : toutes les colonnes, dans l'ordre de la table
+    'comment_emotions': ExportSource("SELECT * FROM comment_emotions ORDER BY id", database='emotions',
+                                     table='comment_emotions'),
+}
+
+
+def open_source_connection(source: ExportSource) -> sqlite3.Connection:
+    if source.database == 'emotions':
+        if not EMOTIONS_DB_PATH.exists():
+            raise FileNotFoundError(f"Base sentiment introuvable: {EMOTIONS_DB_PATH}")
+        # Lecture seule : l'export ne bloque pas le pipeline d'analyse
+        return sqlite3.connect(f"file:{EMOTIONS_DB_PATH}?mode=ro", uri=True)
+    return get_db_connection(update_schema=False)
+
+
+def iter_batches(cursor: sqlite3.Cursor, batch_size: int = FETCH_BATCH_SIZE) -> Iterator[List[tuple]]:
+    """Lots de lignes via fetchmany (tuples bruts, sans row_factory)"""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield [tuple(row) for row in rows]
+
+
+def ndjson_chunks(columns: Sequence[str], batches: Iterable[List[tuple]]) -> Iterator[bytes]:
+    for rows in batches:
+        yield ''.join(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) + '\n' for row in rows
+        ).encode('utf-8')
+
+
+def csv_chunks(columns: Sequence[str], batches: Iterable[List[tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def json_chunks(columns: Sequence[str], batches: Iterable[List[tuple]], export_type: str) -> Iterator[bytes]:
+    """Même structure que l'ancien export JSON, écrite au fil de l'eau"""
+    header = {'export_type': export_type, 'export_date': datetime.now().isoformat()}
+    yield (json.dumps(header, ensure_ascii=False)[:-1] + ', "data": [').encode('utf-8')
+    total = 0
+    for rows in batches:
+        prefix = ', ' if total else ''
+        yield (prefix + ', '.join(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) for row in rows
+        )).encode('utf-8')
+        total += len(rows)
+    yield f'], "total_records": {total}}}'.encode('utf-8')
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compression gzip incrémentale d'un flux d'octets"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _declared_kind(declared_type: str) -> str:
+    """Règles d'affinité SQLite appliquées au type déclaré d'une colonne"""
+    declared_type = (declared_type or '').upper()
+    if 'INT' in declared_type:
+        return 'int'
+    if any(token in declared_type for token in ('REAL', 'FLOA', 'DOUB')):
+        return 'float'
+    return 'str'
+
+
+def column_kinds(conn: sqlite3.Connection, source: ExportSource, columns: Sequence[str]) -> List[str]:
+    """Type de chaque colonne exportée, connu avant la lecture des lignes"""
+    kinds = dict(source.columns)
+    if source.table:
+        for row in conn.execute(f'PRAGMA table_info("{source.table}")'):
+            kinds.setdefault(row[1], _declared_kind(row[2]))
+    return [kinds.get(name, 'str') for name in columns]
+
+
+ARROW_KINDS = {'int': 'int64', 'float': 'float64', 'str': 'string'}
+
+
+def _coerce(value, kind: str):
+    """Valeur convertie au type de la colonne ; None si la conversion est impossible"""
+    if value is None:
+        return None
+    if kind == 'str':
+        return value if isinstance(value, str) else str(value)
+    try:
+        return int(value) if kind == 'int' else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parquet_chunks(columns: Sequence[str], batches: Iterable[List[tuple]],
+                   kinds: Optional[Sequence[str]] = None,
+                   row_group_size: int = PARQUET_ROW_GROUP_SIZE) -> Iterator[bytes]:
+    """Écrit un fichier Parquet temporaire par row groups puis le relit par morceaux
+
+    Le schéma vient des types déclarés (kinds, texte par défaut) et non des premières lignes :
+    une valeur d'un autre type plus loin dans la table ne peut pas interrompre l'export.
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow requis pour l'export Parquet (pip install pyarrow)")
+
+    kinds = list(kinds or ['str'] * len(columns))
+    schema = pa.schema([(name, getattr(pa, ARROW_KINDS[kind])()) for name, kind in zip(columns, kinds)])
+    fd, path = tempfile.mkstemp(suffix='.parquet')
+    os.close(fd)
+    try:
+        writer = pq.ParquetWriter(path, schema, compression='zstd')
+        pending: List[tuple] = []
+
+        def flush(rows):
+            arrays = [
+                pa.array([_coerce(value, kind) for value in values], type=field.type)
+                for values, kind, field in zip(zip(*rows), kinds, schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+        for rows in batches:
+            pending.extend(rows)
+            if len(pending) >= row_group_size:
+                flush(pending)
+                pending = []
+        if pending:
+            flush(pending)
+        writer.close()
+
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(FILE_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        os.unlink(path)
+
+
+def export_stream(data_type: str, fmt: str = 'ndjson', compress: bool = True,
+                  batch_size: int = FETCH_BATCH_SIZE) -> Iterator[bytes]:
+    """Générateur d'octets pour un export ; la connexion vit le temps du flux"""
+    source = EXPORT_SOURCES[data_type]
+    conn = open_source_connection(source)
+    try:
+        cursor = conn.execute(source.query)
+        columns = [description[0] for description in cursor.description]
+        batches = iter_batches(cursor, batch_size)
+
+        if fmt == 'parquet':
+            chunks = parquet_chunks(columns, batches, column_kinds(conn, source, columns))
+            compress = False  # Parquet compresse déjà ses colonnes (zstd)
+        elif fmt == 'csv':
+            chunks = csv_chunks(columns, batches)
+        elif fmt == 'json':
+            chunks = json_chunks(columns, batches, data_type)
+        else:
+            chunks = ndjson_chunks(columns, batches)
+
+        yield from gzip_stream(chunks) if compress else chunks
+    finally:
+        conn.close()
+
+
+def export_filename(data_type: str, fmt: str, compress: bool) -> str:
+    extension = FORMATS[fmt][1]
+    suffix = '.gz' if compress and fmt != 'parquet' else ''
+    return f"{data_type}_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}{suffix}"
+
+
+def export_to_file(data_type: str, path: str, fmt: str = 'ndjson', compress: bool = False) -> int:
+    """Export hors ligne vers un fichier ; retourne le nombre d'octets écrits"""
+    written = 0
+    with open(path, 'wb') as f:
+        for chunk in export_stream(data_type, fmt, compress):
+            f.write(chunk)
+            written += len(chunk)
+    return written
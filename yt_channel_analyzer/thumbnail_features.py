@@ -0,0 +1,329 @@
+"""
+Empreintes visuelles des miniatures et cohérence visuelle par concurrent
+- pHash (DCT 32x32), dHash (gradient 9x8) : 64 bits chacun, stockés en BLOB de 8 octets
+- Histogramme couleur compact : RGB 4x4x4 = 64 cases, BLOB de 64 octets (uint8 normalisé)
+- Calcul incrémental : seules les vidéos nouvelles ou dont la miniature a changé sont traitées
+- Cohérence : distance de Hamming moyenne (exacte, linéaire), part de paires quasi identiques
+  (XOR 64 bits + popcount NumPy, vectorisé par blocs) et proximité à la palette moyenne
+"""
+
+import sqlite3
+import time
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+HASH_BYTES = 8
+HIST_LEVELS = 4
+HIST_BINS = HIST_LEVELS ** 3
+
+# Comparaison par paires (n²) limitée aux premières vidéos par id (échantillon déterministe)
+MAX_PAIRWISE_VIDEOS = 1000
+TEMPLATE_DISTANCE = 10  # bits de pHash en dessous desquels deux miniatures partagent un gabarit
+MIN_FEATURE_VIDEOS = 5
+FEATURE_BATCH_SIZE = 500
+
+# Pondération du score final : structure (hashes) vs palette
+HASH_WEIGHT = 0.6
+COLOUR_WEIGHT = 0.4
+
+_POPCOUNT8 = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+
+def ensure_feature_schema(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS thumbnail_features (
+            video_id INTEGER PRIMARY KEY,
+            thumbnail_url TEXT NOT NULL,
+            phash BLOB NOT NULL,
+            dhash BLOB NOT NULL,
+            histogram BLOB NOT NULL,
+            computed_at REAL
+        )
+    """)
+
+
+# === Extraction ===
+
+def _dct_matrix(size: int) -> np.ndarray:
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_DCT32 = _dct_matrix(32)
+
+
+def phash(gray32: np.ndarray) -> bytes:
+    """Basses fréquences DCT 8x8 comparées à leur médiane (hors composante continue)"""
+    coefficients = (_DCT32 @ gray32 @ _DCT32.T)[:8, :8].ravel()
+    bits = coefficients > np.median(coefficients[1:])
+    return np.packbits(bits).tobytes()
+
+
+def dhash(gray9x8: np.ndarray) -> bytes:
+    """Gradient horizontal : chaque pixel comparé à son voisin de droite"""
+    bits = gray9x8[:, 1:] > gray9x8[:, :-1]
+    return np.packbits(bits.ravel()).tobytes()
+
+
+def colour_histogram(rgb: np.ndarray) -> bytes:
+    """Histogramme RGB quantifié (4 niveaux par canal), normalisé sur 255"""
+    quantized = (rgb.reshape(-1, 3) // (256 // HIST_LEVELS)).astype(np.int64)
+    index = (quantized[:, 0] * HIST_LEVELS + quantized[:, 1]) * HIST_LEVELS + quantized[:, 2]
+    counts = np.bincount(index, minlength=HIST_BINS).astype(np.float64)
+    return np.round(counts / counts.sum() * 255).astype(np.uint8).tobytes()
+
+
+def extract_features(data: bytes) -> Tuple[bytes, bytes, bytes]:
+    """(phash, dhash, histogramme) d'une image encodée"""
+    image = Image.open(BytesIO(data))
+    image.draft('RGB', (64, 64))  # décodage JPEG réduit : inutile de décoder en pleine taille
+    image = image.convert('RGB')
+    gray = image.convert('L')
+    gray32 = np.asarray(gray.resize((32, 32), Image.LANCZOS), dtype=np.float64)
+    gray9x8 = np.asarray(gray.resize((9, 8), Image.LANCZOS), dtype=np.int16)
+    rgb = np.asarray(image.resize((32, 32), Image.BILINEAR), dtype=np.uint8)
+    return phash(gray32), dhash(gray9x8), colour_histogram(rgb)
+
+
+# === Calcul incrémental ===
+
+def pending_videos(conn: sqlite3.Connection, competitor_id: Optional[int] = None,
+                   limit: Optional[int] = None) -> List[Tuple[int, str]]:
+    """Vidéos sans empreinte ou dont l'URL de miniature a changé"""
+    query = """
+        SELECT v.id, v.thumbnail_url FROM video v
+        LEFT JOIN thumbnail_features f ON f.video_id = v.id
+        WHERE v.thumbnail_url LIKE 'http%'
+          AND (f.video_id IS NULL OR f.thumbnail_url != v.thumbnail_url)
+    """
+    params: List = []
+    if competitor_id is not None:
+        query += " AND v.concurrent_id = ?"
+        params.append(competitor_id)
+    query += " ORDER BY v.id"
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
+    return [(row[0], row[1]) for row in conn.execute(query, params).fetchall()]
+
+
+def update_thumbnail_features(competitor_id: Optional[int] = None, limit: Optional[int] = None,
+                              batch_size: int = FEATURE_BATCH_SIZE, max_workers: int = 8) -> Dict:
+    """Télécharge (thumbnail_service) et calcule les empreintes manquantes, par lots"""
+    from .database import get_db_connection
+    from .thumbnail_service import ThumbnailService, blob_path
+
+    stats = {'pending': 0, 'computed': 0, 'failed': 0}
+    if not PIL_AVAILABLE:
+        print("⚠️ Pillow non installé : empreintes visuelles indisponibles")
+        return stats
+
+    conn = get_db_connection(update_schema=False)
+    try:
+        ensure_feature_schema(conn)
+        pending = pending_videos(conn, competitor_id, limit)
+    finally:
+        conn.close()
+    stats['pending'] = len(pending)
+
+    service = ThumbnailService(max_workers=max_workers)
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        fetched = service.fetch_all((url for _, url in batch))
+
+        # Une empreinte par contenu : les miniatures identiques ne sont décodées qu'une fois
+        by_sha: Dict[str, Optional[Tuple[bytes, bytes, bytes]]] = {}
+        rows = []
+        for video_id, url in batch:
+            result = fetched.get(url)
+            if not result or not result.sha256:
+                stats['failed'] += 1
+                continue
+            if result.sha256 not in by_sha:
+                try:
+                    by_sha[result.sha256] = extract_features(blob_path(result.sha256, result.ext).read_bytes())
+                except Exception as e:
+                    print(f"⚠️ Miniature illisible {url}: {e}")
+                    by_sha[result.sha256] = None
+            features = by_sha[result.sha256]
+            if features is None:
+                stats['failed'] += 1
+                continue
+            rows.append((video_id, url, *features, time.time()))
+
+        conn = get_db_connection(update_schema=False)
+        try:
+            conn.executemany("""
+                INSERT OR REPLACE INTO thumbnail_features
+                    (video_id, thumbnail_url, phash, dhash, histogram, computed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+        finally:
+            conn.close()
+        stats['computed'] += len(rows)
+        print(f"🖼️ Empreintes: {stats['computed']}/{stats['pending']} ({stats['failed']} échecs)")
+
+    return stats
+
+
+# === Cohérence visuelle ===
+
+@dataclass
+class VisualConsistency:
+    """Cohérence visuelle d'un ensemble de miniatures (scores 0-100)"""
+    analyzed: int
+    score: float
+    hash_similarity: float
+    template_share: float
+    colour_similarity: float
+
+
+def _popcount64(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, 'bitwise_count'):  # NumPy >= 2.0
+        return np.bitwise_count(values)
+    return _POPCOUNT8[values.view(np.uint8)].reshape(values.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+def pairwise_hamming(hashes: np.ndarray, other: Optional[np.ndarray] = None) -> np.ndarray:
+    """Matrice des distances de Hamming (hashes : n x 8 uint8) par XOR de mots 64 bits"""
+    left = np.ascontiguousarray(hashes).view(np.uint64).ravel()
+    right = left if other is None else np.ascontiguousarray(other).view(np.uint64).ravel()
+    return _popcount64(left[:, None] ^ right[None, :])
+
+
+def mean_pairwise_hamming(hashes: np.ndarray) -> float:
+    """Distance moyenne exacte sur toutes les paires, en O(n) : un bit à c uns sur n diffère dans c(n-c) paires"""
+    n = len(hashes)
+    if n < 2:
+        return 0.0
+    ones = np.unpackbits(hashes, axis=1).sum(axis=0, dtype=np.int64)
+    return float((ones * (n - ones)).sum()) / (n * (n - 1) / 2)
+
+
+def template_share(hashes: np.ndarray, threshold: int = TEMPLATE_DISTANCE, block: int = 256) -> float:
+    """Part des paires quasi identiques (même gabarit) ; échantillon borné, calcul par blocs de lignes"""
+    hashes = hashes[:MAX_PAIRWISE_VIDEOS]
+    n = len(hashes)
+    if n < 2:
+        return 0.0
+    close = 0
+    for start in range(0, n, block):
+        close += int((pairwise_hamming(hashes[start:start + block], hashes) <= threshold).sum())
+    # La diagonale (distance 0 à soi-même) est retirée, chaque paire comptée deux fois
+    return (close - n) / (n * (n - 1))
+
+
+def visual_consistency(phashes: np.ndarray, dhashes: np.ndarray,
+                       histograms: np.ndarray) -> Optional[VisualConsistency]:
+    """Deux images sans rapport ont ~32 bits différents sur 64 : 32 bits de distance = 0%"""
+    n = len(phashes)
+    if n < MIN_FEATURE_VIDEOS:
+        return None
+
+    hamming = (mean_pairwise_hamming(phashes) + mean_pairwise_hamming(dhashes)) / 2
+    hash_similarity = float(np.clip(1 - hamming / 32, 0, 1)) * 100
+    templates = template_share(phashes) * 100
+
+    # Intersection de chaque histogramme avec la palette moyenne de la chaîne (linéaire en n)
+    distributions = histograms.astype(np.float64)
+    distributions /= np.maximum(distributions.sum(axis=1, keepdims=True), 1)
+    palette = distributions.mean(axis=0)
+    colour_similarity = float(np.minimum(distributions, palette).sum(axis=1).mean()) * 100
+
+    structure = (hash_similarity + templates) / 2
+    score = HASH_WEIGHT * structure + COLOUR_WEIGHT * colour_similarity
+    return VisualConsistency(n, round(score, 1), round(hash_similarity, 1), round(templates, 1),
+                             round(colour_similarity, 1))
+
+
+def _as_arrays(rows: Sequence) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Lignes terminées par (phash, dhash, histogram), avec ou sans row_factory"""
+    phashes = np.frombuffer(b''.join(r[-3] for r in rows), dtype=np.uint8).reshape(-1, HASH_BYTES)
+    dhashes = np.frombuffer(b''.join(r[-2] for r in rows), dtype=np.uint8).reshape(-1, HASH_BYTES)
+    histograms = np.frombuffer(b''.join(r[-1] for r in rows), dtype=np.uint8).reshape(-1, HIST_BINS)
+    return phashes, dhashes, histograms
+
+
+def _has_features(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'thumbnail_features'"
+    ).fetchone() is not None
+
+
+def consistency_for_videos(conn: sqlite3.Connection, video_ids: Iterable[int]) -> Optional[VisualConsistency]:
+    """Cohérence d'un ensemble de vidéos (ids de la table video)"""
+    if not _has_features(conn):
+        return None
+    ids = sorted(set(video_ids))
+    rows = []
+    for start in range(0, len(ids), 900):
+        chunk = ids[start:start + 900]
+        rows.extend(conn.execute(
+            f"SELECT video_id, phash, dhash, histogram FROM thumbnail_features "
+            f"WHERE video_id IN ({','.join('?' * len(chunk))}) ORDER BY video_id", chunk
+        ).fetchall())
+    if not rows:
+        return None
+    return visual_consistency(*_as_arrays(rows))
+
+
+def consistency_by_competitor(conn: sqlite3.Connection,
+                              competitor_ids: Optional[Iterable[int]] = None) -> Dict[int, VisualConsistency]:
+    """Cohérence de chaque concurrent en une lecture (empreintes groupées par concurrent)"""
+    if not _has_features(conn):
+        return {}
+    query = """
+        SELECT v.concurrent_id, f.video_id, f.phash, f.dhash, f.histogram
+        FROM thumbnail_features f
+        JOIN video v ON v.id = f.video_id
+    """
+    params: List = []
+    if competitor_ids is not None:
+        ids = list(competitor_ids)
+        if not ids:
+            return {}
+        query += f" WHERE v.concurrent_id IN ({','.join('?' * len(ids))})"
+        params = ids
+    query += " ORDER BY v.concurrent_id, f.video_id"
+    rows = conn.execute(query, params).fetchall()
+    if not rows:
+        return {}
+
+    phashes, dhashes, histograms = _as_arrays(rows)
+    groups = np.array([r[0] for r in rows], dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    ends = np.r_[starts[1:], len(groups)]
+
+    results = {}
+    for start, end in zip(starts, ends):
+        consistency = visual_consistency(phashes[start:end], dhashes[start:end], histograms[start:end])
+        if consistency:
+            results[int(groups[start])] = consistency
+    return results
+
+
+def weighted_consistency(per_competitor: Iterable[VisualConsistency]) -> Optional[VisualConsistency]:
+    """Agrégat pays / Europe : moyenne des concurrents pondérée par le nombre de miniatures"""
+    items = list(per_competitor)
+    analyzed = sum(item.analyzed for item in items)
+    if not analyzed:
+        return None
+
+    def mean(attribute):
+        return round(sum(getattr(item, attribute) * item.analyzed for item in items) / analyzed, 1)
+
+    return VisualConsistency(analyzed, mean('score'), mean('hash_similarity'), mean('template_share'),
+                             mean('colour_similarity'))
@@ -0,0 +1,350 @@
+"""
+Service de miniatures (concurrents et vidéos)
+- Téléchargement concurrent avec sessions HTTP poolées (une par thread)
+- Requêtes conditionnelles ETag / Last-Modified : une image inchangée coûte un 304
+- Stockage adressé par contenu (sha256) : une image partagée n'est stockée qu'une fois
+- Variantes WebP redimensionnées (Pillow) servies avec un cache navigateur immuable
+"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+from .database import get_db_connection
+
+PROJECT_ROOT = Path(__file__).parent.parent
+STATIC_DIR = PROJECT_ROOT / 'static'
+THUMBS_DIR = STATIC_DIR / 'thumbs'
+LEGACY_COMPETITOR_DIR = STATIC_DIR / 'competitors' / 'images'
+
+# URL publique des fichiers adressés par contenu (route /thumbs, cache immuable)
+THUMBS_URL_PREFIX = '/thumbs'
+THUMBS_MAX_AGE = 365 * 24 * 3600
+
+# Largeurs générées : avatars 80px (x2 pour les écrans haute densité), cartes vidéo
+VARIANT_WIDTHS = (160, 320)
+WEBP_QUALITY = 80
+
+DEFAULT_MAX_WORKERS = 8
+REQUEST_TIMEOUT = 10
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+MANIFEST_TTL = 60  # secondes avant relecture des correspondances concurrent -> fichier
+
+_CONTENT_TYPE_EXT = {
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/webp': 'webp',
+    'image/gif': 'gif',
+}
+
+
+def ensure_thumbnail_schema(conn: sqlite3.Connection):
+    """Table des miniatures connues : validateurs HTTP + empreinte du contenu stocké"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS thumbnail_asset (
+            url TEXT PRIMARY KEY,
+            sha256 TEXT,
+            ext TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            variants TEXT DEFAULT '',
+            fetched_at REAL,
+            error TEXT
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_thumbnail_asset_sha256 ON thumbnail_asset(sha256)")
+
+
+def blob_path(sha256: str, ext: str) -> Path:
+    return THUMBS_DIR / sha256[:2] / f"{sha256}.{ext}"
+
+
+def variant_path(sha256: str, width: int) -> Path:
+    return THUMBS_DIR / sha256[:2] / f"{sha256}-{width}.webp"
+
+
+def public_url(path: Path) -> str:
+    return f"{THUMBS_URL_PREFIX}/{path.relative_to(THUMBS_DIR).as_posix()}"
+
+
+@dataclass
+class FetchResult:
+    """Résultat du téléchargement d'une URL"""
+    url: str
+    status: str  # new | unchanged | not_modified | error
+    sha256: Optional[str] = None
+    ext: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    variants: str = ''
+    size: int = 0
+    error: Optional[str] = None
+
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def generate_variants(sha256: str, ext: str, widths: Iterable[int] = VARIANT_WIDTHS) -> List[int]:
+    """Variantes WebP manquantes (jamais agrandies) ; liste des largeurs disponibles"""
+    if not PIL_AVAILABLE:
+        return []
+    available = []
+    image = None
+    for width in widths:
+        target = variant_path(sha256, width)
+        if target.exists():
+            available.append(width)
+            continue
+        try:
+            if image is None:
+                image = Image.open(blob_path(sha256, ext))
+                image.load()
+                if image.mode not in ('RGB', 'RGBA'):
+                    image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+            if width >= image.width:
+                continue
+            height = max(1, round(image.height * width / image.width))
+            buffer = BytesIO()
+            image.resize((width, height), Image.LANCZOS).save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+            _write_atomic(target, buffer.getvalue())
+            available.append(width)
+        except Exception as e:
+            print(f"⚠️ Variante {width}px impossible pour {sha256[:12]}: {e}")
+            break
+    return available
+
+
+class ThumbnailService:
+    """Téléchargement concurrent des miniatures vers le stockage adressé par contenu"""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, timeout: float = REQUEST_TIMEOUT,
+                 widths: Tuple[int, ...] = VARIANT_WIDTHS):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.widths = widths
+        self._local = threading.local()
+        self._manifest: Dict[str, Dict] = {}
+        self._competitor_urls: Dict[int, str] = {}
+        self._manifest_loaded_at = 0.0
+        self._manifest_lock = threading.Lock()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_workers, max_retries=2)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers['User-Agent'] = USER_AGENT
+            self._local.session = session
+        return session
+
+    # === Téléchargement ===
+
+    def fetch(self, url: str, known: Optional[sqlite3.Row] = None) -> FetchResult:
+        """GET conditionnel d'une URL ; stocke le contenu s'il est nouveau"""
+        headers = {}
+        if known and known['sha256'] and blob_path(known['sha256'], known['ext']).exists():
+            if known['etag']:
+                headers['If-None-Match'] = known['etag']
+            if known['last_modified']:
+                headers['If-Modified-Since'] = known['last_modified']
+
+        try:
+            response = self._session().get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304:
+                variants = generate_variants(known['sha256'], known['ext'], self.widths)
+                return FetchResult(url, 'not_modified', known['sha256'], known['ext'],
+                                   known['etag'], known['last_modified'], ','.join(map(str, variants)))
+            response.raise_for_status()
+        except requests.RequestException as e:
+            return FetchResult(url, 'error', error=str(e))
+
+        content = response.content
+        sha256 = hashlib.sha256(content).hexdigest()
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        ext = _CONTENT_TYPE_EXT.get(content_type, 'jpg')
+        path = blob_path(sha256, ext)
+        if not path.exists():
+            _write_atomic(path, content)
+        variants = generate_variants(sha256, ext, self.widths)
+
+        status = 'unchanged' if known and known['sha256'] == sha256 else 'new'
+        return FetchResult(url, status, sha256, ext, response.headers.get('ETag'),
+                           response.headers.get('Last-Modified'), ','.join(map(str, variants)), len(content))
+
+    def fetch_all(self, urls: Iterable[str], max_workers: Optional[int] = None) -> Dict[str, FetchResult]:
+        """Télécharge les URLs en parallèle ; une seule transaction d'écriture à la fin"""
+        urls = list(dict.fromkeys(url for url in urls if url))
+        if not urls:
+            return {}
+
+        conn = get_db_connection(update_schema=False)
+        try:
+            ensure_thumbnail_schema(conn)
+            known = {}
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT * FROM thumbnail_asset WHERE url IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                known.update((row['url'], row) for row in rows)
+
+            with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+                results = list(executor.map(lambda url: self.fetch(url, known.get(url)), urls))
+
+            now = time.time()
+            conn.executemany("""
+                INSERT INTO thumbnail_asset (url, sha256, ext, etag, last_modified, variants, fetched_at, error)
+                VALUES (?, ?, ?, ?, ?, ?, ?, NULL)
+                ON CONFLICT(url) DO UPDATE SET
+                    sha256 = excluded.sha256, ext = excluded.ext, etag = excluded.etag,
+                    last_modified = excluded.last_modified, variants = excluded.variants,
+                    fetched_at = excluded.fetched_at, error = NULL
+            """, [(r.url, r.sha256, r.ext, r.etag, r.last_modified, r.variants, now)
+                  for r in results if r.status != 'error'])
+            # Une erreur conserve la dernière version connue (l'URL peut être temporairement indisponible)
+            conn.executemany("""
+                INSERT INTO thumbnail_asset (url, fetched_at, error) VALUES (?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET fetched_at = excluded.fetched_at, error = excluded.error
+            """, [(r.url, now, r.error) for r in results if r.status == 'error'])
+            conn.commit()
+        finally:
+            conn.close()
+
+        self._manifest_loaded_at = 0.0
+        return {result.url: result for result in results}
+
+    def sync_competitors(self, competitor_ids: Optional[Iterable[int]] = None,
+                         max_workers: Optional[int] = None) -> Dict:
+        """Miniatures des chaînes ; recopie aussi static/competitors/images/{id}.jpg (anciens templates)"""
+        conn = get_db_connection(update_schema=False)
+        try:
+            query = "SELECT id, thumbnail_url FROM concurrent WHERE thumbnail_url IS NOT NULL AND thumbnail_url != ''"
+            params: List = []
+            if competitor_ids is not None:
+                ids = list(competitor_ids)
+                if not ids:
+                    return summarize({})
+                query += f" AND id IN ({','.join('?' * len(ids))})"
+                params = ids
+            competitors = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+
+        results = self.fetch_all((row['thumbnail_url'] for row in competitors), max_workers)
+        LEGACY_COMPETITOR_DIR.mkdir(parents=True, exist_ok=True)
+        for row in competitors:
+            result = results.get(row['thumbnail_url'])
+            if not result or result.status == 'error':
+                continue
+            legacy = LEGACY_COMPETITOR_DIR / f"{row['id']}.jpg"
+            if result.status == 'new' or not legacy.exists():
+                shutil.copyfile(blob_path(result.sha256, result.ext), legacy)
+        return summarize(results)
+
+    def sync_videos(self, competitor_id: Optional[int] = None, limit: Optional[int] = None,
+                    max_workers: Optional[int] = None) -> Dict:
+        """Miniatures des vidéos (hqdefault partagées entre doublons : stockées une seule fois)"""
+        conn = get_db_connection(update_schema=False)
+        try:
+            query = "SELECT DISTINCT thumbnail_url FROM video WHERE thumbnail_url LIKE 'http%'"
+            params: List = []
+            if competitor_id is not None:
+                query += " AND concurrent_id = ?"
+                params.append(competitor_id)
+            if limit:
+                query += " LIMIT ?"
+                params.append(limit)
+            urls = [row[0] for row in conn.execute(query, params).fetchall()]
+        finally:
+            conn.close()
+        return summarize(self.fetch_all(urls, max_workers))
+
+    # === Résolution des URLs pour les pages ===
+
+    def _load_manifest(self):
+        if time.monotonic() - self._manifest_loaded_at < MANIFEST_TTL:
+            return
+        with self._manifest_lock:
+            if time.monotonic() - self._manifest_loaded_at < MANIFEST_TTL:
+                return
+            conn = get_db_connection(update_schema=False)
+            try:
+                ensure_thumbnail_schema(conn)
+                manifest = {
+                    row['url']: {'sha256': row['sha256'], 'ext': row['ext'],
+                                 'variants': [int(w) for w in (row['variants'] or '').split(',') if w]}
+                    for row in conn.execute(
+                        "SELECT url, sha256, ext, variants FROM thumbnail_asset WHERE sha256 IS NOT NULL"
+                    ).fetchall()
+                }
+                competitor_urls = {
+                    row['id']: row['thumbnail_url']
+                    for row in conn.execute(
+                        "SELECT id, thumbnail_url FROM concurrent WHERE thumbnail_url IS NOT NULL"
+                    ).fetchall()
+                }
+            except sqlite3.Error as e:
+                print(f"⚠️ Manifeste des miniatures indisponible: {e}")
+                manifest, competitor_urls = {}, {}
+            finally:
+                conn.close()
+            self._manifest = manifest
+            self._competitor_urls = competitor_urls
+            self._manifest_loaded_at = time.monotonic()
+
+    def url_for(self, url: str, width: Optional[int] = None) -> Optional[str]:
+        """URL locale immuable : plus petite variante >= width, sinon l'original stocké"""
+        self._load_manifest()
+        asset = self._manifest.get(url)
+        if not asset:
+            return None
+        if width:
+            candidates = sorted(w for w in asset['variants'] if w >= width)
+            if candidates:
+                return public_url(variant_path(asset['sha256'], candidates[0]))
+        return public_url(blob_path(asset['sha256'], asset['ext']))
+
+    def competitor_url(self, competitor_id: int, width: Optional[int] = None) -> Optional[str]:
+        self._load_manifest()
+        url = self._competitor_urls.get(competitor_id)
+        return self.url_for(url, width) if url else None
+
+
+def summarize(results: Dict[str, FetchResult]) -> Dict:
+    statuses = [result.status for result in results.values()]
+    return {
+        'total': len(statuses),
+        'new': statuses.count('new'),
+        'unchanged': statuses.count('unchanged'),
+        'not_modified': statuses.count('not_modified'),
+        'errors': statuses.count('error'),
+        'bytes': sum(result.size for result in results.values()),
+        'unique_blobs': len({result.sha256 for result in results.values() if result.sha256}),
+    }
+
+
+# Instance globale (manifeste partagé par les filtres de templates)
+thumbnail_service = ThumbnailService()
@@ -0,0 +1,262 @@
+"""
+Clustering de topics à grande échelle sur les embeddings de vidéos
+- Embeddings lus par morceaux depuis le disque (np.load en memory-map) : jamais tous en float64 en mémoire
+- Réduction IncrementalPCA en float32 puis MiniBatchKMeans (ou HDBSCAN sur échantillon)
+- Index ANN (vector_index) pour les représentants de clusters et les « vidéos similaires »
+- Nouvelles vidéos rattachées aux clusters existants sans réentraînement
+"""
+
+import json
+import os
+import pickle
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import IncrementalPCA
+
+try:
+    from sklearn.cluster import HDBSCAN  # scikit-learn >= 1.3
+except ImportError:
+    try:
+        from hdbscan import HDBSCAN
+    except ImportError:
+        HDBSCAN = None
+
+from .vector_index import VectorIndex
+
+EMBEDDING_CHUNK_SIZE = 20_000
+PCA_COMPONENTS = 64
+KMEANS_BATCH_SIZE = 4096
+HDBSCAN_MAX_SAMPLES = 20_000  # HDBSCAN est quadratique : les autres vidéos sont rattachées par ANN
+HDBSCAN_MIN_CLUSTER_SIZE = 25
+NOVELTY_PERCENTILE = 95  # au-delà : vidéo loin de tout centre, signe qu'un réentraînement s'impose
+
+METHODS = ('minibatch', 'hdbscan')
+NOISE_LABEL = -1
+
+
+def iter_chunks(embeddings, chunk_size: int = EMBEDDING_CHUNK_SIZE):
+    """Morceaux float32 d'une matrice (ou d'un memmap) d'embeddings"""
+    for start in range(0, len(embeddings), chunk_size):
+        yield start, np.asarray(embeddings[start:start + chunk_size], dtype=np.float32)
+
+
+def load_embeddings(path) -> np.ndarray:
+    """Fichier .npy ouvert en memory-map (lecture à la demande)"""
+    return np.load(path, mmap_mode='r')
+
+
+class TopicClusteringEngine:
+    """PCA incrémentale + MiniBatchKMeans/HDBSCAN + index ANN ; clés libres (ex. identifiants YouTube)"""
+
+    def __init__(self, n_clusters: int = 30, method: str = 'minibatch', n_components: int = PCA_COMPONENTS,
+                 chunk_size: int = EMBEDDING_CHUNK_SIZE, random_state: int = 42):
+        if method not in METHODS:
+            raise ValueError(f"Méthode inconnue: {method} ({', '.join(METHODS)})")
+        if method == 'hdbscan' and HDBSCAN is None:
+            raise RuntimeError("HDBSCAN indisponible (scikit-learn >= 1.3 ou pip install hdbscan)")
+        self.n_clusters = n_clusters
+        self.method = method
+        self.n_components = n_components
+        self.chunk_size = chunk_size
+        self.random_state = random_state
+
+        self.pca: Optional[IncrementalPCA] = None
+        self.kmeans: Optional[MiniBatchKMeans] = None
+        self.centroids: Optional[np.ndarray] = None
+        self.novelty_radius: Optional[float] = None
+        self.index: Optional[VectorIndex] = None
+        self.keys: List[Hashable] = []
+        self._positions: Dict[Hashable, int] = {}
+        self.labels = np.empty(0, dtype=np.int32)
+
+    # ------------------------------------------------------------------ entraînement
+
+    def _reduce(self, embeddings) -> np.ndarray:
+        """Projection PCA en float32, morceau par morceau"""
+        reduced = np.empty((len(embeddings), self.pca.n_components_), dtype=np.float32)
+        for start, chunk in iter_chunks(embeddings, self.chunk_size):
+            reduced[start:start + len(chunk)] = self.pca.transform(chunk)
+        return reduced
+
+    def fit(self, embeddings, keys: Optional[Sequence[Hashable]] = None) -> np.ndarray:
+        """Entraîne sur une matrice ou un memmap (n, d) ; retourne les labels (-1 = bruit HDBSCAN)"""
+        n = len(embeddings)
+        if n == 0:
+            raise ValueError("Aucun embedding à regrouper")
+        keys = list(keys) if keys is not None else list(range(n))
+        if len(keys) != n:
+            raise ValueError(f"{len(keys)} clés pour {n} embeddings")
+
+        n_components = min(self.n_components, embeddings.shape[1], n)
+        print(f"[CLUSTERING] 📉 PCA incrémentale {embeddings.shape[1]} → {n_components} dimensions ({n:,} vidéos)")
+        self.pca = IncrementalPCA(n_components=n_components)
+        # Chaque lot de partial_fit doit contenir au moins n_components lignes : reste trop court fusionné
+        chunk_size = max(self.chunk_size, n_components)
+        bounds = list(range(0, n, chunk_size)) + [n]
+        if len(bounds) > 2 and bounds[-1] - bounds[-2] < n_components:
+            del bounds[-2]
+        for start, end in zip(bounds, bounds[1:]):
+            self.pca.partial_fit(np.asarray(embeddings[start:end], dtype=np.float32))
+        reduced = self._reduce(embeddings)
+
+        if self.method == 'hdbscan':
+            labels = self._fit_hdbscan(reduced)
+        else:
+            labels = self._fit_minibatch(reduced)
+
+        self.keys = keys
+        self._positions = {key: position for position, key in enumerate(keys)}
+        self.labels = labels.astype(np.int32)
+
+        self.index = VectorIndex(n_components, space='l2', capacity=n)
+        for start in range(0, n, self.chunk_size):
+            self.index.add(np.arange(start, min(start + self.chunk_size, n)), reduced[start:start + self.chunk_size])
+
+        clustered = labels != NOISE_LABEL
+        distances = np.linalg.norm(reduced[clustered] - self.centroids[labels[clustered]], axis=1)
+        self.novelty_radius = float(np.percentile(distances, NOVELTY_PERCENTILE)) if len(distances) else None
+        print(f"[CLUSTERING] ✅ {len(self.centroids)} clusters ({self.method}), "
+              f"{int((~clustered).sum())} vidéos hors clusters, index {self.index.backend}")
+        return self.labels
+
+    def _fit_minibatch(self, reduced: np.ndarray) -> np.ndarray:
+        n_clusters = min(self.n_clusters, len(reduced))
+        self.kmeans = MiniBatchKMeans(n_clusters=n_clusters, batch_size=KMEANS_BATCH_SIZE, n_init=3,
+                                      max_iter=100, random_state=self.random_state)
+        self.kmeans.fit(reduced)
+        self.centroids = self.kmeans.cluster_centers_.astype(np.float32)
+        labels = np.empty(len(reduced), dtype=np.int32)
+        for start in range(0, len(reduced), self.chunk_size):
+            labels[start:start + self.chunk_size] = self.kmeans.predict(reduced[start:start + self.chunk_size])
+        return labels
+
+    def _fit_hdbscan(self, reduced: np.ndarray) -> np.ndarray:
+        rng = np.random.default_rng(self.random_state)
+        sample = np.sort(rng.choice(len(reduced), min(len(reduced), HDBSCAN_MAX_SAMPLES), replace=False))
+        sample_labels = HDBSCAN(min_cluster_size=HDBSCAN_MIN_CLUSTER_SIZE).fit_predict(reduced[sample])
+        cluster_ids = sorted(set(sample_labels.tolist()) - {NOISE_LABEL})
+        if not cluster_ids:
+            raise RuntimeError("HDBSCAN n'a trouvé aucun cluster (min_cluster_size trop grand ?)")
+        self.centroids = np.stack([reduced[sample[sample_labels == c]].mean(axis=0) for c in cluster_ids])
+
+        labels = np.full(len(reduced), NOISE_LABEL, dtype=np.int32)
+        labels[sample] = sample_labels
+        rest = np.setdiff1d(np.arange(len(reduced)), sample)
+        if len(rest):
+            # Hors échantillon : label du plus proche voisin de l'échantillon
+            sample_index = VectorIndex(reduced.shape[1], space='l2', capacity=len(sample))
+            sample_index.add(sample, reduced[sample])
+            for start in range(0, len(rest), self.chunk_size):
+                part = rest[start:start + self.chunk_size]
+                hits = sample_index.query(reduced[part], k=1)
+                labels[part] = [labels[h[0][0]] for h in hits]
+        return labels
+
+    # ------------------------------------------------------------------ exploitation
+
+    def _check_fitted(self):
+        if self.pca is None or self.index is None:
+            raise RuntimeError("Modèle de clustering non entraîné")
+
+    def label_of(self, key: Hashable) -> int:
+        return int(self.labels[self._positions[key]])
+
+    def cluster_sizes(self) -> Dict[int, int]:
+        return dict(Counter(self.labels.tolist()))
+
+    def representatives(self, cluster_id: int, k: int = 5) -> List[Hashable]:
+        """Vidéos les plus proches du centre du cluster (requête ANN, filtrée sur le label)"""
+        self._check_fitted()
+        if not 0 <= cluster_id < len(self.centroids):
+            return []
+        labels = self.labels
+        hits = self.index.query(self.centroids[cluster_id], k=k, allowed=lambda i: labels[i] == cluster_id)[0]
+        return [self.keys[i] for i, _ in hits]
+
+    def similar(self, key: Hashable, k: int = 10) -> List[Tuple[Hashable, float]]:
+        """Vidéos les plus proches d'une vidéo connue : (clé, distance dans l'espace réduit)"""
+        self._check_fitted()
+        position = self._positions[key]
+        vector = self.index.get_vectors([position])
+        return [(self.keys[i], distance) for i, distance in self.index.query(vector, k=k, exclude=[position])[0]]
+
+    def similar_to_embedding(self, embedding, k: int = 10) -> List[Tuple[Hashable, float]]:
+        self._check_fitted()
+        vector = self.pca.transform(np.asarray(embedding, dtype=np.float32).reshape(1, -1)).astype(np.float32)
+        return [(self.keys[i], distance) for i, distance in self.index.query(vector, k=k)[0]]
+
+    def assign(self, embeddings, keys: Sequence[Hashable]) -> Tuple[np.ndarray, int]:
+        """Rattache de nouvelles vidéos aux clusters existants (centres figés) ; retourne (labels, nb atypiques)"""
+        self._check_fitted()
+        keys = list(keys)
+        if len(keys) != len(embeddings):
+            raise ValueError(f"{len(keys)} clés pour {len(embeddings)} embeddings")
+        if not keys:
+            return np.empty(0, dtype=np.int32), 0
+
+        reduced = self._reduce(embeddings)
+        if self.kmeans is not None:
+            labels = self.kmeans.predict(reduced).astype(np.int32)
+        else:
+            labels = np.array([self.labels[hits[0][0]] for hits in self.index.query(reduced, k=1)], dtype=np.int32)
+
+        novel = 0
+        if self.novelty_radius is not None:
+            known = labels != NOISE_LABEL
+            distances = np.linalg.norm(reduced[known] - self.centroids[labels[known]], axis=1)
+            novel = int((distances > self.novelty_radius).sum())
+
+        positions = []
+        added = []
+        for key, label in zip(keys, labels):
+            position = self._positions.get(key)
+            if position is None:
+                position = len(self.keys)
+                self.keys.append(key)
+                self._positions[key] = position
+                added.append(label)
+            else:
+                self.labels[position] = label
+            positions.append(position)
+        if added:
+            self.labels = np.concatenate([self.labels, np.asarray(added, dtype=np.int32)])
+        self.index.add(positions, reduced)
+        return labels, novel
+
+    # ------------------------------------------------------------------ persistance
+
+    def save(self, directory):
+        """Modèles (pickle), clés/labels et index ANN dans un répertoire"""
+        self._check_fitted()
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.index.save(directory / 'index')
+        state = {
+            'n_clusters': self.n_clusters, 'method': self.method, 'n_components': self.n_components,
+            'chunk_size': self.chunk_size, 'random_state': self.random_state,
+            'pca': self.pca, 'kmeans': self.kmeans, 'centroids': self.centroids,
+            'novelty_radius': self.novelty_radius, 'keys': self.keys, 'labels': self.labels,
+        }
+        with open(directory / 'model.pkl.tmp', 'wb') as f:
+            pickle.dump(state, f)
+        os.replace(directory / 'model.pkl.tmp', directory / 'model.pkl')
+        summary = {'method': self.method, 'clusters': len(self.centroids), 'videos': len(self.keys),
+                   'index_backend': self.index.backend}
+        (directory / 'summary.json').write_text(json.dumps(summary, indent=2), encoding='utf-8')
+
+    @classmethod
+    def load(cls, directory) -> 'TopicClusteringEngine':
+        directory = Path(directory)
+        with open(directory / 'model.pkl', 'rb') as f:
+            state = pickle.load(f)
+        engine = cls(state['n_clusters'], state['method'], state['n_components'],
+                     state['chunk_size'], state['random_state'])
+        for attribute in ('pca', 'kmeans', 'centroids', 'novelty_radius', 'keys', 'labels'):
+            setattr(engine, attribute, state[attribute])
+        engine._positions = {key: position for position, key in enumerate(engine.keys)}
+        engine.index = VectorIndex.load(directory / 'index')
+        return engine
@@ -7,17 +7,27 @@ from pathlib import Path
 
 THUMBNAILS_DIR = Path("static/competitors/images")
 
-def get_competitor_thumbnail(competitor_id, fallback_url=None):
+def get_competitor_thumbnail(competitor_id, fallback_url=None, width=None):
     """
     Obtenir le chemin local de la miniature d'un concurrent
     
     Args:
         competitor_id: ID du concurrent
         fallback_url: URL de fallback si la miniature locale n'existe pas
+        width: Largeur affichée en pixels (variante WebP la plus proche si disponible)
         
     Returns:
         str: Chemin relatif vers la miniature ou URL de fallback
     """
+    # Fichier adressé par contenu (cache navigateur immuable) si le service l'a téléchargé
+    try:
+        from ..thumbnail_service import thumbnail_service
+        stored = thumbnail_service.competitor_url(int(competitor_id), width)
+        if stored:
+            return stored
+    except Exception:
+        pass
+    
     # Chemin de la miniature locale
     local_path = THUMBNAILS_DIR / f"{competitor_id}.jpg"
     
@@ -0,0 +1,246 @@
+"""
+Index de plus proches voisins approché (ANN) pour les embeddings
+- HNSW via hnswlib si installé : requêtes en O(log n), ajouts incrémentaux, persistance sur disque
+- Repli exact numpy (produit matriciel float32) sinon : mêmes résultats, coût linéaire
+- Identifiants entiers fournis par l'appelant ; un ajout sur un identifiant existant remplace le vecteur
+- Filtrage pendant la recherche (exclusions, prédicat) : pas de sur-échantillonnage côté appelant
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    hnswlib = None
+    HNSWLIB_AVAILABLE = False
+
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+INITIAL_CAPACITY = 1024
+
+SPACES = ('cosine', 'l2')
+
+
+def _as_matrix(vectors) -> np.ndarray:
+    matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+    return matrix.reshape(1, -1) if matrix.ndim == 1 else matrix
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class VectorIndex:
+    """Index ANN sur des vecteurs float32 ; distance cosinus (1 - cos) ou euclidienne au carré"""
+
+    def __init__(self, dim: int, space: str = 'cosine', capacity: int = INITIAL_CAPACITY,
+                 backend: Optional[str] = None, ef: int = HNSW_EF_SEARCH):
+        if space not in SPACES:
+            raise ValueError(f"Espace inconnu: {space} ({', '.join(SPACES)})")
+        self.dim = dim
+        self.space = space
+        self.ef = ef
+        self.backend = backend or ('hnsw' if HNSWLIB_AVAILABLE else 'exact')
+        if self.backend == 'hnsw' and not HNSWLIB_AVAILABLE:
+            raise RuntimeError("hnswlib requis pour l'index HNSW (pip install hnswlib)")
+        self._lock = threading.RLock()
+        self._ids = {}  # identifiant -> ligne (exact) ou présence (hnsw)
+        if self.backend == 'hnsw':
+            self._index = hnswlib.Index(space=space, dim=dim)
+            self._index.init_index(max_elements=max(capacity, 1), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+            self._index.set_ef(ef)
+        else:
+            self._matrix = np.empty((0, dim), dtype=np.float32)
+            self._row_ids = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: int) -> bool:
+        return int(item_id) in self._ids
+
+    def ids(self) -> List[int]:
+        return list(self._ids)
+
+    def add(self, ids: Sequence[int], vectors) -> int:
+        """Ajoute ou remplace des vecteurs ; retourne le nombre d'éléments indexés"""
+        matrix = _as_matrix(vectors)
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) != len(matrix):
+            raise ValueError(f"{len(ids)} identifiants pour {len(matrix)} vecteurs")
+        if len(ids) == 0:
+            return len(self)
+        with self._lock:
+            if self.backend == 'hnsw':
+                self._add_hnsw(ids, matrix)
+            else:
+                self._add_exact(ids, matrix)
+            return len(self)
+
+    def _add_hnsw(self, ids: np.ndarray, matrix: np.ndarray):
+        # Les éléments supprimés (marqués) occupent encore leur place dans le graphe
+        needed = self._index.get_current_count() + len(ids)
+        capacity = self._index.get_max_elements()
+        if needed > capacity:
+            self._index.resize_index(max(needed, capacity * 2))
+        # hnswlib met à jour le vecteur d'un label existant (et réactive un label supprimé)
+        self._index.add_items(matrix, ids)
+        for item_id in ids.tolist():
+            self._ids[item_id] = True
+
+    def _add_exact(self, ids: np.ndarray, matrix: np.ndarray):
+        if self.space == 'cosine':
+            matrix = _normalize(matrix)
+        new_rows = []
+        for position, item_id in enumerate(ids.tolist()):
+            row = self._ids.get(item_id)
+            if row is None:
+                new_rows.append(position)
+            else:
+                self._matrix[row] = matrix[position]
+        if new_rows:
+            start = len(self._row_ids)
+            self._matrix = np.vstack([self._matrix, matrix[new_rows]])
+            self._row_ids = np.concatenate([self._row_ids, ids[new_rows]])
+            for offset, position in enumerate(new_rows):
+                self._ids[int(ids[position])] = start + offset
+
+    def remove(self, ids: Iterable[int]):
+        with self._lock:
+            for item_id in [int(i) for i in ids if int(i) in self._ids]:
+                if self.backend == 'hnsw':
+                    self._index.mark_deleted(item_id)
+                    del self._ids[item_id]
+                else:
+                    row = self._ids.pop(item_id)
+                    last = len(self._row_ids) - 1
+                    if row != last:  # la dernière ligne prend la place de la ligne supprimée
+                        self._matrix[row] = self._matrix[last]
+                        self._row_ids[row] = self._row_ids[last]
+                        self._ids[int(self._row_ids[row])] = row
+                    self._matrix = self._matrix[:last]
+                    self._row_ids = self._row_ids[:last]
+
+    def get_vectors(self, ids: Sequence[int]) -> np.ndarray:
+        with self._lock:
+            if self.backend == 'hnsw':
+                return np.asarray(self._index.get_items(list(ids)), dtype=np.float32)
+            return self._matrix[[self._ids[int(i)] for i in ids]]
+
+    def query(self, vectors, k: int = 10, exclude: Optional[Iterable[int]] = None,
+              allowed: Optional[Callable[[int], bool]] = None) -> List[List[Tuple[int, float]]]:
+        """k plus proches voisins par vecteur requête : listes de (identifiant, distance) croissantes
+
+        exclude / allowed sont appliqués pendant la recherche : k résultats dès qu'il existe k candidats admis.
+        """
+        matrix = _as_matrix(vectors)
+        excluded = {int(i) for i in exclude} if exclude else set()
+        if excluded or allowed is not None:
+            def accept(label: int) -> bool:
+                return label not in excluded and (allowed is None or allowed(label))
+        else:
+            accept = None
+        with self._lock:
+            available = len(self._ids)
+            if not available or k <= 0:
+                return [[] for _ in range(len(matrix))]
+            wanted = min(k, available)
+            if self.backend == 'hnsw':
+                return self._query_hnsw(matrix, wanted, accept)
+            labels, distances = self._query_exact(matrix, wanted, accept)
+        return [[(int(label), float(distance)) for label, distance in zip(row_labels, row_distances)
+                 if np.isfinite(distance)]
+                for row_labels, row_distances in zip(labels, distances)]
+
+    def _query_hnsw(self, matrix: np.ndarray, k: int, accept) -> List[List[Tuple[int, float]]]:
+        self._index.set_ef(max(self.ef, k))
+        try:
+            labels, distances = self._index.knn_query(matrix, k=k, filter=accept)
+        except RuntimeError:
+            # Moins de k voisins atteignables (filtre, éléments supprimés) : hnswlib refuse la matrice 2D,
+            # on recherche ligne par ligne en exploration complète en réduisant k jusqu'au nombre trouvé
+            self._index.set_ef(max(self.ef, len(self._ids)))
+            results = [self._query_hnsw_row(row, k, accept) for row in matrix]
+            self._index.set_ef(self.ef)
+            return results
+        return [[(int(label), float(distance)) for label, distance in zip(row_labels, row_distances)]
+                for row_labels, row_distances in zip(labels, distances)]
+
+    def _query_hnsw_row(self, row: np.ndarray, k: int, accept) -> List[Tuple[int, float]]:
+        while k > 0:
+            try:
+                labels, distances = self._index.knn_query(row.reshape(1, -1), k=k, filter=accept)
+            except RuntimeError:
+                k -= 1
+                continue
+            return [(int(label), float(distance)) for label, distance in zip(labels[0], distances[0])]
+        return []
+
+    def _query_exact(self, matrix: np.ndarray, k: int, accept=None) -> Tuple[np.ndarray, np.ndarray]:
+        if self.space == 'cosine':
+            distances = 1.0 - _normalize(matrix) @ self._matrix.T
+        else:
+            distances = ((matrix ** 2).sum(axis=1, keepdims=True) - 2.0 * matrix @ self._matrix.T
+                         + (self._matrix ** 2).sum(axis=1))
+        if accept is not None:
+            # Candidats refusés repoussés à l'infini (retirés du résultat par query)
+            rejected = np.fromiter((not accept(int(i)) for i in self._row_ids), dtype=bool, count=len(self._row_ids))
+            distances[:, rejected] = np.inf
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k] if k < distances.shape[1] \
+            else np.tile(np.arange(distances.shape[1]), (len(matrix), 1))
+        nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+        order = np.argsort(nearest_distances, axis=1)
+        return (self._row_ids[np.take_along_axis(nearest, order, axis=1)],
+                np.take_along_axis(nearest_distances, order, axis=1))
+
+    def save(self, path):
+        """Écrit l'index dans un répertoire (remplacement atomique du fichier de métadonnées)"""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            ids = np.fromiter(self._ids, dtype=np.int64, count=len(self._ids))
+            if self.backend == 'hnsw':
+                self._index.save_index(str(path / 'index.hnsw.tmp'))
+                os.replace(path / 'index.hnsw.tmp', path / 'index.hnsw')
+            else:
+                with open(path / 'vectors.npy.tmp', 'wb') as f:
+                    np.save(f, self._matrix)
+                os.replace(path / 'vectors.npy.tmp', path / 'vectors.npy')
+                ids = self._row_ids.copy()
+            with open(path / 'ids.npy.tmp', 'wb') as f:
+                np.save(f, ids)
+            os.replace(path / 'ids.npy.tmp', path / 'ids.npy')
+            meta = {'dim': self.dim, 'space': self.space, 'backend': self.backend, 'count': len(ids)}
+            (path / 'index.json.tmp').write_text(json.dumps(meta), encoding='utf-8')
+            os.replace(path / 'index.json.tmp', path / 'index.json')
+
+    @classmethod
+    def load(cls, path, ef: int = HNSW_EF_SEARCH) -> 'VectorIndex':
+        path = Path(path)
+        meta = json.loads((path / 'index.json').read_text(encoding='utf-8'))
+        ids = np.load(path / 'ids.npy')
+        index = cls(meta['dim'], meta['space'], capacity=1, backend=meta['backend'], ef=ef)
+        if index.backend == 'hnsw':
+            index._index = hnswlib.Index(space=meta['space'], dim=meta['dim'])
+            index._index.load_index(str(path / 'index.hnsw'))
+            index._index.set_ef(ef)
+            index._ids = {int(i): True for i in ids}
+        else:
+            index._matrix = np.load(path / 'vectors.npy')
+            index._row_ids = ids
+            index._ids = {int(i): row for row, i in enumerate(ids)}
+        return index
+
+    @staticmethod
+    def exists(path) -> bool:
+        return (Path(path) / 'index.json').exists()
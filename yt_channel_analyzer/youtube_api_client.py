@@ -5,11 +5,55 @@ Remplace le scraping par des appels API officiels
 
 import os
 import json
+import threading
 import requests
 from datetime import datetime, date
 from typing import List, Dict, Optional
 import re
 
+QUOTA_FILE = 'api_quota_tracking.json'
+DAILY_QUOTA_LIMIT = 10000
+
+
+class QuotaLedger:
+    """Registre journalier du quota (même fichier que YouTubeAPI), partagé entre threads"""
+    
+    def __init__(self, quota_file: str = QUOTA_FILE, daily_limit: int = DAILY_QUOTA_LIMIT):
+        self.quota_file = quota_file
+        self.daily_limit = daily_limit
+        self._lock = threading.Lock()
+    
+    def _load(self) -> Dict:
+        today = str(date.today())
+        try:
+            with open(self.quota_file, 'r') as f:
+                data = json.load(f)
+            if data.get('date') == today:
+                return data
+        except (OSError, ValueError):
+            pass
+        return {'date': today, 'quota_used': 0, 'requests_made': 0}
+    
+    def reserve(self, units: int = 1) -> bool:
+        """Réserve des unités avant un appel ; False si la limite journalière serait dépassée"""
+        with self._lock:
+            data = self._load()
+            if data.get('quota_used', 0) + units > self.daily_limit:
+                return False
+            data['quota_used'] = data.get('quota_used', 0) + units
+            data['requests_made'] = data.get('requests_made', 0) + 1
+            data['last_updated'] = datetime.now().isoformat()
+            try:
+                with open(self.quota_file, 'w') as f:
+                    json.dump(data, f, indent=2)
+            except OSError as e:
+                print(f"[QUOTA] ❌ Erreur sauvegarde quota: {e}")
+            return True
+    
+    def remaining(self) -> int:
+        with self._lock:
+            return max(0, self.daily_limit - self._load().get('quota_used', 0))
+
 class YouTubeAPI:
     def __init__(self, api_key: Optional[str] = None):
         """Initialise le client API YouTube"""
@@ -20,7 +64,7 @@ class YouTubeAPI:
         self.base_url = "https://www.googleapis.com/youtube/v3"
         self.requests_made = 0
         self.quota_used = 0
-        self.quota_file = 'api_quota_tracking.json'
+        self.quota_file = QUOTA_FILE
         
         # Charger les données de quota existantes
         self._load_quota_data()
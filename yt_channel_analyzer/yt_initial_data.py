@@ -0,0 +1,298 @@
+"""
+Extraction rapide des blobs JSON embarqués dans les pages YouTube (ytInitialData, ytInitialPlayerResponse)
+- Un seul balayage regex pour localiser les blobs, décodage orjson si disponible
+- Champs décrits par des chemins précompilés, tous extraits en un seul parcours de l'arbre JSON
+- Mode lot pour les pages HTML sauvegardées (processus parallèles)
+"""
+
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+INITIAL_DATA = 'ytInitialData'
+PLAYER_RESPONSE = 'ytInitialPlayerResponse'
+WILDCARD = '*'
+
+# Affectations du type `var ytInitialData = {` ou `window["ytInitialData"] = {`
+_BLOB_START = re.compile(r'(ytInitialData|ytInitialPlayerResponse)"?\]?\s*=\s*(?=\{)')
+_BLOB_END = ';</script>'
+_DIGITS = re.compile(r'\d[\d\s,.]*')
+
+_decoder = json.JSONDecoder()
+
+PathKey = Union[str, int]
+
+
+def _loads(text: str) -> Any:
+    return orjson.loads(text) if orjson else json.loads(text)
+
+
+def find_blobs(html: str, names: Iterable[str] = (INITIAL_DATA, PLAYER_RESPONSE)) -> Dict[str, Any]:
+    """Localise et décode les blobs demandés (un balayage, arrêt dès qu'ils sont tous trouvés)"""
+    wanted = set(names)
+    blobs: Dict[str, Any] = {}
+    for match in _BLOB_START.finditer(html):
+        name = match.group(1)
+        if name not in wanted or name in blobs:
+            continue
+        start = match.end()
+        end = html.find(_BLOB_END, start)
+        try:
+            blobs[name] = _loads(html[start:end] if end != -1 else html[start:])
+        except ValueError:
+            # Blob suivi d'autre code JS sur la même ligne : décodage incrémental
+            try:
+                blobs[name] = _decoder.raw_decode(html, start)[0]
+            except ValueError:
+                continue
+        if len(blobs) == len(wanted):
+            break
+    return blobs
+
+
+def compile_path(path: str) -> Tuple[PathKey, ...]:
+    """'a.0.b.*' -> ('a', 0, 'b', '*') ; '*' parcourt tous les éléments d'une liste"""
+    return tuple(int(part) if part.isdigit() else part for part in path.split('.'))
+
+
+@dataclass(frozen=True)
+class Field:
+    """Champ extrait : chemins candidats par priorité décroissante dans un blob"""
+    name: str
+    paths: Tuple[str, ...]
+    blob: str = PLAYER_RESPONSE
+    many: bool = False
+    transform: Optional[Callable[[Any], Any]] = None
+
+
+class _Node:
+    __slots__ = ('children', 'hits')
+
+    def __init__(self):
+        self.children: Dict[PathKey, '_Node'] = {}
+        self.hits: List[Tuple[int, int]] = []  # (index du champ, priorité du chemin)
+
+
+class Extractor:
+    """Ensemble de champs compilés en un arbre de chemins par blob"""
+
+    def __init__(self, fields: Iterable[Field]):
+        self.fields = list(fields)
+        self._tries: Dict[str, _Node] = {}
+        for index, field in enumerate(self.fields):
+            root = self._tries.setdefault(field.blob, _Node())
+            for priority, path in enumerate(field.paths):
+                node = root
+                for key in compile_path(path):
+                    node = node.children.setdefault(key, _Node())
+                node.hits.append((index, priority))
+
+    @property
+    def blob_names(self) -> Tuple[str, ...]:
+        return tuple(self._tries)
+
+    def _walk(self, value: Any, node: _Node, found: Dict[int, Tuple[int, Any]], many: Dict[int, List]):
+        for index, priority in node.hits:
+            if value in (None, '', [], {}):
+                continue
+            if self.fields[index].many:
+                many[index].append(value)
+            elif index not in found or priority < found[index][0]:
+                found[index] = (priority, value)
+
+        if not node.children:
+            return
+        if isinstance(value, dict):
+            for key, child in node.children.items():
+                if key == WILDCARD:
+                    for item in value.values():
+                        self._walk(item, child, found, many)
+                elif key in value:
+                    self._walk(value[key], child, found, many)
+        elif isinstance(value, list):
+            for key, child in node.children.items():
+                if key == WILDCARD:
+                    for item in value:
+                        self._walk(item, child, found, many)
+                elif isinstance(key, int) and -len(value) <= key < len(value):
+                    self._walk(value[key], child, found, many)
+
+    def extract_blobs(self, blobs: Dict[str, Any]) -> Dict[str, Any]:
+        """Un parcours par blob ; champs absents à None (ou [] pour les champs multiples)"""
+        found: Dict[int, Tuple[int, Any]] = {}
+        many: Dict[int, List] = {index: [] for index, field in enumerate(self.fields) if field.many}
+        for name, root in self._tries.items():
+            if name in blobs:
+                self._walk(blobs[name], root, found, many)
+
+        result = {}
+        for index, field in enumerate(self.fields):
+            value = many[index] if field.many else found.get(index, (0, None))[1]
+            if field.transform and value not in (None, []):
+                try:
+                    value = field.transform(value)
+                except (TypeError, ValueError, KeyError, IndexError):
+                    value = None
+            result[field.name] = value
+        return result
+
+    def extract(self, html: str) -> Dict[str, Any]:
+        return self.extract_blobs(find_blobs(html, self.blob_names))
+
+
+# --- Transformations ---
+
+def to_int(value: Any) -> Optional[int]:
+    """'1 234 vues' / '1,234' / 1234 -> 1234"""
+    if isinstance(value, int):
+        return value
+    match = _DIGITS.search(str(value))
+    if not match:
+        return None
+    digits = re.sub(r'\D', '', match.group(0))
+    return int(digits) if digits else None
+
+
+def text_of(value: Any) -> str:
+    """Texte YouTube : chaîne, {'simpleText': ...} ou {'runs': [...]}"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        if 'simpleText' in value:
+            return value['simpleText']
+        if 'runs' in value:
+            return ''.join(run.get('text', '') for run in value['runs'])
+        if 'content' in value:
+            return value['content']
+    return ''
+
+
+def last_thumbnail(thumbnails: List[Dict]) -> str:
+    return thumbnails[-1]['url']
+
+
+_WATCH_CONTENTS = 'contents.twoColumnWatchNextResults.results.results.contents.*'
+_LIKE_BUTTONS = (f'{_WATCH_CONTENTS}.videoPrimaryInfoRenderer.videoActions.menuRenderer.topLevelButtons.*'
+                 '.segmentedLikeDislikeButtonViewModel.likeButtonViewModel.likeButtonViewModel'
+                 '.toggleButtonViewModel.toggleButtonViewModel.defaultButtonViewModel.buttonViewModel')
+_LEGACY_LIKE_BUTTON = (f'{_WATCH_CONTENTS}.videoPrimaryInfoRenderer.videoActions.menuRenderer.topLevelButtons.*'
+                       '.segmentedLikeDislikeButtonRenderer.likeButton.toggleButtonRenderer.defaultText')
+_MICROFORMAT = 'microformat.playerMicroformatRenderer'
+
+VIDEO_FIELDS = (
+    Field('video_id', ('videoDetails.videoId',)),
+    Field('title', ('videoDetails.title', f'{_MICROFORMAT}.title.simpleText')),
+    Field('view_count', ('videoDetails.viewCount', f'{_MICROFORMAT}.viewCount'), transform=to_int),
+    Field('channel_name', ('videoDetails.author', f'{_MICROFORMAT}.ownerChannelName')),
+    Field('channel_id', ('videoDetails.channelId', f'{_MICROFORMAT}.externalChannelId')),
+    Field('description', ('videoDetails.shortDescription', f'{_MICROFORMAT}.description.simpleText')),
+    Field('duration_seconds', ('videoDetails.lengthSeconds', f'{_MICROFORMAT}.lengthSeconds'), transform=to_int),
+    Field('keywords', ('videoDetails.keywords',)),
+    Field('published_at', (f'{_MICROFORMAT}.publishDate', f'{_MICROFORMAT}.uploadDate')),
+    Field('category', (f'{_MICROFORMAT}.category',)),
+    Field('is_live', ('videoDetails.isLiveContent',)),
+    Field('thumbnail_url', ('videoDetails.thumbnail.thumbnails',), transform=last_thumbnail),
+    # ytInitialData : likes (nombre exact dans le libellé d'accessibilité), date et vues affichées
+    Field('like_count', (f'{_LIKE_BUTTONS}.accessibilityText',
+                         f'{_LEGACY_LIKE_BUTTON}.accessibility.accessibilityData.label'),
+          blob=INITIAL_DATA, transform=to_int),
+    Field('like_text', (f'{_LIKE_BUTTONS}.title', f'{_LEGACY_LIKE_BUTTON}.simpleText'), blob=INITIAL_DATA),
+    Field('date_text', (f'{_WATCH_CONTENTS}.videoPrimaryInfoRenderer.dateText',), blob=INITIAL_DATA, transform=text_of),
+    Field('view_text', (f'{_WATCH_CONTENTS}.videoPrimaryInfoRenderer.viewCount.videoViewCountRenderer.viewCount',),
+          blob=INITIAL_DATA, transform=text_of),
+    Field('subscriber_text', (f'{_WATCH_CONTENTS}.videoSecondaryInfoRenderer.owner.videoOwnerRenderer.subscriberCountText',),
+          blob=INITIAL_DATA, transform=text_of),
+)
+
+_CHANNEL_TABS = 'contents.twoColumnBrowseResultsRenderer.tabs.*.tabRenderer.content'
+_GRID_ITEMS = f'{_CHANNEL_TABS}.richGridRenderer.contents.*.richItemRenderer.content'
+
+CHANNEL_FIELDS = (
+    Field('video_ids', (f'{_GRID_ITEMS}.videoRenderer.videoId',
+                        f'{_GRID_ITEMS}.lockupViewModel.contentId'), blob=INITIAL_DATA, many=True),
+    Field('videos', (f'{_GRID_ITEMS}.videoRenderer',), blob=INITIAL_DATA, many=True),
+    Field('channel_name', ('metadata.channelMetadataRenderer.title',), blob=INITIAL_DATA),
+    Field('channel_id', ('metadata.channelMetadataRenderer.externalId',), blob=INITIAL_DATA),
+    Field('video_count', ('header.pageHeaderRenderer.content.pageHeaderViewModel.metadata.contentMetadataViewModel'
+                          '.metadataRows.*.metadataParts.*.text.content',
+                          'header.c4TabbedHeaderRenderer.videosCountText'),
+          blob=INITIAL_DATA, many=True),
+)
+
+video_extractor = Extractor(VIDEO_FIELDS)
+channel_extractor = Extractor(CHANNEL_FIELDS)
+
+
+def extract_video_fields(html: str) -> Dict[str, Any]:
+    """Champs d'une page vidéo (None si absents ; title None = page non reconnue)"""
+    return video_extractor.extract(html)
+
+
+def extract_channel_page(html: str) -> Dict[str, Any]:
+    """IDs des vidéos de la grille /videos (ordre de la page), vidéos détaillées et total affiché"""
+    fields = channel_extractor.extract(html)
+    fields['video_ids'] = list(dict.fromkeys(fields['video_ids']))
+    counts = [text_of(value) for value in fields['video_count']]
+    fields['video_count'] = next(
+        (to_int(text) for text in counts if re.search(r'vid[ée]o', text, re.IGNORECASE) and to_int(text)), 0
+    )
+    fields['videos'] = [
+        {
+            'video_id': item.get('videoId'),
+            'title': text_of(item.get('title')),
+            'views': text_of(item.get('viewCountText')),
+            'published_text': text_of(item.get('publishedTimeText')),
+            'duration': text_of(item.get('lengthText')),
+        }
+        for item in fields['videos']
+    ]
+    return fields
+
+
+def to_video_data(video_url: str, fields: Dict[str, Any]) -> Dict:
+    """Format historique des scrapers (url, title, likes, views, publication_date, channel, thumbnail)"""
+    video_id = fields.get('video_id') or (video_url.split("watch?v=")[1].split("&")[0] if "watch?v=" in video_url else "")
+    like_count = fields.get('like_count')
+    view_count = fields.get('view_count')
+    return {
+        'url': video_url,
+        'title': fields.get('title') or '',
+        'likes': str(like_count) if like_count is not None else (fields.get('like_text') or ''),
+        'views': str(view_count) if view_count is not None else (fields.get('view_text') or ''),
+        'publication_date': fields.get('published_at') or fields.get('date_text') or '',
+        'channel': {'name': fields.get('channel_name') or '', 'url': ''},
+        'thumbnail': f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg",
+        'description': fields.get('description') or '',
+        'duration_seconds': fields.get('duration_seconds'),
+        'tags': fields.get('keywords') or [],
+        'category': fields.get('category'),
+    }
+
+
+# --- Mode lot : pages HTML sauvegardées ---
+
+def _parse_file(path: str) -> Tuple[str, Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        html = f.read()
+    fields = extract_channel_page(html) if '"twoColumnBrowseResultsRenderer"' in html else extract_video_fields(html)
+    return path, fields
+
+
+def parse_saved_pages(paths: Iterable[str], max_workers: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(chemin, champs) pour chaque page sauvegardée ; pages vidéo ou /videos de chaîne détectées automatiquement"""
+    paths = [str(path) for path in paths]
+    workers = max_workers if max_workers is not None else min(len(paths), os.cpu_count() or 1)
+    if workers <= 1 or len(paths) < 4:
+        for path in paths:
+            yield _parse_file(path)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_parse_file, paths, chunksize=max(1, len(paths) // (workers * 4)))